@@ -0,0 +1,62 @@
+"""Add analytics daily rollup tables
+
+Revision ID: analytics_daily_rollups
+Revises: po_aggregate_indexes
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "analytics_daily_rollups"
+down_revision = "po_aggregate_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the fact tables and watermarks behind the admin analytics."""
+    op.create_table(
+        "verification_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("service_name", sa.String(), nullable=False),
+        sa.Column("verifications", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("refunded", sa.Integer(), nullable=False),
+        sa.Column("spend", sa.Float(), nullable=False),
+        sa.Column("refund_amount", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "service_name"),
+    )
+    op.create_table(
+        "ledger_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("entries", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "source", "type"),
+    )
+    op.create_table(
+        "user_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("signups", sa.Integer(), nullable=False),
+        sa.Column("funded", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+    op.create_table(
+        "analytics_rollup_watermarks",
+        sa.Column("rollup", sa.String(length=64), nullable=False),
+        sa.Column("high_water", sa.DateTime(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("rollup"),
+    )
+
+
+def downgrade():
+    """Drop the analytics rollup tables."""
+    op.drop_table("analytics_rollup_watermarks")
+    op.drop_table("user_daily_rollups")
+    op.drop_table("ledger_daily_rollups")
+    op.drop_table("verification_daily_rollups")
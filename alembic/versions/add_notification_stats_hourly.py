@@ -0,0 +1,70 @@
+"""Add hourly notification stats counters
+
+Revision ID: notification_stats_hourly
+Revises: analytics_daily_rollups
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "notification_stats_hourly"
+down_revision = "analytics_daily_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the counter table and backfill it from notification_analytics."""
+    op.create_table(
+        "notification_stats_hourly",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("notification_type", sa.String(length=50), nullable=False),
+        sa.Column("delivery_method", sa.String(length=50), nullable=False),
+        sa.Column("sent", sa.Integer(), nullable=False),
+        sa.Column("delivered", sa.Integer(), nullable=False),
+        sa.Column("read", sa.Integer(), nullable=False),
+        sa.Column("clicked", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("delivery_time_ms_total", sa.BigInteger(), nullable=False),
+        sa.Column("delivery_time_count", sa.Integer(), nullable=False),
+        sa.Column("read_time_ms_total", sa.BigInteger(), nullable=False),
+        sa.Column("read_time_count", sa.Integer(), nullable=False),
+        sa.Column("click_time_ms_total", sa.BigInteger(), nullable=False),
+        sa.Column("click_time_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "hour", "user_id", "notification_type", "delivery_method"
+        ),
+    )
+
+    op.execute(
+        """
+        INSERT INTO notification_stats_hourly
+        SELECT
+            date_trunc('hour', created_at) AS hour,
+            user_id,
+            notification_type,
+            delivery_method,
+            COUNT(*) FILTER (WHERE status = 'sent'),
+            COUNT(*) FILTER (WHERE status = 'delivered'),
+            COUNT(*) FILTER (WHERE status = 'read'),
+            COUNT(*) FILTER (WHERE status = 'clicked'),
+            COUNT(*) FILTER (WHERE status = 'failed'),
+            COALESCE(SUM(delivery_time_ms) FILTER (WHERE delivery_time_ms <> 0), 0),
+            COUNT(*) FILTER (WHERE delivery_time_ms <> 0),
+            COALESCE(SUM(read_time_ms) FILTER (WHERE read_time_ms <> 0), 0),
+            COUNT(*) FILTER (WHERE read_time_ms <> 0),
+            COALESCE(SUM(click_time_ms) FILTER (WHERE click_time_ms <> 0), 0),
+            COUNT(*) FILTER (WHERE click_time_ms <> 0)
+        FROM notification_analytics
+        GROUP BY 1, user_id, notification_type, delivery_method
+        """
+    )
+
+
+def downgrade():
+    """Drop the notification stats counters."""
+    op.drop_table("notification_stats_hourly")
@@ -0,0 +1,47 @@
+"""Add purchase outcome aggregate indexes
+
+Revision ID: po_aggregate_indexes
+Revises: 794eda6caa30
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "po_aggregate_indexes"
+down_revision = "794eda6caa30"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add indexes backing the PurchaseIntelligenceService GROUP BY queries."""
+    # Live health score: provider + service + country in the last hour
+    op.create_index(
+        "ix_po_provider_svc_country_date",
+        "purchase_outcomes",
+        ["provider", "service", "country", "created_at"],
+        unique=False,
+    )
+
+    # Provider ROI: date range grouped by provider; the INCLUDE columns let
+    # Postgres answer the sums with an index-only scan
+    op.create_index(
+        "ix_po_date_provider",
+        "purchase_outcomes",
+        ["created_at", "provider"],
+        unique=False,
+        postgresql_include=[
+            "provider_cost",
+            "user_price",
+            "is_refunded",
+            "refund_amount",
+        ],
+    )
+
+
+def downgrade():
+    """Remove aggregate indexes."""
+    op.drop_index("ix_po_date_provider", table_name="purchase_outcomes")
+    op.drop_index("ix_po_provider_svc_country_date", table_name="purchase_outcomes")
@@ -0,0 +1,29 @@
+"""Index updated_at on the analytics rollup sources
+
+Revision ID: rollup_updated_at_indexes
+Revises: notification_stats_hourly
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "rollup_updated_at_indexes"
+down_revision = "notification_stats_hourly"
+branch_labels = None
+depends_on = None
+
+TABLES = ("verifications", "sms_transactions", "balance_transactions", "users")
+
+
+def upgrade():
+    """Let the rollup refresh find changed rows without a full scan."""
+    for table in TABLES:
+        op.create_index(f"ix_{table}_updated_at", table, ["updated_at"])
+
+
+def downgrade():
+    """Drop the updated_at indexes."""
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
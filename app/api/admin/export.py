@@ -2,18 +2,29 @@
 
 import logging
 from datetime import datetime, timezone
-from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user_id
 from app.models.user import User
+from app.services.export_service import (
+    FORMATS,
+    PYARROW_AVAILABLE,
+    ExportDataset,
+    export_store,
+    stream_export,
+    users_dataset,
+    verifications_dataset,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+FORMAT_PATTERN = "^(csv|json|ndjson|parquet)$"
+
 
 async def require_admin(
     user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
@@ -25,21 +36,43 @@ async def require_admin(
     return user_id
 
 
+def _export_response(db: Session, dataset: ExportDataset, format: str, delivery: str):
+    if format == "parquet" and not PYARROW_AVAILABLE:
+        raise HTTPException(
+            status_code=400, detail="Parquet export is not available on this server"
+        )
+
+    if delivery == "job":
+        job = export_store.start(dataset, format)
+        return {
+            **job,
+            "status_url": f"/api/admin/export/jobs/{job['export_id']}",
+            "download_url": f"/api/admin/export/jobs/{job['export_id']}/download",
+        }
+
+    media_type, extension = FORMATS[format]
+    filename = (
+        f"{dataset.name}_export_{datetime.now(timezone.utc):%Y%m%d_%H%M%S}.{extension}"
+    )
+    return StreamingResponse(
+        stream_export(db, dataset, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
 @router.get("/export/users")
 async def export_users(
-    format: str = Query("csv", pattern="^(csv|json)$"),
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    delivery: str = Query("stream", pattern="^(stream|job)$"),
     admin_id: str = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    """Export users data."""
+    """Export users data, streamed or as a background job."""
     try:
-        return {
-            "export_id": f"users_export_{int(datetime.now().timestamp())}",
-            "format": format,
-            "status": "completed",
-            "download_url": f"/api/admin/download/users_export_{int(datetime.now().timestamp())}.{format}",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        }
+        return _export_response(db, users_dataset(), format, delivery)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to export users: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to export users")
@@ -47,21 +80,44 @@ async def export_users(
 
 @router.get("/export/verifications")
 async def export_verifications(
-    format: str = Query("csv", pattern="^(csv|json)$"),
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
     days: int = Query(30, ge=1, le=365),
+    delivery: str = Query("stream", pattern="^(stream|job)$"),
     admin_id: str = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    """Export verifications data."""
+    """Export verifications data, streamed or as a background job."""
     try:
-        return {
-            "export_id": f"verifications_export_{int(datetime.now().timestamp())}",
-            "format": format,
-            "status": "completed",
-            "days": days,
-            "download_url": f"/api/admin/download/verifications_export_{int(datetime.now().timestamp())}.{format}",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        }
+        return _export_response(db, verifications_dataset(days), format, delivery)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to export verifications: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to export verifications")
+
+
+@router.get("/export/jobs/{export_id}")
+async def get_export_job(export_id: str, admin_id: str = Depends(require_admin)):
+    """Progress of a background export."""
+    job = export_store.get(export_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+
+@router.get("/export/jobs/{export_id}/download")
+async def download_export(export_id: str, admin_id: str = Depends(require_admin)):
+    """Download a finished background export."""
+    job = export_store.get(export_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=409, detail=f"Export is {job['status']}, not completed"
+        )
+    media_type, extension = FORMATS[job["format"]]
+    return FileResponse(
+        export_store.artifact_path(job),
+        media_type=media_type,
+        filename=f"{export_id}.{extension}",
+    )
@@ -0,0 +1,39 @@
+"""Admin performance endpoints."""
+
+from fastapi import APIRouter, Depends
+
+from app.api.admin.dependencies import require_admin
+from app.core.config import get_settings
+from app.core.loop_monitor import loop_monitor
+from app.middleware.timing import middleware_timings
+from app.services.service_catalog import service_catalog
+from app.services.tier_cache import tier_cache
+
+router = APIRouter()
+
+
+@router.get("/performance/middleware")
+async def get_middleware_latency_budget(admin=Depends(require_admin)):
+    """Per-layer cost of the middleware chain since startup, most expensive first."""
+    return {
+        "enabled": get_settings().middleware_timing_enabled,
+        "layers": middleware_timings.report(),
+    }
+
+
+@router.get("/performance/event-loop")
+async def get_event_loop_stalls(admin=Depends(require_admin)):
+    """Event-loop lag and stalls for this worker by route and module, worst first."""
+    return {"enabled": get_settings().loop_monitor_enabled, **loop_monitor.report()}
+
+
+@router.get("/performance/tier-cache")
+async def get_tier_cache_stats(admin=Depends(require_admin)):
+    """Tier resolution cache hit rate for this worker."""
+    return tier_cache.stats()
+
+
+@router.get("/performance/service-catalog")
+async def get_service_catalog_stats(admin=Depends(require_admin)):
+    """Purchase pricing catalog hit rate and snapshot for this worker."""
+    return service_catalog.stats()
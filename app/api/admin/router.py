@@ -11,6 +11,7 @@ from app.api.admin.export import router as export_router
 from app.api.admin.intelligence import router as intelligence_router
 from app.api.admin.kyc import router as kyc_router
 from app.api.admin.logging_dashboard import router as logging_dashboard_router
+from app.api.admin.performance import router as performance_router
 from app.api.admin.pricing_control import router as pricing_control_router
 from app.api.admin.refund_monitoring import router as refund_monitoring_router
 from app.api.admin.stats import router as stats_router
@@ -44,4 +45,5 @@ router.include_router(logging_dashboard_router, prefix="/admin", tags=["Admin"])
 router.include_router(refund_monitoring_router, prefix="/admin", tags=["Admin"])
 router.include_router(support_router, prefix="/admin", tags=["Admin"])
 router.include_router(kyc_router, prefix="/admin", tags=["Admin"])
+router.include_router(performance_router, prefix="/admin", tags=["Admin"])
 router.include_router(audit_unreceived_router, prefix="", tags=["Admin"])
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.dependencies import get_current_user_id
 from app.models.user import User
+from app.services.tier_cache import tier_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -147,6 +148,7 @@ async def update_user_tier(
             )
         user.subscription_tier = body.tier
         db.commit()
+        tier_cache.invalidate(user_id)
 
         try:
             import asyncio
@@ -195,4 +197,6 @@ async def bulk_update_tier(
         .update({"subscription_tier": body.tier}, synchronize_session=False)
     )
     db.commit()
+    for user_id in body.user_ids:
+        tier_cache.invalidate(user_id)
     return {"success": True, "updated": updated, "tier": body.tier}
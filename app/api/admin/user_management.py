@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.dependencies import get_current_user_id
 from app.models.user import User
+from app.services.tier_cache import tier_cache
 
 router = APIRouter()
 
@@ -193,6 +194,7 @@ async def update_user_tier(
         old_tier = getattr(user, "subscription_tier", "freemium")
         user.subscription_tier = tier
         db.commit()
+        tier_cache.invalidate(user_id)
 
         try:
             import asyncio
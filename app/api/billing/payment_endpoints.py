@@ -20,6 +20,7 @@ from app.schemas.payment import (
     PaymentVerifyResponse,
 )
 from app.services.payment_service import get_payment_service
+from app.services.tier_cache import tier_cache
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -218,6 +219,7 @@ async def paystack_webhook(request: Request, db: Session = Depends(get_db)):
                             days=30
                         )
                         db.commit()
+                        tier_cache.invalidate(user_id)
                         logger.info(
                             f"Tier upgraded to {upgrade_to} for user {user_id} via webhook"
                         )
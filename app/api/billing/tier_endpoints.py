@@ -11,6 +11,7 @@ from app.core.dependencies import get_current_user_id
 from app.core.logging import get_logger, log_tier_access
 from app.core.tier_config import TierConfig
 from app.models.user import User
+from app.services.tier_cache import tier_cache
 from app.services.tier_manager import TierManager
 
 logger = get_logger(__name__)
@@ -101,6 +102,7 @@ async def upgrade_tier(
         if target_tier == "payg":
             user.subscription_tier = target_tier
             db.commit()
+            tier_cache.invalidate(user.id)
 
             # Send tier upgrade email (non-blocking)
             try:
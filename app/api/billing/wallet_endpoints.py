@@ -7,7 +7,8 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import func
 from sqlalchemy.orm import Session
@@ -235,12 +236,12 @@ async def export_wallet_csv(
     """Generates and streams a CSV audit trail for the user."""
     try:
         service = FinancialStatementsService(db)
-        csv_content = await service.export_user_transactions_csv(user_id)
+        csv_chunks = service.iter_user_transactions_csv(user_id)
 
         filename = f"vrenum_wallet_audit_{datetime.now().strftime('%Y%m%d')}.csv"
 
-        return Response(
-            content=csv_content,
+        return StreamingResponse(
+            csv_chunks,
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
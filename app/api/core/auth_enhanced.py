@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user_id
+from app.core.token_cache import verified_tokens
 from app.core.token_manager import create_tokens, verify_refresh_token
 from app.models.user import User
 
@@ -125,7 +126,8 @@ async def logout_all(
         if redis:
             redis.setex(f"logout_all:{user_id}", 86400 * 30, "1")
     except Exception:
-        pass
+        redis = None
+    verified_tokens.publish_revocation(redis, user_id=user_id)
 
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user_id
+from app.core.http_clients import get_http_client
 from app.core.logging import get_logger
 from app.models.forwarding import ForwardingConfig
 from app.services.email_service import email_service
@@ -246,14 +247,12 @@ async def _send_forwarding_webhook(
 
         for attempt in range(3):
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    resp = await client.post(
-                        webhook_url, content=payload, headers=headers
-                    )
-                    if resp.status_code in [200, 201, 202, 204]:
-                        return True
-                    if attempt < 2:
-                        await asyncio.sleep(2**attempt)
+                client = get_http_client("webhooks")
+                resp = await client.post(webhook_url, content=payload, headers=headers)
+                if resp.status_code in [200, 201, 202, 204]:
+                    return True
+                if attempt < 2:
+                    await asyncio.sleep(2**attempt)
             except (httpx.TimeoutException, httpx.RequestError) as e:
                 logger.warning(f"Webhook attempt {attempt + 1} failed: {e}")
                 if attempt < 2:
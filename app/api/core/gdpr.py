@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user_id
+from app.core.token_cache import verified_tokens
 from app.models.api_key import APIKey
 from app.models.audit_log import AuditLog
 from app.models.user import User, Webhook
@@ -123,6 +124,7 @@ async def delete_account(
         db.query(Webhook).filter(Webhook.user_id == user_id).delete()
         db.delete(user)
         db.commit()
+        verified_tokens.forget_user(user_id)
 
         return SuccessResponse(
             message="Account and all associated data deleted successfully"
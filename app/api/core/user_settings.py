@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user_id
+from app.core.token_cache import verified_tokens
 from app.models.user import NotificationSettings, User
 from app.models.user_preference import UserPreference
 from app.utils.security import get_password_hash as hash_password
@@ -186,6 +187,7 @@ async def delete_account(
         try:
             db.delete(user)
             db.commit()
+            verified_tokens.forget_user(user_id)
         except Exception:
             db.rollback()
             raise HTTPException(
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user, get_db
+from app.middleware.whitelabel_middleware import domain_branding_cache
 from app.models.user import User
 from app.models.whitelabel_models import (
     WhitelabelBranding,
@@ -271,6 +272,7 @@ async def update_branding(
     branding = whitelabel_service.update_branding(
         db=db, user_id=current_user.id, **request.dict(exclude_unset=True)
     )
+    domain_branding_cache.invalidate_partner(current_user.id)
 
     return BrandingResponse(
         id=branding.id,
@@ -310,6 +312,15 @@ async def verify_domain(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Domain verification failed"
         )
 
+    # The host may be negatively cached from before it was verified
+    verified_domain = (
+        db.query(WhitelabelDomain.domain)
+        .filter(WhitelabelDomain.id == domain_id)
+        .scalar()
+    )
+    if verified_domain:
+        domain_branding_cache.invalidate(verified_domain)
+
     return {"message": "Domain verified successfully", "verified": True}
 
 
@@ -360,8 +371,10 @@ async def remove_domain(
             status_code=status.HTTP_404_NOT_FOUND, detail="Domain not found"
         )
 
+    host = domain.domain
     db.delete(domain)
     db.commit()
+    domain_branding_cache.invalidate(host)
 
     return {"message": "Domain removed successfully"}
 
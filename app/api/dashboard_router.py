@@ -4,10 +4,11 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.dependencies import get_admin_user_id, get_current_user_id
 from app.models.notification import Notification
 from app.models.user import User
@@ -17,10 +18,11 @@ router = APIRouter(prefix="/api")
 
 @router.get("/wallet/balance")
 async def get_balance(
-    user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get user wallet balance."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = (await db.execute(select(User.credits).where(User.id == user_id))).first()
     if not user:
         return {"balance": 0.0, "credits": 0.0}
 
@@ -34,7 +36,7 @@ async def get_balance(
 @router.get("/wallet/transactions")
 async def get_transactions(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 50,
     offset: int = 0,
 ):
@@ -44,19 +46,18 @@ async def get_transactions(
 
         # Query transactions from database
         transactions = (
-            db.query(Transaction)
-            .filter(Transaction.user_id == user_id)
-            .order_by(desc(Transaction.created_at))
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
+            await db.scalars(
+                select(Transaction)
+                .where(Transaction.user_id == user_id)
+                .order_by(desc(Transaction.created_at))
+                .limit(limit)
+                .offset(offset)
+            )
+        ).all()
 
         # Get total count
-        total = (
-            db.query(func.count(Transaction.id))
-            .filter(Transaction.user_id == user_id)
-            .scalar()
+        total = await db.scalar(
+            select(func.count(Transaction.id)).where(Transaction.user_id == user_id)
         )
 
         return {
@@ -81,17 +82,20 @@ async def get_transactions(
 
 @router.get("/analytics/summary")
 async def get_analytics_summary(
-    user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
 
     try:
         from app.models.transaction import Transaction
         from app.models.verification import Verification
 
         verifications = (
-            db.query(Verification).filter(Verification.user_id == user_id).all()
-        )
+            await db.scalars(
+                select(Verification).where(Verification.user_id == user_id)
+            )
+        ).all()
 
         total = len(verifications)
         successful = sum(1 for v in verifications if v.status == "completed")
@@ -129,15 +133,15 @@ async def get_analytics_summary(
             day=1, hour=0, minute=0, second=0, microsecond=0
         )
         prev_month_spent = sum(
-            float(v.cost or 0)
-            for v in db.query(Verification)
-            .filter(
-                Verification.user_id == user_id,
-                Verification.created_at >= prev_month_start,
-                Verification.created_at < this_month_start,
-                Verification.status == "completed",
+            float(cost or 0)
+            for cost in await db.scalars(
+                select(Verification.cost).where(
+                    Verification.user_id == user_id,
+                    Verification.created_at >= prev_month_start,
+                    Verification.created_at < this_month_start,
+                    Verification.status == "completed",
+                )
             )
-            .all()
         )
         monthly_change = 0.0
         if prev_month_spent > 0:
@@ -198,10 +202,12 @@ async def get_analytics_summary(
         from app.models.balance_transaction import BalanceTransaction
 
         balance_txs = (
-            db.query(BalanceTransaction)
-            .filter(BalanceTransaction.user_id == user_id)
-            .all()
-        )
+            await db.execute(
+                select(BalanceTransaction.type, BalanceTransaction.amount).where(
+                    BalanceTransaction.user_id == user_id
+                )
+            )
+        ).all()
 
         total_deposited = sum(
             float(bt.amount) for bt in balance_txs if bt.type == TransactionType.CREDIT
@@ -293,7 +299,7 @@ async def get_analytics_summary(
 @router.get("/verify/history")
 async def get_verification_history(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 50,
     offset: int = 0,
     status: Optional[str] = None,
@@ -303,46 +309,30 @@ async def get_verification_history(
     try:
         from app.models.verification import Verification
 
-        query = db.query(Verification).filter(Verification.user_id == user_id)
+        filters = [Verification.user_id == user_id]
         if status:
             # Support comma-separated multi-status
             statuses = [s.strip() for s in status.split(",") if s.strip()]
             if len(statuses) == 1:
-                query = query.filter(Verification.status == statuses[0])
+                filters.append(Verification.status == statuses[0])
             elif len(statuses) > 1:
-                query = query.filter(Verification.status.in_(statuses))
+                filters.append(Verification.status.in_(statuses))
         if phone:
-            query = query.filter(Verification.phone_number.ilike(f"%{phone}%"))
+            filters.append(Verification.phone_number.ilike(f"%{phone}%"))
         if sms_code:
-            query = query.filter(Verification.sms_code == sms_code)
+            filters.append(Verification.sms_code == sms_code)
 
         verifications = (
-            query.order_by(desc(Verification.created_at))
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
-
-        total_query = db.query(func.count(Verification.id)).filter(
-            Verification.user_id == user_id
-        )
-        if status:
-            statuses_for_count = [s.strip() for s in status.split(",") if s.strip()]
-            if len(statuses_for_count) == 1:
-                total_query = total_query.filter(
-                    Verification.status == statuses_for_count[0]
-                )
-            elif len(statuses_for_count) > 1:
-                total_query = total_query.filter(
-                    Verification.status.in_(statuses_for_count)
-                )
-        if phone:
-            total_query = total_query.filter(
-                Verification.phone_number.ilike(f"%{phone}%")
+            await db.scalars(
+                select(Verification)
+                .where(*filters)
+                .order_by(desc(Verification.created_at))
+                .limit(limit)
+                .offset(offset)
             )
-        if sms_code:
-            total_query = total_query.filter(Verification.sms_code == sms_code)
-        total = total_query.scalar()
+        ).all()
+
+        total = await db.scalar(select(func.count(Verification.id)).where(*filters))
 
         return {
             "verifications": [
@@ -401,13 +391,14 @@ async def get_verification_history(
 
 @router.get("/notifications/unread")
 async def get_unread_notifications_count(
-    user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        count = (
-            db.query(func.count(Notification.id))
-            .filter(Notification.user_id == user_id, Notification.is_read == False)
-            .scalar()
+        count = await db.scalar(
+            select(func.count(Notification.id)).where(
+                Notification.user_id == user_id, Notification.is_read == False
+            )
         )
         return {"unread_count": count or 0}
     except Exception:
@@ -416,13 +407,14 @@ async def get_unread_notifications_count(
 
 @router.get("/notifications/unread-count")
 async def get_unread_count_alias(
-    user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        count = (
-            db.query(func.count(Notification.id))
-            .filter(Notification.user_id == user_id, Notification.is_read == False)
-            .scalar()
+        count = await db.scalar(
+            select(func.count(Notification.id)).where(
+                Notification.user_id == user_id, Notification.is_read == False
+            )
         )
         return {"count": count or 0, "unread_count": count or 0}
     except Exception:
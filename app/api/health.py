@@ -91,10 +91,12 @@ async def check_app_health(db: Session = Depends(get_db)):
 
         polling_status = "healthy" if sms_polling_service.is_running else "unhealthy"
         active_polls = len(sms_polling_service.get_active_polls())
+        polling_stats = sms_polling_service.get_polling_stats()
     except Exception as e:
         logger.error(f"Polling service health check failed: {e}")
         polling_status = "unhealthy"
         active_polls = 0
+        polling_stats = {}
 
     # Check Refund Policy Enforcer
     try:
@@ -103,9 +105,11 @@ async def check_app_health(db: Session = Depends(get_db)):
         enforcer_status = (
             "healthy" if refund_policy_enforcer.is_running else "unhealthy"
         )
+        enforcer_last_run = refund_policy_enforcer.last_report
     except Exception as e:
         logger.error(f"Refund enforcer health check failed: {e}")
         enforcer_status = "unhealthy"
+        enforcer_last_run = None
 
     # Determine overall status
     if (
@@ -125,10 +129,15 @@ async def check_app_health(db: Session = Depends(get_db)):
         "database": db_status,
         "textverified": tv_metrics["status"],
         "textverified_success_rate": tv_metrics["success_rate"],
-        "sms_polling": {"status": polling_status, "active_polls": active_polls},
+        "sms_polling": {
+            "status": polling_status,
+            "active_polls": active_polls,
+            "scheduler": polling_stats,
+        },
         "refund_enforcer": {
             "status": enforcer_status,
             "interval": "5 minutes",
             "policy": "100% automatic refunds for failed/timeout SMS",
+            "last_run": enforcer_last_run,
         },
     }
@@ -23,6 +23,7 @@ from app.services.notification_dispatcher import NotificationDispatcher
 from app.services.notification_service import NotificationService
 from app.services.pricing_calculator import PricingCalculator
 from app.services.purchase_intelligence import PurchaseIntelligenceService
+from app.services.service_catalog import service_catalog
 from app.services.sms_polling_service import sms_polling_service
 from app.services.textverified_service import TextVerifiedService
 from app.services.tier_manager import TierManager
@@ -37,23 +38,20 @@ _tv_service = TextVerifiedService()
 
 
 async def _get_provider_price(service: str) -> Optional[float]:
-    """Look up the real TextVerified price for a service from cache/API.
+    """Look up the real TextVerified price for a service from the catalog.
 
     Returns the raw provider cost (before markup) or None if unavailable.
     Logs a warning on failure so silent swallowing is visible in monitoring.
     """
     try:
-        services = await _tv_service.get_services_list()
-        for s in services:
-            if s["id"] == service:
-                price = s.get("price")
-                if price is not None and price > 0:
-                    return price
-                logger.warning(
-                    f"Provider returned null/zero price for service '{service}'"
-                )
-                return None
-        logger.warning(f"Service '{service}' not found in provider service list")
+        entry = await service_catalog.get(service, loader=_tv_service.get_services_list)
+        if entry is None:
+            logger.warning(f"Service '{service}' not found in provider service list")
+            return None
+        price = entry.get("price")
+        if price is not None and price > 0:
+            return price
+        logger.warning(f"Provider returned null/zero price for service '{service}'")
         return None
     except Exception as e:
         logger.error(f"Failed to fetch provider price for '{service}': {e}")
@@ -15,6 +15,7 @@ from app.models.transaction import Transaction
 from app.models.user import User
 from app.models.verification import NumberRental
 from app.services.pricing_calculator import PricingCalculator
+from app.services.textverified_client import rental_duration_for_hours
 from app.services.textverified_service import TextVerifiedService
 
 logger = get_logger(__name__)
@@ -22,6 +23,14 @@ router = APIRouter()
 _tv = TextVerifiedService()
 
 
+def _require_rental_duration(hours: float) -> None:
+    """400 unless ``hours`` is a rental length the provider sells."""
+    try:
+        rental_duration_for_hours(hours)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 class RentalRequest(BaseModel):
     service: str
     duration_hours: float = Field(default=24.0, ge=1.0, le=720.0)
@@ -42,6 +51,8 @@ async def request_rental(
     """Rent a dedicated number for long-term use (Pro+ tier required)."""
     from app.services.tier_manager import TierManager
 
+    _require_rental_duration(request.duration_hours)
+
     tier_manager = TierManager(db)
     user_tier = tier_manager.get_user_tier(user_id)
     if not tier_manager.check_tier_hierarchy(user_tier, "pro"):
@@ -92,6 +103,7 @@ async def request_rental(
         country="US",
         duration_hours=request.duration_hours,
         area_code=request.area_code,
+        always_on=True,
     )
 
     # Deduct credits
@@ -216,6 +228,7 @@ async def extend_rental(
     db: Session = Depends(get_db),
 ):
     """Extend a rental by additional hours."""
+    _require_rental_duration(payload.extra_hours)
     rental = (
         db.query(NumberRental)
         .filter(NumberRental.id == rental_id, NumberRental.user_id == user_id)
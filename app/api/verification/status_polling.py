@@ -2,23 +2,74 @@
 Handles real-time status updates for pending verifications
 """
 
+import asyncio
+import json
 import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_async_session_local, get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.verification import Verification
 from app.services.textverified_service import TextVerifiedService
+from app.services.verification_waiters import TERMINAL_STATUSES, verification_waiters
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/verification", tags=["verification-status"])
 
+LONG_POLL_MAX_SECONDS = 30.0
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def _status_payload(verification: Verification) -> Dict[str, Any]:
+    """Client-facing status snapshot shared by polling, long-poll and SSE."""
+    # Calculate expiry (Phase 12: Elite Timer Sync)
+    from app.core.config import settings
+
+    timeout_minutes = getattr(settings, "sms_polling_max_minutes", 2)
+    ends_at = None
+    if verification.created_at:
+        created_at = (
+            verification.created_at.replace(tzinfo=timezone.utc)
+            if verification.created_at.tzinfo is None
+            else verification.created_at
+        )
+        ends_at = created_at + timedelta(minutes=timeout_minutes)
+
+    return {
+        "id": verification.id,
+        "status": verification.status,
+        "phone_number": verification.phone_number,
+        "sms_code": verification.sms_code,
+        "sms_text": verification.sms_text,
+        "service_name": verification.service_name,
+        "assigned_carrier": verification.assigned_carrier,
+        "assigned_area_code": verification.assigned_area_code,
+        "requested_carrier": verification.requested_carrier,
+        "requested_area_code": verification.requested_area_code,
+        "fallback_applied": verification.fallback_applied,
+        "same_state_fallback": verification.same_state_fallback,
+        "created_at": (
+            verification.created_at.isoformat() if verification.created_at else None
+        ),
+        "updated_at": (
+            verification.updated_at.isoformat() if verification.updated_at else None
+        ),
+        "failure_reason": verification.failure_reason,
+        "failure_category": verification.failure_category,
+        "ends_at": ends_at.isoformat() if ends_at else None,
+        "server_time": datetime.now(timezone.utc).isoformat(),
+    }
+
 
 class VerificationStatusService:
     def __init__(self, db: Session):
@@ -37,47 +88,7 @@ class VerificationStatusService:
             if not verification:
                 raise HTTPException(status_code=404, detail="Verification not found")
 
-            # Calculate expiry (Phase 12: Elite Timer Sync)
-            from app.core.config import settings
-
-            timeout_minutes = getattr(settings, "sms_polling_max_minutes", 2)
-            ends_at = None
-            if verification.created_at:
-                created_at = (
-                    verification.created_at.replace(tzinfo=timezone.utc)
-                    if verification.created_at.tzinfo is None
-                    else verification.created_at
-                )
-                ends_at = created_at + timedelta(minutes=timeout_minutes)
-
-            base_response = {
-                "id": verification.id,
-                "status": verification.status,
-                "phone_number": verification.phone_number,
-                "sms_code": verification.sms_code,
-                "sms_text": verification.sms_text,
-                "service_name": verification.service_name,
-                "assigned_carrier": verification.assigned_carrier,
-                "assigned_area_code": verification.assigned_area_code,
-                "requested_carrier": verification.requested_carrier,
-                "requested_area_code": verification.requested_area_code,
-                "fallback_applied": verification.fallback_applied,
-                "same_state_fallback": verification.same_state_fallback,
-                "created_at": (
-                    verification.created_at.isoformat()
-                    if verification.created_at
-                    else None
-                ),
-                "updated_at": (
-                    verification.updated_at.isoformat()
-                    if verification.updated_at
-                    else None
-                ),
-                "failure_reason": verification.failure_reason,
-                "failure_category": verification.failure_category,
-                "ends_at": ends_at.isoformat() if ends_at else None,
-                "server_time": datetime.now(timezone.utc).isoformat(),
-            }
+            base_response = _status_payload(verification)
 
             if verification.status in ["completed", "failed", "cancelled", "timeout"]:
                 return base_response
@@ -241,6 +252,104 @@ async def get_verification_status(
     return await status_service.poll_verification_status(verification_id)
 
 
+async def _owned_verification(
+    db: AsyncSession, verification_id: str, user_id: str
+) -> Verification:
+    verification = await db.scalar(
+        select(Verification).where(
+            Verification.id == verification_id, Verification.user_id == user_id
+        )
+    )
+    if not verification:
+        raise HTTPException(status_code=404, detail="Verification not found")
+    return verification
+
+
+async def _read_status(verification_id: str) -> Optional[Dict[str, Any]]:
+    """Status snapshot from a short-lived session; streams outlive request sessions."""
+    async with get_async_session_local()() as db:
+        verification = await db.get(Verification, verification_id)
+        return _status_payload(verification) if verification else None
+
+
+@router.get("/status/{verification_id}/wait")
+async def wait_for_verification_status(
+    verification_id: str,
+    since: Optional[str] = Query(
+        None, description="Last status the client saw; return once it differs"
+    ),
+    timeout: float = Query(25.0, ge=0, le=LONG_POLL_MAX_SECONDS),
+    current_user: User = Depends(get_current_user),
+    auth_db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """Long-poll for a status change without hitting the provider.
+
+    Returns immediately if the verification is terminal or its status differs
+    from ``since``; otherwise parks until the status changes or ``timeout``
+    elapses, then returns the current status.
+    """
+    with verification_waiters.listen(verification_id) as changed:
+        payload = _status_payload(
+            await _owned_verification(db, verification_id, current_user.id)
+        )
+        if payload["status"] in TERMINAL_STATUSES or (
+            since is not None and payload["status"] != since
+        ):
+            return payload
+        # Don't hold pooled connections (auth's included) while parked
+        auth_db.close()
+        await db.close()
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return await _read_status(verification_id) or payload
+
+
+async def _status_events(request: Request, verification_id: str) -> AsyncIterator[str]:
+    from app.core.config import settings
+
+    deadline = time.monotonic() + settings.sms_polling_max_minutes * 60 + 60
+    last = None
+    while True:
+        with verification_waiters.listen(verification_id) as changed:
+            payload = await _read_status(verification_id)
+            if payload is None:
+                return
+            current = (payload["status"], payload["sms_code"])
+            if current != last:
+                last = current
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+            if payload["status"] in TERMINAL_STATUSES:
+                return
+            if time.monotonic() >= deadline or await request.is_disconnected():
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+
+@router.get("/status/{verification_id}/events")
+async def stream_verification_status(
+    verification_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    auth_db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    """Server-Sent Events stream of status changes until the verification ends."""
+    await _owned_verification(db, verification_id, current_user.id)
+    auth_db.close()
+    await db.close()
+    return StreamingResponse(
+        _status_events(request, verification_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/status-updates")
 async def get_status_updates(
     current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
@@ -41,6 +41,25 @@ class CircuitBreaker:
             self._on_failure()
             raise e
 
+    def allow_request(self) -> bool:
+        """Check the breaker before an async call that ``call`` can't wrap."""
+        if self.state == "open":
+            if time.time() - self.last_failure_time > self.recovery_timeout:
+                self.state = "half_open"
+                logger.info("Circuit breaker entering half-open state")
+            else:
+                return False
+        return True
+
+    def record_success(self):
+        """Report a successful call; resets the consecutive failure count."""
+        self._on_success()
+        self.failure_count = 0
+
+    def record_failure(self):
+        """Report a failed call."""
+        self._on_failure()
+
     def _on_success(self):
         """Handle successful call."""
         if self.state == "half_open":
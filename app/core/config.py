@@ -36,6 +36,10 @@ class Settings(BaseSettings):
     # Database settings
     database_url: str = "sqlite:///./data/namaskah.db"
     database_echo: bool = False
+    # Pool for the async (asyncpg) engine behind get_async_db; separate from
+    # the sync engine's pool
+    async_db_pool_size: int = 10
+    async_db_max_overflow: int = 10
 
     # Redis settings
     redis_url: str = "redis://localhost:6379/0"
@@ -108,9 +112,16 @@ class Settings(BaseSettings):
     enable_sms_forwarding: bool = True
     enable_webhooks: bool = True
 
-    # Rate limiting
+    # Rate limiting. Off by default: until the public "/" rule was fixed it
+    # exempted every path, so the limits below have never run in production
+    # and should be tuned before this is turned on
+    rate_limit_enabled: bool = False
     rate_limit_per_minute: int = 60
     rate_limit_burst: int = 100
+    # Share limits across workers through Redis; each worker falls back to its
+    # own in-memory limiter while Redis is unreachable
+    rate_limit_redis_enabled: bool = True
+    rate_limit_redis_retry_seconds: float = 5.0
 
     # Logging
     log_level: str = "INFO"
@@ -137,6 +148,11 @@ class Settings(BaseSettings):
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     upload_dir: str = "uploads"
 
+    # Admin exports: rows fetched per round trip, and where background export
+    # jobs write their artifacts
+    export_chunk_size: int = 1000
+    export_dir: str = "exports"
+
     # Pagination
     default_page_size: int = 20
     max_page_size: int = 100
@@ -231,6 +247,96 @@ class Settings(BaseSettings):
     sms_polling_later_interval_seconds: float = 10.0
     sms_polling_max_minutes: int = 10
     sms_polling_error_backoff_seconds: float = 15.0
+    # TextVerified sweep: one account-wide SMS listing per tick instead of
+    # one request per pending verification
+    sms_polling_sweep_enabled: bool = True
+    sms_polling_sweep_min_batch: int = 3
+    sms_polling_sweep_max_pages: int = 5
+    sms_polling_sweep_interval_seconds: float = 5.0
+
+    # Provider routing: scores are read from a background-refreshed snapshot;
+    # past the TTL the scorer falls back to live queries
+    provider_scoring_refresh_seconds: float = 60.0
+    provider_scoring_snapshot_ttl_seconds: float = 300.0
+
+    # Admin analytics read from daily rollups refreshed on this interval
+    analytics_rollup_interval_seconds: float = 300.0
+    # Area-code/carrier/provider breakdowns are cached per window until a new
+    # purchase outcome lands, and for at most this long
+    area_code_analytics_cache_seconds: float = 60.0
+
+    # Notification dashboard counters are buffered per worker and written on
+    # this interval
+    notification_stats_flush_seconds: float = 10.0
+
+    # WebSocket delivery: each connection drains its own bounded queue; a
+    # client that falls this far behind is disconnected so it can reconnect
+    websocket_send_queue_size: int = 100
+    websocket_send_timeout_seconds: float = 5.0
+
+    # Webhook worker: failed deliveries wait in a retry schedule with
+    # exponential backoff; endpoints that keep failing are circuit-broken
+    webhook_worker_concurrency: int = 20
+    webhook_delivery_timeout_seconds: float = 10.0
+    webhook_max_retries: int = 5
+    webhook_retry_base_seconds: float = 5.0
+    webhook_retry_max_seconds: float = 3600.0
+    webhook_claim_idle_seconds: float = 60.0
+    webhook_breaker_failure_threshold: int = 5
+    webhook_breaker_recovery_seconds: int = 60
+
+    # Shared outbound HTTP clients (app/core/http_clients.py)
+    http_client_timeout_seconds: float = 10.0
+    http_client_connect_timeout_seconds: float = 5.0
+    http_client_max_connections: int = 100
+    http_client_max_keepalive: int = 20
+    http_client_keepalive_expiry_seconds: float = 30.0
+
+    # Record per-layer middleware timings (middleware_layer_seconds)
+    middleware_timing_enabled: bool = True
+
+    # Event-loop monitor (app/core/loop_monitor.py): lag is sampled every
+    # interval; a loop blocked past the threshold has its stack captured and
+    # logged, at most once per log interval for each route and module
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.1
+    loop_stall_threshold_seconds: float = 0.1
+    loop_stall_log_interval_seconds: float = 60.0
+
+    # Path prefixes whose JSON responses skip XSS sanitizing; only for routes
+    # that return numeric or enum data
+    xss_trusted_paths: Union[str, List[str]] = "/health,/api/admin/performance"
+
+    @field_validator("xss_trusted_paths", mode="before")
+    @classmethod
+    def parse_xss_trusted_paths(cls, value):
+        if isinstance(value, str):
+            return [path.strip() for path in value.split(",") if path.strip()]
+        return value
+
+    # Per-process cache of whitelabel host -> branding lookups
+    whitelabel_cache_size: int = 1024
+    whitelabel_cache_ttl_seconds: float = 300.0
+    whitelabel_negative_cache_ttl_seconds: float = 60.0
+
+    # Per-process cache of verified access tokens, keyed by jti; revocations
+    # are pushed over Redis pub/sub, the TTL bounds anything missed (0 = off)
+    auth_token_cache_size: int = 10000
+    auth_token_cache_ttl_seconds: float = 30.0
+
+    # Resolved user tiers: per-process TTL, shared Redis TTL, and how long
+    # tier configs (limits, features) are memoized, which is also how long a
+    # subscription_tiers edit takes to apply; 0 disables a layer
+    tier_cache_local_ttl_seconds: float = 10.0
+    tier_cache_redis_ttl_seconds: float = 300.0
+    tier_cache_config_ttl_seconds: float = 60.0
+
+    # Service catalog used for purchase pricing: served fresh for this long,
+    # then stale while one refresh runs; workers check Redis for a newer
+    # published snapshot at most this often
+    service_catalog_fresh_seconds: float = 300.0
+    service_catalog_max_stale_seconds: float = 86400.0
+    service_catalog_check_seconds: float = 5.0
 
     # Development settings
     reload: bool = False
@@ -6,7 +6,9 @@ import time
 from typing import Optional
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.exc import DisconnectionError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 
@@ -17,12 +19,32 @@ from .config import settings
 logger = logging.getLogger(__name__)
 
 
+def async_database_url(url) -> URL:
+    """The async-driver (asyncpg / aiosqlite) form of a sync database URL."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if backend == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+        # asyncpg spells libpq's sslmode as ssl
+        sslmode = url.query.get("sslmode")
+        if sslmode:
+            url = url.difference_update_query(["sslmode"]).update_query_dict(
+                {"ssl": sslmode}
+            )
+        return url
+    raise ValueError(f"No async driver for database backend: {backend}")
+
+
 class DatabaseConnectionManager:
     """Manages database connections with retry logic and circuit breaker."""
 
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.AsyncSessionLocal = None
         self.circuit_breaker_failures = 0
         self.circuit_breaker_last_failure = 0
         self.circuit_breaker_threshold = 5
@@ -156,6 +178,48 @@ class DatabaseConnectionManager:
             logger.error(f"SQLite fallback failed: {e}")
             raise RuntimeError("Both primary and fallback database connections failed")
 
+    def initialize_async(self):
+        """Create the async engine on the database the sync engine settled on.
+
+        Follows the sync engine's choice (primary or SQLite fallback) so both
+        session kinds always see the same data.
+        """
+        if not self.engine:
+            self.initialize()
+
+        url = async_database_url(self.engine.url)
+        if url.get_backend_name() == "sqlite":
+            engine = create_async_engine(url, connect_args={"check_same_thread": False})
+        else:
+            engine = create_async_engine(
+                url,
+                pool_size=settings.async_db_pool_size,
+                max_overflow=settings.async_db_max_overflow,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+                echo=False,
+                connect_args={
+                    "timeout": 10,
+                    "server_settings": {"application_name": "namaskah_sms"},
+                },
+            )
+        self.use_async_engine(engine)
+        return True
+
+    def use_async_engine(self, engine: AsyncEngine):
+        """Serve async sessions from ``engine``."""
+        self.async_engine = engine
+        self.AsyncSessionLocal = async_sessionmaker(
+            engine, autoflush=False, expire_on_commit=False
+        )
+
+    async def dispose_async(self):
+        """Close the async pool's connections."""
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+        self.async_engine = None
+        self.AsyncSessionLocal = None
+
     def get_session(self):
         """Get database session with connection validation."""
         if not self.engine or not self.SessionLocal:
@@ -189,6 +253,13 @@ def get_session_local():
     return db_manager.SessionLocal
 
 
+def get_async_session_local():
+    """Returns the AsyncSession factory, initializing if needed."""
+    if not db_manager.AsyncSessionLocal:
+        db_manager.initialize_async()
+    return db_manager.AsyncSessionLocal
+
+
 def get_engine():
     """Returns the engine, initializing if needed."""
     if not db_manager.engine:
@@ -248,6 +319,24 @@ def get_db():
             session.close()
 
 
+async def get_async_db():
+    """Dependency to get an AsyncSession; queries are awaited, not run on the loop."""
+    from fastapi import HTTPException
+
+    session = get_async_session_local()()
+    try:
+        yield session
+    except HTTPException:
+        await session.rollback()
+        raise
+    except Exception as e:
+        logger.error(f"Database session error: {e}")
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 def create_tables():
     """Create all database tables with retry logic."""
     if not db_manager.engine:
@@ -17,6 +17,16 @@ logger = get_logger(__name__)
 security = HTTPBearer(auto_error=False)
 
 
+def _load_user(db: Session, user_id: str) -> Optional[User]:
+    """The user row, loaded at most once per request.
+
+    Dependencies share the request's session, so ``Session.get`` answers from
+    its identity map once the row is loaded, including by the existence
+    check ``verify_token`` makes when the token is not cached.
+    """
+    return db.get(User, user_id)
+
+
 def get_current_user_id(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -60,7 +70,7 @@ def get_current_user(
     user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
 ) -> User:
     """Get current user object."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _load_user(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -72,7 +82,7 @@ def get_admin_user_id(
     user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
 ) -> str:
     """Verify user is admin and return user ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _load_user(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -119,7 +129,7 @@ def require_tier(required_tier: str):
         user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)
     ) -> str:
         """Validate user tier and return user_id if authorized."""
-        user = db.query(User).filter(User.id == user_id).first()
+        user = _load_user(db, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -231,10 +241,9 @@ def require_payment_method(
     db: Session = Depends(get_db),
 ) -> str:
     """Block access if no card on file and balance is below $1."""
-    from app.models.user import User as _User
     from app.models.user_preference import UserPreference
 
-    user = db.query(_User).filter(_User.id == user_id).first()
+    user = _load_user(db, user_id)
     pref = db.query(UserPreference).filter(UserPreference.user_id == user_id).first()
     has_card = bool(pref and pref.paystack_authorization_code)
     balance = float(user.credits or 0) if user else 0.0
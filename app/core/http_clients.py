@@ -0,0 +1,126 @@
+"""Process-wide pooled HTTP clients for outbound integrations.
+
+Services ask for a named client (one per destination) instead of opening an
+``httpx.AsyncClient`` per call, so TCP and TLS connections are kept alive and
+reused. Clients are built lazily, use HTTP/2 when the ``h2`` package is
+installed, and are closed by the application lifespan.
+"""
+
+import importlib.util
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import (
+    http_client_connections_opened_total,
+    http_client_requests_total,
+)
+
+logger = get_logger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _instrument(name: str) -> dict:
+    """Event hooks counting requests and newly opened connections.
+
+    Requests minus connections opened is the number served from the pool.
+    """
+    requests = http_client_requests_total.labels(client=name)
+    opened = http_client_connections_opened_total.labels(client=name)
+
+    async def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            opened.inc()
+
+    async def on_request(request: httpx.Request) -> None:
+        requests.inc()
+        request.extensions.setdefault("trace", trace)
+
+    return {"request": [on_request]}
+
+
+class HTTPClientRegistry:
+    """Named, lazily created ``httpx.AsyncClient`` instances."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._options: Dict[str, Tuple] = {}
+
+    def get(
+        self,
+        name: str,
+        *,
+        base_url: str = "",
+        timeout: Optional[httpx.Timeout] = None,
+        limits: Optional[httpx.Limits] = None,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+    ) -> httpx.AsyncClient:
+        """The client for ``name``, created with these options on first use.
+
+        Every caller sharing a name must pass the same options; a caller that
+        needs different ones (its own pool size, say) uses its own name.
+        """
+        options = (base_url, timeout, limits, headers, follow_redirects)
+        client = self._clients.get(name)
+        if client is not None and not client.is_closed:
+            if options != self._options[name]:
+                raise ValueError(
+                    f"HTTP client {name!r} already exists with different options"
+                )
+            return client
+
+        settings = get_settings()
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout
+            or httpx.Timeout(
+                settings.http_client_timeout_seconds,
+                connect=settings.http_client_connect_timeout_seconds,
+            ),
+            limits=limits
+            or httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_keepalive,
+                keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+            ),
+            headers=headers,
+            follow_redirects=follow_redirects,
+            http2=HTTP2_AVAILABLE,
+            event_hooks=_instrument(name),
+        )
+        self._clients[name] = client
+        self._options[name] = options
+        return client
+
+    def stats(self) -> Dict:
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "clients": sorted(
+                name for name, client in self._clients.items() if not client.is_closed
+            ),
+        }
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        self._options = {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP client {name} close failed: {e}")
+
+
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(name: str, **options) -> httpx.AsyncClient:
+    """Shared client for one outbound destination; see ``HTTPClientRegistry.get``."""
+    return http_clients.get(name, **options)
+
+
+async def close_http_clients() -> None:
+    await http_clients.aclose()
@@ -60,6 +60,28 @@ async def lifespan(app):
         except Exception as e:
             startup_logger.warning(f"Cache initialization failed: {e}")
 
+        # Wake long-poll/SSE status requests for changes made on other workers
+        from app.services.verification_waiters import verification_waiters
+
+        verification_waiters.start()
+
+        # Deliver WebSocket messages published by other workers
+        from app.websocket.manager import manager as ws_manager
+
+        ws_manager.start()
+
+        # Evict cached tokens revoked on other workers
+        from app.core.token_cache import verified_tokens
+
+        verified_tokens.start()
+
+        # Sample event-loop lag and capture the stack behind any stall
+        from app.core.config import get_settings
+        from app.core.loop_monitor import loop_monitor
+
+        if get_settings().loop_monitor_enabled:
+            loop_monitor.start(app)
+
         # Pre-warm services and area codes cache (blocking — must complete before traffic)
         async def _prewarm():
             try:
@@ -132,6 +154,30 @@ async def lifespan(app):
                 "✅ Institutional health audit loop started (every 4 hours)"
             )
 
+            # Keep the router's provider scoring snapshot fresh
+            from app.services.providers.scoring_snapshot import (
+                start_scoring_snapshot_loop,
+            )
+
+            asyncio.create_task(start_scoring_snapshot_loop())
+            startup_logger.info("✅ Provider scoring snapshot refresh started")
+
+            # Keep the admin analytics daily rollups current
+            from app.services.analytics_rollup_service import (
+                start_analytics_rollup_loop,
+            )
+
+            asyncio.create_task(start_analytics_rollup_loop())
+            startup_logger.info("✅ Analytics rollup refresh started")
+
+            # Write buffered notification dashboard counters
+            from app.services.notification_analytics_service import (
+                start_notification_stats_flush_loop,
+            )
+
+            asyncio.create_task(start_notification_stats_flush_loop())
+            startup_logger.info("✅ Notification stats flush started")
+
             # Start daily growth snapshot loop (Institutional Mastery)
             async def start_daily_snapshot_loop():
                 while True:
@@ -290,6 +336,42 @@ async def lifespan(app):
         await sms_polling_service.stop_background_service()
         await refund_policy_enforcer.stop_enforcement()
         startup_logger.info("✅ Background services stopped")
+    from app.services.verification_waiters import verification_waiters
+
+    await verification_waiters.stop()
+    from app.websocket.manager import manager as ws_manager
+
+    await ws_manager.stop()
+    from app.core.token_cache import verified_tokens
+
+    await verified_tokens.stop()
+    from app.core.loop_monitor import loop_monitor
+
+    await loop_monitor.stop()
+    from app.services.notification_analytics_service import flush_notification_stats
+
+    try:
+        await asyncio.to_thread(flush_notification_stats)
+    except Exception as e:
+        startup_logger.warning(f"Notification stats flush failed: {e}")
+    from app.services.textverified_client import close_textverified_client
+
+    try:
+        await close_textverified_client()
+    except Exception as e:
+        startup_logger.warning(f"TextVerified client close failed: {e}")
+    from app.core.http_clients import close_http_clients
+
+    try:
+        await close_http_clients()
+    except Exception as e:
+        startup_logger.warning(f"HTTP client close failed: {e}")
+    from app.core.database import db_manager
+
+    try:
+        await db_manager.dispose_async()
+    except Exception as e:
+        startup_logger.warning(f"Async database pool close failed: {e}")
     from app.core.unified_cache import cache
 
     try:
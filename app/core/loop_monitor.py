@@ -0,0 +1,275 @@
+"""Event-loop lag sampling and stall capture.
+
+A task on the loop sleeps ``loop_monitor_interval_seconds`` and records how
+late it wakes (``event_loop_lag_seconds``). A watchdog thread watches that
+heartbeat; once the loop is overdue by ``loop_stall_threshold_seconds`` it
+takes one sample of the loop thread's stack, which is the code blocking it.
+When the loop comes back, the stall is attributed to the route whose
+endpoint is on that stack and to the innermost ``app`` module, counted in
+``event_loop_stalls_total`` and logged with the stack. Nothing is hooked
+per callback, so the cost is one wakeup per interval on each side.
+
+A blocking call that holds the GIL throughout (a large ``json.dumps``, say)
+keeps the watchdog out until it returns; such stalls are still measured as
+lag and counted under ``unknown``.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from inspect import unwrap
+from typing import Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import (
+    event_loop_lag_seconds,
+    event_loop_stall_seconds_total,
+    event_loop_stalls_total,
+)
+
+logger = get_logger(__name__)
+
+UNKNOWN = "unknown"
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ROOT_DIR = os.path.dirname(_APP_DIR)
+
+
+def _module_name(filename: str) -> Optional[str]:
+    """``app.services.foo`` for a file in the app package, else None."""
+    path = os.path.abspath(filename)
+    if not path.startswith(_APP_DIR + os.sep):
+        return None
+    return os.path.splitext(os.path.relpath(path, _ROOT_DIR))[0].replace(os.sep, ".")
+
+
+def _location(frame) -> str:
+    code = frame.f_code
+    path = os.path.abspath(code.co_filename)
+    if path.startswith(_ROOT_DIR + os.sep):
+        path = os.path.relpath(path, _ROOT_DIR)
+    else:
+        path = os.path.basename(path)
+    return f"{path}:{frame.f_lineno} in {code.co_name}"
+
+
+def route_endpoints(app) -> Dict:
+    """Endpoint code object -> ``"GET /path"`` for the app's routes."""
+    from fastapi.routing import APIRoute, APIWebSocketRoute
+
+    routes = {}
+    for route in app.routes:
+        if not isinstance(route, (APIRoute, APIWebSocketRoute)):
+            continue
+        code = getattr(unwrap(route.endpoint), "__code__", None)
+        if code is None:
+            continue
+        methods = ",".join(sorted(getattr(route, "methods", None) or ["WS"]))
+        # An endpoint mounted under several paths keeps its first one
+        routes.setdefault(code, f"{methods} {route.path}")
+    return routes
+
+
+def sample_stack(frame, routes: Dict, depth: int) -> Dict:
+    """Attribute a stack, innermost ``frame`` first, to a route and module."""
+    route = module = None
+    call = _location(frame)
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        if route is None:
+            route = routes.get(code)
+        if module is None:
+            module = _module_name(code.co_filename)
+        if len(stack) < depth:
+            stack.append(_location(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return {
+        "route": route or UNKNOWN,
+        "module": module or UNKNOWN,
+        "call": call,
+        "stack": stack,
+    }
+
+
+_UNATTRIBUTED = {"route": UNKNOWN, "module": UNKNOWN, "call": UNKNOWN, "stack": []}
+
+
+class LoopMonitor:
+    """Loop lag sampler plus a watchdog thread that captures stalled stacks."""
+
+    def __init__(
+        self,
+        interval: float,
+        threshold: float,
+        log_interval: float = 60.0,
+        stack_depth: int = 30,
+        lag_samples: int = 1000,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.log_interval = log_interval
+        self.stack_depth = stack_depth
+        self._routes: Dict = {}
+        self._lags = deque(maxlen=lag_samples)
+        self._stalls: Dict[Tuple[str, str], Dict] = {}
+        self._logged: Dict[Tuple[str, str], float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread: Optional[int] = None
+        # When the monitor task is next due to wake, and the watchdog's sample
+        # for that wakeup; both are written by one thread and read by the other
+        self._due: Optional[float] = None
+        self._sample: Optional[Tuple[float, Dict]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, app=None) -> None:
+        if self.running:
+            return
+        if app is not None:
+            self._routes = route_endpoints(app)
+        self._loop_thread = threading.get_ident()
+        self._due = None
+        self._sample = None
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread:
+            await asyncio.to_thread(self._thread.join, 1.0)
+            self._thread = None
+        self._due = None
+
+    async def _run(self) -> None:
+        while True:
+            due = time.monotonic() + self.interval
+            self._due = due
+            await asyncio.sleep(self.interval)
+            self.record(max(time.monotonic() - due, 0.0), due)
+
+    def _watch(self) -> None:
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stopping.wait(poll):
+            due = self._due
+            if due is None or time.monotonic() - due < self.threshold:
+                continue
+            sample = self._sample
+            if sample is not None and sample[0] == due:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._sample = (
+                    due,
+                    sample_stack(frame, self._routes, self.stack_depth),
+                )
+
+    def record(self, lag: float, due: Optional[float] = None) -> None:
+        """Record one wakeup that came ``lag`` seconds after it was due."""
+        event_loop_lag_seconds.observe(lag)
+        self._lags.append(lag)
+        if lag < self.threshold:
+            return
+        sample = self._sample
+        if sample is not None and sample[0] == due:
+            self.record_stall(lag, sample[1])
+        else:
+            self.record_stall(lag, _UNATTRIBUTED)
+
+    def record_stall(self, seconds: float, sample: Dict) -> None:
+        key = (sample["route"], sample["module"])
+        stats = self._stalls.get(key)
+        if stats is None:
+            stats = self._stalls[key] = {"count": 0, "total": 0.0, "max": 0.0}
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+        stats["call"] = sample["call"]
+        stats["stack"] = sample["stack"]
+        stats["last_seen"] = time.time()
+        event_loop_stalls_total.labels(route=key[0], module=key[1]).inc()
+        event_loop_stall_seconds_total.labels(route=key[0], module=key[1]).inc(seconds)
+
+        now = time.monotonic()
+        last = self._logged.get(key)
+        if last is None or now - last >= self.log_interval:
+            self._logged[key] = now
+            logger.warning(
+                f"Event loop blocked for {seconds * 1000:.0f}ms in {key[0]} "
+                f"({key[1]}) at {sample['call']}\n" + "\n".join(sample["stack"])
+            )
+
+    def report(self) -> Dict:
+        """Lag percentiles and stalls by route and module, most time first."""
+        lags = sorted(self._lags)
+
+        def percentile(q: float) -> float:
+            if not lags:
+                return 0.0
+            return round(lags[min(len(lags) - 1, int(len(lags) * q))] * 1000, 2)
+
+        stalls = [
+            {
+                "route": route,
+                "module": module,
+                "call": stats["call"],
+                "count": stats["count"],
+                "total_ms": round(stats["total"] * 1000, 1),
+                "max_ms": round(stats["max"] * 1000, 1),
+                "last_seen": datetime.fromtimestamp(
+                    stats["last_seen"], timezone.utc
+                ).isoformat(),
+                "stack": stats["stack"],
+            }
+            for (route, module), stats in self._stalls.items()
+        ]
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 1),
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "lag": {
+                "samples": len(lags),
+                "p50_ms": percentile(0.5),
+                "p99_ms": percentile(0.99),
+                "max_ms": round(lags[-1] * 1000, 2) if lags else 0.0,
+            },
+            "stalls": sorted(stalls, key=lambda row: row["total_ms"], reverse=True),
+        }
+
+    def reset(self) -> None:
+        self._lags.clear()
+        self._stalls.clear()
+        self._logged.clear()
+
+
+def _build_monitor() -> LoopMonitor:
+    settings = get_settings()
+    return LoopMonitor(
+        interval=settings.loop_monitor_interval_seconds,
+        threshold=settings.loop_stall_threshold_seconds,
+        log_interval=settings.loop_stall_log_interval_seconds,
+    )
+
+
+loop_monitor = _build_monitor()
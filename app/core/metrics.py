@@ -6,6 +6,13 @@ Tracks:
 - API response times
 - Error rates
 - Request throughput
+- SMS poll scheduler queue depth, lag and in-flight checks
+- Provider scoring snapshot freshness
+- WebSocket fan-out and slow-consumer drops
+- Outbound HTTP requests and connection reuse
+- Time spent in each middleware layer
+- Verified-token cache hits and misses
+- Event-loop lag and stalls by route and module
 """
 
 import logging
@@ -143,6 +150,154 @@ request_queue_length = Gauge(
     "request_queue_length", "Request queue length", registry=registry
 )
 
+# ============================================================================
+# SMS POLLING METRICS
+# ============================================================================
+
+sms_poll_queue_depth = Gauge(
+    "sms_poll_queue_depth",
+    "Verifications waiting in the SMS poll scheduler",
+    registry=registry,
+)
+
+sms_poll_lag_seconds = Gauge(
+    "sms_poll_lag_seconds",
+    "How late the most recent SMS poll tick ran versus its due time",
+    registry=registry,
+)
+
+sms_poll_in_flight = Gauge(
+    "sms_poll_in_flight",
+    "SMS poll checks currently in flight",
+    ["provider"],
+    registry=registry,
+)
+
+# ============================================================================
+# PROVIDER ROUTING METRICS
+# ============================================================================
+
+provider_scoring_snapshot_age_seconds = Gauge(
+    "provider_scoring_snapshot_age_seconds",
+    "Age of the provider scoring snapshot used by the router",
+    registry=registry,
+)
+
+provider_scoring_lookups_total = Counter(
+    "provider_scoring_lookups_total",
+    "Provider score calculations by input source",
+    ["source"],
+    registry=registry,
+)
+
+# ============================================================================
+# WEBSOCKET METRICS
+# ============================================================================
+
+websocket_backplane_messages_total = Counter(
+    "websocket_backplane_messages_total",
+    "WebSocket messages crossing the worker backplane",
+    ["direction"],
+    registry=registry,
+)
+
+websocket_send_queue_dropped_total = Counter(
+    "websocket_send_queue_dropped_total",
+    "WebSocket connections dropped for falling behind their send queue",
+    ["reason"],
+    registry=registry,
+)
+
+# ============================================================================
+# OUTBOUND HTTP METRICS
+# ============================================================================
+
+http_client_requests_total = Counter(
+    "http_client_requests_total",
+    "Outbound HTTP requests sent through shared clients",
+    ["client"],
+    registry=registry,
+)
+
+http_client_connections_opened_total = Counter(
+    "http_client_connections_opened_total",
+    "New outbound connections opened; the rest of the requests reused one",
+    ["client"],
+    registry=registry,
+)
+
+# ============================================================================
+# MIDDLEWARE METRICS
+# ============================================================================
+
+middleware_layer_seconds = Histogram(
+    "middleware_layer_seconds",
+    "Time a middleware layer adds to a request, excluding downstream work",
+    ["layer"],
+    buckets=(
+        0.00001,
+        0.000025,
+        0.00005,
+        0.0001,
+        0.00025,
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.1,
+    ),
+    registry=registry,
+)
+
+# ============================================================================
+# AUTH METRICS
+# ============================================================================
+
+auth_token_cache_total = Counter(
+    "auth_token_cache_total",
+    "Verified-token cache lookups by result (hit, miss)",
+    ["result"],
+    registry=registry,
+)
+
+# ============================================================================
+# RATE LIMIT METRICS
+# ============================================================================
+
+rate_limit_checks_total = Counter(
+    "rate_limit_checks_total",
+    "Rate limit decisions by backend (redis, local) and result",
+    ["backend", "result"],
+    registry=registry,
+)
+
+# ============================================================================
+# EVENT LOOP METRICS
+# ============================================================================
+
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "How late the loop monitor woke versus when it was due",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=registry,
+)
+
+event_loop_stalls_total = Counter(
+    "event_loop_stalls_total",
+    "Event-loop stalls past the threshold, by route and innermost app module",
+    ["route", "module"],
+    registry=registry,
+)
+
+event_loop_stall_seconds_total = Counter(
+    "event_loop_stall_seconds_total",
+    "Time the event loop spent stalled, by route and innermost app module",
+    ["route", "module"],
+    registry=registry,
+)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -225,3 +380,11 @@ def set_active_requests(count: int):
 def set_request_queue_length(length: int):
     """Set request queue length."""
     request_queue_length.set(length)
+
+
+def update_sms_poll_metrics(queue_depth: int, lag_seconds: float, in_flight: dict):
+    """Publish SMS poll scheduler queue depth, lag and per-provider in-flight."""
+    sms_poll_queue_depth.set(queue_depth)
+    sms_poll_lag_seconds.set(lag_seconds)
+    for provider, count in in_flight.items():
+        sms_poll_in_flight.labels(provider=provider).set(count)
@@ -0,0 +1,160 @@
+"""Short-lived cache of verified access tokens.
+
+``AuthService.verify_token`` checks the signature on every call, but the
+revocation lookups in Redis and the user-exists query only run when the
+token's jti is not cached here. Logout and logout-all call
+``publish_revocation``, which evicts locally and tells the other workers
+over Redis pub/sub. If a worker misses a message (Redis down, subscription
+reconnecting), an entry still expires after ``auth_token_cache_ttl_seconds``.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.local_cache import TTLCache
+from app.core.logging import get_logger
+from app.core.metrics import auth_token_cache_total
+
+logger = get_logger(__name__)
+
+CHANNEL = "auth:revocations"
+
+
+def _get_redis():
+    """Lazy import to avoid circular deps; None when Redis is unavailable."""
+    from app.core.unified_cache import cache
+
+    return cache.redis_client
+
+
+class VerifiedTokenCache:
+    """jti -> user id for tokens that passed the revocation and user checks."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._claims = TTLCache(maxsize, ttl)
+        self._origin = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+
+    def get(self, jti: str) -> Optional[str]:
+        user_id = self._claims.get(jti)
+        auth_token_cache_total.labels(result="hit" if user_id else "miss").inc()
+        return user_id
+
+    def add(self, jti: str, user_id: str, exp: Optional[float] = None) -> None:
+        ttl = self._claims.ttl
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        if ttl > 0:
+            self._claims.set(jti, str(user_id), ttl=ttl)
+
+    def revoke(self, jti: Optional[str] = None, user_id: Optional[str] = None) -> None:
+        """Evict one token, or every cached token of a user."""
+        if jti:
+            self._claims.pop(jti)
+        if user_id:
+            user_id = str(user_id)
+            self._claims.discard_where(lambda _, cached: cached == user_id)
+
+    def clear(self) -> None:
+        self._claims.clear()
+
+    def publish_revocation(
+        self, redis, jti: Optional[str] = None, user_id: Optional[str] = None
+    ) -> None:
+        """Evict here and on the other workers.
+
+        ``redis`` is the synchronous client the caller used to write the
+        revocation key.
+        """
+        self.revoke(jti=jti, user_id=user_id)
+        if redis is None:
+            return
+        try:
+            redis.publish(
+                CHANNEL,
+                json.dumps(
+                    {
+                        "jti": jti,
+                        "user_id": str(user_id) if user_id else None,
+                        "origin": self._origin,
+                    }
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Token revocation publish failed: {e}")
+
+    def forget_user(self, user_id: str) -> None:
+        """Evict a deleted user's tokens on every worker."""
+        try:
+            from app.core.cache import get_redis
+
+            redis = get_redis()
+        except Exception:
+            redis = None
+        self.publish_revocation(redis, user_id=user_id)
+
+    # ------------------------------------------------------------------
+    # Cross-worker revocations
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_redis())
+
+    async def stop(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    def _on_message(self, data) -> None:
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if isinstance(event, dict) and event.get("origin") != self._origin:
+            self.revoke(jti=event.get("jti"), user_id=event.get("user_id"))
+
+    async def _listen_redis(self) -> None:
+        while True:
+            redis = _get_redis()
+            if redis is None:
+                # Revocation keys live in Redis too, so there is nothing to miss
+                logger.info("Redis unavailable; token revocations are local-only")
+                return
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._on_message(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token revocation subscription dropped: {e}")
+                # Revocations may have been missed while disconnected
+                self.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+
+def _build_cache() -> VerifiedTokenCache:
+    settings = get_settings()
+    return VerifiedTokenCache(
+        maxsize=settings.auth_token_cache_size,
+        ttl=settings.auth_token_cache_ttl_seconds,
+    )
+
+
+verified_tokens = _build_cache()
@@ -3,8 +3,7 @@
 import os
 from typing import Optional
 
-import httpx
-
+from app.core.http_clients import get_http_client
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -30,18 +29,19 @@ async def verify_turnstile(token: Optional[str]) -> bool:
         return False
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.post(
-                TURNSTILE_VERIFY_URL,
-                data={"secret": TURNSTILE_SECRET, "response": token},
+        client = get_http_client("turnstile")
+        resp = await client.post(
+            TURNSTILE_VERIFY_URL,
+            data={"secret": TURNSTILE_SECRET, "response": token},
+            timeout=5.0,
+        )
+        result = resp.json()
+        success = result.get("success", False)
+        if not success:
+            logger.warning(
+                f"Turnstile verification failed: {result.get('error-codes', [])}"
             )
-            result = resp.json()
-            success = result.get("success", False)
-            if not success:
-                logger.warning(
-                    f"Turnstile verification failed: {result.get('error-codes', [])}"
-                )
-            return success
+        return success
     except Exception as e:
         logger.error(f"Turnstile verification error: {e}")
         # Fail open on network error — don't block legitimate users
@@ -5,18 +5,19 @@
 
 import json
 import logging
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Dict, Optional
 
-from fastapi import Request, Response
+from fastapi import Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import get_settings
 from app.core.unified_rate_limiting import setup_unified_rate_limiting
+from app.middleware.timing import add_timed_middleware
 
 logger = logging.getLogger(__name__)
 
@@ -145,29 +146,44 @@ class ServiceUnavailableError(NamaskahException):
 # Unified Middleware
 
 
-class UnifiedErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Unified error handling middleware with fallback responses."""
+class UnifiedErrorHandlingMiddleware:
+    """Pure ASGI error handling middleware with fallback responses."""
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.fallback_responses = self._get_fallback_responses()
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        path = str(request.url.path)
-        if path.startswith("/api/") or path.startswith("/auth/"):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        path = scope["path"]
+        if path.startswith("/api/") or path.startswith("/auth/"):
+            await self.app(scope, receive, send)
+            return
+
+        has_fallback = path in self.fallback_responses
+        started = False
+        replaced = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal started, replaced
+            if message["type"] == "http.response.start":
+                # Error responses on fallback paths are swapped for the fallback
+                if has_fallback and message["status"] >= 400:
+                    replaced = True
+                    return
+                started = True
+            if not replaced:
+                await send(message)
+
+        request = Request(scope)
         try:
-            response = await call_next(request)
-
-            if response.status_code >= 400:
-                fallback = self._get_fallback_response(request)
-                if fallback:
-                    return fallback
-
-            return response
-
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
+            if started:
+                raise
             logger.error(
                 "Unhandled error in %s %s: %s",
                 request.method,
@@ -176,11 +192,14 @@ class UnifiedErrorHandlingMiddleware(BaseHTTPMiddleware):
                 exc_info=True,
             )
 
-            fallback = self._get_fallback_response(request)
-            if fallback:
-                return fallback
+            response = self._get_fallback_response(request)
+            if response is None:
+                response = await self._handle_error(request, exc)
+            await response(scope, receive, send)
+            return
 
-            return await self._handle_error(request, exc)
+        if replaced:
+            await self._get_fallback_response(request)(scope, receive, send)
 
     def _get_fallback_response(self, request: Request) -> Optional[JSONResponse]:
         """Get fallback response for critical endpoints."""
@@ -552,7 +571,7 @@ def safe_json_parse(
 
 def setup_unified_error_handling(app):
     """Setup unified error handling for FastAPI app."""
-    app.add_middleware(UnifiedErrorHandlingMiddleware)
+    add_timed_middleware(app, UnifiedErrorHandlingMiddleware, "error_handling")
 
     app.add_exception_handler(NamaskahException, unified_exception_handler)
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
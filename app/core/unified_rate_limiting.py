@@ -1,20 +1,136 @@
-"""Unified rate limiting system."""
+"""Unified rate limiting system.
 
-import asyncio
+Limits are enforced in Redis so every worker shares them: a GCRA burst
+bucket and a sliding-window log per client IP and per user, checked and
+recorded by one Lua script in a single round trip. While Redis is
+unreachable each worker limits on its own with the in-memory buckets and
+deques below, retrying Redis every ``rate_limit_redis_retry_seconds``.
+"""
+
+import math
 import time
+import uuid
 from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.core.metrics import rate_limit_checks_total
+from app.middleware.timing import add_timed_middleware
 
 logger = get_logger(__name__)
 
+REDIS_PREFIX = "ratelimit:"
+
+# Burst buckets (capacity, tokens per second), shared by both backends
+IP_BUCKET = (20, 2.0)
+USER_BUCKET = (50, 5.0)
+
+# Users get this many times the per-IP window limit
+USER_LIMIT_MULTIPLIER = 5
+
+# Longest window any rule uses; bounds how long a log is kept
+MAX_WINDOW = 3600
+
+# KEYS: ip bucket, ip log[, user bucket, user log]
+# ARGV: now_ms, window_ms, log_ttl_ms, member,
+#       then interval_ms, capacity, limit for the ip and (optionally) the user
+# Returns {allowed, failed check (1-4), retry_after_ms, remaining}. Nothing is
+# recorded unless every check passes.
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local log_ttl = tonumber(ARGV[3])
+local member = ARGV[4]
+local tats = {}
+local remaining = 0
+
+for i = 0, #KEYS / 2 - 1 do
+  local bucket = KEYS[2 * i + 1]
+  local log = KEYS[2 * i + 2]
+  local interval = tonumber(ARGV[5 + 3 * i])
+  local capacity = tonumber(ARGV[6 + 3 * i])
+  local limit = tonumber(ARGV[7 + 3 * i])
+
+  local tat = tonumber(redis.call('GET', bucket)) or now
+  if tat < now then
+    tat = now
+  end
+  local allow_at = tat + interval - interval * capacity
+  if allow_at > now then
+    return {0, 2 * i + 1, allow_at - now, 0}
+  end
+  tats[i] = tat + interval
+
+  redis.call('ZREMRANGEBYSCORE', log, '-inf', now - window)
+  local count = redis.call('ZCARD', log)
+  if count >= limit then
+    local oldest = redis.call('ZRANGE', log, 0, 0, 'WITHSCORES')
+    local retry = window
+    if oldest[2] then
+      retry = tonumber(oldest[2]) + window - now
+    end
+    return {0, 2 * i + 2, retry, 0}
+  end
+  remaining = limit - count - 1
+end
+
+for i = 0, #KEYS / 2 - 1 do
+  redis.call('SET', KEYS[2 * i + 1], tats[i], 'PX', math.ceil(tats[i] - now))
+  redis.call('ZADD', KEYS[2 * i + 2], now, member)
+  redis.call('PEXPIRE', KEYS[2 * i + 2], log_ttl)
+end
+return {1, 0, 0, remaining}
+"""
+
+_END = object()
+
+
+class PrefixTrie:
+    """Character trie mapping path prefixes to values."""
+
+    def __init__(self, items: Iterable[Tuple[str, Any]] = ()):
+        self._root: Dict[Any, Any] = {}
+        for prefix, value in items:
+            self.insert(prefix, value)
+
+    def insert(self, prefix: str, value: Any) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[_END] = value
+
+    def longest_prefix(self, path: str, default: Any = None) -> Any:
+        """Value of the longest inserted prefix of ``path``."""
+        node = self._root
+        match = node.get(_END, default)
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                match = node[_END]
+        return match
+
+    def has_prefix_of(self, path: str) -> bool:
+        """Whether any inserted prefix is a prefix of ``path``."""
+        node = self._root
+        if _END in node:
+            return True
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
+
 
 @dataclass
 class RateLimitConfig:
@@ -59,7 +175,9 @@ class UnifiedRateLimiter:
 
     def __init__(self):
         self.settings = get_settings()
-        self._lock = asyncio.Lock()
+        self.enabled = self.settings.rate_limit_enabled
+        self._redis_retry_at = 0.0
+        self._script = None
 
         self.user_buckets: Dict[str, TokenBucket] = {}
         self.ip_buckets: Dict[str, TokenBucket] = {}
@@ -90,8 +208,9 @@ class UnifiedRateLimiter:
             "/support/submit": RateLimitConfig(10, 3600),
         }
 
+        # Matched exactly; a "/" prefix would exempt every path
+        self.public_exact_paths = {"/"}
         self.public_paths = [
-            "/",
             "/app",
             "/services",
             "/pricing",
@@ -107,20 +226,23 @@ class UnifiedRateLimiter:
             "/api/diagnostics",
         ]
 
+        self.compile_rules()
+
+    def compile_rules(self):
+        """Build the path tries; call again after changing the rules above."""
+        self._endpoint_trie = PrefixTrie(self.endpoint_limits.items())
+        self._public_trie = PrefixTrie((path, True) for path in self.public_paths)
+
     def should_skip_rate_limiting(self, path: str) -> bool:
         """Check if path should skip rate limiting."""
-        return any(path.startswith(public_path) for public_path in self.public_paths)
+        return path in self.public_exact_paths or self._public_trie.has_prefix_of(path)
 
     def get_endpoint_config(self, path: str) -> RateLimitConfig:
         """Get rate limit configuration for endpoint."""
-        if path in self.endpoint_limits:
-            return self.endpoint_limits[path]
-
-        for endpoint_path, config in self.endpoint_limits.items():
-            if path.startswith(endpoint_path):
-                return config
-
-        return self.default_config
+        config = self.endpoint_limits.get(path)
+        if config is not None:
+            return config
+        return self._endpoint_trie.longest_prefix(path, self.default_config)
 
     def get_client_ip(self, request: Request) -> str:
         """Extract client IP from request safely."""
@@ -143,7 +265,7 @@ class UnifiedRateLimiter:
     ) -> Tuple[bool, int]:
         """Check rate limit using token bucket algorithm."""
         if ip not in self.ip_buckets:
-            self.ip_buckets[ip] = TokenBucket(capacity=20, refill_rate=2.0)
+            self.ip_buckets[ip] = TokenBucket(*IP_BUCKET)
 
         ip_bucket = self.ip_buckets[ip]
         if not ip_bucket.allow_request():
@@ -151,7 +273,7 @@ class UnifiedRateLimiter:
 
         if user_id:
             if user_id not in self.user_buckets:
-                self.user_buckets[user_id] = TokenBucket(capacity=50, refill_rate=5.0)
+                self.user_buckets[user_id] = TokenBucket(*USER_BUCKET)
 
             user_bucket = self.user_buckets[user_id]
             if not user_bucket.allow_request():
@@ -177,7 +299,7 @@ class UnifiedRateLimiter:
             user_requests = self.user_requests[user_id]
             self._clean_old_requests(user_requests, config.window, current_time)
 
-            user_limit = int(config.requests * 5)
+            user_limit = int(config.requests * USER_LIMIT_MULTIPLIER)
             if len(user_requests) >= user_limit:
                 return False, config.window
 
@@ -213,79 +335,204 @@ class UnifiedRateLimiter:
         self, request: Request, user_id: Optional[str] = None
     ) -> Tuple[bool, int, Dict[str, Any]]:
         """Check all rate limits and return result."""
-        async with self._lock:
-            current_time = time.time()
-            ip = self.get_client_ip(request)
-            path = request.url.path
-
-            if self.should_skip_rate_limiting(path):
-                return True, 0, {}
-
-            config = self.get_endpoint_config(path)
-
-            system_load = self.calculate_system_load(current_time)
-            if system_load > 0.8:
-                adjusted_limit = max(1, int(config.requests * 0.2))
-
-                ip_requests_count = len(self.ip_requests[ip])
-                if ip_requests_count >= adjusted_limit:
-                    return (
-                        False,
-                        60,
-                        {
-                            "limit_type": "adaptive_high_load",
-                            "system_load": system_load,
-                            "retry_after": 60,
-                        },
-                    )
-
-            bucket_allowed, bucket_retry = self.check_token_bucket_limit(user_id, ip)
-            if not bucket_allowed:
-                return (
-                    False,
-                    bucket_retry,
-                    {"limit_type": "burst", "retry_after": bucket_retry},
+        path = request.url.path
+        if not self.enabled or self.should_skip_rate_limiting(path):
+            return True, 0, {}
+
+        current_time = time.time()
+        ip = self.get_client_ip(request)
+        config = self.get_endpoint_config(path)
+        system_load = self.calculate_system_load(current_time)
+
+        result = None
+        redis = self._shared_redis(current_time)
+        if redis is not None:
+            try:
+                result = await self._check_shared(
+                    redis, user_id, ip, config, system_load, current_time
                 )
-
-            window_allowed, window_retry = self.check_sliding_window_limit(
-                user_id, ip, config, current_time
-            )
-            if not window_allowed:
-                return (
-                    False,
-                    window_retry,
-                    {
-                        "limit_type": "window",
-                        "retry_after": window_retry,
-                        "limit": config.requests,
-                        "window": config.window,
-                    },
+                backend = "redis"
+            except Exception as e:
+                logger.warning(
+                    f"Shared rate limiter unavailable, limiting locally: {e}"
                 )
-
-            self.ip_requests[ip].append(current_time)
-            if user_id:
-                self.user_requests[user_id].append(current_time)
-
+                self._redis_retry_at = (
+                    current_time + self.settings.rate_limit_redis_retry_seconds
+                )
+        if result is None:
+            result = self._check_local(user_id, ip, config, system_load, current_time)
+            backend = "local"
+
+        allowed = result[0]
+        rate_limit_checks_total.labels(
+            backend=backend, result="allowed" if allowed else "limited"
+        ).inc()
+        if allowed:
             self.request_times.append(current_time)
             self.total_requests += 1
+        return result
 
-            if current_time - self.last_cleanup > 60:
-                self._cleanup_old_entries(current_time)
-                self.last_cleanup = current_time
+    def _shared_redis(self, current_time: float):
+        """Async Redis client to limit with, or None to limit locally."""
+        if not self.settings.rate_limit_redis_enabled:
+            return None
+        if current_time < self._redis_retry_at:
+            return None
+        from app.core.unified_cache import cache
 
-            remaining = self._get_remaining_requests(user_id, ip, config, current_time)
+        return cache.redis_client
 
+    async def _check_shared(
+        self,
+        redis,
+        user_id: Optional[str],
+        ip: str,
+        config: RateLimitConfig,
+        system_load: float,
+        current_time: float,
+    ) -> Tuple[bool, int, Dict[str, Any]]:
+        """Check and record the request in Redis with one script call."""
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(RATE_LIMIT_SCRIPT)
+
+        ip_limit = config.requests
+        high_load = system_load > 0.8
+        if high_load:
+            ip_limit = max(1, int(config.requests * 0.2))
+
+        keys = [f"{REDIS_PREFIX}ip:{ip}:bucket", f"{REDIS_PREFIX}ip:{ip}:log"]
+        args = [
+            int(current_time * 1000),
+            config.window * 1000,
+            max(MAX_WINDOW, config.window) * 1000,
+            uuid.uuid4().hex,
+            int(1000 / IP_BUCKET[1]),
+            IP_BUCKET[0],
+            ip_limit,
+        ]
+        if user_id:
+            keys += [
+                f"{REDIS_PREFIX}user:{user_id}:bucket",
+                f"{REDIS_PREFIX}user:{user_id}:log",
+            ]
+            args += [
+                int(1000 / USER_BUCKET[1]),
+                USER_BUCKET[0],
+                int(config.requests * USER_LIMIT_MULTIPLIER),
+            ]
+
+        allowed, failed, retry_ms, remaining = await self._script(keys=keys, args=args)
+        if allowed:
             return (
                 True,
                 0,
                 {
                     "limit": config.requests,
-                    "remaining": remaining,
+                    "remaining": int(remaining),
                     "reset": int(current_time + config.window),
                     "system_load": system_load,
                 },
             )
 
+        retry_after = max(1, math.ceil(int(retry_ms) / 1000))
+        if failed == 2 and high_load:
+            return (
+                False,
+                60,
+                {
+                    "limit_type": "adaptive_high_load",
+                    "system_load": system_load,
+                    "retry_after": 60,
+                },
+            )
+        if failed in (1, 3):
+            return (
+                False,
+                retry_after,
+                {"limit_type": "burst", "retry_after": retry_after},
+            )
+        return (
+            False,
+            retry_after,
+            {
+                "limit_type": "window",
+                "retry_after": retry_after,
+                "limit": config.requests,
+                "window": config.window,
+            },
+        )
+
+    def _check_local(
+        self,
+        user_id: Optional[str],
+        ip: str,
+        config: RateLimitConfig,
+        system_load: float,
+        current_time: float,
+    ) -> Tuple[bool, int, Dict[str, Any]]:
+        """Check and record the request in this worker's memory.
+
+        Runs without awaiting, so concurrent requests cannot interleave.
+        """
+        if system_load > 0.8:
+            adjusted_limit = max(1, int(config.requests * 0.2))
+
+            ip_requests_count = len(self.ip_requests[ip])
+            if ip_requests_count >= adjusted_limit:
+                return (
+                    False,
+                    60,
+                    {
+                        "limit_type": "adaptive_high_load",
+                        "system_load": system_load,
+                        "retry_after": 60,
+                    },
+                )
+
+        bucket_allowed, bucket_retry = self.check_token_bucket_limit(user_id, ip)
+        if not bucket_allowed:
+            return (
+                False,
+                bucket_retry,
+                {"limit_type": "burst", "retry_after": bucket_retry},
+            )
+
+        window_allowed, window_retry = self.check_sliding_window_limit(
+            user_id, ip, config, current_time
+        )
+        if not window_allowed:
+            return (
+                False,
+                window_retry,
+                {
+                    "limit_type": "window",
+                    "retry_after": window_retry,
+                    "limit": config.requests,
+                    "window": config.window,
+                },
+            )
+
+        self.ip_requests[ip].append(current_time)
+        if user_id:
+            self.user_requests[user_id].append(current_time)
+
+        if current_time - self.last_cleanup > 60:
+            self._cleanup_old_entries(current_time)
+            self.last_cleanup = current_time
+
+        remaining = self._get_remaining_requests(user_id, ip, config, current_time)
+
+        return (
+            True,
+            0,
+            {
+                "limit": config.requests,
+                "remaining": remaining,
+                "reset": int(current_time + config.window),
+                "system_load": system_load,
+            },
+        )
+
     def _get_remaining_requests(
         self,
         user_id: Optional[str],
@@ -296,7 +543,7 @@ class UnifiedRateLimiter:
         """Get remaining requests for client."""
         if user_id:
             request_times = self.user_requests[user_id]
-            effective_limit = config.requests * 5
+            effective_limit = config.requests * USER_LIMIT_MULTIPLIER
         else:
             request_times = self.ip_requests[ip]
             effective_limit = config.requests
@@ -308,8 +555,7 @@ class UnifiedRateLimiter:
 
     def _cleanup_old_entries(self, current_time: float):
         """Clean up old entries to prevent memory leaks."""
-        max_window = 3600
-        cutoff_time = current_time - max_window
+        cutoff_time = current_time - MAX_WINDOW
 
         for ip in list(self.ip_requests.keys()):
             request_times = self.ip_requests[ip]
@@ -333,16 +579,32 @@ class UnifiedRateLimiter:
         """Record an error for adaptive limiting."""
         self.error_count += 1
 
+    def reset(self):
+        """Forget this worker's local buckets, windows and load samples."""
+        self.user_buckets.clear()
+        self.ip_buckets.clear()
+        self.ip_requests.clear()
+        self.user_requests.clear()
+        self.request_times.clear()
+        self.error_count = 0
+        self.total_requests = 0
+        self._redis_retry_at = 0.0
+
 
-class UnifiedRateLimitMiddleware(BaseHTTPMiddleware):
-    """Unified rate limiting middleware."""
+class UnifiedRateLimitMiddleware:
+    """Unified rate limiting middleware (pure ASGI)."""
 
-    def __init__(self, app):
-        super().__init__(app)
-        self.rate_limiter = UnifiedRateLimiter()
+    def __init__(self, app: ASGIApp, rate_limiter: Optional[UnifiedRateLimiter] = None):
+        self.app = app
+        self.rate_limiter = rate_limiter or unified_rate_limiter
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Apply unified rate limiting."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         user_id = getattr(request.state, "user_id", None)
 
         allowed, retry_after, metadata = await self.rate_limiter.check_rate_limit(
@@ -354,7 +616,7 @@ class UnifiedRateLimitMiddleware(BaseHTTPMiddleware):
                 f"Rate limit exceeded for {user_id or 'anonymous'} from {self.rate_limiter.get_client_ip(request)}: {metadata}"
             )
 
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": "Rate limit exceeded",
@@ -364,23 +626,24 @@ class UnifiedRateLimitMiddleware(BaseHTTPMiddleware):
                 },
                 headers={"Retry-After": str(retry_after)},
             )
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if message["status"] >= 500:
+                    self.rate_limiter.record_error()
+                if metadata:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-RateLimit-Limit"] = str(metadata.get("limit", ""))
+                    headers["X-RateLimit-Remaining"] = str(
+                        metadata.get("remaining", "")
+                    )
+                    headers["X-RateLimit-Reset"] = str(metadata.get("reset", ""))
+                    headers["X-System-Load"] = f"{metadata.get('system_load', 0):.2f}"
+            await send(message)
 
-        start_time = time.time()
-        response = await call_next(request)
-        time.time() - start_time
-
-        if response.status_code >= 500:
-            self.rate_limiter.record_error()
-
-        if metadata:
-            response.headers["X-RateLimit-Limit"] = str(metadata.get("limit", ""))
-            response.headers["X-RateLimit-Remaining"] = str(
-                metadata.get("remaining", "")
-            )
-            response.headers["X-RateLimit-Reset"] = str(metadata.get("reset", ""))
-            response.headers["X-System-Load"] = f"{metadata.get('system_load', 0):.2f}"
-
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
 # Global rate limiter instance
@@ -389,4 +652,4 @@ unified_rate_limiter = UnifiedRateLimiter()
 
 def setup_unified_rate_limiting(app):
     """Setup unified rate limiting for FastAPI app."""
-    app.add_middleware(UnifiedRateLimitMiddleware)
+    add_timed_middleware(app, UnifiedRateLimitMiddleware, "rate_limit")
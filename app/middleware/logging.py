@@ -1,24 +1,25 @@
 """Logging middleware - minimal version."""
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Minimal request logging middleware."""
+class _Passthrough:
+    """Pure ASGI placeholder layer; forwards every scope unchanged."""
 
-    async def dispatch(self, request, call_next):
-        return await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
 
-class PerformanceMetricsMiddleware(BaseHTTPMiddleware):
-    """Minimal performance metrics middleware."""
 
-    async def dispatch(self, request, call_next):
-        return await call_next(request)
+class RequestLoggingMiddleware(_Passthrough):
+    """Minimal request logging middleware."""
 
 
-class AuditTrailMiddleware(BaseHTTPMiddleware):
-    """Minimal audit trail middleware."""
+class PerformanceMetricsMiddleware(_Passthrough):
+    """Minimal performance metrics middleware."""
+
 
-    async def dispatch(self, request, call_next):
-        return await call_next(request)
+class AuditTrailMiddleware(_Passthrough):
+    """Minimal audit trail middleware."""
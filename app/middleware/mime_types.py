@@ -0,0 +1,37 @@
+"""Force correct content types for CSS and JS responses."""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_CONTENT_TYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+}
+
+
+class MimeTypeMiddleware:
+    """Pure ASGI middleware that rewrites content-type by path suffix."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        content_type = next(
+            (ct for suffix, ct in _CONTENT_TYPES.items() if path.endswith(suffix)),
+            None,
+        )
+        if content_type is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_type(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["content-type"] = content_type
+            await send(message)
+
+        await self.app(scope, receive, send_with_type)
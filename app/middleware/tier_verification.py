@@ -1,17 +1,21 @@
 """Tier verification middleware for all requests.
 
 This middleware verifies the user's tier on every request and attaches it to the
-request state for use in endpoints and decorators. It ensures that tier information
-is always fresh and available throughout the request lifecycle.
+request state for use in endpoints and decorators. Tiers come from ``tier_cache``,
+which is invalidated whenever a user's tier changes.
 """
 
 from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.logging import get_logger
+from app.services.tier_cache import tier_cache
 from app.services.tier_manager import TierManager
 
 logger = get_logger(__name__)
 
+PUBLIC_PATHS = ("/auth/", "/health", "/docs", "/openapi.json", "/static/")
+
 
 async def tier_verification_middleware(request: Request, call_next):
     """Verify and attach tier to every request.
@@ -20,7 +24,7 @@ async def tier_verification_middleware(request: Request, call_next):
     1. Skips public endpoints (auth, health, docs)
     2. Gets user_id from request state (set by auth middleware)
     3. Creates TierManager instance
-    4. Calls get_user_tier() to get fresh tier from database
+    4. Calls get_user_tier() to get the tier (cached, else from database)
     5. Attaches tier and tier_manager to request state
     6. Handles errors gracefully (defaults to freemium)
 
@@ -31,33 +35,38 @@ async def tier_verification_middleware(request: Request, call_next):
     Returns:
         Response from next middleware/endpoint
     """
+    if not request.url.path.startswith(PUBLIC_PATHS):
+        _attach_tier(request.state)
 
-    # Skip public endpoints
-    public_paths = ["/auth/", "/health", "/docs", "/openapi.json", "/static/"]
-    if any(request.url.path.startswith(p) for p in public_paths):
-        return await call_next(request)
+    # Continue to next middleware/endpoint
+    return await call_next(request)
 
+
+def _attach_tier(state) -> None:
     # Get user_id from request state (set by auth middleware)
-    user_id = getattr(request.state, "user_id", None)
+    user_id = getattr(state, "user_id", None)
     if not user_id:
         # No authenticated user - skip tier verification
-        return await call_next(request)
+        return
 
     try:
         # Get database session from request state
-        db = getattr(request.state, "db", None)
-        if not db:
-            # No database session - skip tier verification
-            logger.warning(f"No database session for user {user_id}")
-            return await call_next(request)
-
-        # Create TierManager and get fresh tier from database
-        tier_manager = TierManager(db)
-        tier = tier_manager.get_user_tier(user_id)
+        db = getattr(state, "db", None)
+        if db:
+            # TierManager answers from tier_cache and falls back to the DB
+            tier_manager = TierManager(db)
+            tier = tier_manager.get_user_tier(user_id)
+        else:
+            tier_manager = None
+            tier = tier_cache.get(user_id)
+            if tier is None:
+                # No database session and nothing cached - skip tier verification
+                logger.warning(f"No database session for user {user_id}")
+                return
 
         # Attach to request state for use in endpoints
-        request.state.user_tier = tier
-        request.state.tier_manager = tier_manager
+        state.user_tier = tier
+        state.tier_manager = tier_manager
 
         # Log tier verification (debug level to avoid log spam)
         logger.debug(f"Tier verified: user={user_id}, tier={tier}")
@@ -65,8 +74,17 @@ async def tier_verification_middleware(request: Request, call_next):
     except Exception as e:
         # Error during tier verification - default to freemium
         logger.error(f"Tier verification failed for user {user_id}: {e}")
-        request.state.user_tier = "freemium"
-        request.state.tier_manager = None
+        state.user_tier = "freemium"
+        state.tier_manager = None
 
-    # Continue to next middleware/endpoint
-    return await call_next(request)
+
+class TierVerificationMiddleware:
+    """Pure ASGI form of ``tier_verification_middleware`` for the app stack."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not scope["path"].startswith(PUBLIC_PATHS):
+            _attach_tier(Request(scope).state)
+        await self.app(scope, receive, send)
@@ -0,0 +1,131 @@
+"""Per-layer timing for the ASGI middleware chain.
+
+``add_timed_middleware`` registers a middleware wrapped in ``TimedLayer``,
+which measures the time the layer itself spends on a request: its work
+before calling the next app, plus its work around each ``send``, with the
+downstream app and the outer send subtracted. Results go to the
+``middleware_layer_seconds`` histogram and to an in-process summary used
+by the admin latency budget report.
+"""
+
+import time
+from typing import Dict, List
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.metrics import middleware_layer_seconds
+
+_SCOPE_KEY = "middleware_timing"
+
+
+class _LayerClock:
+    __slots__ = ("downstream", "inner_send", "outer_send")
+
+    def __init__(self):
+        self.downstream = 0.0
+        self.inner_send = 0.0
+        self.outer_send = 0.0
+
+
+class _Downstream:
+    """Sits between a timed layer and the app it wraps."""
+
+    def __init__(self, app: ASGIApp, name: str):
+        self.app = app
+        self.name = name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        clock = scope.get(_SCOPE_KEY, {}).get(self.name)
+        if clock is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def timed_send(message: Message) -> None:
+            start = time.perf_counter()
+            try:
+                await send(message)
+            finally:
+                clock.inner_send += time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            clock.downstream += time.perf_counter() - start
+
+
+class MiddlewareTimings:
+    """Running totals per layer for the latency budget report."""
+
+    def __init__(self):
+        self._totals: Dict[str, List[float]] = {}
+
+    def record(self, layer: str, seconds: float) -> None:
+        totals = self._totals.setdefault(layer, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] = max(totals[2], seconds)
+
+    def report(self) -> List[Dict]:
+        """Layers ordered by mean cost per request, in microseconds."""
+        rows = [
+            {
+                "layer": layer,
+                "requests": count,
+                "mean_us": round(total / count * 1e6, 1),
+                "max_us": round(peak * 1e6, 1),
+                "total_ms": round(total * 1e3, 2),
+            }
+            for layer, (count, total, peak) in self._totals.items()
+            if count
+        ]
+        return sorted(rows, key=lambda row: row["mean_us"], reverse=True)
+
+    def reset(self) -> None:
+        self._totals.clear()
+
+
+middleware_timings = MiddlewareTimings()
+
+
+class TimedLayer:
+    """Wraps one middleware and records the time it adds to each request."""
+
+    def __init__(self, app: ASGIApp, layer: type, name: str, **options):
+        self.name = name
+        self.app = layer(_Downstream(app, name), **options)
+        self._histogram = middleware_layer_seconds.labels(layer=name)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        clock = _LayerClock()
+        scope.setdefault(_SCOPE_KEY, {})[self.name] = clock
+
+        async def outer_send(message: Message) -> None:
+            start = time.perf_counter()
+            try:
+                await send(message)
+            finally:
+                clock.outer_send += time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, outer_send)
+        finally:
+            total = time.perf_counter() - start
+            own = total - (clock.downstream - clock.inner_send) - clock.outer_send
+            own = max(own, 0.0)
+            self._histogram.observe(own)
+            middleware_timings.record(self.name, own)
+
+
+def add_timed_middleware(app, layer: type, name: str, **options) -> None:
+    """``app.add_middleware`` with per-layer timing when it is enabled."""
+    if get_settings().middleware_timing_enabled:
+        app.add_middleware(TimedLayer, layer=layer, name=name, **options)
+    else:
+        app.add_middleware(layer, **options)
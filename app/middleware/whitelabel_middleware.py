@@ -1,113 +1,36 @@
-"""Whitelabel middleware for domain-based tenant resolution and branding injection"""
+"""Whitelabel middleware for domain-based tenant resolution and branding injection
 
+Host lookups are cached per process in ``domain_branding_cache`` (LRU with
+TTL, including negative entries for hosts without a whitelabel config),
+together with the partner's rendered CSS. Branding CSS is spliced into HTML
+responses as they stream, before ``</head>``, without buffering the page.
+"""
+
+import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import get_settings
 from app.core.database import SessionLocal
+from app.core.local_cache import TTLCache
 from app.services.whitelabel_service import whitelabel_service
 
 logger = logging.getLogger(__name__)
 
+_HEAD_CLOSE = b"</head>"
+_BODY_OPEN = b"<body>"
 
-class WhitelabelMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to detect custom domains and inject whitelabel branding
-
-    Flow:
-    1. Extract domain from request host
-    2. Check if it's a custom whitelabel domain
-    3. Load branding configuration
-    4. Inject into request state
-    5. Modify response to include custom CSS
-    """
-
-    def __init__(self, app, base_domain: str):
-        super().__init__(app)
-        self.base_domain = (
-            base_domain.replace("http://", "").replace("https://", "").split(":")[0]
-        )
-
-    async def dispatch(self, request: Request, call_next):
-        """Process request and inject whitelabel branding"""
-
-        # Extract domain from host header
-        host = request.headers.get("host", "").split(":")[0]
-
-        # Initialize whitelabel state
-        request.state.whitelabel = {
-            "enabled": False,
-            "partner_id": None,
-            "branding": None,
-            "domain": host,
-        }
-
-        # Check if this is a custom domain (not the platform domain)
-        if (
-            host
-            and host != self.base_domain
-            and host != "localhost"
-            and host != "127.0.0.1"
-        ):
-            db = SessionLocal()
-            try:
-                # Query whitelabel branding by domain
-                branding = whitelabel_service.get_branding_by_domain(db, host)
-
-                if branding:
-                    # Inject whitelabel state
-                    request.state.whitelabel = {
-                        "enabled": True,
-                        "partner_id": branding.user_id,
-                        "branding": branding.to_dict(),
-                        "domain": host,
-                    }
-                    logger.debug(
-                        f"Whitelabel enabled for domain: {host}, partner: {branding.user_id}"
-                    )
-                else:
-                    logger.debug(
-                        f"No whitelabel configuration found for domain: {host}"
-                    )
-
-            except Exception as e:
-                logger.error(f"Error loading whitelabel config for {host}: {e}")
-            finally:
-                db.close()
-
-        # Process request
-        response = await call_next(request)
 
-        # Inject custom CSS if whitelabel is enabled and response is HTML
-        if request.state.whitelabel["enabled"] and response.headers.get(
-            "content-type", ""
-        ).startswith("text/html"):
-            response = await self._inject_branding_css(request, response)
+def _disabled(host: Optional[str]) -> dict:
+    return {"enabled": False, "partner_id": None, "branding": None, "domain": host}
 
-        return response
 
-    async def _inject_branding_css(
-        self, request: Request, response: Response
-    ) -> Response:
-        """Inject custom CSS variables into HTML response"""
-        try:
-            branding = request.state.whitelabel.get("branding")
-            if not branding:
-                return response
-
-            # Read response body
-            body = b""
-            async for chunk in response.body_iterator:
-                body += chunk
-
-            # Decode HTML
-            html = body.decode("utf-8")
-
-            # Create custom CSS
-            custom_css = f"""
+def _branding_css(branding: dict) -> str:
+    """Custom CSS variables for a partner's branding."""
+    return f"""
 <style id="whitelabel-branding">
 :root {{
     --primary-color: {branding['primary_color']};
@@ -143,26 +66,216 @@ body {{
 </style>
 """
 
-            # Inject before </head> tag
-            if "</head>" in html:
-                html = html.replace("</head>", f"{custom_css}\n</head>")
-            else:
-                # If no </head>, inject at start of body
-                html = html.replace("<body>", f"<body>\n{custom_css}")
-
-            # Update response
-            from starlette.responses import Response as StarletteResponse
-
-            return StarletteResponse(
-                content=html.encode("utf-8"),
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type="text/html",
-            )
 
+class DomainBrandingCache(TTLCache):
+    """host -> (whitelabel state, branding CSS).
+
+    Hosts without a whitelabel config are cached too, for the shorter
+    negative TTL. Entries are dropped when a partner changes branding or a
+    domain is verified or removed; other workers catch up when their
+    entries expire.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float):
+        super().__init__(maxsize, ttl)
+        self.negative_ttl = negative_ttl
+
+    def set(self, host: str, whitelabel: dict, css: Optional[bytes]) -> None:
+        ttl = self.ttl if whitelabel["enabled"] else self.negative_ttl
+        super().set(host, (whitelabel, css), ttl=ttl)
+
+    def invalidate(self, host: Optional[str] = None) -> None:
+        """Drop one host, or everything when ``host`` is None."""
+        if host is None:
+            self.clear()
+        else:
+            self.pop(host)
+
+    def invalidate_partner(self, partner_id) -> None:
+        """Drop every host that resolved to ``partner_id``."""
+        self.discard_where(lambda host, entry: entry[0]["partner_id"] == partner_id)
+
+
+def _build_cache() -> DomainBrandingCache:
+    settings = get_settings()
+    return DomainBrandingCache(
+        maxsize=settings.whitelabel_cache_size,
+        ttl=settings.whitelabel_cache_ttl_seconds,
+        negative_ttl=settings.whitelabel_negative_cache_ttl_seconds,
+    )
+
+
+domain_branding_cache = _build_cache()
+
+
+class _CSSInjector:
+    """Inserts CSS before ``</head>`` in an HTML body arriving in chunks.
+
+    Falls back to just after ``<body>`` when that comes first. Only the last
+    few bytes of a chunk are held back, in case a marker straddles chunks.
+    """
+
+    _KEEP = len(_HEAD_CLOSE) - 1
+
+    def __init__(self, css: bytes):
+        self.css = css
+        self.done = False
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self.done:
+            return chunk
+        data, self._tail = self._tail + chunk, b""
+        head = data.find(_HEAD_CLOSE)
+        body = data.find(_BODY_OPEN)
+        if head != -1 and (body == -1 or head < body):
+            self.done = True
+            return data[:head] + self.css + b"\n" + data[head:]
+        if body != -1:
+            self.done = True
+            at = body + len(_BODY_OPEN)
+            return data[:at] + b"\n" + self.css + data[at:]
+        self._tail = data[-self._KEEP :]
+        return data[: -self._KEEP]
+
+    def flush(self) -> bytes:
+        tail, self._tail = self._tail, b""
+        return tail
+
+
+class WhitelabelMiddleware:
+    """
+    Pure ASGI middleware to detect custom domains and inject whitelabel branding
+
+    Flow:
+    1. Extract domain from request host
+    2. Check if it's a custom whitelabel domain
+    3. Load branding configuration
+    4. Inject into request state
+    5. Modify HTML responses to include custom CSS
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        base_domain: str,
+        cache: Optional[DomainBrandingCache] = None,
+    ):
+        self.app = app
+        self.base_domain = (
+            base_domain.replace("http://", "").replace("https://", "").split(":")[0]
+        )
+        self.cache = cache if cache is not None else domain_branding_cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        # Extract domain from host header
+        host = request.headers.get("host", "").split(":")[0]
+        whitelabel, css = await self._resolve(host)
+        request.state.whitelabel = whitelabel
+
+        if css is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, self._css_injector(send, css))
+
+    def _is_platform_host(self, host: str) -> bool:
+        return (
+            not host
+            or host == self.base_domain
+            or host == "localhost"
+            or host == "127.0.0.1"
+        )
+
+    async def _resolve(self, host: str) -> Tuple[dict, Optional[bytes]]:
+        """Whitelabel state and branding CSS for a host, from cache when fresh."""
+        # Check if this is a custom domain (not the platform domain)
+        if self._is_platform_host(host):
+            return _disabled(host), None
+
+        cached = self.cache.get(host)
+        if cached is not None:
+            return cached
+
+        try:
+            whitelabel = await asyncio.to_thread(self._load, host)
         except Exception as e:
-            logger.error(f"Error injecting branding CSS: {e}")
-            return response
+            # Not cached, so the next request retries the lookup
+            logger.error(f"Error loading whitelabel config for {host}: {e}")
+            return _disabled(host), None
+
+        css = None
+        if whitelabel["branding"]:
+            try:
+                css = _branding_css(whitelabel["branding"]).encode("utf-8")
+            except Exception as e:
+                logger.error(f"Error rendering branding CSS for {host}: {e}")
+        self.cache.set(host, whitelabel, css)
+        return whitelabel, css
+
+    def _load(self, host: str) -> dict:
+        db = SessionLocal()
+        try:
+            # Query whitelabel branding by domain
+            branding = whitelabel_service.get_branding_by_domain(db, host)
+            if not branding:
+                logger.debug(f"No whitelabel configuration found for domain: {host}")
+                return _disabled(host)
+
+            logger.debug(
+                f"Whitelabel enabled for domain: {host}, partner: {branding.user_id}"
+            )
+            return {
+                "enabled": True,
+                "partner_id": branding.user_id,
+                "branding": branding.to_dict(),
+                "domain": host,
+            }
+        finally:
+            db.close()
+
+    def _css_injector(self, send: Send, css: bytes) -> Send:
+        """Wrap ``send`` to add branding CSS to an HTML response as it streams."""
+        injector: Optional[_CSSInjector] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal injector
+            if message["type"] == "http.response.start":
+                content_type = b""
+                for key, value in message.get("headers", []):
+                    if key.lower() == b"content-type":
+                        content_type = value
+                if content_type.startswith(b"text/html"):
+                    injector = _CSSInjector(css)
+                    # The body grows, so it goes out chunked
+                    message = {
+                        **message,
+                        "headers": [
+                            (k, v)
+                            for k, v in message.get("headers", [])
+                            if k.lower() != b"content-length"
+                        ],
+                    }
+                await send(message)
+                return
+
+            if injector is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            more_body = message.get("more_body", False)
+            body = injector.feed(message.get("body", b""))
+            if not more_body:
+                body += injector.flush()
+            if body or not more_body:
+                await send({**message, "body": body})
+
+        return send_wrapper
 
 
 def get_whitelabel_context(request: Request) -> dict:
@@ -177,4 +290,4 @@ def get_whitelabel_context(request: Request) -> dict:
     if hasattr(request.state, "whitelabel"):
         return request.state.whitelabel
 
-    return {"enabled": False, "partner_id": None, "branding": None, "domain": None}
+    return _disabled(None)
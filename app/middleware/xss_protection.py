@@ -1,10 +1,46 @@
-"""XSS protection middleware."""
+"""XSS protection middleware and sanitizing JSON responses.
+
+``SanitizedJSONResponse`` is the application's default response class: it
+escapes user-facing strings while the route's return value is rendered, so
+the body is encoded once. ``XSSProtectionMiddleware`` lets those responses
+stream straight through and only buffers and re-encodes JSON produced some
+other way (routes returning a plain ``JSONResponse``, exception handlers).
+"""
 
 import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.utils.sanitization import sanitize_response_content
+
+# Set on the ASGI scope by responses whose body needs no further sanitizing
+_SANITIZED_SCOPE_KEY = "xss_sanitized"
+
+
+class SanitizedJSONResponse(JSONResponse):
+    """JSON response whose user-facing strings are escaped at render time."""
+
+    def render(self, content: Any) -> bytes:
+        return super().render(sanitize_response_content(content))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope[_SANITIZED_SCOPE_KEY] = True
+        await super().__call__(scope, receive, send)
+
 
-from starlette.types import ASGIApp, Receive, Scope, Send
+class TrustedJSONResponse(JSONResponse):
+    """Opt-out for routes that only return numeric or enum data.
+
+    Use as ``response_class=TrustedJSONResponse``; the body is neither
+    sanitized at render time nor buffered by the middleware.
+    """
 
-from app.utils.sanitization import validate_and_sanitize_response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope[_SANITIZED_SCOPE_KEY] = True
+        await super().__call__(scope, receive, send)
 
 
 class XSSProtectionMiddleware:
@@ -16,9 +52,12 @@ class XSSProtectionMiddleware:
 
     def __init__(self, app: ASGIApp) -> None:
         self.app = app
+        self.trusted_paths = tuple(get_settings().xss_trusted_paths)
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] != "http":
+        if scope["type"] != "http" or (
+            self.trusted_paths and scope["path"].startswith(self.trusted_paths)
+        ):
             await self.app(scope, receive, send)
             return
 
@@ -26,17 +65,18 @@ class XSSProtectionMiddleware:
         body_chunks: list[bytes] = []
         is_json = False
 
-        async def send_wrapper(message: dict) -> None:
+        async def send_wrapper(message: Message) -> None:
             nonlocal initial_message, is_json
 
             if message["type"] == "http.response.start":
-                headers = dict(
-                    (k.lower(), v)
-                    for k, v in (
-                        (k.decode(), v.decode()) for k, v in message.get("headers", [])
-                    )
-                )
-                is_json = headers.get("content-type", "").startswith("application/json")
+                if scope.get(_SANITIZED_SCOPE_KEY):
+                    await send(message)
+                    return
+                content_type = b""
+                for key, value in message.get("headers", []):
+                    if key.lower() == b"content-type":
+                        content_type = value
+                is_json = content_type.startswith(b"application/json")
                 if is_json:
                     initial_message = message
                     return
@@ -57,8 +97,9 @@ class XSSProtectionMiddleware:
                 if full_body:
                     try:
                         data = json.loads(full_body)
-                        sanitized = validate_and_sanitize_response(data)
-                        full_body = json.dumps(sanitized).encode()
+                        sanitized = sanitize_response_content(data)
+                        if sanitized is not data:
+                            full_body = json.dumps(sanitized).encode()
                     except (json.JSONDecodeError, UnicodeDecodeError):
                         pass
 
@@ -75,4 +116,6 @@ class XSSProtectionMiddleware:
                 await send({"type": "http.response.body", "body": full_body})
                 return
 
+            await send(message)
+
         await self.app(scope, receive, send_wrapper)
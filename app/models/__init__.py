@@ -11,6 +11,12 @@ from .analytics import (
     VerificationEvent,
     VerificationStatistics,
 )
+from .analytics_rollup import (
+    AnalyticsRollupWatermark,
+    LedgerDailyRollup,
+    UserDailyRollup,
+    VerificationDailyRollup,
+)
 from .api_key import APIKey  # Import from separate api_key module
 from .balance_transaction import BalanceTransaction
 from .base import Base, BaseModel
@@ -108,6 +114,10 @@ __all__ = [
     "ScheduledReport",
     "UserAnalyticsSnapshot",
     "VerificationStatistics",
+    "VerificationDailyRollup",
+    "LedgerDailyRollup",
+    "UserDailyRollup",
+    "AnalyticsRollupWatermark",
     # User models
     "User",
     "APIKey",
@@ -0,0 +1,71 @@
+"""Daily rollups backing the admin analytics dashboards.
+
+Maintained by ``AnalyticsRollupService``; each row is recomputed whole from
+its source table whenever a source row for that day changes.
+"""
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String
+
+from app.models.base import Base
+
+
+class VerificationDailyRollup(Base):
+    """Verification counts and spend per day and service."""
+
+    __tablename__ = "verification_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    service_name = Column(String, primary_key=True)
+    verifications = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    refunded = Column(Integer, nullable=False, default=0)
+    spend = Column(Float, nullable=False, default=0.0)
+    refund_amount = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<VerificationDailyRollup {self.day} {self.service_name}>"
+
+
+class LedgerDailyRollup(Base):
+    """Entry counts and amounts per day, ledger and entry type.
+
+    ``source`` is ``transactions`` (sms_transactions) or
+    ``balance_transactions``.
+    """
+
+    __tablename__ = "ledger_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    source = Column(String(32), primary_key=True)
+    type = Column(String, primary_key=True)
+    entries = Column(Integer, nullable=False, default=0)
+    amount = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<LedgerDailyRollup {self.day} {self.source}:{self.type}>"
+
+
+class UserDailyRollup(Base):
+    """Signups per day, and how many of them currently hold credit."""
+
+    __tablename__ = "user_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    signups = Column(Integer, nullable=False, default=0)
+    funded = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<UserDailyRollup {self.day}>"
+
+
+class AnalyticsRollupWatermark(Base):
+    """Latest source change each rollup has absorbed."""
+
+    __tablename__ = "analytics_rollup_watermarks"
+
+    rollup = Column(String(64), primary_key=True)
+    high_water = Column(DateTime, nullable=True)
+    refreshed_at = Column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<AnalyticsRollupWatermark {self.rollup}>"
@@ -1,6 +1,6 @@
 """Balance transaction model for tracking balance changes."""
 
-from sqlalchemy import Column, ForeignKey, Numeric, String, Text
+from sqlalchemy import Column, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -10,6 +10,8 @@ class BalanceTransaction(BaseModel):
     """Balance transaction model."""
 
     __tablename__ = "balance_transactions"
+    # Change detection for the analytics rollups
+    __table_args__ = (Index("ix_balance_transactions_updated_at", "updated_at"),)
 
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     amount = Column(Numeric(10, 2), nullable=False)
@@ -18,7 +18,11 @@ class BaseModel(Base):
     created_at = Column(
         DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
     )
-    updated_at = Column(DateTime, onupdate=lambda: datetime.now(timezone.utc))
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
     # deleted_at = Column(DateTime, nullable=True)
     # is_deleted = Column(Boolean, default=False, nullable=False)
 
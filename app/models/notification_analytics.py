@@ -1,8 +1,8 @@
 """Notification analytics model for tracking delivery and engagement metrics."""
 
-from sqlalchemy import JSON, Column, ForeignKey, Integer, String
+from sqlalchemy import JSON, BigInteger, Column, DateTime, ForeignKey, Integer, String
 
-from app.models.base import BaseModel
+from app.models.base import Base, BaseModel
 
 
 class NotificationAnalytics(BaseModel):
@@ -63,3 +63,34 @@ class NotificationAnalytics(BaseModel):
             "retry_count": self.retry_count,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class NotificationStatsHourly(Base):
+    """Notification counters per hour, user, type and delivery method.
+
+    Status columns count the tracked notifications currently in that status;
+    a status change moves one count between columns. ``*_ms_total`` and
+    ``*_count`` back the average timings. Updated in batches by
+    ``NotificationStatsBuffer``.
+    """
+
+    __tablename__ = "notification_stats_hourly"
+
+    hour = Column(DateTime, primary_key=True)
+    user_id = Column(String, primary_key=True)
+    notification_type = Column(String(50), primary_key=True)
+    delivery_method = Column(String(50), primary_key=True)
+    sent = Column(Integer, nullable=False, default=0)
+    delivered = Column(Integer, nullable=False, default=0)
+    read = Column(Integer, nullable=False, default=0)
+    clicked = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    delivery_time_ms_total = Column(BigInteger, nullable=False, default=0)
+    delivery_time_count = Column(Integer, nullable=False, default=0)
+    read_time_ms_total = Column(BigInteger, nullable=False, default=0)
+    read_time_count = Column(Integer, nullable=False, default=0)
+    click_time_ms_total = Column(BigInteger, nullable=False, default=0)
+    click_time_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<NotificationStatsHourly {self.hour} {self.user_id}>"
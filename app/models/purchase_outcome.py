@@ -112,4 +112,24 @@ class PurchaseOutcome(Base):
         Index("ix_po_svc_assigned_date", "service", "assigned_code", "created_at"),
         Index("ix_po_svc_requested_date", "service", "requested_code", "created_at"),
         Index("ix_po_carrier_svc", "assigned_carrier", "service"),
+        # Live health: provider+service+country over the last hour
+        Index(
+            "ix_po_provider_svc_country_date",
+            "provider",
+            "service",
+            "country",
+            "created_at",
+        ),
+        # ROI: per-provider sums over a date range, index-only on Postgres
+        Index(
+            "ix_po_date_provider",
+            "created_at",
+            "provider",
+            postgresql_include=[
+                "provider_cost",
+                "user_price",
+                "is_refunded",
+                "refund_amount",
+            ],
+        ),
     )
@@ -1,6 +1,6 @@
 """Transaction and payment - related database models."""
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Index, Integer, String
 
 from app.models.base import BaseModel
 
@@ -9,6 +9,8 @@ class Transaction(BaseModel):
     """Financial transaction model."""
 
     __tablename__ = "sms_transactions"
+    # Change detection for the analytics rollups
+    __table_args__ = (Index("ix_sms_transactions_updated_at", "updated_at"),)
 
     user_id = Column(String, nullable=False, index=True)
     amount = Column(Float, nullable=False)
@@ -1,6 +1,6 @@
 """User - related database models."""
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, Numeric, String
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -10,6 +10,8 @@ class User(BaseModel):
     """User account model."""
 
     __tablename__ = "users"
+    # Change detection for the analytics rollups
+    __table_args__ = (Index("ix_users_updated_at", "updated_at"),)
 
     email = Column(String, unique=True, nullable=False, index=True)
     password_hash = Column(String, nullable=True)  # Nullable for OAuth users
@@ -1,6 +1,15 @@
 """Verification - related database models."""
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 
 from app.models.base import BaseModel
 
@@ -9,6 +18,8 @@ class Verification(BaseModel):
     """SMS/Voice verification model."""
 
     __tablename__ = "verifications"
+    # Change detection for the analytics rollups
+    __table_args__ = (Index("ix_verifications_updated_at", "updated_at"),)
 
     user_id = Column(String, nullable=False, index=True)
     service_name = Column(String, nullable=False, index=True)
@@ -1,6 +1,10 @@
 """Adaptive polling service that optimizes intervals based on metrics."""
 
+import bisect
+import json
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -10,9 +14,266 @@ from app.models.verification import Verification
 
 logger = get_logger(__name__)
 
+# Upper edges (seconds) of the SMS latency histogram buckets; the last
+# bucket is open-ended.
+LATENCY_BUCKETS = [
+    2, 4, 6, 8, 10, 15, 20, 25, 30, 40, 50, 60,
+    75, 90, 120, 150, 180, 240, 300, 420, 600,
+]  # fmt: skip
+WINDOW_SLICES = 12
+SLICE_SECONDS = 300  # 12 x 5 min = rolling 1 hour, same as the DB queries
+MIN_SAMPLES = 5
+MIN_INTERVAL = 5
+MAX_INTERVAL = 30
+PERSIST_KEY = "adaptive_polling:latency_model"
+PERSIST_INTERVAL_SECONDS = 300
+PERSIST_TTL_SECONDS = 7200
+
+
+def _get_redis():
+    """Lazy import to avoid circular deps."""
+    from app.core.cache import get_redis
+
+    return get_redis()
+
+
+class LatencyHistogram:
+    """Rolling-window SMS latency histogram for one service.
+
+    The window is a ring of time slices; each slice holds bucket counts and a
+    timeout count. Recording is O(log buckets) and every query is bounded by
+    slices x buckets, independent of how many verifications were seen.
+    """
+
+    def __init__(self):
+        self.epochs: List[int] = [-1] * WINDOW_SLICES
+        self.counts: List[List[int]] = [
+            [0] * (len(LATENCY_BUCKETS) + 1) for _ in range(WINDOW_SLICES)
+        ]
+        self.timeouts: List[int] = [0] * WINDOW_SLICES
+
+    def _slot(self, now: float) -> int:
+        epoch = int(now // SLICE_SECONDS)
+        slot = epoch % WINDOW_SLICES
+        if self.epochs[slot] != epoch:
+            self.epochs[slot] = epoch
+            self.counts[slot] = [0] * (len(LATENCY_BUCKETS) + 1)
+            self.timeouts[slot] = 0
+        return slot
+
+    def _live_slots(self, now: float) -> List[int]:
+        oldest = int(now // SLICE_SECONDS) - WINDOW_SLICES + 1
+        return [i for i, epoch in enumerate(self.epochs) if epoch >= oldest]
+
+    def record(self, latency_seconds: float, now: float) -> None:
+        slot = self._slot(now)
+        self.counts[slot][bisect.bisect_left(LATENCY_BUCKETS, latency_seconds)] += 1
+
+    def record_timeout(self, now: float) -> None:
+        self.timeouts[self._slot(now)] += 1
+
+    def merged(self, now: float) -> List[int]:
+        merged = [0] * (len(LATENCY_BUCKETS) + 1)
+        for slot in self._live_slots(now):
+            for i, count in enumerate(self.counts[slot]):
+                merged[i] += count
+        return merged
+
+    def completed(self, now: float) -> int:
+        return sum(self.merged(now))
+
+    def timed_out(self, now: float) -> int:
+        return sum(self.timeouts[slot] for slot in self._live_slots(now))
+
+    def percentile(self, q: float, now: float) -> Optional[float]:
+        """Latency at quantile ``q`` (0-1), linearly interpolated in-bucket."""
+        merged = self.merged(now)
+        total = sum(merged)
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for i, count in enumerate(merged):
+            if count and seen + count >= target:
+                lower = LATENCY_BUCKETS[i - 1] if i > 0 else 0
+                upper = (
+                    LATENCY_BUCKETS[i]
+                    if i < len(LATENCY_BUCKETS)
+                    else LATENCY_BUCKETS[-1]
+                )
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+        return float(LATENCY_BUCKETS[-1])
+
+    def to_dict(self) -> Dict:
+        return {"epochs": self.epochs, "counts": self.counts, "timeouts": self.timeouts}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        hist = cls()
+        if len(data.get("epochs", [])) == WINDOW_SLICES:
+            hist.epochs = list(data["epochs"])
+            hist.counts = [list(c) for c in data["counts"]]
+            hist.timeouts = list(data["timeouts"])
+        return hist
+
+
+class LatencyModel:
+    """Per-service latency histograms fed from polling outcomes."""
+
+    ALL = "__all__"
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.last_persisted = time.time()
+
+    def _hist(self, service: str) -> LatencyHistogram:
+        hist = self.histograms.get(service)
+        if hist is None:
+            hist = self.histograms[service] = LatencyHistogram()
+        return hist
+
+    def record_completion(
+        self, service: Optional[str], latency_seconds: float, now: float = None
+    ) -> None:
+        now = time.time() if now is None else now
+        for key in {service or self.ALL, self.ALL}:
+            self._hist(key).record(latency_seconds, now)
+
+    def record_timeout(self, service: Optional[str], now: float = None) -> None:
+        now = time.time() if now is None else now
+        for key in {service or self.ALL, self.ALL}:
+            self._hist(key).record_timeout(now)
+
+    def get(self, service: Optional[str]) -> Optional[LatencyHistogram]:
+        return self.histograms.get(service or self.ALL)
+
+    def snapshot(self, service: Optional[str] = None, now: float = None) -> Dict:
+        now = time.time() if now is None else now
+        hist = self.get(service)
+        if hist is None:
+            return {"completed": 0, "timed_out": 0, "p50": None, "p90": None}
+        return {
+            "completed": hist.completed(now),
+            "timed_out": hist.timed_out(now),
+            "p50": hist.percentile(0.5, now),
+            "p90": hist.percentile(0.9, now),
+        }
+
+    def persist(self) -> bool:
+        """Save histograms to Redis so a restarted worker starts warm."""
+        if not self.histograms:
+            return False
+        try:
+            payload = {k: h.to_dict() for k, h in self.histograms.items()}
+            _get_redis().setex(PERSIST_KEY, PERSIST_TTL_SECONDS, json.dumps(payload))
+            self.last_persisted = time.time()
+            return True
+        except Exception as e:
+            logger.warning(f"Latency model persist failed: {e}")
+            return False
+
+    def maybe_persist(self) -> bool:
+        if time.time() - self.last_persisted < PERSIST_INTERVAL_SECONDS:
+            return False
+        return self.persist()
+
+    def load(self) -> bool:
+        """Warm histograms from the last persisted snapshot."""
+        try:
+            raw = _get_redis().get(PERSIST_KEY)
+            if not raw:
+                return False
+            for key, data in json.loads(raw).items():
+                self.histograms[key] = LatencyHistogram.from_dict(data)
+            self.last_persisted = time.time()
+            logger.info(f"Latency model warmed for {len(self.histograms)} services")
+            return True
+        except Exception as e:
+            logger.warning(f"Latency model load failed: {e}")
+            return False
+
+
+latency_model = LatencyModel()
+
 
 class AdaptivePollingService:
-    """Dynamically adjust polling intervals based on success metrics."""
+    """Dynamically adjust polling intervals based on success metrics.
+
+    ``interval_for`` answers from the in-memory ``LatencyModel`` without
+    touching the database. The ``db``-based static methods below recompute
+    the same signals from ``Verification`` rows and are kept for reporting.
+    """
+
+    def __init__(self, model: LatencyModel = None):
+        self.model = model or latency_model
+
+    def record_completion(self, service: Optional[str], latency_seconds: float):
+        self.model.record_completion(service, latency_seconds)
+
+    def record_timeout(self, service: Optional[str]):
+        self.model.record_timeout(service)
+
+    def warm(self, db: Session = None) -> None:
+        """Load the persisted model, or seed it from the last hour of DB rows."""
+        if self.model.load() or db is None:
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
+        try:
+            rows = (
+                db.query(
+                    Verification.service_name,
+                    Verification.created_at,
+                    Verification.completed_at,
+                )
+                .filter(
+                    Verification.created_at >= cutoff,
+                    Verification.status == "completed",
+                    Verification.completed_at.isnot(None),
+                )
+                .all()
+            )
+        except Exception as e:
+            logger.warning(f"Latency model seed failed: {e}")
+            return
+        for service_name, created_at, completed_at in rows:
+            latency = (completed_at - created_at).total_seconds()
+            self.model.record_completion(
+                service_name, latency, now=completed_at.timestamp()
+            )
+        logger.info(f"Latency model seeded from {len(rows)} recent verifications")
+
+    def interval_for(
+        self, service: Optional[str], elapsed_seconds: float = 0.0
+    ) -> Optional[float]:
+        """Percentile-based poll interval, or None while the model is cold.
+
+        While most codes are still expected (before p90), poll at a third of
+        p50. Past p90 the SMS is a tail case, so back off to half of p90. A high
+        timeout rate adds the same +5s penalty as
+        ``get_service_specific_interval``.
+        """
+        now = time.time()
+        hist = self.model.get(service)
+        if hist is None or hist.completed(now) < MIN_SAMPLES:
+            hist = self.model.get(None)
+        if hist is None:
+            return None
+        completed = hist.completed(now)
+        if completed < MIN_SAMPLES:
+            return None
+
+        p50 = hist.percentile(0.5, now)
+        p90 = hist.percentile(0.9, now)
+        if elapsed_seconds < p90:
+            interval = p50 / 3
+        else:
+            interval = p90 / 2
+
+        timed_out = hist.timed_out(now)
+        if completed / (completed + timed_out) < 0.70:
+            interval += 5
+        return float(max(MIN_INTERVAL, min(MAX_INTERVAL, interval)))
 
     @staticmethod
     def get_optimal_interval(db: Session, service: str = None) -> int:
@@ -0,0 +1,316 @@
+"""Incremental daily rollups for the admin analytics dashboards.
+
+Each rollup groups a source table by creation day (plus a few dimensions).
+A refresh finds the source rows changed since the rollup's watermark
+(``updated_at``, else ``created_at``) and recomputes only the days those rows
+belong to: it deletes those days' fact rows and re-inserts them with one
+``INSERT ... SELECT ... GROUP BY`` over just those days. Recomputing whole
+days keeps the facts right when rows change after they were first counted,
+e.g. a pending verification completing or a user's credits changing.
+Deleted source rows are only reflected once their day is recomputed, or by
+``rebuild``.
+
+Every worker runs the refresh loop; on PostgreSQL an advisory lock lets one
+of them refresh at a time and the others skip that round.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import (
+    Date,
+    String,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.analytics_rollup import (
+    AnalyticsRollupWatermark,
+    LedgerDailyRollup,
+    UserDailyRollup,
+    VerificationDailyRollup,
+)
+from app.models.balance_transaction import BalanceTransaction
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.verification import Verification
+
+logger = get_logger(__name__)
+
+# Re-scan this far behind the watermark so rows committed late by a long
+# transaction are not missed; recomputing a day twice is harmless
+OVERLAP = timedelta(minutes=5)
+
+# Days recomputed per INSERT ... SELECT
+DAYS_PER_STATEMENT = 100
+
+# pg_try_advisory_lock key held by the worker running a refresh
+REFRESH_LOCK_KEY = 0x616E616C79746963
+
+
+@dataclass(frozen=True)
+class RollupSpec:
+    """How a fact table is derived from its source table."""
+
+    name: str
+    source: Any
+    fact: Any
+    dimensions: Tuple[Tuple[str, Any], ...]
+    measures: Tuple[Tuple[str, Any], ...]
+    # Constant fact columns identifying this spec's rows in a shared table
+    scope: Dict[str, str] = field(default_factory=dict)
+
+
+def _created_day(model):
+    return func.date(model.created_at, type_=Date)
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def _ledger_spec(name: str, model) -> RollupSpec:
+    return RollupSpec(
+        name=name,
+        source=model,
+        fact=LedgerDailyRollup,
+        dimensions=(("type", model.type),),
+        measures=(
+            ("entries", func.count(model.id)),
+            ("amount", func.coalesce(func.sum(model.amount), 0)),
+        ),
+        scope={"source": name},
+    )
+
+
+ROLLUPS: Tuple[RollupSpec, ...] = (
+    RollupSpec(
+        name="verifications",
+        source=Verification,
+        fact=VerificationDailyRollup,
+        dimensions=(("service_name", Verification.service_name),),
+        measures=(
+            ("verifications", func.count(Verification.id)),
+            (
+                "completed",
+                func.sum(case((Verification.status == "completed", 1), else_=0)),
+            ),
+            (
+                "refunded",
+                func.sum(case((Verification.refunded == True, 1), else_=0)),
+            ),
+            ("spend", func.coalesce(func.sum(Verification.cost), 0)),
+            (
+                "refund_amount",
+                func.sum(
+                    case(
+                        (
+                            Verification.refunded == True,
+                            func.coalesce(Verification.refund_amount, 0),
+                        ),
+                        else_=0,
+                    )
+                ),
+            ),
+        ),
+    ),
+    _ledger_spec("transactions", Transaction),
+    _ledger_spec("balance_transactions", BalanceTransaction),
+    RollupSpec(
+        name="users",
+        source=User,
+        fact=UserDailyRollup,
+        dimensions=(),
+        measures=(
+            ("signups", func.count(User.id)),
+            ("funded", func.sum(case((User.credits > 0, 1), else_=0))),
+        ),
+    ),
+)
+
+
+class AnalyticsRollupService:
+    """Keeps the daily rollup tables in step with their sources."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_ready(self) -> bool:
+        """Whether every rollup has been built at least once."""
+        built = self.db.execute(
+            select(func.count()).where(
+                AnalyticsRollupWatermark.rollup.in_([r.name for r in ROLLUPS])
+            )
+        ).scalar()
+        return built == len(ROLLUPS)
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Absorb source changes since each rollup's watermark."""
+        return [self.refresh_rollup(spec) for spec in ROLLUPS]
+
+    def rebuild(self) -> List[Dict[str, Any]]:
+        """Recompute every rollup from scratch."""
+        for spec in ROLLUPS:
+            self.db.execute(
+                delete(AnalyticsRollupWatermark).where(
+                    AnalyticsRollupWatermark.rollup == spec.name
+                )
+            )
+            self.db.execute(delete(spec.fact).where(*self._scope_filter(spec)))
+        self.db.commit()
+        return self.refresh()
+
+    def refresh_rollup(self, spec: RollupSpec) -> Dict[str, Any]:
+        started = time.monotonic()
+        source = spec.source
+        mark = self.db.get(AnalyticsRollupWatermark, spec.name)
+
+        changed = func.coalesce(source.updated_at, source.created_at)
+        since = mark.high_water - OVERLAP if mark and mark.high_water else None
+        if since is None:
+            changed_since = true()
+        else:
+            # Each branch is served by an index; rows from before updated_at
+            # was set on insert only have created_at
+            changed_since = or_(
+                source.updated_at > since,
+                and_(source.updated_at.is_(None), source.created_at > since),
+            )
+
+        high_water = self.db.execute(
+            select(func.max(changed)).where(changed_since)
+        ).scalar()
+        days = sorted(
+            {
+                _as_date(day)
+                for (day,) in self.db.execute(
+                    select(_created_day(source)).where(changed_since).distinct()
+                )
+                if day is not None
+            }
+        )
+
+        for i in range(0, len(days), DAYS_PER_STATEMENT):
+            self._recompute_days(spec, days[i : i + DAYS_PER_STATEMENT])
+
+        now = datetime.now(timezone.utc)
+        if mark is None:
+            mark = AnalyticsRollupWatermark(rollup=spec.name)
+            self.db.add(mark)
+        if high_water is not None:
+            mark.high_water = high_water
+        mark.refreshed_at = now
+        self.db.commit()
+
+        report = {
+            "rollup": spec.name,
+            "days_recomputed": len(days),
+            "high_water": mark.high_water.isoformat() if mark.high_water else None,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        if days:
+            logger.info(f"Analytics rollup refreshed: {report}")
+        return report
+
+    def _scope_filter(self, spec: RollupSpec) -> list:
+        table = spec.fact.__table__
+        return [table.c[column] == value for column, value in spec.scope.items()]
+
+    def _recompute_days(self, spec: RollupSpec, days: List[date]) -> None:
+        source = spec.source
+        table = spec.fact.__table__
+        day = _created_day(source)
+
+        self.db.execute(
+            delete(table).where(table.c.day.in_(days), *self._scope_filter(spec))
+        )
+
+        columns = ["day"]
+        selected = [day.label("day")]
+        for column, value in spec.scope.items():
+            columns.append(column)
+            selected.append(literal(value, type_=String).label(column))
+        for column, expression in spec.dimensions + spec.measures:
+            columns.append(column)
+            selected.append(expression.label(column))
+
+        # The created_at range lets the source's index narrow the scan
+        start = datetime.combine(days[0], datetime.min.time())
+        end = datetime.combine(days[-1] + timedelta(days=1), datetime.min.time())
+        rows = (
+            select(*selected)
+            .where(
+                and_(
+                    source.created_at >= start,
+                    source.created_at < end,
+                    day.in_(days),
+                )
+            )
+            .group_by(day, *[expression for _, expression in spec.dimensions])
+        )
+        self.db.execute(insert(table).from_select(columns, rows))
+
+
+@contextmanager
+def _refresh_lock(engine):
+    """Yields whether this worker may refresh; only PostgreSQL is locked."""
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+    # Session-level lock on a connection of its own, so the refresh's
+    # commits do not release it
+    with engine.connect() as conn:
+        locked = conn.execute(
+            select(func.pg_try_advisory_lock(REFRESH_LOCK_KEY))
+        ).scalar()
+        try:
+            yield locked
+        finally:
+            if locked:
+                conn.execute(select(func.pg_advisory_unlock(REFRESH_LOCK_KEY)))
+
+
+def refresh_analytics_rollups() -> List[Dict[str, Any]]:
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with _refresh_lock(db.get_bind()) as locked:
+            if not locked:
+                logger.debug("Analytics rollup refresh running on another worker")
+                return []
+            return AnalyticsRollupService(db).refresh()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def start_analytics_rollup_loop():
+    """Background loop that keeps the analytics rollups current.
+
+    Intended to be called by the main application lifecycle manager.
+    """
+    interval = get_settings().analytics_rollup_interval_seconds
+    logger.info(f"Analytics rollup refresh every {interval:.0f}s")
+    while True:
+        try:
+            await asyncio.to_thread(refresh_analytics_rollups)
+        except Exception as e:
+            logger.error(f"Analytics rollup refresh failed: {e}")
+        await asyncio.sleep(interval)
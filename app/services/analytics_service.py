@@ -12,8 +12,99 @@ class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
 
+    def _rollups_ready(self) -> bool:
+        from app.services.analytics_rollup_service import AnalyticsRollupService
+
+        return AnalyticsRollupService(self.db).is_ready()
+
     async def get_overview(self):
         """Get dashboard overview metrics"""
+        if self._rollups_ready():
+            totals = self._rollup_overview_totals()
+        else:
+            totals = self._live_overview_totals()
+        (
+            total_users,
+            active_users,
+            total_verifications,
+            success_verifications,
+            total_revenue,
+            total_refunds,
+            monthly_revenue,
+        ) = totals
+
+        success_rate = (
+            (success_verifications / total_verifications * 100)
+            if total_verifications > 0
+            else 0
+        )
+        total_refunds = abs(float(total_refunds))
+
+        # Net Revenue
+        net_revenue = float(total_revenue) - total_refunds
+
+        # Calculate changes (mock for now - would need historical data)
+        return {
+            "users": {"total": total_users, "active": active_users, "change": "+12%"},
+            "verifications": {
+                "total": total_verifications,
+                "success": success_verifications,
+                "rate": round(success_rate, 1),
+            },
+            "revenue": {
+                "gross": float(total_revenue),
+                "refunds": total_refunds,
+                "net": net_revenue,
+                "monthly": float(monthly_revenue),
+                "change": "+8%",
+            },
+        }
+
+    def _rollup_overview_totals(self):
+        """Overview totals from the daily rollups.
+
+        The monthly window is whole days, so it can include up to a day more
+        than the live query's rolling 30 days.
+        """
+        from app.models.analytics_rollup import (
+            LedgerDailyRollup,
+            UserDailyRollup,
+            VerificationDailyRollup,
+        )
+
+        users = self.db.query(
+            func.coalesce(func.sum(UserDailyRollup.signups), 0),
+            func.coalesce(func.sum(UserDailyRollup.funded), 0),
+        ).one()
+        verifications = self.db.query(
+            func.coalesce(func.sum(VerificationDailyRollup.verifications), 0),
+            func.coalesce(func.sum(VerificationDailyRollup.completed), 0),
+        ).one()
+
+        month_start = (datetime.now(timezone.utc) - timedelta(days=30)).date()
+
+        def ledger_total(entry_type, since=None):
+            query = self.db.query(
+                func.coalesce(func.sum(LedgerDailyRollup.amount), 0)
+            ).filter(
+                LedgerDailyRollup.source == "transactions",
+                LedgerDailyRollup.type == entry_type,
+            )
+            if since is not None:
+                query = query.filter(LedgerDailyRollup.day >= since)
+            return query.scalar()
+
+        return (
+            int(users[0]),
+            int(users[1]),
+            int(verifications[0]),
+            int(verifications[1]),
+            ledger_total("credit"),
+            ledger_total("verification_refund"),
+            ledger_total("credit", month_start),
+        )
+
+    def _live_overview_totals(self):
         # Users
         total_users = self.db.query(func.count(User.id)).scalar() or 0
         active_users = (
@@ -28,11 +119,6 @@ class AnalyticsService:
             .scalar()
             or 0
         )
-        success_rate = (
-            (success_verifications / total_verifications * 100)
-            if total_verifications > 0
-            else 0
-        )
 
         # Revenue
         total_revenue = (
@@ -49,10 +135,6 @@ class AnalyticsService:
             .scalar()
             or 0
         )
-        total_refunds = abs(float(total_refunds))
-
-        # Net Revenue
-        net_revenue = float(total_revenue) - total_refunds
 
         # Monthly revenue (last 30 days)
         thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
@@ -68,40 +150,48 @@ class AnalyticsService:
             or 0
         )
 
-        # Calculate changes (mock for now - would need historical data)
-        return {
-            "users": {"total": total_users, "active": active_users, "change": "+12%"},
-            "verifications": {
-                "total": total_verifications,
-                "success": success_verifications,
-                "rate": round(success_rate, 1),
-            },
-            "revenue": {
-                "gross": float(total_revenue),
-                "refunds": total_refunds,
-                "net": net_revenue,
-                "monthly": float(monthly_revenue),
-                "change": "+8%",
-            },
-        }
+        return (
+            total_users,
+            active_users,
+            total_verifications,
+            success_verifications,
+            total_revenue,
+            total_refunds,
+            monthly_revenue,
+        )
 
     async def get_timeseries(self, days: int = 30):
         """Get daily verification timeseries data"""
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
 
-        results = (
-            self.db.query(
-                func.date(Verification.created_at).label("date"),
-                func.count(Verification.id).label("verifications"),
-                func.sum(
-                    case([(Verification.status == "completed", 1)], else_=0)
-                ).label("success"),
+        if self._rollups_ready():
+            from app.models.analytics_rollup import VerificationDailyRollup as R
+
+            results = (
+                self.db.query(
+                    R.day.label("date"),
+                    func.sum(R.verifications).label("verifications"),
+                    func.sum(R.completed).label("success"),
+                )
+                .filter(R.day >= start_date.date())
+                .group_by(R.day)
+                .order_by(R.day)
+                .all()
+            )
+        else:
+            results = (
+                self.db.query(
+                    func.date(Verification.created_at).label("date"),
+                    func.count(Verification.id).label("verifications"),
+                    func.sum(
+                        case((Verification.status == "completed", 1), else_=0)
+                    ).label("success"),
+                )
+                .filter(Verification.created_at >= start_date)
+                .group_by(func.date(Verification.created_at))
+                .order_by("date")
+                .all()
             )
-            .filter(Verification.created_at >= start_date)
-            .group_by(func.date(Verification.created_at))
-            .order_by("date")
-            .all()
-        )
 
         return [
             {
@@ -114,20 +204,25 @@ class AnalyticsService:
 
     async def get_services_stats(self):
         """Get top services by usage"""
+        if self._rollups_ready():
+            from app.models.analytics_rollup import VerificationDailyRollup as R
+
+            count = func.sum(R.verifications)
+            completed = func.sum(R.completed)
+            service_name = R.service_name
+        else:
+            count = func.count(Verification.id)
+            completed = func.sum(case((Verification.status == "completed", 1), else_=0))
+            service_name = Verification.service_name
+
         results = (
             self.db.query(
-                Verification.service_name,
-                func.count(Verification.id).label("count"),
-                (
-                    func.sum(
-                        func.case([(Verification.status == "completed", 1)], else_=0)
-                    )
-                    * 100.0
-                    / func.count(Verification.id)
-                ).label("success_rate"),
+                service_name.label("service_name"),
+                count.label("count"),
+                (completed * 100.0 / count).label("success_rate"),
             )
-            .group_by(Verification.service_name)
-            .order_by(func.count(Verification.id).desc())
+            .group_by(service_name)
+            .order_by(count.desc())
             .limit(10)
             .all()
         )
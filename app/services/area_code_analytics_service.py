@@ -0,0 +1,431 @@
+"""Purchase-outcome breakdowns for the admin area-code analytics pages.
+
+Each report is a handful of GROUP BY queries over the window, so only the
+grouped rows (area codes, carriers, providers) leave the database rather
+than every outcome. Reports are cached per worker keyed by report and window
+and stamped with ``MAX(purchase_outcomes.id)``: a new outcome invalidates
+them on the next request, and in-place updates (SMS receipt, refunds) show
+up once the entry expires after ``area_code_analytics_cache_seconds``.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.local_cache import TTLCache
+from app.models.purchase_outcome import PurchaseOutcome
+from app.services.area_code_geo import NANPA_DATA
+
+# Rough approximation of total US area codes
+US_AREA_CODES = 350
+
+_reports = TTLCache(maxsize=64, ttl=get_settings().area_code_analytics_cache_seconds)
+
+
+def _blank(column):
+    """``column`` with empty strings read as NULL, like ``value or default``."""
+    return func.nullif(column, "")
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _sum_if(condition, value):
+    return func.coalesce(
+        func.sum(case((condition, func.coalesce(value, 0.0)), else_=0.0)), 0.0
+    )
+
+
+def _sms_counts():
+    sms = PurchaseOutcome.sms_received
+    return (
+        func.count(sms).label("sms_total"),
+        _count_if(sms.is_(True)).label("sms_success"),
+    )
+
+
+def _rate(part: float, whole: float) -> float:
+    return part / whole if whole > 0 else 0.0
+
+
+def _cutoff(days: int) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def _watermark(db: Session) -> Optional[int]:
+    return db.query(func.max(PurchaseOutcome.id)).scalar()
+
+
+def _cached(
+    db: Session,
+    report: str,
+    days: Optional[int],
+    build: Callable[[Session, Optional[int]], Dict[str, Any]],
+) -> Dict[str, Any]:
+    watermark = _watermark(db)
+    entry = _reports.get((report, days))
+    if entry is not None and entry[0] == watermark:
+        return entry[1]
+    result = build(db, days)
+    _reports.set((report, days), (watermark, result))
+    return result
+
+
+def clear_cache() -> None:
+    _reports.clear()
+
+
+def _area_codes(db: Session, days: int) -> Dict[str, Any]:
+    window = PurchaseOutcome.created_at >= _cutoff(days)
+    requested = _blank(PurchaseOutcome.requested_code)
+
+    total, matched, known_codes = (
+        db.query(
+            func.count(PurchaseOutcome.id),
+            _count_if(PurchaseOutcome.matched.is_(True)),
+            func.count(
+                func.distinct(
+                    func.coalesce(requested, _blank(PurchaseOutcome.assigned_code))
+                )
+            ),
+        )
+        .filter(window)
+        .one()
+    )
+
+    if not total:
+        return {
+            "period": f"{days}d",
+            "total_purchases": 0,
+            "match_rate": 0.0,
+            "top_requested": [],
+            "worst_performing": [],
+            "data_coverage": 0.0,
+        }
+
+    requests = func.count(PurchaseOutcome.id)
+    rows = (
+        db.query(
+            requested.label("area_code"),
+            PurchaseOutcome.service,
+            requests.label("requests"),
+            _count_if(
+                PurchaseOutcome.requested_code == PurchaseOutcome.assigned_code
+            ).label("successes"),
+        )
+        .filter(window, requested.isnot(None))
+        .group_by(requested, PurchaseOutcome.service)
+        .order_by(requests.desc(), requested, PurchaseOutcome.service)
+        .all()
+    )
+
+    results = [
+        {
+            "area_code": row.area_code,
+            "service": row.service,
+            "requests": row.requests,
+            "success_rate": round(row.successes / row.requests, 2),
+        }
+        for row in rows
+    ]
+
+    top_requested = [r for r in results if r["requests"] >= 5][:10]
+    if not top_requested:
+        top_requested = results[:10]
+
+    worst_performing = sorted(
+        [r for r in results if r["requests"] >= 5], key=lambda x: x["success_rate"]
+    )[:10]
+
+    return {
+        "period": f"{days}d",
+        "total_purchases": total,
+        "match_rate": round(matched / total, 2),
+        "top_requested": top_requested,
+        "worst_performing": worst_performing,
+        "data_coverage": round(known_codes / US_AREA_CODES, 2),
+    }
+
+
+def _carriers(db: Session, days: int) -> Dict[str, Any]:
+    carrier = func.coalesce(_blank(PurchaseOutcome.assigned_carrier), "unknown")
+    rows = (
+        db.query(
+            PurchaseOutcome.service,
+            carrier.label("carrier"),
+            func.count(PurchaseOutcome.id).label("outcomes"),
+            *_sms_counts(),
+            _count_if(PurchaseOutcome.carrier_type == "voip").label("voip"),
+            _count_if(PurchaseOutcome.carrier_type == "landline").label("landline"),
+        )
+        .filter(PurchaseOutcome.created_at >= _cutoff(days))
+        .group_by(PurchaseOutcome.service, carrier)
+        .all()
+    )
+
+    if not rows:
+        return {
+            "period": f"{days}d",
+            "carrier_distribution": [],
+            "carrier_by_service": [],
+            "voip_rate": 0.0,
+            "landline_rate": 0.0,
+        }
+
+    total = sum(row.outcomes for row in rows)
+    carrier_stats: Dict[str, Dict[str, int]] = {}
+    by_service = []
+    for row in rows:
+        stats = carrier_stats.setdefault(
+            row.carrier, {"count": 0, "sms_total": 0, "sms_success": 0}
+        )
+        stats["count"] += row.outcomes
+        stats["sms_total"] += row.sms_total
+        stats["sms_success"] += row.sms_success
+        by_service.append(
+            {
+                "service": row.service,
+                "carrier": row.carrier,
+                "count": row.outcomes,
+                "sms_delivery_rate": round(_rate(row.sms_success, row.sms_total), 2),
+            }
+        )
+
+    distribution = [
+        {
+            "carrier": c,
+            "count": stats["count"],
+            "pct": round(stats["count"] / total, 2),
+            "sms_delivery_rate": round(
+                _rate(stats["sms_success"], stats["sms_total"]), 2
+            ),
+        }
+        for c, stats in carrier_stats.items()
+        if not (c == "unknown" and stats["count"] < 5)
+    ]
+
+    distribution.sort(key=lambda x: x["count"], reverse=True)
+    by_service.sort(key=lambda x: x["count"], reverse=True)
+
+    return {
+        "period": f"{days}d",
+        "carrier_distribution": distribution[:15],
+        "carrier_by_service": by_service[:20],
+        "voip_rate": round(sum(row.voip for row in rows) / total, 2),
+        "landline_rate": round(sum(row.landline for row in rows) / total, 2),
+    }
+
+
+def _geography(db: Session, days: int) -> Dict[str, Any]:
+    code = func.coalesce(
+        _blank(PurchaseOutcome.assigned_code), _blank(PurchaseOutcome.requested_code)
+    )
+    rows = (
+        db.query(
+            code.label("area_code"),
+            func.count(PurchaseOutcome.id).label("purchases"),
+            *_sms_counts(),
+        )
+        .filter(PurchaseOutcome.created_at >= _cutoff(days), code.isnot(None))
+        .group_by(code)
+        .all()
+    )
+
+    city_stats: Dict[str, Dict[str, Any]] = {}
+    state_stats: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        if row.area_code not in NANPA_DATA:
+            continue
+        city = NANPA_DATA[row.area_code].get("major_city", "Unknown")
+        state = NANPA_DATA[row.area_code].get("state", "Unknown")
+
+        stats = city_stats.setdefault(
+            f"{city}, {state}",
+            {
+                "city": city,
+                "state": state,
+                "purchases": 0,
+                "sms_success": 0,
+                "sms_total": 0,
+            },
+        )
+        stats["purchases"] += row.purchases
+        stats["sms_total"] += row.sms_total
+        stats["sms_success"] += row.sms_success
+
+        state_entry = state_stats.setdefault(
+            state, {"state": state, "purchases": 0, "unique_area_codes": 0}
+        )
+        state_entry["purchases"] += row.purchases
+        state_entry["unique_area_codes"] += 1
+
+    top_cities = [
+        {
+            "city": st["city"],
+            "state": st["state"],
+            "purchases": st["purchases"],
+            "sms_delivery_rate": round(_rate(st["sms_success"], st["sms_total"]), 2),
+        }
+        for st in city_stats.values()
+    ]
+    top_cities.sort(key=lambda x: x["purchases"], reverse=True)
+
+    top_states = sorted(
+        state_stats.values(), key=lambda x: x["purchases"], reverse=True
+    )
+
+    return {
+        "period": f"{days}d",
+        "top_cities": top_cities[:15],
+        "top_states": top_states[:15],
+    }
+
+
+def _learning(db: Session, days: Optional[int] = None) -> Dict[str, Any]:
+    cutoff = _cutoff(7)
+    code = func.coalesce(
+        _blank(PurchaseOutcome.assigned_code), _blank(PurchaseOutcome.requested_code)
+    )
+
+    total_purchases, alternative_selections = db.query(
+        func.count(PurchaseOutcome.id),
+        _count_if(PurchaseOutcome.selected_from_alternatives.is_(True)),
+    ).one()
+
+    # Every (service, area code) pair with the first time it was bought
+    combinations = (
+        db.query(func.min(PurchaseOutcome.created_at).label("first_seen"))
+        .filter(code.isnot(None))
+        .group_by(PurchaseOutcome.service, code)
+        .subquery()
+    )
+    tracked, new_this_week = (
+        db.query(func.count(), _count_if(combinations.c.first_seen >= cutoff))
+        .select_from(combinations)
+        .one()
+    )
+
+    return {
+        "total_combinations_tracked": tracked,
+        "new_combinations_7d": new_this_week,
+        "alternative_selections_total": alternative_selections,
+        "alternative_selection_rate": round(
+            _rate(alternative_selections, total_purchases), 2
+        ),
+        "total_purchases": total_purchases,
+        "message": f"System has purchase data for {tracked} unique area-code/service combinations. Added {new_this_week} new combinations this week.",
+    }
+
+
+def _providers(db: Session, days: int) -> Dict[str, Any]:
+    window = PurchaseOutcome.created_at >= _cutoff(days)
+    provider = func.coalesce(_blank(PurchaseOutcome.provider), "unknown")
+    refunded = PurchaseOutcome.is_refunded.is_(True)
+    recouped = and_(refunded, PurchaseOutcome.provider_refunded.is_(True))
+    leaked = and_(
+        refunded,
+        or_(
+            PurchaseOutcome.provider_refunded.is_(None),
+            PurchaseOutcome.provider_refunded.is_(False),
+        ),
+    )
+    timed = and_(
+        PurchaseOutcome.latency_seconds.isnot(None),
+        PurchaseOutcome.latency_seconds != 0,
+    )
+
+    rows = (
+        db.query(
+            provider.label("provider"),
+            func.count(PurchaseOutcome.id).label("total"),
+            _count_if(PurchaseOutcome.sms_received.is_(True)).label("sms_success"),
+            _count_if(refunded).label("refunds"),
+            _sum_if(refunded, PurchaseOutcome.refund_amount).label("refund_amount"),
+            _count_if(recouped).label("recouped"),
+            _sum_if(leaked, PurchaseOutcome.provider_cost).label("leakage"),
+            func.coalesce(func.sum(PurchaseOutcome.provider_cost), 0.0).label("cost"),
+            func.coalesce(func.sum(PurchaseOutcome.user_price), 0.0).label("revenue"),
+            _sum_if(timed, PurchaseOutcome.latency_seconds).label("latency"),
+            _count_if(timed).label("timed"),
+        )
+        .filter(window)
+        .group_by(provider)
+        .all()
+    )
+
+    if not rows:
+        return {"period": f"{days}d", "provider_performance": []}
+
+    category = func.coalesce(_blank(PurchaseOutcome.outcome_category), "UNKNOWN")
+    outcomes: Dict[str, Dict[str, int]] = {}
+    for name, cat, count in (
+        db.query(provider, category, func.count(PurchaseOutcome.id))
+        .filter(window)
+        .group_by(provider, category)
+        .all()
+    ):
+        outcomes.setdefault(name, {})[cat] = count
+
+    performance = []
+    for row in rows:
+        # Gross profit = Revenue - Raw Provider Cost
+        # (Before refunds are deducted from revenue)
+        gross_profit = row.revenue - row.cost
+        # Net profit = Revenue - Raw Provider Cost - Refund Amount
+        net_profit = gross_profit - row.refund_amount
+        # ROI = (Gross Profit / Total Cost) * 100
+        roi = _rate(gross_profit, row.cost) * 100
+
+        performance.append(
+            {
+                "provider": row.provider,
+                "total_attempts": row.total,
+                "success_rate": round(_rate(row.sms_success, row.total), 2),
+                "refund_rate": round(_rate(row.refunds, row.total), 2),
+                "avg_latency": round(_rate(row.latency, row.timed), 1),
+                "financials": {
+                    "total_cost": round(row.cost, 2),
+                    "total_revenue": round(row.revenue, 2),
+                    "gross_profit": round(gross_profit, 2),
+                    "net_profit": round(net_profit, 2),
+                    "roi_pct": round(roi, 1),
+                    "margin_leakage": round(row.leakage, 2),
+                    "recoup_rate": (
+                        round(row.recouped / row.refunds, 2) if row.refunds else 1.0
+                    ),
+                },
+                "outcome_distribution": outcomes.get(row.provider, {}),
+            }
+        )
+
+    performance.sort(key=lambda x: x["total_attempts"], reverse=True)
+
+    return {
+        "period": f"{days}d",
+        "provider_performance": performance,
+        "total_attempts_period": sum(row.total for row in rows),
+    }
+
+
+def get_area_code_report(db: Session, days: int) -> Dict[str, Any]:
+    return _cached(db, "area_codes", days, _area_codes)
+
+
+def get_carrier_report(db: Session, days: int) -> Dict[str, Any]:
+    return _cached(db, "carriers", days, _carriers)
+
+
+def get_geography_report(db: Session, days: int) -> Dict[str, Any]:
+    return _cached(db, "geography", days, _geography)
+
+
+def get_learning_report(db: Session) -> Dict[str, Any]:
+    return _cached(db, "learning", None, _learning)
+
+
+def get_provider_report(db: Session, days: int) -> Dict[str, Any]:
+    return _cached(db, "providers", days, _providers)
@@ -1,7 +1,21 @@
+import bisect
+import hashlib
 import json
 import math
 import os
-from typing import Any, Dict, List
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+_ASSETS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets"
+)
+NANPA_PATH = os.path.join(_ASSETS_DIR, "nanpa_index.json")
+PROXIMITY_PATH = os.path.join(_ASSETS_DIR, "nanpa_proximity.json")
+
+NEARBY_MILES = 50
+TIER_ORDER = {"same_city": 0, "nearby": 1, "same_state": 2}
+# Two codes can be no closer than their latitude difference along a meridian
+_MILES_PER_LAT_DEGREE = 3956 * math.pi / 180
 
 
 # --- INSTITUTIONAL ASSET LOADING ---
@@ -33,12 +47,8 @@ def _load_nanpa_data() -> Dict[str, Dict[str, Any]]:
     }
 
     try:
-        # Resolve absolute path relative to this service
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        asset_path = os.path.join(base_dir, "assets", "nanpa_index.json")
-
-        if os.path.exists(asset_path):
-            with open(asset_path, "r") as f:
+        if os.path.exists(NANPA_PATH):
+            with open(NANPA_PATH, "r") as f:
                 return json.load(f)
         return fallback
     except Exception:
@@ -66,14 +76,140 @@ def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return c * r
 
 
+def _fingerprint(data: Dict[str, Dict[str, Any]]) -> str:
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ProximityIndex:
+    """Area codes grouped by metro and state, and each code's ranked neighbours.
+
+    A code's neighbours are every other code that is in its metro
+    (``same_city``), within ``NEARBY_MILES`` (``nearby``) or in its state
+    (``same_state``), ordered by tier, then distance, then index order; the
+    first ``k`` are the ``k`` best alternatives.
+    """
+
+    def __init__(
+        self,
+        fingerprint: str,
+        metros: Dict[str, List[str]],
+        states: Dict[str, List[str]],
+        neighbors: Dict[str, List[Tuple[str, str, float]]],
+    ):
+        self.fingerprint = fingerprint
+        self.metros = metros
+        self.states = states
+        self.neighbors = neighbors
+
+    @classmethod
+    def build(cls, data: Dict[str, Dict[str, Any]]) -> "ProximityIndex":
+        metros: Dict[str, List[str]] = defaultdict(list)
+        states: Dict[str, List[str]] = defaultdict(list)
+        for code, entry in data.items():
+            metros[entry["metro"]].append(code)
+            states[entry["state"]].append(code)
+
+        # Codes sorted by latitude: only those within NEARBY_MILES of latitude
+        # can be within NEARBY_MILES
+        position = {code: i for i, code in enumerate(data)}
+        by_lat = sorted(data, key=lambda code: data[code]["lat"])
+        lats = [data[code]["lat"] for code in by_lat]
+        span = NEARBY_MILES / _MILES_PER_LAT_DEGREE
+
+        neighbors = {}
+        for code, entry in data.items():
+            lo = bisect.bisect_left(lats, entry["lat"] - span)
+            hi = bisect.bisect_right(lats, entry["lat"] + span)
+            candidates = set(by_lat[lo:hi])
+            candidates.update(metros[entry["metro"]], states[entry["state"]])
+            candidates.discard(code)
+
+            ranked = []
+            for other in candidates:
+                other_entry = data[other]
+                dist = _haversine(
+                    entry["lat"], entry["lng"], other_entry["lat"], other_entry["lng"]
+                )
+                if other_entry["metro"] == entry["metro"]:
+                    tier = "same_city"
+                elif dist < NEARBY_MILES:
+                    tier = "nearby"
+                elif other_entry["state"] == entry["state"]:
+                    tier = "same_state"
+                else:
+                    continue
+                ranked.append((TIER_ORDER[tier], dist, position[other], other, tier))
+            ranked.sort()
+            neighbors[code] = [
+                (other, tier, dist) for _, dist, _, other, tier in ranked
+            ]
+
+        return cls(_fingerprint(data), dict(metros), dict(states), neighbors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "nearby_miles": NEARBY_MILES,
+            "metros": self.metros,
+            "states": self.states,
+            "neighbors": {
+                code: [list(neighbor) for neighbor in ranked]
+                for code, ranked in self.neighbors.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "ProximityIndex":
+        return cls(
+            payload["fingerprint"],
+            payload["metros"],
+            payload["states"],
+            {
+                code: [tuple(neighbor) for neighbor in ranked]
+                for code, ranked in payload["neighbors"].items()
+            },
+        )
+
+
+def _load_proximity(data: Dict[str, Dict[str, Any]]) -> ProximityIndex:
+    """The serialized index when it was built from ``data``, else a fresh one."""
+    try:
+        with open(PROXIMITY_PATH, "r") as f:
+            payload = json.load(f)
+        if (
+            payload.get("fingerprint") == _fingerprint(data)
+            and payload.get("nearby_miles") == NEARBY_MILES
+        ):
+            return ProximityIndex.from_dict(payload)
+    except (OSError, ValueError, KeyError):
+        pass
+    return ProximityIndex.build(data)
+
+
+def write_proximity_index(path: Optional[str] = None) -> ProximityIndex:
+    """Rebuild the serialized index; run after editing ``nanpa_index.json``."""
+    index = ProximityIndex.build(NANPA_DATA)
+    with open(path or PROXIMITY_PATH, "w") as f:
+        json.dump(index.to_dict(), f, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
+    return index
+
+
+PROXIMITY = _load_proximity(NANPA_DATA)
+
+
 def get_metro_codes(area_code: str) -> List[str]:
     """Returns all area codes in the same metro area as the provided area code."""
     if area_code not in NANPA_DATA:
         return []
 
-    target_metro = NANPA_DATA[area_code]["metro"]
-    # Return all area codes matching the metro
-    return [code for code, data in NANPA_DATA.items() if data["metro"] == target_metro]
+    return list(PROXIMITY.metros.get(NANPA_DATA[area_code]["metro"], []))
+
+
+def get_state_codes(state: str) -> List[str]:
+    """Returns all area codes in a state."""
+    return list(PROXIMITY.states.get(state, []))
 
 
 def filter_supported(area_codes: List[str], supported_list: List[str]) -> List[str]:
@@ -99,47 +235,19 @@ def get_nearby(area_code: str, max_results: int = 8) -> List[Dict[str, Any]]:
     """
     Returns nearby area codes up to max_results, tiered by same_city, nearby (<50mi), same_state (>50mi).
     """
-    if area_code not in NANPA_DATA:
-        return []
-
-    target_data = NANPA_DATA[area_code]
-    target_lat = target_data["lat"]
-    target_lng = target_data["lng"]
-    target_metro = target_data["metro"]
-    target_state = target_data["state"]
-
     results = []
-
-    for code, data in NANPA_DATA.items():
-        if code == area_code:
-            continue
-
-        dist = _haversine(target_lat, target_lng, data["lat"], data["lng"])
-
-        tier = None
-        if data["metro"] == target_metro:
-            tier = "same_city"
-        elif dist < 50:
-            tier = "nearby"
-        elif data["state"] == target_state:
-            tier = "same_state"
-
-        if tier:
-            results.append(
-                {
-                    "area_code": code,
-                    "city": data["major_city"],
-                    "state": data["state"],
-                    "proximity": tier,
-                    "distance": dist,
-                }
-            )
-
-    # Sort by tier priority then by distance
-    tier_order = {"same_city": 0, "nearby": 1, "same_state": 2}
-    results.sort(key=lambda x: (tier_order[x["proximity"]], x["distance"]))
-
-    return results[:max_results]
+    for code, tier, dist in PROXIMITY.neighbors.get(area_code, [])[:max_results]:
+        data = NANPA_DATA[code]
+        results.append(
+            {
+                "area_code": code,
+                "city": data["major_city"],
+                "state": data["state"],
+                "proximity": tier,
+                "distance": dist,
+            }
+        )
+    return results
 
 
 async def get_ranked_alternatives(
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.core.token_cache import verified_tokens
 from app.models.api_key import APIKey
 from app.models.user import User
 
@@ -104,8 +105,18 @@ class AuthService:
                 token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
             )
 
-            # Check token blacklist (logout revocation)
+            # Support both 'sub' and 'user_id' for backwards compatibility
+            user_id = payload.get("sub") or payload.get("user_id")
+            if not user_id:
+                return None
+
+            # Already checked against revocations and the users table
             jti = payload.get("jti")
+            if jti and verified_tokens.get(jti) == str(user_id):
+                return user_id
+
+            # Check token blacklist (logout revocation)
+            revocation_checked = False
             if jti:
                 try:
                     redis = _get_redis()
@@ -113,29 +124,22 @@ class AuthService:
                         logger.debug("Token revoked", extra={"jti": jti})
                         return None
                     # Check user-level logout-all block
-                    user_id_check = payload.get("sub") or payload.get("user_id")
-                    if user_id_check and redis.exists(f"logout_all:{user_id_check}"):
-                        iat = payload.get("iat", 0)
-                        block_set_at = redis.object(
-                            "idletime", f"logout_all:{user_id_check}"
-                        )
+                    if redis.exists(f"logout_all:{user_id}"):
                         # Simpler: just block all — user must re-login
                         logger.debug(
-                            "User logout-all active", extra={"user_id": user_id_check}
+                            "User logout-all active", extra={"user_id": user_id}
                         )
                         return None
+                    revocation_checked = True
                 except Exception as e:
                     logger.warning(f"Blacklist check failed (allowing token): {e}")
 
-            # Support both 'sub' and 'user_id' for backwards compatibility
-            user_id = payload.get("sub") or payload.get("user_id")
-            if not user_id:
-                return None
-
             user = self.db.query(User).filter(User.id == user_id).first()
             if not user:
                 return None
 
+            if revocation_checked:
+                verified_tokens.add(jti, user_id, payload.get("exp"))
             return user_id
 
         except jwt.ExpiredSignatureError:
@@ -167,6 +171,7 @@ class AuthService:
             )
             redis = _get_redis()
             redis.setex(f"blacklist:jti:{jti}", ttl, "1")
+            verified_tokens.publish_revocation(redis, jti=jti)
             logger.info("Token revoked", extra={"jti": jti})
             return True
         except Exception as e:
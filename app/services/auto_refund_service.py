@@ -18,6 +18,15 @@ from app.services.notification_dispatcher import NotificationDispatcher
 logger = get_logger(__name__)
 
 
+def refund_display_reason(reason: str) -> str:
+    """Customer-facing label for a refund reason."""
+    if reason == "sms_timeout":
+        return "Carrier Delivery Failure"
+    if reason == "area_code_mismatch":
+        return "Area Code Mismatch"
+    return reason.replace("_", " ").title()
+
+
 class AutoRefundService:
     """Automatic refund service for failed verifications."""
 
@@ -110,11 +119,7 @@ class AutoRefundService:
                 logger.error(f"Failed to sync refund to PurchaseOutcome: {e}")
 
             # Phase 11 & 12: Institutional Transparency & Financial Integrity
-            display_reason = reason.replace("_", " ").title()
-            if reason == "sms_timeout":
-                display_reason = "Carrier Delivery Failure"
-            elif reason == "area_code_mismatch":
-                display_reason = "Area Code Mismatch"
+            display_reason = refund_display_reason(reason)
 
             import uuid
 
@@ -204,37 +209,14 @@ class AutoRefundService:
                 f"Reason={reason}, Balance: ${old_balance:.2f} → ${new_balance:.2f}"
             )
 
-            try:
-                notification_dispatcher = NotificationDispatcher(self.db)
-                if reason == "timeout":
-                    await notification_dispatcher.notify_verification_timeout(
-                        user_id=verification.user_id,
-                        verification_id=verification_id,
-                        service=verification.service_name,
-                        refund_amount=refund_amount,
-                    )
-                elif reason == "cancelled":
-                    await notification_dispatcher.notify_verification_cancelled(
-                        user_id=verification.user_id,
-                        verification_id=verification_id,
-                        service=verification.service_name,
-                        refund_amount=refund_amount,
-                        new_balance=new_balance,
-                    )
-                else:
-                    await notification_dispatcher.notify_verification_failed(
-                        user_id=verification.user_id,
-                        verification_id=verification_id,
-                        service=verification.service_name,
-                        reason=f"Refunded: {reason}",
-                    )
-
-                logger.info(f"✓ Refund notification sent to {verification.user_id}")
-            except Exception as e:
-                logger.error(
-                    f"🚨 CRITICAL: Refund notification failed for {verification.user_id}: {e}",
-                    exc_info=True,
-                )
+            await self.notify_refund(
+                user_id=verification.user_id,
+                verification_id=verification_id,
+                service=verification.service_name,
+                refund_amount=refund_amount,
+                reason=reason,
+                new_balance=new_balance,
+            )
 
             return {
                 "verification_id": verification_id,
@@ -277,6 +259,48 @@ class AutoRefundService:
                 "context": error_context,
             }
 
+    async def notify_refund(
+        self,
+        user_id: str,
+        verification_id: str,
+        service: str,
+        refund_amount: float,
+        reason: str,
+        new_balance: float,
+    ) -> None:
+        """Tell the user their verification was refunded."""
+        try:
+            notification_dispatcher = NotificationDispatcher(self.db)
+            if reason == "timeout":
+                await notification_dispatcher.notify_verification_timeout(
+                    user_id=user_id,
+                    verification_id=verification_id,
+                    service=service,
+                    refund_amount=refund_amount,
+                )
+            elif reason == "cancelled":
+                await notification_dispatcher.notify_verification_cancelled(
+                    user_id=user_id,
+                    verification_id=verification_id,
+                    service=service,
+                    refund_amount=refund_amount,
+                    new_balance=new_balance,
+                )
+            else:
+                await notification_dispatcher.notify_verification_failed(
+                    user_id=user_id,
+                    verification_id=verification_id,
+                    service=service,
+                    reason=f"Refunded: {reason}",
+                )
+
+            logger.info(f"✓ Refund notification sent to {user_id}")
+        except Exception as e:
+            logger.error(
+                f"🚨 CRITICAL: Refund notification failed for {user_id}: {e}",
+                exc_info=True,
+            )
+
     def reconcile_unrefunded_verifications(
         self, days_back: int = 30, dry_run: bool = True
     ) -> dict:
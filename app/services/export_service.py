@@ -0,0 +1,374 @@
+"""Streaming exports of admin datasets.
+
+Rows are read with ``yield_per`` (a server-side cursor on PostgreSQL) and
+encoded one chunk at a time as CSV, JSON, NDJSON or Parquet, so memory stays
+flat however many rows match. An export is either streamed straight into the
+response or run as a background job that writes into the local artifact store
+under ``settings.export_dir``. A job's ``<export_id>.json`` sidecar records
+its progress, so any worker on the host can report on it and serve the file.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import Boolean, DateTime, Integer, Numeric, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.user import User
+from app.models.verification import Verification
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# format -> (media type, file extension)
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "csv": ("text/csv", "csv"),
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+_EXPORT_ID = re.compile(r"[a-z_]+_[0-9a-f]{32}")
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    name: str
+    kind: str = "str"  # str, int, float, bool or datetime
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """A named SELECT; its selected columns become the export columns."""
+
+    name: str
+    statement: Any
+
+    @property
+    def columns(self) -> List[ExportColumn]:
+        return [
+            ExportColumn(column.key, _column_kind(column.type))
+            for column in self.statement.selected_columns
+        ]
+
+
+def _column_kind(sql_type) -> str:
+    if isinstance(sql_type, Boolean):
+        return "bool"
+    if isinstance(sql_type, Integer):
+        return "int"
+    if isinstance(sql_type, Numeric):
+        return "float"
+    if isinstance(sql_type, DateTime):
+        return "datetime"
+    return "str"
+
+
+def users_dataset() -> ExportDataset:
+    return ExportDataset(
+        "users",
+        select(
+            User.id,
+            User.email,
+            User.subscription_tier,
+            User.credits,
+            User.is_admin,
+            User.email_verified,
+            User.provider,
+            User.created_at,
+            User.last_login,
+        ).order_by(User.created_at, User.id),
+    )
+
+
+def verifications_dataset(days: int) -> ExportDataset:
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return ExportDataset(
+        "verifications",
+        select(
+            Verification.id,
+            Verification.user_id,
+            Verification.service_name,
+            Verification.country,
+            Verification.provider,
+            Verification.status,
+            Verification.cost,
+            Verification.refunded,
+            Verification.refund_amount,
+            Verification.created_at,
+            Verification.completed_at,
+        )
+        .where(Verification.created_at >= since)
+        .order_by(Verification.created_at, Verification.id),
+    )
+
+
+def iter_chunks(
+    db: Session, statement, chunk_size: Optional[int] = None
+) -> Iterator[List[Tuple]]:
+    """Run ``statement`` and yield its rows ``chunk_size`` at a time."""
+    chunk_size = chunk_size or get_settings().export_chunk_size
+    result = db.execute(statement.execution_options(yield_per=chunk_size))
+    try:
+        for partition in result.partitions():
+            yield [
+                tuple(float(v) if isinstance(v, Decimal) else v for v in row)
+                for row in partition
+            ]
+    finally:
+        result.close()
+
+
+def _text(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def encode_csv(
+    columns: List[ExportColumn],
+    chunks: Iterable[List[Tuple]],
+    header: Optional[List[str]] = None,
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header or [column.name for column in columns])
+    for chunk in chunks:
+        writer.writerows([_text(value) for value in row] for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode_json(
+    columns: List[ExportColumn], chunks: Iterable[List[Tuple]], lines: bool = False
+) -> Iterator[bytes]:
+    """A JSON array of objects, or one object per line when ``lines``."""
+    names = [column.name for column in columns]
+    separator = "\n" if lines else ","
+    first = True
+    if not lines:
+        yield b"["
+    for chunk in chunks:
+        body = separator.join(
+            json.dumps(dict(zip(names, row)), default=_json_default) for row in chunk
+        )
+        if lines:
+            body += "\n"
+        elif not first:
+            body = "," + body
+        first = False
+        yield body.encode()
+    if not lines:
+        yield b"]"
+
+
+class _ByteSink:
+    """Write-only file object whose contents are drained as they arrive."""
+
+    def __init__(self):
+        self.closed = False
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def encode_parquet(
+    columns: List[ExportColumn], chunks: Iterable[List[Tuple]]
+) -> Iterator[bytes]:
+    """One Parquet row group per chunk, emitted as soon as it is written."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    arrow_types = {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }
+    schema = pa.schema([(column.name, arrow_types[column.kind]) for column in columns])
+    sink = _ByteSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in chunks:
+            values = list(zip(*chunk))
+            writer.write_table(
+                pa.Table.from_arrays(
+                    [
+                        pa.array(values[i], type=field.type)
+                        for i, field in enumerate(schema)
+                    ],
+                    schema=schema,
+                )
+            )
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def encode(
+    fmt: str, columns: List[ExportColumn], chunks: Iterable[List[Tuple]]
+) -> Iterator[bytes]:
+    if fmt == "csv":
+        return encode_csv(columns, chunks)
+    if fmt == "json":
+        return encode_json(columns, chunks)
+    if fmt == "ndjson":
+        return encode_json(columns, chunks, lines=True)
+    if fmt == "parquet":
+        return encode_parquet(columns, chunks)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def stream_export(db: Session, dataset: ExportDataset, fmt: str) -> Iterator[bytes]:
+    """Encoded bytes of ``dataset``, produced chunk by chunk."""
+    return encode(fmt, dataset.columns, iter_chunks(db, dataset.statement))
+
+
+class ExportStore:
+    """Background export jobs and their artifacts in one local directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _path(self, export_id: str, suffix: str) -> str:
+        return os.path.join(self.root, f"{export_id}.{suffix}")
+
+    def get(self, export_id: str) -> Optional[Dict[str, Any]]:
+        """The job's progress record, or None for an unknown id."""
+        if not _EXPORT_ID.fullmatch(export_id):
+            return None
+        try:
+            with open(self._path(export_id, "json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def artifact_path(self, job: Dict[str, Any]) -> str:
+        return self._path(job["export_id"], FORMATS[job["format"]][1])
+
+    def start(self, dataset: ExportDataset, fmt: str) -> Dict[str, Any]:
+        """Queue an export on a worker thread and return its job record."""
+        os.makedirs(self.root, exist_ok=True)
+        job = {
+            "export_id": f"{dataset.name}_{uuid.uuid4().hex}",
+            "dataset": dataset.name,
+            "format": fmt,
+            "status": "queued",
+            "total_rows": None,
+            "rows_written": 0,
+            "bytes_written": 0,
+            "error": None,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+        }
+        self._save(job)
+        task = asyncio.create_task(asyncio.to_thread(self.run, job, dataset))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def run(self, job: Dict[str, Any], dataset: ExportDataset) -> Dict[str, Any]:
+        """Write the artifact, updating the job record after every chunk."""
+        from app.core.database import SessionLocal
+
+        path = self.artifact_path(job)
+        partial = f"{path}.part"
+        db = SessionLocal()
+        try:
+            job["status"] = "running"
+            job["total_rows"] = db.execute(
+                select(func.count()).select_from(dataset.statement.subquery())
+            ).scalar()
+            self._save(job)
+
+            def counted(chunks):
+                for chunk in chunks:
+                    yield chunk
+                    job["rows_written"] += len(chunk)
+
+            with open(partial, "wb") as f:
+                for data in encode(
+                    job["format"],
+                    dataset.columns,
+                    counted(iter_chunks(db, dataset.statement)),
+                ):
+                    f.write(data)
+                    job["bytes_written"] += len(data)
+                    self._save(job)
+            os.replace(partial, path)
+            job["status"] = "completed"
+        except Exception as e:
+            logger.error(f"Export {job['export_id']} failed: {e}", exc_info=True)
+            job["status"] = "failed"
+            job["error"] = str(e)
+            if os.path.exists(partial):
+                os.remove(partial)
+        finally:
+            db.close()
+            job["finished_at"] = datetime.now(timezone.utc).isoformat()
+            self._save(job)
+        return job
+
+    def _save(self, job: Dict[str, Any]) -> None:
+        path = self._path(job["export_id"], "json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(job, f)
+        os.replace(f"{path}.tmp", path)
+
+
+export_store = ExportStore(get_settings().export_dir)
@@ -1,11 +1,9 @@
 """Financial statements generation service."""
 
-import csv
-import io
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 
 from app.core.logging import get_logger
@@ -19,6 +17,7 @@ from app.models.financial_statement import (
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.models.verification import Verification
+from app.services.export_service import encode_csv, iter_chunks
 
 logger = get_logger(__name__)
 
@@ -468,50 +467,57 @@ class FinancialStatementsService:
         This is the source-of-truth audit trail for the user.
         """
         try:
-            query = self.db.query(BalanceTransaction).filter(
-                BalanceTransaction.user_id == user_id
-            )
-
-            if start_date:
-                query = query.filter(BalanceTransaction.created_at >= start_date)
-            if end_date:
-                query = query.filter(BalanceTransaction.created_at <= end_date)
-
-            transactions = query.order_by(BalanceTransaction.created_at.desc()).all()
-
-            output = io.StringIO()
-            writer = csv.writer(output)
-
-            # Header
-            writer.writerow(
-                [
-                    "Transaction ID",
-                    "Date (UTC)",
-                    "Type",
-                    "Amount ($)",
-                    "Balance After ($)",
-                    "Description",
-                ]
-            )
-
-            for tx in transactions:
-                writer.writerow(
-                    [
-                        tx.id,
-                        (
-                            tx.created_at.strftime("%Y-%m-%d %H:%M:%S")
-                            if tx.created_at
-                            else ""
-                        ),
-                        tx.type.upper(),
-                        f"{float(tx.amount):.2f}",
-                        f"{float(tx.balance_after):.2f}",
-                        tx.description,
-                    ]
-                )
-
-            return output.getvalue()
-
+            return b"".join(
+                self.iter_user_transactions_csv(user_id, start_date, end_date)
+            ).decode()
         except Exception as e:
             logger.error(f"Failed to export CSV for user {user_id}: {e}")
             raise
+
+    def iter_user_transactions_csv(
+        self, user_id: str, start_date: datetime = None, end_date: datetime = None
+    ) -> Iterator[bytes]:
+        """The same CSV as ``export_user_transactions_csv``, chunk by chunk."""
+        statement = select(
+            BalanceTransaction.id,
+            BalanceTransaction.created_at,
+            BalanceTransaction.type,
+            BalanceTransaction.amount,
+            BalanceTransaction.balance_after,
+            BalanceTransaction.description,
+        ).where(BalanceTransaction.user_id == user_id)
+
+        if start_date:
+            statement = statement.where(BalanceTransaction.created_at >= start_date)
+        if end_date:
+            statement = statement.where(BalanceTransaction.created_at <= end_date)
+
+        statement = statement.order_by(BalanceTransaction.created_at.desc())
+
+        def format_row(row):
+            tx_id, created_at, tx_type, amount, balance_after, description = row
+            return (
+                tx_id,
+                created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else "",
+                tx_type.upper(),
+                f"{float(amount):.2f}",
+                f"{float(balance_after):.2f}",
+                description,
+            )
+
+        def formatted(chunks):
+            for chunk in chunks:
+                yield [format_row(row) for row in chunk]
+
+        return encode_csv(
+            [],
+            formatted(iter_chunks(self.db, statement)),
+            header=[
+                "Transaction ID",
+                "Date (UTC)",
+                "Type",
+                "Amount ($)",
+                "Balance After ($)",
+                "Description",
+            ],
+        )
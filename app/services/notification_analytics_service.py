@@ -1,16 +1,226 @@
-"""Notification analytics service for tracking delivery and engagement metrics."""
+"""Notification analytics service for tracking delivery and engagement metrics.
 
+Every tracked event also updates hourly counters in ``notification_stats_hourly``.
+The increments are merged in memory by ``NotificationStatsBuffer`` and written
+in one upsert per flush, so the dashboards aggregate a few counter rows per
+hour instead of every ``NotificationAnalytics`` row in the window.
+"""
+
+import asyncio
+import threading
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_
+from sqlalchemy import Date, and_, func
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.models.notification_analytics import NotificationAnalytics
+from app.models.notification_analytics import (
+    NotificationAnalytics,
+    NotificationStatsHourly,
+)
 
 logger = get_logger(__name__)
 
+STATUSES = ("sent", "delivered", "read", "clicked", "failed")
+TIMINGS = ("delivery", "read", "click")
+COUNTERS = STATUSES + tuple(
+    column
+    for prefix in TIMINGS
+    for column in (f"{prefix}_time_ms_total", f"{prefix}_time_count")
+)
+
+# Counter rows per upsert statement
+FLUSH_BATCH = 500
+
+StatsKey = Tuple[datetime, str, str, str]
+
+
+def _hour(moment: datetime) -> datetime:
+    """Naive UTC hour bucket, matching how ``created_at`` is stored."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class NotificationStatsBuffer:
+    """Pending counter increments, merged per key and written in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[StatsKey, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, key: StatsKey, deltas: Dict[str, int]) -> None:
+        with self._lock:
+            counters = self._pending.setdefault(key, {})
+            for column, delta in deltas.items():
+                if delta:
+                    counters[column] = counters.get(column, 0) + delta
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+    def flush(self, db: Session) -> int:
+        """Write pending increments; returns the number of counter rows touched.
+
+        On failure the increments go back into the buffer for the next flush.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        rows = [
+            {
+                "hour": key[0],
+                "user_id": key[1],
+                "notification_type": key[2],
+                "delivery_method": key[3],
+                **{column: counters.get(column, 0) for column in COUNTERS},
+            }
+            for key, counters in pending.items()
+            if any(counters.values())
+        ]
+        if not rows:
+            return 0
+        try:
+            for i in range(0, len(rows), FLUSH_BATCH):
+                db.execute(self._upsert(db, rows[i : i + FLUSH_BATCH]))
+            db.commit()
+        except Exception:
+            db.rollback()
+            for key, counters in pending.items():
+                self.add(key, counters)
+            raise
+        return len(rows)
+
+    @staticmethod
+    def _upsert(db: Session, rows: List[Dict[str, Any]]):
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        table = NotificationStatsHourly.__table__
+        statement = insert(table).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[column.name for column in table.primary_key],
+            set_={
+                column: table.c[column] + statement.excluded[column]
+                for column in COUNTERS
+            },
+        )
+
+
+notification_stats = NotificationStatsBuffer()
+
+
+def _stats_change(
+    analytics: NotificationAnalytics,
+    previous_status: Optional[str],
+    previous_times: Tuple[Optional[int], ...] = (None, None, None),
+) -> Tuple[StatsKey, Dict[str, int]]:
+    """Counter increments for ``analytics`` moving from its previous state."""
+    deltas: Dict[str, int] = {}
+    if previous_status != analytics.status:
+        if previous_status in STATUSES:
+            deltas[previous_status] = -1
+        if analytics.status in STATUSES:
+            deltas[analytics.status] = 1
+    current_times = (
+        analytics.delivery_time_ms,
+        analytics.read_time_ms,
+        analytics.click_time_ms,
+    )
+    for prefix, before, after in zip(TIMINGS, previous_times, current_times):
+        # Averages skip missing and zero timings, as they always have
+        deltas[f"{prefix}_time_ms_total"] = (after or 0) - (before or 0)
+        deltas[f"{prefix}_time_count"] = bool(after) - bool(before)
+    key = (
+        _hour(analytics.created_at),
+        analytics.user_id,
+        analytics.notification_type,
+        analytics.delivery_method,
+    )
+    return key, deltas
+
+
+def _previous_times(analytics: NotificationAnalytics) -> Tuple[Optional[int], ...]:
+    return (
+        analytics.delivery_time_ms,
+        analytics.read_time_ms,
+        analytics.click_time_ms,
+    )
+
+
+def _status_counts(row) -> Dict[str, int]:
+    """Cumulative funnel counts from per-status counters."""
+    clicked = int(row.clicked)
+    read = int(row.read) + clicked
+    delivered = int(row.delivered) + read
+    sent = int(row.sent) + delivered
+    failed = int(row.failed)
+    return {
+        "total": sent + failed,
+        "sent": sent,
+        "delivered": delivered,
+        "read": read,
+        "clicked": clicked,
+        "failed": failed,
+    }
+
+
+def _group_metrics(row) -> Dict[str, Any]:
+    counts = _status_counts(row)
+    total, delivered = counts["total"], counts["delivered"]
+    return {
+        "total": total,
+        "delivered": delivered,
+        "read": counts["read"],
+        "clicked": counts["clicked"],
+        "failed": counts["failed"],
+        "delivery_rate": round((delivered / total * 100) if total > 0 else 0, 2),
+        "read_rate": round(
+            (counts["read"] / delivered * 100) if delivered > 0 else 0, 2
+        ),
+        "click_rate": round(
+            (counts["clicked"] / delivered * 100) if delivered > 0 else 0, 2
+        ),
+    }
+
+
+def flush_notification_stats(bind=None) -> int:
+    """Write buffered counters on a session of their own.
+
+    ``bind`` is the engine to write to, the application's by default.
+    """
+    if bind is None:
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+    else:
+        db = Session(bind=bind)
+    try:
+        return notification_stats.flush(db)
+    finally:
+        db.close()
+
+
+async def start_notification_stats_flush_loop():
+    """Background loop that writes buffered notification counters.
+
+    Intended to be called by the main application lifecycle manager.
+    """
+    interval = get_settings().notification_stats_flush_seconds
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(flush_notification_stats)
+        except Exception as e:
+            logger.error(f"Notification stats flush failed: {e}")
+
 
 class NotificationAnalyticsService:
     """Service for tracking and analyzing notification metrics."""
@@ -23,6 +233,19 @@ class NotificationAnalyticsService:
         """
         self.db = db
 
+    def _locked_record(self, *criteria) -> Optional[NotificationAnalytics]:
+        """The matching row, locked until commit.
+
+        The counter deltas are taken from the status the row moves from, so
+        two workers updating the same row must not both read the old one.
+        """
+        return (
+            self.db.query(NotificationAnalytics)
+            .filter(and_(*criteria))
+            .with_for_update()
+            .first()
+        )
+
     def track_notification_sent(
         self,
         notification_id: str,
@@ -44,18 +267,22 @@ class NotificationAnalyticsService:
             NotificationAnalytics record
         """
         try:
+            now = datetime.now(timezone.utc)
             analytics = NotificationAnalytics(
                 notification_id=notification_id,
                 user_id=user_id,
                 notification_type=notification_type,
                 delivery_method=delivery_method,
                 status="sent",
-                sent_at=datetime.now(timezone.utc).isoformat(),
-                metadata=metadata,
+                sent_at=now.isoformat(),
+                tracking_data=metadata,
+                created_at=now,
             )
+            change = _stats_change(analytics, None)
 
             self.db.add(analytics)
             self.db.commit()
+            notification_stats.add(*change)
 
             logger.info(
                 f"Notification sent tracked: notification_id={notification_id}, "
@@ -85,16 +312,10 @@ class NotificationAnalyticsService:
             True if tracking successful, False otherwise
         """
         try:
-            analytics = (
-                self.db.query(NotificationAnalytics)
-                .filter(
-                    and_(
-                        NotificationAnalytics.notification_id == notification_id,
-                        NotificationAnalytics.user_id == user_id,
-                        NotificationAnalytics.delivery_method == delivery_method,
-                    )
-                )
-                .first()
+            analytics = self._locked_record(
+                NotificationAnalytics.notification_id == notification_id,
+                NotificationAnalytics.user_id == user_id,
+                NotificationAnalytics.delivery_method == delivery_method,
             )
 
             if not analytics:
@@ -104,6 +325,7 @@ class NotificationAnalyticsService:
                 )
                 return False
 
+            previous = analytics.status, _previous_times(analytics)
             now = datetime.now(timezone.utc)
             analytics.status = "delivered"
             analytics.delivered_at = now.isoformat()
@@ -114,8 +336,10 @@ class NotificationAnalyticsService:
                 analytics.delivery_time_ms = int(
                     (now - sent_time).total_seconds() * 1000
                 )
+            change = _stats_change(analytics, *previous)
 
             self.db.commit()
+            notification_stats.add(*change)
 
             logger.info(
                 f"Notification delivered tracked: notification_id={notification_id}, "
@@ -125,6 +349,7 @@ class NotificationAnalyticsService:
             return True
 
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Failed to track notification delivered: {e}")
             return False
 
@@ -143,15 +368,9 @@ class NotificationAnalyticsService:
             True if tracking successful, False otherwise
         """
         try:
-            analytics = (
-                self.db.query(NotificationAnalytics)
-                .filter(
-                    and_(
-                        NotificationAnalytics.notification_id == notification_id,
-                        NotificationAnalytics.user_id == user_id,
-                    )
-                )
-                .first()
+            analytics = self._locked_record(
+                NotificationAnalytics.notification_id == notification_id,
+                NotificationAnalytics.user_id == user_id,
             )
 
             if not analytics:
@@ -160,6 +379,7 @@ class NotificationAnalyticsService:
                 )
                 return False
 
+            previous = analytics.status, _previous_times(analytics)
             now = datetime.now(timezone.utc)
             analytics.status = "read"
             analytics.read_at = now.isoformat()
@@ -170,8 +390,10 @@ class NotificationAnalyticsService:
                 analytics.read_time_ms = int(
                     (now - delivered_time).total_seconds() * 1000
                 )
+            change = _stats_change(analytics, *previous)
 
             self.db.commit()
+            notification_stats.add(*change)
 
             logger.info(
                 f"Notification read tracked: notification_id={notification_id}, "
@@ -181,6 +403,7 @@ class NotificationAnalyticsService:
             return True
 
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Failed to track notification read: {e}")
             return False
 
@@ -199,15 +422,9 @@ class NotificationAnalyticsService:
             True if tracking successful, False otherwise
         """
         try:
-            analytics = (
-                self.db.query(NotificationAnalytics)
-                .filter(
-                    and_(
-                        NotificationAnalytics.notification_id == notification_id,
-                        NotificationAnalytics.user_id == user_id,
-                    )
-                )
-                .first()
+            analytics = self._locked_record(
+                NotificationAnalytics.notification_id == notification_id,
+                NotificationAnalytics.user_id == user_id,
             )
 
             if not analytics:
@@ -216,6 +433,7 @@ class NotificationAnalyticsService:
                 )
                 return False
 
+            previous = analytics.status, _previous_times(analytics)
             now = datetime.now(timezone.utc)
             analytics.status = "clicked"
             analytics.clicked_at = now.isoformat()
@@ -226,8 +444,10 @@ class NotificationAnalyticsService:
                 analytics.click_time_ms = int(
                     (now - delivered_time).total_seconds() * 1000
                 )
+            change = _stats_change(analytics, *previous)
 
             self.db.commit()
+            notification_stats.add(*change)
 
             logger.info(
                 f"Notification clicked tracked: notification_id={notification_id}, "
@@ -237,6 +457,7 @@ class NotificationAnalyticsService:
             return True
 
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Failed to track notification clicked: {e}")
             return False
 
@@ -259,16 +480,10 @@ class NotificationAnalyticsService:
             True if tracking successful, False otherwise
         """
         try:
-            analytics = (
-                self.db.query(NotificationAnalytics)
-                .filter(
-                    and_(
-                        NotificationAnalytics.notification_id == notification_id,
-                        NotificationAnalytics.user_id == user_id,
-                        NotificationAnalytics.delivery_method == delivery_method,
-                    )
-                )
-                .first()
+            analytics = self._locked_record(
+                NotificationAnalytics.notification_id == notification_id,
+                NotificationAnalytics.user_id == user_id,
+                NotificationAnalytics.delivery_method == delivery_method,
             )
 
             if not analytics:
@@ -277,12 +492,15 @@ class NotificationAnalyticsService:
                 )
                 return False
 
+            previous = analytics.status, _previous_times(analytics)
             analytics.status = "failed"
             analytics.failed_at = datetime.now(timezone.utc).isoformat()
             analytics.failure_reason = reason
             analytics.retry_count += 1
+            change = _stats_change(analytics, *previous)
 
             self.db.commit()
+            notification_stats.add(*change)
 
             logger.info(
                 f"Notification failed tracked: notification_id={notification_id}, "
@@ -292,9 +510,43 @@ class NotificationAnalyticsService:
             return True
 
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Failed to track notification failed: {e}")
             return False
 
+    def _stats_query(
+        self,
+        *columns,
+        user_id: Optional[str] = None,
+        notification_type: Optional[str] = None,
+        days: int = 30,
+    ):
+        """Summed counters over the hourly buckets in the window.
+
+        The window starts at the hour containing ``now - days``.
+        """
+        # Flushed on its own session so the caller's transaction is left alone
+        try:
+            flush_notification_stats(self.db.get_bind())
+        except Exception as e:
+            logger.warning(f"Notification stats flush failed: {e}")
+
+        threshold = _hour(datetime.now(timezone.utc) - timedelta(days=days))
+        stats = NotificationStatsHourly
+        query = self.db.query(
+            *columns,
+            *[
+                func.coalesce(func.sum(getattr(stats, column)), 0).label(column)
+                for column in COUNTERS
+            ],
+        ).filter(stats.hour >= threshold)
+
+        if user_id:
+            query = query.filter(stats.user_id == user_id)
+        if notification_type:
+            query = query.filter(stats.notification_type == notification_type)
+        return query
+
     def get_delivery_metrics(
         self,
         user_id: Optional[str] = None,
@@ -312,56 +564,27 @@ class NotificationAnalyticsService:
             Dictionary with delivery metrics
         """
         try:
-            threshold = datetime.now(timezone.utc) - timedelta(days=days)
-
-            query = self.db.query(NotificationAnalytics).filter(
-                NotificationAnalytics.created_at >= threshold
+            row = self._stats_query(
+                user_id=user_id, notification_type=notification_type, days=days
+            ).one()
+            counts = _status_counts(row)
+            total, sent, delivered = (
+                counts["total"],
+                counts["sent"],
+                counts["delivered"],
             )
 
-            if user_id:
-                query = query.filter(NotificationAnalytics.user_id == user_id)
-
-                if notification_type:
-                    query = query.filter(
-                        NotificationAnalytics.notification_type == notification_type
-                    )
-
-            analytics = query.all()
-
-            # Calculate metrics
-            total = len(analytics)
-            sent = len(
-                [
-                    a
-                    for a in analytics
-                    if a.status in ["sent", "delivered", "read", "clicked"]
-                ]
-            )
-            delivered = len(
-                [a for a in analytics if a.status in ["delivered", "read", "clicked"]]
-            )
-            read = len([a for a in analytics if a.status in ["read", "clicked"]])
-            clicked = len([a for a in analytics if a.status == "clicked"])
-            failed = len([a for a in analytics if a.status == "failed"])
-
             # Calculate rates
             delivery_rate = (delivered / sent * 100) if sent > 0 else 0
-            read_rate = (read / delivered * 100) if delivered > 0 else 0
-            click_rate = (clicked / delivered * 100) if delivered > 0 else 0
-            failure_rate = (failed / total * 100) if total > 0 else 0
+            read_rate = (counts["read"] / delivered * 100) if delivered > 0 else 0
+            click_rate = (counts["clicked"] / delivered * 100) if delivered > 0 else 0
+            failure_rate = (counts["failed"] / total * 100) if total > 0 else 0
 
             # Calculate average times
-            delivery_times = [
-                a.delivery_time_ms for a in analytics if a.delivery_time_ms
-            ]
-            read_times = [a.read_time_ms for a in analytics if a.read_time_ms]
-            click_times = [a.click_time_ms for a in analytics if a.click_time_ms]
-
-            avg_delivery_time = (
-                sum(delivery_times) / len(delivery_times) if delivery_times else 0
-            )
-            avg_read_time = sum(read_times) / len(read_times) if read_times else 0
-            avg_click_time = sum(click_times) / len(click_times) if click_times else 0
+            def average(prefix):
+                count = int(getattr(row, f"{prefix}_time_count"))
+                total_ms = int(getattr(row, f"{prefix}_time_ms_total"))
+                return total_ms / count if count else 0
 
             logger.info(
                 f"Delivery metrics calculated: total={total}, delivery_rate={delivery_rate:.2f}%, "
@@ -372,16 +595,16 @@ class NotificationAnalyticsService:
                 "total_notifications": total,
                 "sent": sent,
                 "delivered": delivered,
-                "read": read,
-                "clicked": clicked,
-                "failed": failed,
+                "read": counts["read"],
+                "clicked": counts["clicked"],
+                "failed": counts["failed"],
                 "delivery_rate": round(delivery_rate, 2),
                 "read_rate": round(read_rate, 2),
                 "click_rate": round(click_rate, 2),
                 "failure_rate": round(failure_rate, 2),
-                "avg_delivery_time_ms": round(avg_delivery_time, 2),
-                "avg_read_time_ms": round(avg_read_time, 2),
-                "avg_click_time_ms": round(avg_click_time, 2),
+                "avg_delivery_time_ms": round(average("delivery"), 2),
+                "avg_read_time_ms": round(average("read"), 2),
+                "avg_click_time_ms": round(average("click"), 2),
             }
 
         except Exception as e:
@@ -403,51 +626,13 @@ class NotificationAnalyticsService:
             Dictionary with metrics by type
         """
         try:
-            threshold = datetime.now(timezone.utc) - timedelta(days=days)
-
-            query = self.db.query(NotificationAnalytics).filter(
-                NotificationAnalytics.created_at >= threshold
+            group = NotificationStatsHourly.notification_type
+            rows = (
+                self._stats_query(group, user_id=user_id, days=days)
+                .group_by(group)
+                .all()
             )
-
-            if user_id:
-                query = query.filter(NotificationAnalytics.user_id == user_id)
-
-            analytics = query.all()
-
-            # Group by type
-            by_type = {}
-            for a in analytics:
-                if a.notification_type not in by_type:
-                    by_type[a.notification_type] = []
-                by_type[a.notification_type].append(a)
-
-            # Calculate metrics for each type
-            result = {}
-            for notification_type, records in by_type.items():
-                total = len(records)
-                delivered = len(
-                    [r for r in records if r.status in ["delivered", "read", "clicked"]]
-                )
-                read = len([r for r in records if r.status in ["read", "clicked"]])
-                clicked = len([r for r in records if r.status == "clicked"])
-                failed = len([r for r in records if r.status == "failed"])
-
-                result[notification_type] = {
-                    "total": total,
-                    "delivered": delivered,
-                    "read": read,
-                    "clicked": clicked,
-                    "failed": failed,
-                    "delivery_rate": round(
-                        (delivered / total * 100) if total > 0 else 0, 2
-                    ),
-                    "read_rate": round(
-                        (read / delivered * 100) if delivered > 0 else 0, 2
-                    ),
-                    "click_rate": round(
-                        (clicked / delivered * 100) if delivered > 0 else 0, 2
-                    ),
-                }
+            result = {row.notification_type: _group_metrics(row) for row in rows}
 
             logger.info(f"Metrics by type calculated: {len(result)} types")
 
@@ -472,51 +657,13 @@ class NotificationAnalyticsService:
             Dictionary with metrics by method
         """
         try:
-            threshold = datetime.now(timezone.utc) - timedelta(days=days)
-
-            query = self.db.query(NotificationAnalytics).filter(
-                NotificationAnalytics.created_at >= threshold
+            group = NotificationStatsHourly.delivery_method
+            rows = (
+                self._stats_query(group, user_id=user_id, days=days)
+                .group_by(group)
+                .all()
             )
-
-            if user_id:
-                query = query.filter(NotificationAnalytics.user_id == user_id)
-
-            analytics = query.all()
-
-            # Group by method
-            by_method = {}
-            for a in analytics:
-                if a.delivery_method not in by_method:
-                    by_method[a.delivery_method] = []
-                by_method[a.delivery_method].append(a)
-
-            # Calculate metrics for each method
-            result = {}
-            for method, records in by_method.items():
-                total = len(records)
-                delivered = len(
-                    [r for r in records if r.status in ["delivered", "read", "clicked"]]
-                )
-                read = len([r for r in records if r.status in ["read", "clicked"]])
-                clicked = len([r for r in records if r.status == "clicked"])
-                failed = len([r for r in records if r.status == "failed"])
-
-                result[method] = {
-                    "total": total,
-                    "delivered": delivered,
-                    "read": read,
-                    "clicked": clicked,
-                    "failed": failed,
-                    "delivery_rate": round(
-                        (delivered / total * 100) if total > 0 else 0, 2
-                    ),
-                    "read_rate": round(
-                        (read / delivered * 100) if delivered > 0 else 0, 2
-                    ),
-                    "click_rate": round(
-                        (clicked / delivered * 100) if delivered > 0 else 0, 2
-                    ),
-                }
+            result = {row.delivery_method: _group_metrics(row) for row in rows}
 
             logger.info(f"Metrics by method calculated: {len(result)} methods")
 
@@ -543,62 +690,21 @@ class NotificationAnalyticsService:
             List of metrics by time period
         """
         try:
-            threshold = datetime.now(timezone.utc) - timedelta(days=days)
+            if interval == "day":
+                period = func.date(NotificationStatsHourly.hour, type_=Date)
+            else:  # hour
+                period = NotificationStatsHourly.hour
 
-            query = self.db.query(NotificationAnalytics).filter(
-                NotificationAnalytics.created_at >= threshold
+            rows = (
+                self._stats_query(period.label("period"), user_id=user_id, days=days)
+                .group_by(period)
+                .order_by(period)
+                .all()
             )
-
-            if user_id:
-                query = query.filter(NotificationAnalytics.user_id == user_id)
-
-            analytics = query.all()
-
-            # Group by time period
-            by_period = {}
-            for a in analytics:
-                if interval == "day":
-                    period = a.created_at.date().isoformat()
-            else:  # hour
-                period = a.created_at.replace(
-                    minute=0, second=0, microsecond=0
-                ).isoformat()
-
-                if period not in by_period:
-                    by_period[period] = []
-                by_period[period].append(a)
-
-            # Calculate metrics for each period
-            result = []
-            for period in sorted(by_period.keys()):
-                records = by_period[period]
-                total = len(records)
-                delivered = len(
-                    [r for r in records if r.status in ["delivered", "read", "clicked"]]
-                )
-                read = len([r for r in records if r.status in ["read", "clicked"]])
-                clicked = len([r for r in records if r.status == "clicked"])
-                failed = len([r for r in records if r.status == "failed"])
-
-                result.append(
-                    {
-                        "period": period,
-                        "total": total,
-                        "delivered": delivered,
-                        "read": read,
-                        "clicked": clicked,
-                        "failed": failed,
-                        "delivery_rate": round(
-                            (delivered / total * 100) if total > 0 else 0, 2
-                        ),
-                        "read_rate": round(
-                            (read / delivered * 100) if delivered > 0 else 0, 2
-                        ),
-                        "click_rate": round(
-                            (clicked / delivered * 100) if delivered > 0 else 0, 2
-                        ),
-                    }
-                )
+            result = [
+                {"period": row.period.isoformat(), **_group_metrics(row)}
+                for row in rows
+            ]
 
             logger.info(f"Timeline metrics calculated: {len(result)} periods")
 
@@ -8,6 +8,7 @@ import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.http_clients import get_http_client
 from app.models.device_token import DeviceToken
 from app.models.user import User
 
@@ -71,19 +72,19 @@ class OneSignalService:
             payload["url"] = url
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/notifications",
-                    json=payload,
-                    headers=self._get_headers(),
-                )
-                response.raise_for_status()
-                result = response.json()
-                logger.info(
-                    f"OneSignal notification sent to {len(user_ids)} users",
-                    extra={"recipients": result.get("recipients", 0)},
-                )
-                return {"ok": True, "data": result}
+            client = get_http_client("onesignal")
+            response = await client.post(
+                f"{self.base_url}/notifications",
+                json=payload,
+                headers=self._get_headers(),
+            )
+            response.raise_for_status()
+            result = response.json()
+            logger.info(
+                f"OneSignal notification sent to {len(user_ids)} users",
+                extra={"recipients": result.get("recipients", 0)},
+            )
+            return {"ok": True, "data": result}
 
         except httpx.HTTPStatusError as e:
             logger.error(f"OneSignal API error: {e.response.status_code}")
@@ -4,9 +4,8 @@ import hashlib
 import hmac
 from typing import Any, Dict, Optional
 
-import httpx
-
 from app.core.config import get_settings
+from app.core.http_clients import get_http_client
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -48,14 +47,14 @@ class PaystackService:
             "metadata": metadata or {},
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/transaction/charge_authorization",
-                json=payload,
-                headers=self._get_headers(),
-                timeout=30.0,
-            )
-            result = response.json()
+        client = get_http_client("paystack")
+        response = await client.post(
+            f"{self.base_url}/transaction/charge_authorization",
+            json=payload,
+            headers=self._get_headers(),
+            timeout=30.0,
+        )
+        result = response.json()
 
         if result.get("status") and result["data"].get("status") == "success":
             return {"status": "success", "reference": reference, "data": result["data"]}
@@ -73,40 +72,40 @@ class PaystackService:
             raise Exception("Paystack not configured")
 
         try:
-            async with httpx.AsyncClient() as client:
-                payload = {
-                    "email": email,
-                    "amount": amount_kobo,
-                }
-
-                if reference:
-                    payload["reference"] = reference
-
-                if metadata:
-                    payload["metadata"] = metadata
-
-                response = await client.post(
-                    f"{self.base_url}/transaction/initialize",
-                    headers=self._get_headers(),
-                    json=payload,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                if not data.get("status"):
-                    raise Exception("Paystack error: " + data.get("message", "Unknown"))
-
-                result = data.get("data", {})
-                logger.info(
-                    f"Payment initialized for {email}: Amount={amount_kobo}, Reference={result.get('reference')}"
-                )
-
-                return {
-                    "authorization_url": result.get("authorization_url"),
-                    "access_code": result.get("access_code"),
-                    "reference": result.get("reference"),
-                }
+            client = get_http_client("paystack")
+            payload = {
+                "email": email,
+                "amount": amount_kobo,
+            }
+
+            if reference:
+                payload["reference"] = reference
+
+            if metadata:
+                payload["metadata"] = metadata
+
+            response = await client.post(
+                f"{self.base_url}/transaction/initialize",
+                headers=self._get_headers(),
+                json=payload,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            if not data.get("status"):
+                raise Exception("Paystack error: " + data.get("message", "Unknown"))
+
+            result = data.get("data", {})
+            logger.info(
+                f"Payment initialized for {email}: Amount={amount_kobo}, Reference={result.get('reference')}"
+            )
+
+            return {
+                "authorization_url": result.get("authorization_url"),
+                "access_code": result.get("access_code"),
+                "reference": result.get("reference"),
+            }
 
         except Exception as e:
             logger.error(f"Failed to initialize payment: {str(e)}")
@@ -118,32 +117,32 @@ class PaystackService:
             raise Exception("Paystack not configured")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/transaction/verify/{reference}",
-                    headers=self._get_headers(),
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                if not data.get("status"):
-                    raise Exception("Paystack error: " + data.get("message", "Unknown"))
-
-                result = data.get("data", {})
-                logger.info(
-                    f"Payment verified: Reference={reference}, "
-                    f"Status={result.get('status')}, Amount={result.get('amount')}"
-                )
-
-                return {
-                    "status": result.get("status"),
-                    "reference": result.get("reference"),
-                    "amount": result.get("amount"),
-                    "paid_at": result.get("paid_at"),
-                    "customer": result.get("customer", {}),
-                    "authorization": result.get("authorization", {}),
-                }
+            client = get_http_client("paystack")
+            response = await client.get(
+                f"{self.base_url}/transaction/verify/{reference}",
+                headers=self._get_headers(),
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            if not data.get("status"):
+                raise Exception("Paystack error: " + data.get("message", "Unknown"))
+
+            result = data.get("data", {})
+            logger.info(
+                f"Payment verified: Reference={reference}, "
+                f"Status={result.get('status')}, Amount={result.get('amount')}"
+            )
+
+            return {
+                "status": result.get("status"),
+                "reference": result.get("reference"),
+                "amount": result.get("amount"),
+                "paid_at": result.get("paid_at"),
+                "customer": result.get("customer", {}),
+                "authorization": result.get("authorization", {}),
+            }
 
         except Exception as e:
             logger.error(f"Failed to verify payment: {str(e)}")
@@ -169,19 +168,19 @@ class PaystackService:
             raise Exception("Paystack not configured")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/transaction/{transaction_id}",
-                    headers=self._get_headers(),
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client("paystack")
+            response = await client.get(
+                f"{self.base_url}/transaction/{transaction_id}",
+                headers=self._get_headers(),
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
 
-                if not data.get("status"):
-                    raise Exception("Paystack error: " + data.get("message", "Unknown"))
+            if not data.get("status"):
+                raise Exception("Paystack error: " + data.get("message", "Unknown"))
 
-                return data.get("data", {})
+            return data.get("data", {})
 
         except Exception as e:
             logger.error(f"Failed to get transaction: {str(e)}")
@@ -193,25 +192,25 @@ class PaystackService:
             raise Exception("Paystack not configured")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/balance",
-                    headers=self._get_headers(),
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                if not data.get("status"):
-                    raise Exception("Paystack error: " + data.get("message", "Unknown"))
-
-                result = data.get("data", [])
-                logger.info(f"Account balance retrieved: {result}")
-
-                return {
-                    "balance": result[0].get("balance") if result else 0,
-                    "currency": "NGN",
-                }
+            client = get_http_client("paystack")
+            response = await client.get(
+                f"{self.base_url}/balance",
+                headers=self._get_headers(),
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            if not data.get("status"):
+                raise Exception("Paystack error: " + data.get("message", "Unknown"))
+
+            result = data.get("data", [])
+            logger.info(f"Account balance retrieved: {result}")
+
+            return {
+                "balance": result[0].get("balance") if result else 0,
+                "currency": "NGN",
+            }
 
         except Exception as e:
             logger.error(f"Failed to get balance: {str(e)}")
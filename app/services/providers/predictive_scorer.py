@@ -3,6 +3,8 @@ from typing import Any, Dict, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.metrics import provider_scoring_lookups_total
+from app.services.providers.scoring_snapshot import scoring_snapshot
 from app.services.purchase_intelligence import PurchaseIntelligenceService
 
 logger = logging.getLogger(__name__)
@@ -32,29 +34,45 @@ class PredictiveRouterScorer:
         - Sentiment (45%): Career/AreaCode success history
         - ROI (25%): Profitability vs Margin Leakage
         - Resilience (30%): Recent health status (60 min window)
+
+        Inputs come from the background scoring snapshot while it is fresh,
+        otherwise from live queries.
         """
         try:
-            # 1. Resilience (30%) - Async health check
-            health_score = await PurchaseIntelligenceService.get_live_health_score(
-                service, country, provider_name
-            )
+            snapshot = scoring_snapshot.current()
+            if snapshot is not None:
+                provider_scoring_lookups_total.labels(source="snapshot").inc()
+                health_score = snapshot.health_score(service, country, provider_name)
+                roi_raw = snapshot.efficiency_score(provider_name)
+            else:
+                provider_scoring_lookups_total.labels(source="live").inc()
+                # 1. Resilience (30%) - Async health check
+                health_score = await PurchaseIntelligenceService.get_live_health_score(
+                    service, country, provider_name
+                )
+
+                # 2. ROI (25%) - Sync analytics check
+                # We fetch ROI for the last 14 days for routing recency
+                roi_data = PurchaseIntelligenceService.get_provider_roi(
+                    self.db, days=14
+                )
+                provider_roi = roi_data.get(provider_name, {})
+                roi_raw = provider_roi.get("efficiency_score", 50.0)
 
-            # 2. ROI (25%) - Sync analytics check
-            # We fetch ROI for the last 14 days for routing recency
-            roi_data = PurchaseIntelligenceService.get_provider_roi(self.db, days=14)
-            provider_roi = roi_data.get(provider_name, {})
             # Normalized ROI score (using efficiency_score which accounts for refunds)
             # Scaling: common efficiency is 50-150. We cap at 200 for 1.0 normalization.
-            roi_raw = provider_roi.get("efficiency_score", 50.0)
             roi_score = min(roi_raw / 200.0, 1.0)
 
             # 3. Sentiment (45%) - Service/Carrier specificity
             sentiment_score = 0.5  # Neutral start
             if carrier:
-                sentiment_map = PurchaseIntelligenceService.get_carrier_sentiment(
-                    self.db, service, days=14
-                )
-                sentiment_score = sentiment_map.get(carrier, 0.5)
+                if snapshot is not None:
+                    sentiment_score = snapshot.carrier_sentiment(service, carrier)
+                else:
+                    sentiment_map = PurchaseIntelligenceService.get_carrier_sentiment(
+                        self.db, service, days=14
+                    )
+                    sentiment_score = sentiment_map.get(carrier, 0.5)
             elif area_code:
                 # Fallback to general service health if specific carrier unknown
                 sentiment_score = health_score
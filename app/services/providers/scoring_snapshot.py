@@ -0,0 +1,184 @@
+"""In-memory provider scoring snapshot for the predictive router.
+
+The router scores every candidate on every purchase. Instead of running the
+health, ROI and carrier-sentiment queries per call, a background loop
+aggregates them in SQL and publishes an immutable snapshot that
+``PredictiveRouterScorer`` reads with plain dictionary lookups.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Integer, func
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.logging import get_logger
+from app.core.metrics import provider_scoring_snapshot_age_seconds
+from app.models.purchase_outcome import PurchaseOutcome
+from app.services.purchase_intelligence import PurchaseIntelligenceService
+
+logger = get_logger(__name__)
+
+# Defaults mirror the live PurchaseIntelligenceService calculations
+HEALTH_WINDOW = timedelta(hours=1)
+ROUTING_WINDOW = timedelta(days=14)
+DEFAULT_HEALTH = 1.0
+DEFAULT_EFFICIENCY = 50.0
+DEFAULT_SENTIMENT = 0.5
+
+
+@dataclass(frozen=True)
+class ScoringSnapshot:
+    """Pre-aggregated scoring inputs, stamped with a version and build time."""
+
+    version: int
+    built_at: float
+    # (provider, service, country) -> success rate over the last hour
+    health: Dict[Tuple[str, str, str], float] = field(default_factory=dict)
+    # provider -> efficiency_score over the routing window
+    efficiency: Dict[str, float] = field(default_factory=dict)
+    # service -> carrier -> success rate over the routing window
+    sentiment: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def health_score(self, service: str, country: str, provider: str) -> float:
+        return self.health.get((provider, service, country), DEFAULT_HEALTH)
+
+    def efficiency_score(self, provider: str) -> float:
+        return self.efficiency.get(provider, DEFAULT_EFFICIENCY)
+
+    def carrier_sentiment(self, service: str, carrier: str) -> float:
+        return self.sentiment.get(service, {}).get(carrier, DEFAULT_SENTIMENT)
+
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+
+
+def build_snapshot(db: Session, version: int) -> ScoringSnapshot:
+    """Aggregate every scoring input with three GROUP BY queries."""
+    now = datetime.now(timezone.utc)
+    received = func.sum(func.cast(PurchaseOutcome.sms_received, Integer))
+
+    health_rows = (
+        db.query(
+            PurchaseOutcome.provider,
+            PurchaseOutcome.service,
+            PurchaseOutcome.country,
+            func.count(PurchaseOutcome.id).label("total"),
+            received.label("successes"),
+        )
+        .filter(PurchaseOutcome.created_at >= now - HEALTH_WINDOW)
+        .group_by(
+            PurchaseOutcome.provider, PurchaseOutcome.service, PurchaseOutcome.country
+        )
+        .all()
+    )
+    health = {
+        (r.provider, r.service, r.country): (r.successes or 0) / r.total
+        for r in health_rows
+        if r.total
+    }
+
+    roi = PurchaseIntelligenceService.get_provider_roi(db, days=ROUTING_WINDOW.days)
+    efficiency = {provider: r["efficiency_score"] for provider, r in roi.items()}
+
+    cutoff = now - ROUTING_WINDOW
+    sentiment_rows = (
+        db.query(
+            PurchaseOutcome.service,
+            PurchaseOutcome.assigned_carrier,
+            func.count(PurchaseOutcome.id).label("total"),
+            received.label("successes"),
+        )
+        .filter(
+            PurchaseOutcome.created_at >= cutoff,
+            PurchaseOutcome.assigned_carrier.isnot(None),
+            PurchaseOutcome.sms_received.isnot(None),
+        )
+        .group_by(PurchaseOutcome.service, PurchaseOutcome.assigned_carrier)
+        .all()
+    )
+    sentiment: Dict[str, Dict[str, float]] = {}
+    for r in sentiment_rows:
+        if r.total:
+            sentiment.setdefault(r.service, {})[r.assigned_carrier] = round(
+                (r.successes or 0) / r.total, 2
+            )
+
+    return ScoringSnapshot(
+        version=version,
+        built_at=time.monotonic(),
+        health=health,
+        efficiency=efficiency,
+        sentiment=sentiment,
+    )
+
+
+class ScoringSnapshotStore:
+    """Holds the current snapshot and refreshes it in the background."""
+
+    def __init__(self):
+        self._snapshot: Optional[ScoringSnapshot] = None
+        self._version = 0
+
+    def current(self) -> Optional[ScoringSnapshot]:
+        """The latest snapshot, or None if there is none or it outlived its TTL."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if snapshot.age() > get_settings().provider_scoring_snapshot_ttl_seconds:
+            return None
+        return snapshot
+
+    def refresh(self, db: Optional[Session] = None) -> ScoringSnapshot:
+        """Rebuild the snapshot and swap it in atomically."""
+        session = db or SessionLocal()
+        try:
+            snapshot = build_snapshot(session, self._version + 1)
+        finally:
+            if db is None:
+                session.close()
+        self._version = snapshot.version
+        self._snapshot = snapshot
+        return snapshot
+
+    def age(self) -> Optional[float]:
+        snapshot = self._snapshot
+        return snapshot.age() if snapshot else None
+
+    def clear(self) -> None:
+        self._snapshot = None
+
+    def stats(self) -> Dict:
+        age = self.age()
+        return {
+            "version": self._snapshot.version if self._snapshot else None,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "fresh": self.current() is not None,
+        }
+
+
+scoring_snapshot = ScoringSnapshotStore()
+
+
+async def start_scoring_snapshot_loop():
+    """Background loop that keeps ``scoring_snapshot`` fresh.
+
+    Intended to be called by the main application lifecycle manager.
+    """
+    interval = get_settings().provider_scoring_refresh_seconds
+    logger.info(f"Provider scoring snapshot refresh every {interval:.0f}s")
+    while True:
+        try:
+            snapshot = await asyncio.to_thread(scoring_snapshot.refresh)
+            logger.debug(f"Provider scoring snapshot v{snapshot.version} built")
+        except Exception as e:
+            logger.error(f"Provider scoring snapshot refresh failed: {e}")
+        age = scoring_snapshot.age()
+        if age is not None:
+            provider_scoring_snapshot_age_seconds.set(age)
+        await asyncio.sleep(interval)
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
-from sqlalchemy import update
+from sqlalchemy import Integer, case, func, update
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
@@ -15,6 +15,12 @@ from app.services.area_code_geo import NANPA_DATA
 logger = logging.getLogger(__name__)
 
 
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 class AvailabilityScore(BaseModel):
     available: Optional[bool]
     confidence: float
@@ -223,20 +229,32 @@ class PurchaseIntelligenceService:
         seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
         two_hours_ago = datetime.now(timezone.utc) - timedelta(hours=2)
 
+        matched = PurchaseOutcome.assigned_code == area_code
+        # Recency weighting: outcomes in the last 2 hours count 3×
+        weight = case((PurchaseOutcome.created_at >= two_hours_ago, 3.0), else_=1.0)
+
         db = None
         try:
             db = SessionLocal()
-            outcomes = (
-                db.query(PurchaseOutcome)
+            # Success = this exact area code was actually assigned
+            row = (
+                db.query(
+                    func.count(PurchaseOutcome.id).label("sample_size"),
+                    func.sum(weight).label("total_weight"),
+                    func.sum(case((matched, weight), else_=0.0)).label("successes"),
+                    func.max(case((matched, PurchaseOutcome.created_at))).label(
+                        "last_success"
+                    ),
+                    func.max(case((~matched, PurchaseOutcome.created_at))).label(
+                        "last_failure"
+                    ),
+                )
                 .filter(
                     PurchaseOutcome.service == service,
-                    (
-                        (PurchaseOutcome.assigned_code == area_code)
-                        | (PurchaseOutcome.requested_code == area_code)
-                    ),
+                    (matched | (PurchaseOutcome.requested_code == area_code)),
                     PurchaseOutcome.created_at >= seven_days_ago,
                 )
-                .all()
+                .one()
             )
         except Exception as err:
             logger.error(f"score_availability DB initialization or query failed: {err}")
@@ -245,39 +263,19 @@ class PurchaseIntelligenceService:
             if db:
                 db.close()
 
-        if not outcomes:
+        sample_size = row.sample_size or 0
+        if not sample_size:
             await cache.set(cache_key, _UNKNOWN.model_dump(mode="json"), 600)
             return _UNKNOWN
 
-        successes = 0.0
-        total_weight = 0.0
-        last_s = None
-        last_f = None
-
-        for outcome in outcomes:
-            # Success = this exact area code was actually assigned
-            is_success = outcome.assigned_code == area_code
-
-            created_at = outcome.created_at
-            if created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
-
-            # Recency weighting: outcomes in the last 2 hours count 3×
-            weight = 3.0 if created_at >= two_hours_ago else 1.0
-            total_weight += weight
-
-            if is_success:
-                successes += weight
-                if not last_s or created_at > last_s:
-                    last_s = created_at
-            else:
-                if not last_f or created_at > last_f:
-                    last_f = created_at
-
-        success_rate = successes / total_weight if total_weight > 0 else 0.0
+        total_weight = float(row.total_weight or 0.0)
+        success_rate = (
+            float(row.successes or 0.0) / total_weight if total_weight > 0 else 0.0
+        )
+        last_s = _as_utc(row.last_success)
+        last_f = _as_utc(row.last_failure)
 
         # Confidence tiers (from roadmap spec)
-        sample_size = len(outcomes)
         if sample_size <= 2:
             confidence = 0.3
         elif sample_size <= 9:
@@ -329,19 +327,24 @@ class PurchaseIntelligenceService:
 
         db = SessionLocal()
         try:
-            # Query outcomes for this niche in the last hour
-            outcomes = (
-                db.query(PurchaseOutcome)
+            # Aggregate outcomes for this niche in the last hour
+            row = (
+                db.query(
+                    func.count(PurchaseOutcome.id).label("total"),
+                    func.sum(func.cast(PurchaseOutcome.sms_received, Integer)).label(
+                        "successes"
+                    ),
+                )
                 .filter(
                     PurchaseOutcome.service == service,
                     PurchaseOutcome.country == country,
                     PurchaseOutcome.provider == provider,
                     PurchaseOutcome.created_at >= one_hour_ago,
                 )
-                .all()
+                .one()
             )
 
-            if not outcomes:
+            if not row.total:
                 # Optimistic: No data means assume it's working
                 await cache.set(cache_key, 1.0, 300)
                 return 1.0
@@ -349,10 +352,7 @@ class PurchaseIntelligenceService:
             # Success means we got a code.
             # (In institutional grade, we ignore matched/mismatched for health,
             # as that's an inventory issue, not a service failure)
-            successes = sum(1 for o in outcomes if o.sms_received is True)
-            total = len(outcomes)
-
-            health_rate = successes / total
+            health_rate = (row.successes or 0) / row.total
             await cache.set(cache_key, health_rate, 300)
             return health_rate
 
@@ -365,25 +365,36 @@ class PurchaseIntelligenceService:
     @staticmethod
     def get_provider_roi(db: Session, days: int = 30) -> Dict[str, Any]:
         """Calculate ROI and Margins per provider for routing prioritization."""
-        from datetime import datetime, timedelta, timezone
-
-        from app.models.purchase_outcome import PurchaseOutcome
-
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        outcomes = (
-            db.query(PurchaseOutcome).filter(PurchaseOutcome.created_at >= cutoff).all()
+        rows = (
+            db.query(
+                PurchaseOutcome.provider,
+                func.sum(PurchaseOutcome.provider_cost).label("cost"),
+                func.sum(PurchaseOutcome.user_price).label("rev"),
+                func.sum(
+                    case(
+                        (
+                            PurchaseOutcome.is_refunded.is_(True),
+                            PurchaseOutcome.refund_amount,
+                        ),
+                        else_=0.0,
+                    )
+                ).label("refunds"),
+            )
+            .filter(PurchaseOutcome.created_at >= cutoff)
+            .group_by(PurchaseOutcome.provider)
+            .all()
         )
 
         stats = {}
-        for o in outcomes:
-            p = o.provider or "unknown"
+        for r in rows:
+            p = r.provider or "unknown"
             if p not in stats:
                 stats[p] = {"cost": 0.0, "rev": 0.0, "refunds": 0.0}
 
-            stats[p]["cost"] += o.provider_cost or 0.0
-            stats[p]["rev"] += o.user_price or 0.0
-            if o.is_refunded:
-                stats[p]["refunds"] += o.refund_amount or 0.0
+            stats[p]["cost"] += r.cost or 0.0
+            stats[p]["rev"] += r.rev or 0.0
+            stats[p]["refunds"] += r.refunds or 0.0
 
         roi_data = {}
         for p, s in stats.items():
@@ -404,12 +415,6 @@ class PurchaseIntelligenceService:
         db: Session, service: str, days: int = 14
     ) -> Dict[str, float]:
         """Returns success rates per carrier for a specific service."""
-        from datetime import datetime, timedelta, timezone
-
-        from sqlalchemy import Integer, func
-
-        from app.models.purchase_outcome import PurchaseOutcome
-
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
         results = (
             db.query(
@@ -9,6 +9,7 @@ import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.http_clients import get_http_client
 from app.models.device_token import DeviceToken
 from app.models.user import User
 
@@ -174,25 +175,23 @@ class PushNotificationService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.fcm_url, json=payload, headers=headers
+            client = get_http_client("fcm")
+            response = await client.post(self.fcm_url, json=payload, headers=headers)
+            response.raise_for_status()
+            result = response.json()
+
+            if result.get("success") == 1:
+                logger.info(
+                    f"Push notification sent successfully to token {token[:20]}..."
                 )
-                response.raise_for_status()
-                result = response.json()
-
-                if result.get("success") == 1:
-                    logger.info(
-                        f"Push notification sent successfully to token {token[:20]}..."
-                    )
-                    return {
-                        "success": True,
-                        "message_id": result.get("results", [{}])[0].get("message_id"),
-                    }
-                else:
-                    error = result.get("results", [{}])[0].get("error", "Unknown error")
-                    logger.warning(f"FCM error: {error}")
-                    return {"success": False, "error": error}
+                return {
+                    "success": True,
+                    "message_id": result.get("results", [{}])[0].get("message_id"),
+                }
+            else:
+                error = result.get("results", [{}])[0].get("error", "Unknown error")
+                logger.warning(f"FCM error: {error}")
+                return {"success": False, "error": error}
 
         except httpx.HTTPStatusError as e:
             logger.error(
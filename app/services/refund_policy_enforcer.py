@@ -4,18 +4,28 @@ Ensures 100% automatic refunds for failed SMS verifications
 """
 
 import asyncio
+import time
+import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, bindparam, insert, or_, update
 from sqlalchemy.orm import Session
 
+from app.core.constants import TransactionType
 from app.core.logging import get_logger
+from app.models.balance_transaction import BalanceTransaction
+from app.models.purchase_outcome import PurchaseOutcome
+from app.models.transaction import Transaction
+from app.models.user import User
 from app.models.verification import Verification
-from app.services.auto_refund_service import AutoRefundService
+from app.services.auto_refund_service import AutoRefundService, refund_display_reason
 
 logger = get_logger(__name__)
 
+REFUNDABLE_STATUSES = ["timeout", "failed", "cancelled", "error"]
+
 
 class RefundPolicyEnforcer:
     """
@@ -30,6 +40,8 @@ class RefundPolicyEnforcer:
         self.is_running = False
         self.enforcement_interval = 300  # 5 minutes
         self.timeout_threshold = 600  # 10 minutes
+        self.batch_size = 500
+        self.last_report: Optional[dict] = None
 
     async def start_enforcement(self):
         """Start the refund policy enforcement background service."""
@@ -52,10 +64,52 @@ class RefundPolicyEnforcer:
         self.is_running = False
         logger.info("🛡️  REFUND POLICY ENFORCER STOPPED")
 
+    def _eligible(self, cutoff_time: datetime):
+        """Criteria for refund.
+
+        1. Status is pending but created >10 minutes ago (stuck)
+        2. Status is timeout/failed/cancelled/error but not refunded yet
+        """
+        return or_(
+            # Stuck pending verifications
+            and_(
+                Verification.status == "pending",
+                Verification.created_at < cutoff_time,
+            ),
+            # Failed/timeout/cancelled/error not yet refunded
+            and_(
+                Verification.status.in_(REFUNDABLE_STATUSES),
+                or_(
+                    Verification.refund_eligible == True,
+                    Verification.refund_eligible.is_(None),
+                ),
+                or_(
+                    Verification.refunded == False,
+                    Verification.refunded.is_(None),
+                ),
+            ),
+        )
+
     async def _enforce_refund_policy(self):
-        """Enforce refund policy - find and refund all eligible verifications."""
+        """Enforce refund policy - find and refund all eligible verifications.
+
+        Eligible rows are walked in id order, ``batch_size`` at a time. Each
+        batch is refunded in one transaction with set-based statements (see
+        ``_refund_batch``); users are notified once it has committed.
+        """
         from app.core.database import SessionLocal
 
+        started = time.monotonic()
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "batches": 0,
+            "selected": 0,
+            "refunded": 0,
+            "already_refunded": 0,
+            "failed": 0,
+            "amount": 0.0,
+        }
+
         db = None
         try:
             db = SessionLocal()
@@ -64,109 +118,68 @@ class RefundPolicyEnforcer:
                 db.rollback()
             except Exception:
                 pass  # Ignore if no transaction to rollback
-            # Find verifications that need refunds
+
             cutoff_time = datetime.now(timezone.utc) - timedelta(
                 seconds=self.timeout_threshold
             )
-
-            # Criteria for refund:
-            # 1. Status is pending but created >10 minutes ago (stuck)
-            # 2. Status is timeout/failed/cancelled but not refunded yet
-            eligible = (
-                db.query(Verification)
-                .filter(
-                    or_(
-                        # Stuck pending verifications
-                        and_(
-                            Verification.status == "pending",
-                            Verification.created_at < cutoff_time,
-                        ),
-                        # Failed/timeout/cancelled/error not yet refunded
-                        and_(
-                            Verification.status.in_(
-                                ["timeout", "failed", "cancelled", "error"]
-                            ),
-                            or_(
-                                getattr(Verification, "refund_eligible", True) == True,
-                                Verification.refund_eligible.is_(None),
-                            ),
-                            or_(
-                                Verification.refunded == False,
-                                Verification.refunded.is_(None),
-                            ),
-                        ),
+            eligible = self._eligible(cutoff_time)
+            refund_service = AutoRefundService(db)
+            last_id = ""
+
+            while True:
+                # Keyset pagination; rows another worker holds are skipped
+                rows = (
+                    db.query(
+                        Verification.id,
+                        Verification.user_id,
+                        Verification.service_name,
+                        Verification.status,
+                        Verification.cost,
                     )
+                    .filter(eligible, Verification.id > last_id)
+                    .order_by(Verification.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                    .all()
                 )
-                .all()
-            )
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                report["batches"] += 1
+                report["selected"] += len(rows)
 
-            if not eligible:
-                logger.debug("✅ No verifications need refunds")
-                return
-
-            logger.warning(
-                f"🚨 REFUND POLICY VIOLATION: {len(eligible)} verifications need refunds"
-            )
-
-            refund_service = AutoRefundService(db)
-            refunded_count = 0
-            refunded_amount = 0.0
-            failed_count = 0
-
-            for verification in eligible:
                 try:
-                    # Update status if still pending
-                    if verification.status == "pending":
-                        try:
-                            verification.status = "timeout"
-                            verification.outcome = "timeout"
-                            db.commit()
-                            logger.info(
-                                f"Updated stuck verification {verification.id} to timeout"
-                            )
-                        except Exception as commit_error:
-                            db.rollback()
-                            logger.error(
-                                f"Failed to update verification status: {commit_error}"
-                            )
-
-                    # Process refund
-                    reason = verification.status
-                    result = await refund_service.process_verification_refund(
-                        verification.id, reason
-                    )
-
-                    if result:
-                        refunded_count += 1
-                        refunded_amount += result["refund_amount"]
-                        logger.info(
-                            f"✅ ENFORCED REFUND: {verification.id} - "
-                            f"${result['refund_amount']:.2f} - {reason}"
-                        )
-                    else:
-                        failed_count += 1
-                        logger.error(f"❌ REFUND FAILED: {verification.id} - {reason}")
-
+                    refunds, already_refunded = self._refund_batch(db, rows)
+                    db.commit()
                 except Exception as e:
-                    failed_count += 1
+                    db.rollback()
+                    report["failed"] += len(rows)
                     logger.error(
-                        f"❌ REFUND ERROR: {verification.id} - {str(e)}", exc_info=True
+                        f"❌ REFUND BATCH FAILED: {len(rows)} verifications from "
+                        f"{rows[0].id} - {e}",
+                        exc_info=True,
                     )
+                    continue
+
+                report["already_refunded"] += already_refunded
+                report["failed"] += len(rows) - len(refunds) - already_refunded
+                for refund in refunds:
+                    report["refunded"] += 1
+                    report["amount"] += refund["refund_amount"]
+                    logger.info(
+                        f"✅ ENFORCED REFUND: {refund['verification_id']} - "
+                        f"${refund['refund_amount']:.2f} - {refund['reason']}"
+                    )
+                    await refund_service.notify_refund(**refund)
+
+            if not report["selected"]:
+                logger.debug("✅ No verifications need refunds")
+                return
 
-            # Summary
             logger.warning(
-                f"🛡️  REFUND ENFORCEMENT COMPLETE: "
-                f"Refunded={refunded_count}, "
-                f"Failed={failed_count}, "
-                f"Amount=${refunded_amount:.2f}"
+                f"🚨 REFUND POLICY VIOLATION: {report['selected']} verifications needed refunds"
             )
 
-            # Alert if any refunds failed
-            if failed_count > 0:
-                logger.critical(
-                    f"🚨 CRITICAL: {failed_count} refunds FAILED - Manual intervention required"
-                )
-
         except Exception as e:
             logger.error(f"Refund enforcement failed: {e}", exc_info=True)
             if db:
@@ -180,6 +193,211 @@ class RefundPolicyEnforcer:
                     db.close()
                 except:
                     pass
+            elapsed = time.monotonic() - started
+            report["duration_seconds"] = round(elapsed, 3)
+            report["rows_per_second"] = (
+                round(report["selected"] / elapsed, 1) if elapsed > 0 else None
+            )
+            self.last_report = report
+
+        # Summary
+        logger.warning(
+            f"🛡️  REFUND ENFORCEMENT COMPLETE: "
+            f"Refunded={report['refunded']}, "
+            f"Failed={report['failed']}, "
+            f"Amount=${report['amount']:.2f}, "
+            f"Batches={report['batches']}, "
+            f"Throughput={report['rows_per_second']} rows/s"
+        )
+
+        # Alert if any refunds failed
+        if report["failed"] > 0:
+            logger.critical(
+                f"🚨 CRITICAL: {report['failed']} refunds FAILED - Manual intervention required"
+            )
+
+    def _refund_batch(self, db: Session, rows) -> Tuple[List[dict], int]:
+        """Stage refunds for one batch of eligible verifications.
+
+        Issues a fixed number of statements however large the batch is: one
+        status UPDATE for stuck rows, one credit UPDATE per user (executemany),
+        bulk inserts of the ledger rows and executemany UPDATEs of the
+        verifications and their PurchaseOutcome telemetry. The caller commits.
+
+        Returns the refunds staged (as ``notify_refund`` keyword arguments)
+        and how many rows already had a refund transaction.
+        """
+        now = datetime.now(timezone.utc)
+
+        stuck_ids = [row.id for row in rows if row.status == "pending"]
+        if stuck_ids:
+            db.execute(
+                update(Verification)
+                .where(Verification.id.in_(stuck_ids), Verification.status == "pending")
+                .values(status="timeout", outcome="timeout"),
+                execution_options={"synchronize_session": False},
+            )
+
+        # Idempotency: a refund transaction already exists for these
+        references = [f"refund_{row.id}" for row in rows]
+        existing = {
+            reference
+            for (reference,) in db.query(Transaction.reference).filter(
+                Transaction.reference.in_(references)
+            )
+        }
+
+        user_ids = {row.user_id for row in rows}
+        balances = {
+            user_id: float(credits) if credits else 0.0
+            for user_id, credits in db.query(User.id, User.credits)
+            .filter(User.id.in_(user_ids))
+            .with_for_update()
+        }
+
+        already_refunded = []
+        refunds = []
+        credit_by_user: Dict[str, float] = defaultdict(float)
+        balance_txs = []
+        transactions = []
+        verification_updates = []
+        outcome_updates = []
+
+        for row in rows:
+            reference = f"refund_{row.id}"
+            if reference in existing:
+                logger.info(f"Verification {row.id} already refunded: {reference}")
+                already_refunded.append(row.id)
+                continue
+            if row.user_id not in balances:
+                logger.error(
+                    f"❌ REFUND FAILED: {row.id} - user {row.user_id} not found"
+                )
+                continue
+
+            reason = "timeout" if row.status == "pending" else row.status
+            amount = float(row.cost)
+            balances[row.user_id] += amount
+            credit_by_user[row.user_id] += amount
+            display_reason = refund_display_reason(reason)
+            balance_tx_id = str(uuid.uuid4())
+
+            balance_txs.append(
+                {
+                    "id": balance_tx_id,
+                    "user_id": row.user_id,
+                    "amount": abs(amount),
+                    "type": TransactionType.REFUND,
+                    "description": f"Refund: {row.service_name} ({display_reason})",
+                    "balance_after": balances[row.user_id],
+                    "created_at": now,
+                }
+            )
+            transactions.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": row.user_id,
+                    "amount": amount,
+                    "type": "verification_refund",
+                    "description": f"Auto-refund: {row.service_name} ({display_reason})",
+                    "status": "completed",
+                    "reference": reference,
+                    "created_at": now,
+                }
+            )
+            verification_updates.append(
+                {
+                    "b_id": row.id,
+                    "b_amount": amount,
+                    "b_reason": reason,
+                    "b_tx": balance_tx_id,
+                }
+            )
+            outcome_updates.append(
+                {
+                    "b_id": str(row.id),
+                    "b_amount": amount,
+                    "b_reason": reason,
+                    "b_tx": balance_tx_id,
+                }
+            )
+            refunds.append(
+                {
+                    "user_id": row.user_id,
+                    "verification_id": row.id,
+                    "service": row.service_name,
+                    "refund_amount": amount,
+                    "reason": reason,
+                    "new_balance": balances[row.user_id],
+                }
+            )
+
+        verifications = Verification.__table__
+        if already_refunded:
+            db.execute(
+                update(verifications)
+                .where(verifications.c.id.in_(already_refunded))
+                .values(refunded=True)
+            )
+        if not refunds:
+            return refunds, len(already_refunded)
+
+        result = db.execute(
+            update(verifications)
+            .where(
+                verifications.c.id == bindparam("b_id"),
+                or_(
+                    verifications.c.refunded == False,
+                    verifications.c.refunded.is_(None),
+                ),
+            )
+            .values(
+                refunded=True,
+                refund_amount=bindparam("b_amount"),
+                refund_reason=bindparam("b_reason"),
+                refund_transaction_id=bindparam("b_tx"),
+                refunded_at=now,
+            ),
+            verification_updates,
+        )
+        if (
+            db.get_bind().dialect.supports_sane_multi_rowcount
+            and result.rowcount != len(verification_updates)
+        ):
+            raise RuntimeError("verifications were refunded concurrently")
+
+        users = User.__table__
+        db.execute(
+            update(users)
+            .where(users.c.id == bindparam("b_id"))
+            .values(credits=users.c.credits + bindparam("b_amount")),
+            [
+                {"b_id": user_id, "b_amount": amount}
+                for user_id, amount in credit_by_user.items()
+            ],
+        )
+
+        db.execute(insert(BalanceTransaction), balance_txs)
+        db.execute(insert(Transaction), transactions)
+
+        outcomes = PurchaseOutcome.__table__
+        db.execute(
+            update(outcomes)
+            .where(outcomes.c.verification_id == bindparam("b_id"))
+            .values(
+                is_refunded=True,
+                sms_received=False,
+                refund_amount=bindparam("b_amount"),
+                refund_reason=bindparam("b_reason"),
+                refund_transaction_id=bindparam("b_tx"),
+                refund_requested_at=now,
+                refund_processed_at=now,
+                refund_latency_seconds=0.0,
+            ),
+            outcome_updates,
+        )
+
+        return refunds, len(already_refunded)
 
     async def enforce_single_verification(
         self, verification_id: str, db: Session
@@ -200,7 +418,7 @@ class RefundPolicyEnforcer:
                 return None
 
             # Check if refund needed
-            if verification.status not in ["timeout", "failed", "cancelled", "error"]:
+            if verification.status not in REFUNDABLE_STATUSES:
                 logger.debug(
                     f"Verification {verification_id} status={verification.status} - no refund needed"
                 )
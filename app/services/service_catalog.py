@@ -0,0 +1,287 @@
+"""In-process TextVerified service catalog for purchase pricing.
+
+Purchases look a service up in a dict snapshot held by this worker (L1)
+instead of decoding and scanning the whole service list from Redis each time.
+Snapshots are published to Redis (L2) by one script that bumps
+``tv:catalog:version`` and stores the payload under ``tv:catalog:<version>``
+together, so a worker that sees a new version always finds the complete
+snapshot and swaps its own in with one assignment. Workers look at the
+version at most every ``check_interval`` seconds.
+
+A snapshot older than ``fresh_ttl`` is still served while a refresh runs in
+the background; only a worker with no usable snapshot waits. Concurrent
+refreshes on a worker share one task, and a short Redis lock keeps workers
+from fetching from TextVerified at the same time.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+VERSION_KEY = "tv:catalog:version"
+SNAPSHOT_PREFIX = "tv:catalog:"
+LOCK_KEY = "tv:catalog:refresh_lock"
+LOCK_SECONDS = 30
+# How long a worker that lost the lock waits for the winner's snapshot
+LOCK_WAIT_SECONDS = 5.0
+LOCK_POLL_SECONDS = 0.25
+# Names-only snapshots (pricing still loading) are re-checked this often
+UNPRICED_TTL = 30.0
+
+# KEYS[1] version counter; ARGV: snapshot key prefix, payload, TTL seconds
+PUBLISH_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+redis.call('SET', ARGV[1] .. version, ARGV[2], 'EX', tonumber(ARGV[3]))
+return version
+"""
+
+# KEYS[1] lock; ARGV[1] the holder's token. Deletes the lock only if it is
+# still ours, not one another worker took after ours expired.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+Loader = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def _get_redis():
+    from app.core.unified_cache import cache
+
+    return cache.redis_client
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    loaded_at: float
+    services: Dict[str, Dict[str, Any]]
+
+    @property
+    def priced(self) -> bool:
+        return any(s.get("price") is not None for s in self.services.values())
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.loaded_at
+
+
+def _index(services: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    index: Dict[str, Dict[str, Any]] = {}
+    for service in services:
+        index.setdefault(service["id"], service)
+    return index
+
+
+class ServiceCatalog:
+    """service id -> service entry (id, name, price, cost)."""
+
+    def __init__(
+        self,
+        loader: Loader,
+        fresh_ttl: float,
+        max_stale: float,
+        check_interval: float,
+    ):
+        self._loader = loader
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = max_stale
+        self.check_interval = check_interval
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._refresh: Optional[asyncio.Task] = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.source_fetches = 0
+
+    async def get(
+        self, service_id: str, loader: Optional[Loader] = None
+    ) -> Optional[Dict[str, Any]]:
+        """The service's entry; ``loader`` overrides the default source."""
+        snapshot = await self.snapshot(loader)
+        return snapshot.services.get(service_id) if snapshot else None
+
+    async def snapshot(
+        self, loader: Optional[Loader] = None
+    ) -> Optional[CatalogSnapshot]:
+        await self._follow_shared()
+        current = self._snapshot
+        if current and current.age < self._fresh_for(current):
+            self.hits += 1
+            return current
+        if current and current.age < self.max_stale:
+            self.stale_hits += 1
+            self._start_refresh(loader)
+            return current
+        self.misses += 1
+        return await asyncio.shield(self._start_refresh(loader))
+
+    async def publish(self, services: List[Dict[str, Any]]) -> CatalogSnapshot:
+        """Install ``services`` here and announce them to the other workers."""
+        loaded_at = time.time()
+        version = (self._snapshot.version + 1) if self._snapshot else 1
+        redis = _get_redis()
+        if redis is not None:
+            payload = json.dumps({"loaded_at": loaded_at, "services": services})
+            try:
+                version = int(
+                    await redis.eval(
+                        PUBLISH_SCRIPT,
+                        1,
+                        VERSION_KEY,
+                        SNAPSHOT_PREFIX,
+                        payload,
+                        int(self.max_stale),
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Service catalog publish failed: {e}")
+        snapshot = CatalogSnapshot(version, loaded_at, _index(services))
+        self._install(snapshot, force=True)
+        return snapshot
+
+    def clear(self) -> None:
+        self._snapshot = None
+        self._refresh = None
+        self._checked_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses
+        current = self._snapshot
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                round((self.hits + self.stale_hits) / total, 4) if total else None
+            ),
+            "source_fetches": self.source_fetches,
+            "version": current.version if current else None,
+            "services": len(current.services) if current else 0,
+            "age_seconds": round(current.age, 1) if current else None,
+        }
+
+    def _fresh_for(self, snapshot: CatalogSnapshot) -> float:
+        return self.fresh_ttl if snapshot.priced else min(self.fresh_ttl, UNPRICED_TTL)
+
+    def _install(self, snapshot: CatalogSnapshot, force: bool = False) -> None:
+        current = self._snapshot
+        if force or current is None or snapshot.version > current.version:
+            self._snapshot = snapshot
+
+    def _start_refresh(self, loader: Optional[Loader]) -> asyncio.Task:
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(
+                self._refresh_snapshot(loader or self._loader)
+            )
+        return self._refresh
+
+    async def _follow_shared(self) -> None:
+        """Swap in a snapshot another worker published, if there is one."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        redis = _get_redis()
+        if redis is None:
+            return
+        try:
+            version = await redis.get(VERSION_KEY)
+            current = self._snapshot
+            if version and (current is None or int(version) > current.version):
+                shared = await self._read_shared(redis, int(version))
+                if shared:
+                    self._install(shared)
+        except Exception as e:
+            logger.debug(f"Service catalog version check skipped: {e}")
+
+    async def _read_shared(self, redis, version: int) -> Optional[CatalogSnapshot]:
+        raw = await redis.get(f"{SNAPSHOT_PREFIX}{version}")
+        if not raw:
+            return None
+        data = json.loads(raw)
+        return CatalogSnapshot(version, data["loaded_at"], _index(data["services"]))
+
+    async def _newer_shared(self, redis) -> Optional[CatalogSnapshot]:
+        """The published snapshot, if it is newer than ours and still fresh."""
+        version = await redis.get(VERSION_KEY)
+        current = self._snapshot
+        if not version or (current and int(version) <= current.version):
+            return None
+        shared = await self._read_shared(redis, int(version))
+        if shared and shared.age < self._fresh_for(shared):
+            return shared
+        return None
+
+    async def _refresh_snapshot(self, loader: Loader) -> Optional[CatalogSnapshot]:
+        redis = _get_redis()
+        token = uuid.uuid4().hex
+        locked = False
+        try:
+            if redis is not None:
+                shared = await self._newer_shared(redis)
+                if shared:
+                    self._install(shared)
+                    return shared
+
+                locked = bool(
+                    await redis.set(LOCK_KEY, token, nx=True, ex=LOCK_SECONDS)
+                )
+                if not locked:
+                    # Another worker is fetching; use its snapshot when it lands
+                    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+                    while time.monotonic() < deadline:
+                        await asyncio.sleep(LOCK_POLL_SECONDS)
+                        shared = await self._newer_shared(redis)
+                        if shared:
+                            self._install(shared)
+                            return shared
+        except Exception as e:
+            logger.debug(f"Service catalog shared refresh skipped: {e}")
+
+        try:
+            self.source_fetches += 1
+            services = await loader()
+            return await self.publish(services)
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            logger.warning(f"Service catalog refresh failed, serving stale: {e}")
+            return self._snapshot
+        finally:
+            if locked:
+                try:
+                    await redis.eval(RELEASE_LOCK_SCRIPT, 1, LOCK_KEY, token)
+                except Exception as e:
+                    logger.debug(f"Service catalog lock release failed: {e}")
+
+
+async def _load_services() -> List[Dict[str, Any]]:
+    from app.services.textverified_service import TextVerifiedService
+
+    return await TextVerifiedService().get_services_list()
+
+
+def _build_catalog() -> ServiceCatalog:
+    settings = get_settings()
+    return ServiceCatalog(
+        loader=_load_services,
+        fresh_ttl=settings.service_catalog_fresh_seconds,
+        max_stale=settings.service_catalog_max_stale_seconds,
+        check_interval=settings.service_catalog_check_seconds,
+    )
+
+
+service_catalog = _build_catalog()
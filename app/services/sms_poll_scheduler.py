@@ -0,0 +1,259 @@
+"""Central scheduler for SMS polling.
+
+Replaces one long-lived asyncio task per verification with a single loop
+driving a heap of poll jobs keyed by their next-due time. Every tick pops
+all jobs that are due, groups them by provider and hands each group to a
+batch handler in one call. The handler decides, per job, whether to poll
+again (and when) or to drop the job.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Jobs due within this window of "now" are folded into the same tick so
+# verifications purchased close together share one provider batch.
+TICK_RESOLUTION_SECONDS = 0.25
+
+
+@dataclass
+class PollJob:
+    """Everything needed to poll one verification without a DB session."""
+
+    verification_id: str
+    provider: str
+    activation_id: str
+    deadline: float
+    user_id: Optional[str] = None
+    service_name: Optional[str] = None
+    phone_number: Optional[str] = None
+    capability: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+    errors: int = 0
+    waiting_notified: bool = False
+    due_at: float = 0.0
+    seq: int = 0
+
+
+# Maps verification_id -> seconds until next poll, or None to drop the job.
+BatchResult = Dict[str, Optional[float]]
+BatchHandler = Callable[[str, List[PollJob]], Awaitable[BatchResult]]
+
+
+class PollScheduler:
+    """Heap-based timer that batches due poll jobs per provider."""
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        error_backoff_seconds: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.handler = handler
+        self.error_backoff_seconds = error_backoff_seconds
+        self.clock = clock
+        self._heap: List[Tuple[float, int, str]] = []
+        self._jobs: Dict[str, PollJob] = {}
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._in_flight_ids: set = set()
+        self._batches: set = set()
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+        self.ticks = 0
+        self.dispatched = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Job management
+    # ------------------------------------------------------------------
+
+    def __contains__(self, verification_id: str) -> bool:
+        return verification_id in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def job_ids(self) -> List[str]:
+        return list(self._jobs.keys())
+
+    def get(self, verification_id: str) -> Optional[PollJob]:
+        return self._jobs.get(verification_id)
+
+    def schedule(self, job: PollJob, delay: float = 0.0) -> bool:
+        """Add a job. Returns False if the verification is already scheduled."""
+        if job.verification_id in self._jobs:
+            return False
+        self._jobs[job.verification_id] = job
+        self._push(job, delay)
+        return True
+
+    def cancel(self, verification_id: str) -> bool:
+        """Drop a job. Its heap entry is discarded lazily when it surfaces."""
+        return self._jobs.pop(verification_id, None) is not None
+
+    def _push(self, job: PollJob, delay: float) -> None:
+        job.seq = next(self._counter)
+        job.due_at = self.clock() + max(0.0, delay)
+        heapq.heappush(self._heap, (job.due_at, job.seq, job.verification_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _pop_due(self, now: float) -> List[PollJob]:
+        due = []
+        horizon = now + TICK_RESOLUTION_SECONDS
+        while self._heap and self._heap[0][0] <= horizon:
+            due_at, seq, verification_id = heapq.heappop(self._heap)
+            job = self._jobs.get(verification_id)
+            if job is None or job.seq != seq:
+                continue  # cancelled or superseded entry
+            due.append(job)
+        return due
+
+    def _next_delay(self, now: float) -> Optional[float]:
+        while self._heap:
+            due_at, seq, verification_id = self._heap[0]
+            job = self._jobs.get(verification_id)
+            if job is None or job.seq != seq:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, due_at - now)
+        return None
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    async def run(self):
+        """Drive the heap until stop() is called."""
+        self._running = True
+        self._wakeup = asyncio.Event()
+        logger.info("SMS poll scheduler started")
+        try:
+            while self._running:
+                now = self.clock()
+                delay = self._next_delay(now)
+                if delay is None or delay > TICK_RESOLUTION_SECONDS:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                self._tick(now)
+                # Yield so dispatched batches start before the next pop
+                await asyncio.sleep(0)
+        finally:
+            self._running = False
+            for task in list(self._batches):
+                task.cancel()
+            self._batches.clear()
+            logger.info("SMS poll scheduler stopped")
+
+    def stop(self):
+        self._running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _tick(self, now: float) -> None:
+        due = self._pop_due(now)
+        if not due:
+            return
+        self.ticks += 1
+        lag = max(0.0, now - min(job.due_at for job in due))
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+        by_provider: Dict[str, List[PollJob]] = defaultdict(list)
+        for job in due:
+            by_provider[job.provider].append(job)
+
+        for provider, jobs in by_provider.items():
+            self._in_flight[provider] += len(jobs)
+            self._in_flight_ids.update(job.verification_id for job in jobs)
+            self.dispatched += len(jobs)
+            task = asyncio.create_task(self._run_batch(provider, jobs))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+        self._publish_metrics()
+
+    async def _run_batch(self, provider: str, jobs: List[PollJob]) -> None:
+        try:
+            result = await self.handler(provider, jobs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Poll batch for {provider} failed: {e}", exc_info=True)
+            result = {job.verification_id: self.error_backoff_seconds for job in jobs}
+        finally:
+            self._in_flight[provider] -= len(jobs)
+            self._in_flight_ids.difference_update(job.verification_id for job in jobs)
+
+        for job in jobs:
+            if self._jobs.get(job.verification_id) is not job:
+                continue  # cancelled while in flight
+            job.attempts += 1
+            next_delay = result.get(job.verification_id)
+            if next_delay is None:
+                self._jobs.pop(job.verification_id, None)
+            else:
+                self._push(job, next_delay)
+        self._publish_metrics()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def queue_depth(self) -> int:
+        """Jobs waiting in the heap (excludes batches currently in flight)."""
+        return len(self._jobs) - len(self._in_flight_ids)
+
+    def in_flight(self) -> Dict[str, int]:
+        return {p: n for p, n in self._in_flight.items() if n > 0}
+
+    def current_lag(self) -> float:
+        """How far behind schedule the oldest due job is right now."""
+        delay = self._next_delay(self.clock())
+        if delay is None or delay > 0:
+            return 0.0
+        due_at = self._heap[0][0]
+        return max(0.0, self.clock() - due_at)
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._running,
+            "scheduled": len(self._jobs),
+            "queue_depth": self.queue_depth(),
+            "in_flight": self.in_flight(),
+            "lag_seconds": round(self.current_lag(), 3),
+            "last_tick_lag_seconds": round(self.last_lag_seconds, 3),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "ticks": self.ticks,
+            "dispatched": self.dispatched,
+        }
+
+    def _publish_metrics(self) -> None:
+        try:
+            from app.core.metrics import update_sms_poll_metrics
+
+            update_sms_poll_metrics(
+                self.queue_depth(), self.last_lag_seconds, dict(self._in_flight)
+            )
+        except Exception:
+            pass
@@ -1,6 +1,10 @@
-"""SMS polling service — TextVerified only."""
+"""SMS polling service — one scheduler for all providers."""
 
 import asyncio
+import math
+import re
+import time
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
@@ -14,35 +18,50 @@ from app.services.notification_dispatcher import NotificationDispatcher
 from app.services.notification_service import NotificationService
 from app.services.purchase_intelligence import PurchaseIntelligenceService
 from app.services.refund_policy_enforcer import refund_policy_enforcer
+from app.services.sms_poll_scheduler import BatchResult, PollJob, PollScheduler
 from app.services.textverified_service import TextVerifiedService
 
 logger = get_logger(__name__)
 
 
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _digits(phone_number: Optional[str]) -> str:
+    return re.sub(r"\D", "", phone_number or "")
+
+
 class SMSPollingService:
+    """Polls providers for SMS through one shared scheduler.
+
+    Each pending verification is a ``PollJob`` in ``PollScheduler``. On every
+    tick the due jobs are grouped by provider and checked once each; a DB
+    session is opened only when a code arrives or the job times out.
+    """
+
     def __init__(self):
         self.textverified = TextVerifiedService()
         self.adaptive = AdaptivePollingService()
-        self.polling_tasks: Dict[str, asyncio.Task] = {}
+        self.scheduler = PollScheduler(
+            self._poll_batch,
+            error_backoff_seconds=settings.sms_polling_error_backoff_seconds,
+        )
+        self.max_concurrency_per_provider = 20
+        self._scheduler_task: Optional[asyncio.Task] = None
         self.is_running = False
+        self.sweeps = 0
+        self.sweep_matches = 0
+        self.sweep_fallbacks = 0
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
 
     async def start_polling(self, verification_id: str, phone_number: str = None):
         """Start polling for SMS for a specific verification."""
-        if verification_id in self.polling_tasks:
+        if verification_id in self.scheduler:
             return
-        task = asyncio.create_task(self._poll_verification(verification_id))
-        self.polling_tasks[verification_id] = task
-        logger.info(f"Started polling for verification {verification_id}")
-
-    async def stop_polling(self, verification_id: str):
-        """Stop polling for a specific verification."""
-        if verification_id in self.polling_tasks:
-            task = self.polling_tasks.pop(verification_id)
-            task.cancel()
-            logger.info(f"Stopped polling for verification {verification_id}")
-
-    async def _poll_verification(self, verification_id: str):
-        """Poll provider for SMS using provider-specific method."""
         db = None
         try:
             db = SessionLocal()
@@ -51,275 +70,407 @@ class SMSPollingService:
                 .filter(Verification.id == verification_id)
                 .first()
             )
+            job = self._build_job(verification) if verification else None
+        finally:
+            if db:
+                db.close()
 
-            if not verification or verification.status != "pending":
-                logger.info(
-                    f"Verification {verification_id} no longer pending, stopping poll"
-                )
-                return
+        if job is None:
+            logger.info(f"Verification {verification_id} not pollable, not scheduling")
+            return
+        self._schedule(job)
 
-            if not verification.activation_id:
-                logger.warning(
-                    f"No activation_id for verification {verification_id}, stopping poll"
-                )
-                return
+    async def stop_polling(self, verification_id: str):
+        """Stop polling for a specific verification."""
+        if self.scheduler.cancel(verification_id):
+            logger.info(f"Stopped polling for verification {verification_id}")
 
-            # Calculate timeout
-            timeout_seconds = settings.sms_polling_max_minutes * 60
-            if hasattr(verification, "ends_at") and verification.ends_at:
-                ends_at = verification.ends_at
-                if ends_at.tzinfo is None:
-                    ends_at = ends_at.replace(tzinfo=timezone.utc)
-                remaining = (ends_at - datetime.now(timezone.utc)).total_seconds()
-                if remaining > 0:
-                    timeout_seconds = min(remaining, timeout_seconds)
-
-            # Dispatch by provider
-            provider = getattr(verification, "provider", "textverified")
-            if provider == "textverified":
-                await self._poll_textverified(verification, db, timeout_seconds)
-            elif provider == "telnyx":
-                await self._poll_telnyx(verification, db, timeout_seconds)
-            elif provider == "5sim":
-                await self._poll_fivesim(verification, db, timeout_seconds)
-            elif provider == "pvapins":
-                await self._poll_pvapins(verification, db, timeout_seconds)
+    def _schedule(self, job: PollJob) -> None:
+        if self.scheduler.schedule(job):
+            self._ensure_scheduler()
+            logger.info(
+                f"Scheduled polling for verification {job.verification_id} "
+                f"(provider={job.provider})"
+            )
+
+    def _ensure_scheduler(self) -> None:
+        if self._scheduler_task is None or self._scheduler_task.done():
+            self._scheduler_task = asyncio.create_task(self.scheduler.run())
+
+    def _build_job(self, verification) -> Optional[PollJob]:
+        """Snapshot the fields polling needs so no session is held open."""
+        if verification.status != "pending":
+            return None
+        if not verification.activation_id:
+            logger.warning(
+                f"No activation_id for verification {verification.id}, not polling"
+            )
+            return None
+
+        timeout_seconds = settings.sms_polling_max_minutes * 60
+        ends_at = getattr(verification, "ends_at", None)
+        if ends_at:
+            if ends_at.tzinfo is None:
+                ends_at = ends_at.replace(tzinfo=timezone.utc)
+            remaining = (ends_at - datetime.now(timezone.utc)).total_seconds()
+            if remaining > 0:
+                timeout_seconds = min(remaining, timeout_seconds)
+
+        return PollJob(
+            verification_id=verification.id,
+            provider=getattr(verification, "provider", None) or "textverified",
+            activation_id=verification.activation_id,
+            deadline=time.monotonic() + timeout_seconds,
+            user_id=verification.user_id,
+            service_name=verification.service_name,
+            phone_number=verification.phone_number,
+            capability=getattr(verification, "capability", None),
+            created_at=verification.created_at,
+        )
+
+    def _next_interval(self, job: PollJob) -> float:
+        """Interval from the latency model, or the configured defaults when cold."""
+        now = time.monotonic()
+        elapsed = now - job.started_at
+        interval = self.adaptive.interval_for(job.service_name, elapsed)
+        if interval is None:
+            if elapsed < 60:
+                interval = settings.sms_polling_initial_interval_seconds
             else:
-                logger.warning(
-                    f"Unknown provider '{provider}' for verification {verification_id}, "
-                    f"handling as timeout"
+                interval = settings.sms_polling_later_interval_seconds
+        return min(interval, max(0.0, job.deadline - now))
+
+    def _sweep_enabled(self) -> bool:
+        return bool(settings.sms_polling_sweep_enabled and self.textverified.enabled)
+
+    def _align_to_sweep(self, job: PollJob, delay: float) -> float:
+        """Round a TextVerified job's next poll up to the shared sweep grid.
+
+        Jobs that land in the same grid slot become due on the same scheduler
+        tick, so one sweep covers all of them.
+        """
+        if job.provider != "textverified" or not self._sweep_enabled():
+            return delay
+        grid = settings.sms_polling_sweep_interval_seconds
+        now = time.monotonic()
+        aligned = math.ceil((now + delay) / grid) * grid - now
+        return min(aligned, max(0.0, job.deadline - now))
+
+    # ------------------------------------------------------------------
+    # Batch polling
+    # ------------------------------------------------------------------
+
+    async def _poll_batch(self, provider: str, jobs: List[PollJob]) -> BatchResult:
+        """Check every due job for one provider; returns next delay per job.
+
+        TextVerified batches of ``sms_polling_sweep_min_batch`` or more are
+        checked against one account-wide SMS listing, and their completions
+        are written in a single DB session.
+        """
+        completions: Optional[list] = None
+        if (
+            provider == "textverified"
+            and self._sweep_enabled()
+            and len(jobs) >= settings.sms_polling_sweep_min_batch
+        ):
+            checker = await self._sweep_checker(jobs)
+            completions = []
+        else:
+            checker = self._get_checker(provider)
+        semaphore = asyncio.Semaphore(self.max_concurrency_per_provider)
+        result: BatchResult = {}
+
+        async def _one(job: PollJob):
+            async with semaphore:
+                result[job.verification_id] = await self._poll_job(
+                    job, checker, completions
                 )
-                await self._handle_timeout(verification, db, reason="sms_timeout")
 
-        except asyncio.CancelledError:
-            logger.info(f"Polling cancelled for verification {verification_id}")
-        except Exception as e:
-            logger.error(
-                f"Unexpected polling error for {verification_id}: {str(e)}",
-                exc_info=True,
+        await asyncio.gather(*(_one(job) for job in jobs))
+        if completions:
+            await self._finalize_success_bulk(completions)
+        return result
+
+    def _get_checker(self, provider: str):
+        """Return a one-shot ``check(job) -> (sms_text, code) | None`` callable."""
+        if provider == "textverified":
+            return self._check_sms
+        if provider == "telnyx":
+            from app.services.providers.telnyx_adapter import TelnyxAdapter
+
+            return self._adapter_checker(TelnyxAdapter())
+        if provider == "5sim":
+            from app.services.providers.fivesim_adapter import FiveSimAdapter
+
+            return self._adapter_checker(FiveSimAdapter())
+        if provider == "pvapins":
+            return self._check_sms
+        return None
+
+    async def _poll_job(
+        self, job: PollJob, checker, completions: Optional[list] = None
+    ) -> Optional[float]:
+        """Poll one job once. Returns seconds until next poll, or None if done.
+
+        When ``completions`` is given, received codes are appended to it for
+        the caller to finalize in bulk instead of being finalized here.
+        """
+        if checker is None:
+            logger.warning(
+                f"Unknown provider '{job.provider}' for verification "
+                f"{job.verification_id}, handling as timeout"
             )
-        finally:
-            if db:
-                db.close()
-            if verification_id in self.polling_tasks:
-                self.polling_tasks.pop(verification_id)
+            await self._finalize_timeout(job)
+            return None
 
-    async def _poll_textverified(self, verification, db, timeout_seconds: float):
-        """Poll TextVerified using standard sms.incoming() method."""
-        tv_details = await self.textverified.get_verification_details(
-            verification.activation_id
-        )
+        if job.attempts == 0:
+            self._on_first_poll(job)
+        elif not job.waiting_notified and time.monotonic() - job.started_at >= 20:
+            job.waiting_notified = True
+            asyncio.create_task(self._notify_waiting(job.user_id, job.service_name))
 
-        if not tv_details:
+        try:
+            received = await checker(job)
+        except Exception as e:
+            job.errors += 1
             logger.warning(
-                f"Could not get TV details for {verification.activation_id}, "
-                f"falling back to legacy polling"
+                f"{job.provider} polling error for {job.verification_id}: {e}"
             )
-            await self._poll_legacy(verification, db, timeout_seconds)
-            return
+            received = None
+            if time.monotonic() < job.deadline:
+                return settings.sms_polling_error_backoff_seconds
+
+        if received:
+            sms_text, code = received
+            if completions is not None:
+                completions.append((job, sms_text, code))
+            else:
+                await self._finalize_success(job, sms_text, code)
+            return None
 
-        # Build minimal object for sms.incoming()
-        class _TVVerif:
-            def __init__(self, d, _created_at, _service_name="unknown"):
-                self.number = d["number"]
-                self.created_at = _created_at
-                self.id = d["id"]
-                self.ends_at = d.get("ends_at")
-                self.service_name = _service_name
-
-        tv_obj = _TVVerif(
-            tv_details, verification.created_at, verification.service_name
-        )
+        if time.monotonic() >= job.deadline:
+            await self._finalize_timeout(job)
+            return None
 
-        # Phase 11: Late-binding carrier enrichment
-        if tv_details.get("carrier"):
-            asyncio.create_task(
-                PurchaseIntelligenceService.enrich_outcome_carrier(
-                    verification.id, tv_details.get("carrier")
-                )
-            )
+        self._broadcast_progress(job, "polling")
+        return self._align_to_sweep(job, self._next_interval(job))
 
+    def _on_first_poll(self, job: PollJob) -> None:
         logger.info(
-            f"Polling {verification.id} via sms.incoming() "
-            f"(timeout={timeout_seconds:.0f}s)"
+            f"Polling {job.verification_id} via {job.provider} "
+            f"(timeout={job.deadline - time.monotonic():.0f}s)"
         )
+        self._broadcast_progress(job, "polling_started")
+        if job.provider == "textverified":
+            asyncio.create_task(self._enrich_carrier(job))
+
+    async def _enrich_carrier(self, job: PollJob) -> None:
+        """Phase 11: Late-binding carrier enrichment."""
+        try:
+            tv_details = await self.textverified.get_verification_details(
+                job.activation_id
+            )
+            if tv_details and tv_details.get("carrier"):
+                await PurchaseIntelligenceService.enrich_outcome_carrier(
+                    job.verification_id, tv_details.get("carrier")
+                )
+        except Exception as e:
+            logger.debug(f"Carrier enrichment skipped for {job.verification_id}: {e}")
 
+    def _broadcast_progress(self, job: PollJob, status: str) -> None:
         try:
             from app.services.event_broadcaster import event_broadcaster
 
             asyncio.create_task(
                 event_broadcaster.broadcast_verification_event(
-                    user_id=verification.user_id,
+                    user_id=job.user_id,
                     event_type="progress",
-                    service_name=verification.service_name or "",
-                    verification_id=verification.id,
-                    status="polling_started",
-                    metadata={"provider": "textverified", "timeout": timeout_seconds},
+                    service_name=job.service_name or "",
+                    verification_id=job.verification_id,
+                    status=status,
+                    metadata={"provider": job.provider},
                 )
             )
         except Exception:
             pass
 
-        # Notify user we're still waiting
-        asyncio.create_task(
-            self._notify_waiting(verification.user_id, verification.service_name)
+    async def _check_sms(self, job: PollJob):
+        """Single non-blocking TextVerified ``check_sms`` (also PVApins fallback)."""
+        sms_data = await self.textverified.check_sms(
+            job.activation_id,
+            created_after=job.created_at,
+            phone_number=job.phone_number,
         )
-
-        # Standard TextVerified poll
-        result = await self.textverified.poll_sms_standard(
-            tv_obj, timeout_seconds=timeout_seconds
-        )
-
-        # Reload verification
-        db.expire(verification)
-        verification = (
-            db.query(Verification).filter(Verification.id == verification.id).first()
+        if not sms_data or not sms_data.get("messages"):
+            return None
+
+        latest = sms_data["messages"][-1]
+        sms_text = latest if isinstance(latest, str) else latest.get("text", "")
+        return self._received(job, sms_text, self._extract_code(latest))
+
+    @staticmethod
+    def _received(job: PollJob, sms_text: str, code: Optional[str]):
+        # Voice fallback: no parsable code but a transcription came back
+        if not code and job.capability == "voice" and sms_text:
+            return sms_text, "VOICE_RECV"
+        if not code:
+            return None
+        return sms_text, code
+
+    async def _sweep_checker(self, jobs: List[PollJob]):
+        """Fetch recent account SMS once and match them to jobs by number.
+
+        Falls back to per-job ``_check_sms`` if the sweep request fails, for
+        jobs without a number, and for jobs older than the fetched window.
+        """
+        created = [_as_utc(job.created_at) for job in jobs if job.created_at]
+        if not created:
+            return self._check_sms
+        try:
+            messages, complete = await self.textverified.get_recent_sms(
+                min(created), max_pages=settings.sms_polling_sweep_max_pages
+            )
+        except Exception as e:
+            logger.warning(f"TextVerified SMS sweep failed, checking per job: {e}")
+            return self._check_sms
+        self.sweeps += 1
+
+        by_number: Dict[str, list] = defaultdict(list)
+        for sms in messages:
+            by_number[_digits(sms.to)].append(sms)
+        # An incomplete sweep only covers SMS newer than its oldest message
+        covered_since = (
+            None
+            if complete
+            else min((_as_utc(m.created_at) for m in messages), default=None)
         )
-        if not verification or verification.status != "pending":
-            return
 
-        if result.get("success"):
-            # Prepare metadata for completion
-            code = result.get("code", "")
-            text = result.get("sms", "")
-            transcription = result.get("transcription")
-            audio_url = result.get("audio_url")
-
-            # Fallback for voice: if no code but have transcription, use transcription
-            if verification.capability == "voice" and not code and transcription:
-                code = "VOICE_RECV"
-                text = transcription
-
-            if code:
-                await self._complete_verification(
-                    verification,
-                    db,
-                    text,
-                    code,
-                    transcription=transcription,
-                    audio_url=audio_url,
-                )
-                return
-            elif verification.capability == "voice" and audio_url:
-                # Audio received — mark complete immediately, don't re-poll
-                # User can play the audio from the status endpoint
-                await self._complete_verification(
-                    verification,
-                    db,
-                    audio_url,
-                    "VOICE_RECV",
-                    transcription=transcription,
-                    audio_url=audio_url,
+        async def _check(job: PollJob):
+            created_at = _as_utc(job.created_at) if job.created_at else None
+            if (
+                not job.phone_number
+                or created_at is None
+                or (
+                    not complete
+                    and (covered_since is None or created_at < covered_since)
                 )
+            ):
+                self.sweep_fallbacks += 1
+                return await self._check_sms(job)
+
+            fresh = [
+                m
+                for m in by_number.get(_digits(job.phone_number), [])
+                if _as_utc(m.created_at) >= created_at
+            ]
+            if not fresh:
+                return None
+            latest = max(fresh, key=lambda m: _as_utc(m.created_at))
+            self.sweep_matches += 1
+            code = TextVerifiedService._parse_code(
+                latest.parsed_code, latest.sms_content
+            )
+            return self._received(job, latest.sms_content or "", code)
+
+        return _check
+
+    def _adapter_checker(self, adapter):
+        async def _check(job: PollJob):
+            messages = await adapter.check_messages(job.activation_id)
+            if not messages:
+                return None
+            msg = messages[-1]
+            return msg.text, msg.code
+
+        return _check
+
+    @staticmethod
+    def _extract_code(message) -> Optional[str]:
+        if isinstance(message, dict) and message.get("code"):
+            return message["code"]
+        text = message if isinstance(message, str) else message.get("text", "")
+        hyphen = re.findall(r"\b(\d{3}-\d{3})\b", text)
+        plain = re.findall(r"\b(\d{4,8})\b", text)
+        if hyphen:
+            return hyphen[-1].replace("-", "")
+        if plain:
+            return plain[-1]
+        return None
+
+    async def _finalize_success(self, job: PollJob, sms_text: str, code: str):
+        """Open a short-lived session and record the received code."""
+        db = None
+        try:
+            db = SessionLocal()
+            verification = (
+                db.query(Verification)
+                .filter(Verification.id == job.verification_id)
+                .first()
+            )
+            if not verification or verification.status != "pending":
                 return
-            else:
-                logger.warning(f"Poll success but no usable code for {verification.id}")
-                await self._handle_timeout(verification, db, reason="sms_timeout")
-        else:
-            await self._handle_timeout(verification, db, reason="sms_timeout")
-
-    async def _poll_telnyx(self, verification, db, timeout_seconds: float):
-        """Poll Telnyx for SMS with adaptive backoff."""
-        from app.services.providers.telnyx_adapter import TelnyxAdapter
-
-        adapter = TelnyxAdapter()
-        logger.info(
-            f"Polling {verification.id} via Telnyx (timeout={timeout_seconds:.0f}s)"
-        )
-
-        start_time = datetime.now(timezone.utc)
-        while (
-            datetime.now(timezone.utc) - start_time
-        ).total_seconds() < timeout_seconds:
-            # Phase 12: Adaptive Intelligence
-            delay = self.adaptive.get_optimal_interval(
-                db, service=verification.service_name
+            await self._complete_verification(verification, db, sms_text, code)
+        except Exception as e:
+            logger.error(
+                f"Failed to complete verification {job.verification_id}: {e}",
+                exc_info=True,
             )
+        finally:
+            if db:
+                db.close()
 
-            try:
-                messages = await adapter.check_messages(verification.activation_id)
-                if messages:
-                    msg = messages[-1]
-                    await self._complete_verification(
-                        verification, db, msg.text, msg.code
-                    )
-                    return
-            except Exception as e:
-                logger.warning(f"Telnyx polling error for {verification.id}: {e}")
-
-            try:
-                from app.services.event_broadcaster import event_broadcaster
-
-                asyncio.create_task(
-                    event_broadcaster.broadcast_verification_event(
-                        user_id=verification.user_id,
-                        event_type="progress",
-                        service_name=verification.service_name or "",
-                        verification_id=verification.id,
-                        status="polling",
-                        metadata={"provider": "telnyx"},
-                    )
+    async def _finalize_success_bulk(self, completions: list):
+        """Record several received codes with one short-lived session."""
+        by_id = {
+            job.verification_id: (sms_text, code) for job, sms_text, code in completions
+        }
+        db = None
+        try:
+            db = SessionLocal()
+            verifications = (
+                db.query(Verification)
+                .filter(
+                    Verification.id.in_(list(by_id)),
+                    Verification.status == "pending",
                 )
-            except Exception:
-                pass
-
-            await asyncio.sleep(delay)
-
-        await self._handle_timeout(verification, db, reason="sms_timeout")
-
-    async def _poll_fivesim(self, verification, db, timeout_seconds: float):
-        """Poll 5sim for SMS with adaptive backoff."""
-        from app.services.providers.fivesim_adapter import FiveSimAdapter
-
-        adapter = FiveSimAdapter()
-        logger.info(
-            f"Polling {verification.id} via 5sim (timeout={timeout_seconds:.0f}s)"
-        )
-
-        start_time = datetime.now(timezone.utc)
-        while (
-            datetime.now(timezone.utc) - start_time
-        ).total_seconds() < timeout_seconds:
-            # Phase 12: Adaptive Intelligence
-            delay = self.adaptive.get_optimal_interval(
-                db, service=verification.service_name
+                .all()
             )
-
-            try:
-                messages = await adapter.check_messages(verification.activation_id)
-                if messages:
-                    msg = messages[-1]
-                    await self._complete_verification(
-                        verification, db, msg.text, msg.code
-                    )
-                    return
-            except Exception as e:
-                logger.warning(f"5sim polling error for {verification.id}: {e}")
-
-            try:
-                from app.services.event_broadcaster import event_broadcaster
-
-                asyncio.create_task(
-                    event_broadcaster.broadcast_verification_event(
-                        user_id=verification.user_id,
-                        event_type="progress",
-                        service_name=verification.service_name or "",
-                        verification_id=verification.id,
-                        status="polling",
-                        metadata={"provider": "5sim"},
+            for verification in verifications:
+                sms_text, code = by_id[verification.id]
+                try:
+                    await self._complete_verification(verification, db, sms_text, code)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to complete verification {verification.id}: {e}",
+                        exc_info=True,
                     )
-                )
-            except Exception:
-                pass
-
-            await asyncio.sleep(delay)
-
-        await self._handle_timeout(verification, db, reason="sms_timeout")
+        except Exception as e:
+            logger.error(f"Bulk SMS completion failed: {e}", exc_info=True)
+        finally:
+            if db:
+                db.close()
 
-    async def _poll_pvapins(self, verification, db, timeout_seconds: float):
-        """Poll PVApins for SMS."""
-        logger.info(f"Polling {verification.id} via PVApins (fallback to legacy)")
-        await self._poll_legacy(verification, db, timeout_seconds)
+    async def _finalize_timeout(self, job: PollJob):
+        """Open a short-lived session and fail the verification."""
+        db = None
+        try:
+            db = SessionLocal()
+            verification = (
+                db.query(Verification)
+                .filter(Verification.id == job.verification_id)
+                .first()
+            )
+            if not verification or verification.status != "pending":
+                return
+            await self._handle_timeout(verification, db, reason="sms_timeout")
+        except Exception as e:
+            logger.error(
+                f"Failed to time out verification {job.verification_id}: {e}",
+                exc_info=True,
+            )
+        finally:
+            if db:
+                db.close()
 
     async def _complete_verification(
         self,
@@ -352,6 +503,7 @@ class SMSPollingService:
                 else v.created_at
             )
             latency = int((v.completed_at - created_at).total_seconds())
+            self.adaptive.record_completion(v.service_name, latency)
 
         asyncio.create_task(
             PurchaseIntelligenceService.update_sms_received(
@@ -468,6 +620,8 @@ class SMSPollingService:
             refund_eligible=True,
         )
 
+        self.adaptive.record_timeout(verification.service_name)
+
         # Phase 10: Categorization
         outcome_category = "NETWORK"
 
@@ -516,8 +670,7 @@ class SMSPollingService:
         logger.info(f"Verification {verification.id} timed out")
 
     async def _notify_waiting(self, user_id: str, service_name: str):
-        """Send 'still waiting' notification after 20 seconds."""
-        await asyncio.sleep(20)
+        """Send 'still waiting' notification (scheduled ~20s into polling)."""
         db = None
         try:
             db = SessionLocal()
@@ -534,62 +687,12 @@ class SMSPollingService:
             if db:
                 db.close()
 
-    async def _poll_legacy(
-        self, verification: Verification, db, timeout_seconds: float
-    ):
-        """Legacy polling fallback with progressive delay."""
-        import re
-
-        start_time = datetime.now(timezone.utc)
-        delay = 2.0
-        while (
-            datetime.now(timezone.utc) - start_time
-        ).total_seconds() < timeout_seconds:
-            if verification.status != "pending":
-                break
-
-            try:
-                sms_data = await self.textverified.check_sms(
-                    verification.activation_id,
-                    created_after=verification.created_at,
-                )
-                if sms_data and sms_data.get("messages"):
-                    latest = sms_data["messages"][-1]
-                    sms_text = (
-                        latest if isinstance(latest, str) else latest.get("text", "")
-                    )
-                    pre_parsed = (
-                        latest.get("code", "") if isinstance(latest, dict) else ""
-                    )
-
-                    if pre_parsed:
-                        extracted_code = pre_parsed
-                    else:
-                        hyphen = re.findall(r"\b(\d{3}-\d{3})\b", sms_text)
-                        plain = re.findall(r"\b(\d{4,8})\b", sms_text)
-                        extracted_code = (
-                            hyphen[-1].replace("-", "")
-                            if hyphen
-                            else plain[-1] if plain else None
-                        )
-
-                    if extracted_code:
-                        await self._complete_verification(
-                            verification, db, sms_text, extracted_code
-                        )
-                        return
-            except Exception as e:
-                logger.warning(f"Legacy check_sms failed: {e}")
-
-            await asyncio.sleep(delay)
-            delay = min(delay * 1.5, 10.0)
-
-        await self._handle_timeout(verification, db, reason="sms_timeout")
-
     async def start_background_service(self):
-        """Start the background polling service."""
+        """Start the scheduler and keep it in sync with pending verifications."""
         self.is_running = True
+        self._ensure_scheduler()
         logger.info("SMS polling service started")
+        self._warm_latency_model()
 
         while self.is_running:
             db = None
@@ -600,9 +703,10 @@ class SMSPollingService:
                     .filter(Verification.status == "pending")
                     .all()
                 )
-                for v in pending:
-                    if v.id not in self.polling_tasks:
-                        await self.start_polling(v.id, v.phone_number)
+                db.close()
+                db = None
+                self._sync_pending(pending)
+                self.adaptive.model.maybe_persist()
                 await asyncio.sleep(30)
             except Exception as e:
                 logger.error(f"Background service error: {str(e)}")
@@ -611,17 +715,56 @@ class SMSPollingService:
                 if db:
                     db.close()
 
+    def _warm_latency_model(self) -> None:
+        db = None
+        try:
+            db = SessionLocal()
+            self.adaptive.warm(db)
+        except Exception as e:
+            logger.warning(f"Latency model warm-up failed: {e}")
+        finally:
+            if db:
+                db.close()
+
+    def _sync_pending(self, pending) -> None:
+        """Schedule new pending verifications and drop ones no longer pending."""
+        pending_ids = set()
+        for v in pending:
+            pending_ids.add(v.id)
+            if v.id not in self.scheduler:
+                job = self._build_job(v)
+                if job:
+                    self._schedule(job)
+        for verification_id in self.scheduler.job_ids():
+            if verification_id not in pending_ids:
+                self.scheduler.cancel(verification_id)
+
     async def stop_background_service(self):
         """Stop the background polling service."""
         self.is_running = False
-        for task in self.polling_tasks.values():
-            task.cancel()
-        self.polling_tasks.clear()
+        self.scheduler.stop()
+        if self._scheduler_task is not None:
+            self._scheduler_task.cancel()
+            self._scheduler_task = None
+        for verification_id in self.scheduler.job_ids():
+            self.scheduler.cancel(verification_id)
+        self.adaptive.model.persist()
         logger.info("SMS polling service stopped")
 
     def get_active_polls(self) -> List[str]:
         """Get list of active polling verification IDs."""
-        return list(self.polling_tasks.keys())
+        return self.scheduler.job_ids()
+
+    def get_polling_stats(self) -> Dict:
+        """Scheduler queue depth, lag and per-provider in-flight counts."""
+        stats = self.scheduler.stats()
+        stats["textverified_sweep"] = {
+            "enabled": self._sweep_enabled(),
+            "sweeps": self.sweeps,
+            "matches": self.sweep_matches,
+            "fallbacks": self.sweep_fallbacks,
+        }
+        return stats
 
 
 sms_polling_service = SMSPollingService()
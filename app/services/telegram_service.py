@@ -8,6 +8,7 @@ import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.http_clients import get_http_client
 from app.models.telegram import TelegramConnection, TelegramForwardingRule
 from app.models.verification import Verification
 
@@ -59,10 +60,10 @@ class TelegramService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                return response.json()
+            client = get_http_client("telegram")
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"Telegram API error: {e.response.status_code} - {e.response.text}"
@@ -181,10 +182,10 @@ Use /status to check your connection anytime."""
         url = f"{self.base_url}/getMe"
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.json()
+            client = get_http_client("telegram")
+            response = await client.get(url, timeout=5.0)
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Failed to get bot info: {e}")
             return {"ok": False, "error": str(e)}
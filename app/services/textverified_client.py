@@ -0,0 +1,387 @@
+"""Async-native TextVerified REST transport.
+
+Talks to the TextVerified v2 public API over one shared ``httpx.AsyncClient``
+instead of running the blocking SDK in ``asyncio.to_thread``. Concurrency is
+bounded by the connection pool, not by the default thread executor.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.http_clients import get_http_client
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BASE_URL = "https://www.textverified.com"
+USER_AGENT = "Namaskah-TextVerified-Async/1.0"
+
+# Refresh the bearer token this long before TextVerified says it expires
+TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+# A 429 was not processed, so any method is re-sent. A 5xx may come after a
+# POST took effect (a number bought, a rental billed), so only reads retry it.
+RETRY_STATUSES = {429}
+READ_RETRY_STATUSES = {429, 500, 502, 503, 504}
+READ_METHODS = {"GET", "HEAD"}
+MAX_RETRIES = 3
+
+# Rental lengths TextVerified sells, in hours
+RENTAL_DURATIONS = {
+    24: "oneDay",
+    72: "threeDay",
+    168: "sevenDay",
+    336: "fourteenDay",
+    720: "thirtyDay",
+    2160: "ninetyDay",
+    8760: "oneYear",
+}
+
+
+class TextVerifiedAPIError(Exception):
+    """Non-2xx response from the TextVerified API."""
+
+    def __init__(
+        self,
+        status_code: int,
+        method: str,
+        url: str,
+        error_code: Optional[str] = None,
+        description: Optional[str] = None,
+    ):
+        self.status_code = status_code
+        self.error_code = error_code
+        self.description = description
+        super().__init__(
+            f"HTTP {status_code} for {method} {url}: "
+            f"{error_code or ''} {description or ''}".strip()
+        )
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API timestamp into an aware UTC datetime."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def rental_duration_for_hours(hours: float) -> str:
+    """TextVerified's name for a rental of exactly ``hours``.
+
+    Rentals only come in fixed lengths; any other length raises ValueError
+    instead of buying (and billing) a longer one.
+    """
+    duration = RENTAL_DURATIONS.get(hours)
+    if duration is None:
+        supported = ", ".join(f"{h}h" for h in RENTAL_DURATIONS)
+        raise ValueError(
+            f"Unsupported rental duration {hours:g}h; choose one of {supported}"
+        )
+    return duration
+
+
+@dataclass(frozen=True)
+class TVVerification:
+    """Subset of TextVerified's VerificationExpanded used by the platform."""
+
+    id: str
+    number: str
+    created_at: Optional[datetime]
+    ends_at: Optional[datetime]
+    total_cost: float
+    state: str
+    service_name: Optional[str] = None
+    carrier: Optional[str] = None
+    can_cancel: bool = False
+    can_report: bool = False
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "TVVerification":
+        return cls(
+            id=str(data.get("id")),
+            number=str(data.get("number") or ""),
+            created_at=parse_datetime(data.get("createdAt")),
+            ends_at=parse_datetime(data.get("endsAt")),
+            total_cost=float(data.get("totalCost") or 0.0),
+            state=str(data.get("state") or ""),
+            service_name=data.get("serviceName"),
+            carrier=data.get("carrier") or data.get("carrierName"),
+            can_cancel=bool((data.get("cancel") or {}).get("canCancel")),
+            can_report=bool((data.get("report") or {}).get("canReport")),
+        )
+
+
+@dataclass(frozen=True)
+class TVSms:
+    """One inbound SMS from ``GET /api/pub/v2/sms``."""
+
+    id: str
+    to: str
+    created_at: Optional[datetime]
+    sms_content: str = ""
+    parsed_code: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "TVSms":
+        return cls(
+            id=str(data.get("id")),
+            to=str(data.get("to") or ""),
+            created_at=parse_datetime(data.get("createdAt")),
+            sms_content=data.get("smsContent") or "",
+            parsed_code=data.get("parsedCode"),
+        )
+
+
+class TextVerifiedAsyncClient:
+    """Bearer-authenticated async client for the TextVerified v2 API."""
+
+    def __init__(
+        self,
+        api_key: str,
+        api_username: str,
+        base_url: str = DEFAULT_BASE_URL,
+        http: Optional[httpx.AsyncClient] = None,
+    ):
+        self.api_key = api_key
+        self.api_username = api_username
+        self.base_url = base_url.rstrip("/")
+        self._http = http
+        self._token: Optional[str] = None
+        self._token_expires_at: Optional[datetime] = None
+        self._auth_lock = asyncio.Lock()
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is not None and not self._http.is_closed:
+            return self._http
+        # The pooled client belongs to the registry, which the lifespan closes
+        return get_http_client(
+            "textverified",
+            base_url=self.base_url,
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    async def aclose(self) -> None:
+        """Close an injected transport; the shared pool is left to the registry."""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+
+    # ------------------------------------------------------------------
+    # Auth
+    # ------------------------------------------------------------------
+
+    def _token_valid(self) -> bool:
+        return bool(
+            self._token
+            and self._token_expires_at
+            and datetime.now(timezone.utc)
+            < self._token_expires_at - TOKEN_REFRESH_MARGIN
+        )
+
+    async def _ensure_token(self, force: bool = False) -> str:
+        if not force and self._token_valid():
+            return self._token
+        async with self._auth_lock:
+            # Another coroutine may have refreshed while we waited
+            if not force and self._token_valid():
+                return self._token
+            response = await self.http.post(
+                "/api/pub/v2/auth",
+                headers={
+                    "X-API-KEY": self.api_key,
+                    "X-API-USERNAME": self.api_username,
+                },
+            )
+            self._raise_for_status("POST", "/api/pub/v2/auth", response)
+            data = response.json()
+            self._token = data["token"]
+            self._token_expires_at = parse_datetime(data.get("expiresAt")) or (
+                datetime.now(timezone.utc) + timedelta(minutes=30)
+            )
+            return self._token
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _raise_for_status(method: str, url: str, response: httpx.Response) -> None:
+        if 200 <= response.status_code < 300:
+            return
+        error_code = description = None
+        try:
+            body = response.json()
+            error_code = body.get("errorCode")
+            description = body.get("errorDescription")
+        except ValueError:
+            description = response.text[:200]
+        raise TextVerifiedAPIError(
+            response.status_code, method, url, error_code, description
+        )
+
+    async def request(self, method: str, path: str, **kwargs) -> Any:
+        """Authenticated request with 401 re-auth and 429/5xx backoff.
+
+        5xx responses are retried for reads only; see ``READ_RETRY_STATUSES``.
+        """
+        retry_statuses = (
+            READ_RETRY_STATUSES if method.upper() in READ_METHODS else RETRY_STATUSES
+        )
+        reauthed = False
+        attempt = 0
+        while True:
+            token = await self._ensure_token()
+            response = await self.http.request(
+                method,
+                path,
+                headers={"Authorization": f"Bearer {token}"},
+                **kwargs,
+            )
+            if response.status_code == 401 and not reauthed:
+                reauthed = True
+                await self._ensure_token(force=True)
+                continue
+            if response.status_code in retry_statuses and attempt < MAX_RETRIES:
+                delay = self._retry_delay(response, attempt)
+                logger.warning(
+                    f"TextVerified {method} {path} returned "
+                    f"{response.status_code}, retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._raise_for_status(method, path, response)
+            return response.json() if response.content else {}
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
+        return (2**attempt) * (0.5 + random.random() / 2)
+
+    async def follow(self, action: Dict[str, Any]) -> Any:
+        """Follow an ``{"method", "href"}`` action returned by the API."""
+        href = action["href"]
+        if href.startswith(self.base_url):
+            href = href[len(self.base_url) :]
+        return await self.request(action.get("method", "GET"), href)
+
+    # ------------------------------------------------------------------
+    # Verifications
+    # ------------------------------------------------------------------
+
+    async def create_verification(self, payload: Dict[str, Any]) -> TVVerification:
+        action = await self.request("POST", "/api/pub/v2/verifications", json=payload)
+        return TVVerification.from_api(await self.follow(action))
+
+    async def get_verification(self, verification_id: str) -> TVVerification:
+        data = await self.request("GET", f"/api/pub/v2/verifications/{verification_id}")
+        return TVVerification.from_api(data)
+
+    async def cancel_verification(self, verification_id: str) -> None:
+        await self.request(
+            "POST", f"/api/pub/v2/verifications/{verification_id}/cancel"
+        )
+
+    async def report_verification(self, verification_id: str) -> None:
+        await self.request(
+            "POST", f"/api/pub/v2/verifications/{verification_id}/report"
+        )
+
+    # ------------------------------------------------------------------
+    # SMS
+    # ------------------------------------------------------------------
+
+    async def iter_sms_pages(
+        self,
+        to_number: Optional[str] = None,
+        reservation_id: Optional[str] = None,
+        reservation_type: Optional[str] = None,
+        max_pages: int = 10,
+    ) -> AsyncIterator[Tuple[List[TVSms], bool]]:
+        """Yield ``(messages, has_next)`` per page of ``GET /api/pub/v2/sms``."""
+        params = {}
+        if to_number:
+            params["to"] = to_number
+        if reservation_id:
+            params["reservation_id"] = reservation_id
+        if reservation_type:
+            params["reservation_type"] = reservation_type
+
+        page = await self.request("GET", "/api/pub/v2/sms", params=params)
+        pages = 1
+        while True:
+            next_action = (page.get("links") or {}).get("next")
+            has_next = bool(page.get("hasNext") and next_action)
+            yield [TVSms.from_api(item) for item in page.get("data", [])], has_next
+            if not has_next or pages >= max_pages:
+                return
+            page = await self.follow(next_action)
+            pages += 1
+
+    async def iter_sms(self, max_pages: int = 10, **filters) -> AsyncIterator[TVSms]:
+        """Yield inbound SMS across pages of ``GET /api/pub/v2/sms``."""
+        async for messages, _ in self.iter_sms_pages(max_pages=max_pages, **filters):
+            for sms in messages:
+                yield sms
+
+    async def list_sms(self, **kwargs) -> List[TVSms]:
+        return [sms async for sms in self.iter_sms(**kwargs)]
+
+    # ------------------------------------------------------------------
+    # Reservations (rentals)
+    # ------------------------------------------------------------------
+
+    async def create_rental(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a rental and return the sale (with its ``reservations``)."""
+        action = await self.request(
+            "POST", "/api/pub/v2/reservations/rental", json=payload
+        )
+        return await self.follow(action)
+
+    async def get_reservation(self, reservation_id: str) -> Dict[str, Any]:
+        action = await self.request("GET", f"/api/pub/v2/reservations/{reservation_id}")
+        return await self.follow(action)
+
+    async def extend_rental(self, rental_id: str, duration: str) -> None:
+        await self.request(
+            "POST",
+            "/api/pub/v2/reservations/rentals/extensions",
+            json={"extensionDuration": duration, "rentalId": rental_id},
+        )
+
+
+_shared_client: Optional[TextVerifiedAsyncClient] = None
+
+
+def get_textverified_client(api_key: str, api_username: str) -> TextVerifiedAsyncClient:
+    """Process-wide client so every service instance shares one pool and token."""
+    global _shared_client
+    if (
+        _shared_client is None
+        or _shared_client.api_key != api_key
+        or _shared_client.api_username != api_username
+    ):
+        _shared_client = TextVerifiedAsyncClient(api_key, api_username)
+    return _shared_client
+
+
+async def close_textverified_client() -> None:
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
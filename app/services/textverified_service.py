@@ -3,7 +3,10 @@
 import asyncio
 import json
 import os
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -15,6 +18,12 @@ from app.services.area_code_geo import get_ranked_alternatives
 from app.services.carrier_lookup import CarrierLookupService
 from app.services.phone_validator import PhoneValidator
 from app.services.purchase_intelligence import PurchaseIntelligenceService
+from app.services.textverified_client import (
+    TextVerifiedAsyncClient,
+    get_textverified_client,
+    parse_datetime,
+    rental_duration_for_hours,
+)
 
 settings = get_settings()
 
@@ -36,6 +45,33 @@ _SERVICES_TTL = 86400  # 24 hours
 _SERVICES_NAMES_CACHE_KEY = "tv:services_names"
 _SERVICES_NAMES_TTL = 86400  # 24 hours
 
+# SMS poll cadence for poll_sms_standard (matches the old sms.incoming() call)
+_SMS_POLL_INTERVAL = 3.0
+
+# verification id -> number; numbers never change for a verification, so a
+# bounded process-local map saves a details call on every SMS check
+_VERIFICATION_NUMBERS_MAX = 10000
+_verification_numbers: "OrderedDict[str, str]" = OrderedDict()
+
+# TextVerified reservation states -> platform verification statuses
+_TV_STATE_STATUS = {
+    "verificationPending": "pending",
+    "verificationReactivated": "pending",
+    "verificationCompleted": "completed",
+    "verificationCanceled": "cancelled",
+    "verificationTimedOut": "timeout",
+    "verificationReported": "failed",
+    "verificationRefunded": "refunded",
+}
+
+
+# Sort key for messages without a timestamp: older than any real one
+_NO_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
 
 def _get_redis():
     """Lazy import to avoid circular deps."""
@@ -56,8 +92,13 @@ class TextVerifiedService:
             self.api_key and self.api_username
         )
 
+        self.http: Optional[TextVerifiedAsyncClient] = None
         if self.enabled:
             try:
+                # Hot paths (purchase, SMS, cancel/report, rentals) go through
+                # the shared async transport; the SDK is kept for the cached
+                # catalog, pricing, area-code and balance lookups.
+                self.http = get_textverified_client(self.api_key, self.api_username)
                 self.client = textverified.TextVerified(
                     api_key=self.api_key,
                     api_username=self.api_username,
@@ -72,6 +113,7 @@ class TextVerifiedService:
                 logger.error(f"TextVerified client initialization failed: {e}")
                 self.enabled = False
                 self.client = None
+                self.http = None
         else:
             logger.warning(
                 "TextVerified service disabled - missing credentials or library"
@@ -427,6 +469,10 @@ class TextVerifiedService:
             ]
             await cache.set(_SERVICES_CACHE_KEY, result, _SERVICES_TTL)
             logger.info(f"Background pricing cache updated: {len(result)} services")
+
+            from app.services.service_catalog import service_catalog
+
+            await service_catalog.publish(result)
         except Exception as e:
             logger.error(f"Background pricing fetch failed: {e}")
 
@@ -468,18 +514,20 @@ class TextVerifiedService:
             return {"status": "error", "error": "Service disabled"}
 
         try:
-            # Note: The textverified lib might use different method names
-            # We'll try to get it via the client
-            status = await asyncio.to_thread(
-                self.client.verifications.get, activation_id
-            )
-
-            # Extract common fields
+            tv = await self.http.get_verification(activation_id)
+            self._remember_number(tv.id, tv.number)
+            status = _TV_STATE_STATUS.get(tv.state, "pending")
+            # The verification itself carries no SMS; read the number's inbox
+            sms = {}
+            if status in ("pending", "completed"):
+                sms = await self.get_sms(
+                    tv.id, created_after=tv.created_at, phone_number=tv.number
+                )
             return {
-                "status": status.status,
-                "sms_code": getattr(status, "sms_code", None),
-                "sms_text": getattr(status, "sms_text", None),
-                "carrier": getattr(status, "carrier", None),
+                "status": status,
+                "sms_code": sms.get("code"),
+                "sms_text": sms.get("sms"),
+                "carrier": tv.carrier,
             }
         except Exception as e:
             logger.error(f"Failed to get verification status for {activation_id}: {e}")
@@ -490,14 +538,15 @@ class TextVerifiedService:
         tv_verification,
         timeout_seconds: float = 600.0,
     ) -> Dict[str, Any]:
-        """Poll for SMS using TextVerified's standard sms.incoming() method.
+        """Poll for SMS on the verification's number until a fresh one arrives.
 
-        This is the correct way to poll — passes the VerificationExpanded
-        object (not a string), uses TV's built-in since filter, deduplication,
-        and timeout. Works identically for both SMS and voice capability.
+        Lists inbound SMS for ``tv_verification.number`` every few seconds on
+        the shared async transport, skipping messages already seen or older
+        than ``tv_verification.created_at``. Nothing blocks a thread while
+        waiting. Works identically for both SMS and voice capability.
 
         Args:
-            tv_verification: VerificationExpanded object from verifications.create()
+            tv_verification: TVVerification (``tv_object``) from create_verification()
             timeout_seconds: How long to wait. Use ends_at delta for accuracy.
 
         Returns:
@@ -507,56 +556,62 @@ class TextVerifiedService:
         if not self.enabled:
             return {"success": False, "error": "Service not available"}
 
-        def _blocking_poll():
-            try:
-                for sms in self.client.sms.incoming(
-                    data=tv_verification,
-                    since=tv_verification.created_at,
-                    timeout=timeout_seconds,
-                    polling_interval=3.0,
-                ):
-                    # Master Check: Ensure message is strictly fresh (v6.0 Institutional Grade)
-                    from datetime import timezone
+        from datetime import timezone
+
+        ref_time = tv_verification.created_at
+        if ref_time is not None and ref_time.tzinfo is None:
+            ref_time = ref_time.replace(tzinfo=timezone.utc)
+
+        deadline = time.monotonic() + timeout_seconds
+        seen = set()
+        try:
+            while True:
+                for sms in await self.http.list_sms(to_number=tv_verification.number):
+                    if sms.id in seen:
+                        continue
+                    seen.add(sms.id)
 
+                    # Master Check: Ensure message is strictly fresh (v6.0 Institutional Grade)
                     msg_time = sms.created_at
+                    if msg_time is None:
+                        continue
                     if msg_time.tzinfo is None:
                         msg_time = msg_time.replace(tzinfo=timezone.utc)
-
-                    ref_time = tv_verification.created_at
-                    if ref_time.tzinfo is None:
-                        ref_time = ref_time.replace(tzinfo=timezone.utc)
-
-                    if msg_time < ref_time:
+                    if ref_time is not None and msg_time < ref_time:
                         logger.warning(
                             f"Rejected stale SMS from recycled number: {sms.sms_content}"
                         )
                         continue
 
-                    parsed = sms.parsed_code or ""
-                    # ... [rest as before]
-                    if not parsed:
-                        import re
-
-                        text = sms.sms_content or ""
-                        # TextVerified voice transcription often has codes in brackets or quotes
-                        hyphen = re.findall(r"\b(\d{3}-\d{3})\b", text)
-                        plain = re.findall(r"\b(\d{4,8})\b", text)
-                        if hyphen:
-                            parsed = hyphen[-1].replace("-", "")
-                        elif plain:
-                            parsed = plain[-1]
-
                     return {
                         "success": True,
-                        "code": parsed,
+                        "code": self._parse_code(sms.parsed_code, sms.sms_content),
                         "sms": sms.sms_content or "",
                         "received_at": msg_time.isoformat(),
                     }
-                return {"success": False, "timed_out": True}
-            except Exception as e:
-                return {"success": False, "error": str(e)}
 
-        return await asyncio.to_thread(_blocking_poll)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return {"success": False, "timed_out": True}
+                await asyncio.sleep(min(_SMS_POLL_INTERVAL, remaining))
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _parse_code(parsed_code: Optional[str], sms_content: Optional[str]) -> str:
+        """Prefer TextVerified's parsed_code, else regex the (voice) transcript."""
+        if parsed_code:
+            return parsed_code
+        import re
+
+        text = sms_content or ""
+        hyphen = re.findall(r"\b(\d{3}-\d{3})\b", text)
+        plain = re.findall(r"\b(\d{4,8})\b", text)
+        if hyphen:
+            return hyphen[-1].replace("-", "")
+        if plain:
+            return plain[-1]
+        return ""
 
     async def report_verification(self, verification_id: str) -> bool:
         """Report a failed verification to TextVerified.
@@ -570,7 +625,7 @@ class TextVerifiedService:
         if not self.enabled:
             return False
         try:
-            await asyncio.to_thread(self.client.verifications.report, verification_id)
+            await self.http.report_verification(verification_id)
             logger.info(
                 f"Reported verification {verification_id} to TextVerified — refund triggered"
             )
@@ -587,20 +642,18 @@ class TextVerifiedService:
         if not self.enabled:
             return {}
         try:
-            tv = await asyncio.to_thread(
-                self.client.verifications.details, verification_id
-            )
+            tv = await self.http.get_verification(verification_id)
+            self._remember_number(tv.id, tv.number)
             return {
                 "id": tv.id,
                 "number": tv.number,
-                "state": tv.state.value,
-                "carrier": getattr(tv, "carrier", None)
-                or getattr(tv, "carrier_name", None),
-                "created_at": tv.created_at.isoformat(),
-                "ends_at": tv.ends_at.isoformat(),
+                "state": tv.state,
+                "carrier": tv.carrier,
+                "created_at": _isoformat(tv.created_at),
+                "ends_at": _isoformat(tv.ends_at),
                 "total_cost": tv.total_cost,
-                "can_cancel": tv.cancel.can_cancel,
-                "can_report": tv.report.can_report,
+                "can_cancel": tv.can_cancel,
+                "can_report": tv.can_report,
             }
         except Exception as e:
             logger.error(
@@ -608,7 +661,9 @@ class TextVerifiedService:
             )
             return {}
 
-    async def check_sms(self, activation_id: str, created_after=None) -> Dict[str, Any]:
+    async def check_sms(
+        self, activation_id: str, created_after=None, phone_number=None
+    ) -> Dict[str, Any]:
         """
         Check for SMS messages for a specific activation.
         Used by SMSPollingService.
@@ -617,12 +672,15 @@ class TextVerifiedService:
             activation_id: TextVerified activation ID.
             created_after: datetime — only return SMS received after this time.
                            Pass verification.created_at to reject stale SMS.
+            phone_number: The activation's number, forwarded to get_sms().
         """
         if not self.enabled:
             return {"status": "ERROR", "messages": []}
 
         try:
-            sms_data = await self.get_sms(activation_id, created_after=created_after)
+            sms_data = await self.get_sms(
+                activation_id, created_after=created_after, phone_number=phone_number
+            )
             if sms_data.get("success"):
                 return {
                     "status": "COMPLETED",
@@ -645,7 +703,7 @@ class TextVerifiedService:
         Never raises exceptions - failures are logged as warnings.
         """
         try:
-            await asyncio.to_thread(self.client.verifications.cancel, verification_id)
+            await self.http.cancel_verification(verification_id)
             logger.info(f"Cancelled verification {verification_id}")
             return True
         except Exception as e:
@@ -676,11 +734,7 @@ class TextVerifiedService:
         if not self.enabled:
             raise RuntimeError("TextVerified service not available")
 
-        cap = (
-            ReservationCapability.SMS
-            if capability == "sms"
-            else ReservationCapability.VOICE
-        )
+        cap = "sms" if capability == "sms" else "voice"
 
         # Build preference list from live TextVerified data
         area_code_options: Optional[List[str]] = None
@@ -709,13 +763,13 @@ class TextVerifiedService:
 
         while attempt_count < max_attempts:
             attempt_count += 1
-            result = await asyncio.to_thread(
-                self.client.verifications.create,
-                service_name=service,
-                capability=cap,
-                area_code_select_option=area_code_options,
-                carrier_select_option=carrier_options,
-            )
+            payload = {"serviceName": service, "capability": cap}
+            if area_code_options:
+                payload["areaCodeSelectOption"] = area_code_options
+            if carrier_options:
+                payload["carrierSelectOption"] = carrier_options
+            result = await self.http.create_verification(payload)
+            self._remember_number(result.id, result.number)
 
             assigned_number = result.number
             assigned_area_code = (
@@ -847,7 +901,7 @@ class TextVerifiedService:
             "id": result.id,
             "phone_number": assigned_number,
             "cost": result.total_cost,
-            "ends_at": result.ends_at.isoformat(),
+            "ends_at": _isoformat(result.ends_at),
             "tv_object": result,
             "attempt_count": attempt_count,
             "retry_attempts": attempt_count - 1,  # Legacy Phase 4 compatibility
@@ -909,24 +963,27 @@ class TextVerifiedService:
             logger.error(f"purchase_number failed: {e}")
             return {"success": False, "error": str(e), "verification_id": None}
 
-    async def get_sms(self, verification_id: str, created_after=None) -> Dict[str, Any]:
+    async def get_sms(
+        self, verification_id: str, created_after=None, phone_number=None
+    ) -> Dict[str, Any]:
         """Fetch SMS for a verification, filtering out stale messages.
 
         Args:
             verification_id: The TextVerified activation ID.
             created_after: datetime — only return SMS received after this time.
                            Prevents stale SMS from recycled numbers being delivered.
+            phone_number: The verification's number, if the caller has it.
+                          Saves a details lookup when it is not cached yet.
         """
         if not self.enabled:
             return {"success": False, "error": "Service not available", "sms": None}
         try:
-            sms_list = await asyncio.to_thread(
-                lambda: list(self.client.sms.list(verification_id))
-            )
+            number = phone_number or await self._number_for(verification_id)
+            sms_list = await self.http.list_sms(to_number=number)
             if sms_list:
                 # CRITICAL: Filter out stale SMS from recycled numbers.
-                # TextVerified reuses numbers — sms.list() returns ALL historical
-                # SMS on that activation, including codes from prior activations.
+                # TextVerified reuses numbers — listing by number returns ALL
+                # historical SMS on it, including codes from prior activations.
                 # Only accept SMS received AFTER this verification was created.
                 if created_after is not None:
                     from datetime import timezone
@@ -950,36 +1007,69 @@ class TextVerifiedService:
                         return {"success": False, "sms": None, "code": None}
                     sms_list = fresh
 
-                latest = sms_list[-1]
+                # Listing order is not part of the API contract; take the newest
+                latest = max(sms_list, key=lambda m: m.created_at or _NO_TIMESTAMP)
                 sms_content = latest.sms_content or ""
                 # CRITICAL: Use TextVerified's parsed_code first — it handles
                 # hyphenated codes (e.g. 806-185), alphanumeric codes, etc.
-                parsed = getattr(latest, "parsed_code", None) or ""
-                if not parsed:
-                    import re
-
-                    hyphen = re.findall(r"\b(\d{3}-\d{3})\b", sms_content)
-                    plain = re.findall(r"\b(\d{4,8})\b", sms_content)
-                    if hyphen:
-                        parsed = hyphen[-1].replace("-", "")
-                    elif plain:
-                        parsed = plain[-1]
                 return {
                     "success": True,
                     "sms": sms_content,
-                    "code": parsed,
-                    "received_at": latest.created_at.isoformat(),
+                    "code": self._parse_code(latest.parsed_code, sms_content),
+                    "received_at": _isoformat(latest.created_at),
                 }
             return {"success": False, "sms": None, "code": None}
         except Exception as e:
             logger.error(f"Failed to get SMS: {e}")
             return {"success": False, "error": str(e), "sms": None}
 
+    async def get_recent_sms(self, since, max_pages: int = 5) -> Tuple[list, bool]:
+        """Account-wide inbound SMS received at or after ``since``.
+
+        Used by the polling sweep to check every pending verification with a
+        single paginated listing. The listing is newest-first, so pages are
+        read until one holds a message older than ``since``. Returns
+        ``(messages, complete)`` where ``complete`` is False if ``max_pages``
+        ran out first, i.e. matches for the oldest verifications may be
+        missing.
+        """
+        if not self.enabled:
+            return [], False
+
+        from datetime import timezone
+
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        messages = []
+        async for page, has_next in self.http.iter_sms_pages(max_pages=max_pages):
+            messages.extend(m for m in page if m.created_at and m.created_at >= since)
+            # Messages without a timestamp say nothing about where we are
+            if not has_next or any(m.created_at and m.created_at < since for m in page):
+                return messages, True
+        return messages, False
+
+    def _remember_number(self, verification_id: str, number: str) -> None:
+        if verification_id and number:
+            _verification_numbers[verification_id] = number
+            _verification_numbers.move_to_end(verification_id)
+            while len(_verification_numbers) > _VERIFICATION_NUMBERS_MAX:
+                _verification_numbers.popitem(last=False)
+
+    async def _number_for(self, verification_id: str) -> str:
+        """Phone number behind a verification; SMS are listed by number."""
+        number = _verification_numbers.get(verification_id)
+        if number:
+            return number
+        tv = await self.http.get_verification(verification_id)
+        self._remember_number(verification_id, tv.number)
+        return tv.number
+
     async def cancel_verification(self, verification_id: str) -> Dict[str, Any]:
         if not self.enabled:
             return {"success": False, "error": "Service not available"}
         try:
-            await asyncio.to_thread(self.client.verifications.cancel, verification_id)
+            await self.http.cancel_verification(verification_id)
             return {"success": True}
         except Exception as e:
             logger.error(f"Failed to cancel verification: {e}")
@@ -993,36 +1083,42 @@ class TextVerifiedService:
         country: str = "US",
         duration_hours: float = 24.0,
         area_code: Optional[str] = None,
+        always_on: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Create a long-term reservation (rental) for a service."""
+        """Create a long-term reservation (rental) for a service.
+
+        ``duration_hours`` must be one of TextVerified's rental lengths
+        (``RENTAL_DURATIONS``); anything else raises ValueError.
+        """
         if not self.enabled:
             raise RuntimeError("TextVerified service disabled")
 
+        duration = rental_duration_for_hours(duration_hours)
         try:
-            # Map hours to minutes for the API
-            duration_minutes = int(duration_hours * 60)
-
-            # Build reservation parameters
-            params = {
-                "service_name": service,
-                "duration": duration_minutes,
+            payload = {
+                "allowBackOrderReservations": False,
+                "duration": duration,
+                "serviceName": service,
+                "capability": "sms",
             }
+            if always_on is not None:
+                payload["alwaysOn"] = always_on
             if area_code:
-                params["area_code_select_option"] = area_code
+                payload["areaCodeSelectOption"] = [area_code]
 
             # TextVerified reservations are US-only in standard API
-            reservation = await asyncio.to_thread(
-                self.client.reservations.create, **params
-            )
+            sale = await self.http.create_rental(payload)
+            reservation_id = sale["reservations"][0]["id"]
+            reservation = await self.http.get_reservation(reservation_id)
 
             # Costs are marked up in the platform level (RentalService)
             # but we return raw cost here for accounting
             return {
-                "id": reservation.id,
-                "phone_number": reservation.number,
-                "cost": float(reservation.total_cost),
-                "ends_at": reservation.ends_at,
-                "status": reservation.state.value,
+                "id": reservation_id,
+                "phone_number": reservation.get("number"),
+                "cost": float(sale.get("total") or 0.0),
+                "ends_at": parse_datetime(reservation.get("endsAt")),
+                "status": reservation.get("state"),
                 "tv_object": reservation,
             }
         except Exception as e:
@@ -1036,16 +1132,13 @@ class TextVerifiedService:
         if not self.enabled:
             return []
         try:
-            # Reservations use a different message retrieval endpoint
-            messages = await asyncio.to_thread(
-                self.client.reservations.messages, reservation_id
-            )
+            messages = await self.http.list_sms(reservation_id=reservation_id)
             return [
                 {
                     "id": m.id,
                     "text": m.sms_content,
                     "code": m.parsed_code,
-                    "received_at": m.created_at.isoformat(),
+                    "received_at": _isoformat(m.created_at),
                 }
                 for m in messages
             ]
@@ -1054,14 +1147,15 @@ class TextVerifiedService:
             return []
 
     async def extend_reservation(self, reservation_id: str, extra_hours: float) -> bool:
-        """Extend an existing reservation."""
+        """Extend an existing reservation by one of TextVerified's rental lengths.
+
+        Raises ValueError for any other ``extra_hours``.
+        """
         if not self.enabled:
             return False
+        duration = rental_duration_for_hours(extra_hours)
         try:
-            extra_minutes = int(extra_hours * 60)
-            await asyncio.to_thread(
-                self.client.reservations.extend, reservation_id, extra_minutes
-            )
+            await self.http.extend_rental(reservation_id, duration)
             return True
         except Exception as e:
             logger.error(f"Failed to extend reservation: {e}")
@@ -1072,19 +1166,17 @@ class TextVerifiedService:
         if not self.enabled:
             return {"status": "unknown"}
         try:
-            res = await asyncio.to_thread(self.client.reservations.get, reservation_id)
+            res = await self.http.get_reservation(reservation_id)
             from datetime import datetime, timezone
 
             now = datetime.now(timezone.utc)
-            ends_at = res.ends_at
-            if ends_at.tzinfo is None:
-                ends_at = ends_at.replace(tzinfo=timezone.utc)
+            ends_at = parse_datetime(res.get("endsAt"))
 
             remaining_minutes = (ends_at - now).total_seconds() / 60
 
             return {
-                "id": res.id,
-                "status": res.state.value,
+                "id": res.get("id"),
+                "status": res.get("state"),
                 "remaining_minutes": remaining_minutes,
                 "is_critical": remaining_minutes < 15,
                 "ends_at": ends_at.isoformat(),
@@ -0,0 +1,158 @@
+"""Cached tier resolution for ``TierManager``.
+
+Resolved tiers are kept per user in process memory (short TTL) and in Redis
+(longer TTL, shared by workers), and tier configs per tier in memory.
+Anything that changes ``subscription_tier`` or ``tier_expires_at`` calls
+``tier_cache.invalidate(user_id)`` after committing; that clears Redis and
+this worker's copy, and other workers follow once their local entry
+expires. An entry never outlives the user's ``tier_expires_at``, so the
+expiry downgrade in ``get_user_tier`` still runs on time.
+
+Tier configs are only changed outside the app (``subscription_tiers`` is
+seeded at startup and edited by scripts or SQL), so nothing invalidates
+them; an edit reaches each worker within ``tier_cache_config_ttl_seconds``.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.local_cache import TTLCache
+from app.core.logging import get_logger
+from app.core.metrics import track_cache_hit
+from app.core.tier_config import TierConfig
+
+logger = get_logger(__name__)
+
+REDIS_PREFIX = "tier:resolved:"
+
+
+def _get_redis():
+    from app.core.cache import get_redis
+
+    return get_redis()
+
+
+def _timestamp(expires_at: Optional[datetime]) -> Optional[float]:
+    if expires_at is None:
+        return None
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at.timestamp()
+
+
+class TierCache:
+    """user id -> resolved tier, and tier -> tier config."""
+
+    def __init__(self, local_ttl: float, redis_ttl: float, config_ttl: float):
+        self.redis_ttl = redis_ttl
+        self._tiers = TTLCache(maxsize=10000, ttl=local_ttl)
+        self._configs = TTLCache(maxsize=64, ttl=config_ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Optional[str]:
+        tier = self._tiers.get(user_id)
+        if tier is None:
+            tier = self._get_shared(user_id)
+        self._record(tier is not None)
+        return tier
+
+    def set(
+        self, user_id: str, tier: str, expires_at: Optional[datetime] = None
+    ) -> None:
+        expires = _timestamp(expires_at)
+        local_ttl = self._ttl(self._tiers.ttl, expires)
+        if local_ttl > 0:
+            self._tiers.set(user_id, tier, ttl=local_ttl)
+
+        redis_ttl = int(self._ttl(self.redis_ttl, expires))
+        if redis_ttl <= 0:
+            return
+        try:
+            _get_redis().setex(
+                f"{REDIS_PREFIX}{user_id}",
+                redis_ttl,
+                json.dumps({"tier": tier, "expires": expires}),
+            )
+        except Exception as e:
+            logger.debug(f"Tier cache write skipped: {e}")
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget a user's tier after it changed."""
+        self._tiers.pop(user_id)
+        try:
+            _get_redis().delete(f"{REDIS_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"Tier cache invalidation for {user_id} failed: {e}")
+
+    def tier_config(self, tier: str, db: Optional[Session]) -> Dict[str, Any]:
+        """``TierConfig.get_tier_config`` memoized per tier.
+
+        Edits to ``subscription_tiers`` show up once the entry expires.
+        """
+        config = self._configs.get(tier)
+        if config is None:
+            config = TierConfig.get_tier_config(tier, db)
+            self._configs.set(tier, config)
+        return config
+
+    def clear(self) -> None:
+        self._tiers.clear()
+        self._configs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "local_entries": len(self._tiers),
+        }
+
+    def _get_shared(self, user_id: str) -> Optional[str]:
+        try:
+            raw = _get_redis().get(f"{REDIS_PREFIX}{user_id}")
+        except Exception as e:
+            logger.debug(f"Tier cache read skipped: {e}")
+            return None
+        if not raw:
+            return None
+        try:
+            entry = json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        local_ttl = self._ttl(self._tiers.ttl, entry.get("expires"))
+        if local_ttl <= 0:
+            return None
+        self._tiers.set(user_id, entry["tier"], ttl=local_ttl)
+        return entry["tier"]
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        track_cache_hit(hit)
+
+    @staticmethod
+    def _ttl(ttl: float, expires: Optional[float]) -> float:
+        if expires is None:
+            return ttl
+        return min(ttl, expires - time.time())
+
+
+def _build_cache() -> TierCache:
+    settings = get_settings()
+    return TierCache(
+        local_ttl=settings.tier_cache_local_ttl_seconds,
+        redis_ttl=settings.tier_cache_redis_ttl_seconds,
+        config_ttl=settings.tier_cache_config_ttl_seconds,
+    )
+
+
+tier_cache = _build_cache()
@@ -1,13 +1,15 @@
 """Tier management service for subscription tiers and feature access."""
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
 from app.core.logging import get_logger
+from app.core.metrics import track_tier_identification
 from app.core.tier_config import TierConfig
 from app.models.user import User
+from app.services.tier_cache import tier_cache
 
 logger = get_logger(__name__)
 
@@ -18,15 +20,27 @@ class TierManager:
     def __init__(self, db: Session):
         self.db = db
 
+    @track_tier_identification
     def get_user_tier(self, user_id: str) -> str:
         """Get user's current subscription tier.
 
-        Forces a fresh DB read to prevent stale SQLAlchemy identity-map data
-        from returning a default/outdated tier value.
+        Served from ``tier_cache`` when possible. Otherwise forces a fresh DB
+        read to prevent stale SQLAlchemy identity-map data from returning a
+        default/outdated tier value, and caches the result.
         """
+        tier = tier_cache.get(user_id)
+        if tier is not None:
+            return tier
+
+        tier, expires_at = self._resolve_tier(user_id)
+        tier_cache.set(user_id, tier, expires_at)
+        return tier
+
+    def _resolve_tier(self, user_id: str) -> Tuple[str, Optional[datetime]]:
+        """The user's tier from the database, and when it stops applying."""
         user = self.db.query(User).filter(User.id == user_id).first()
         if not user:
-            return "freemium"
+            return "freemium", None
 
         # Force reload from DB to avoid stale session cache
         try:
@@ -36,12 +50,13 @@ class TierManager:
             self.db.expire_all()
             user = self.db.query(User).filter(User.id == user_id).first()
             if not user:
-                return "freemium"
+                return "freemium", None
 
         # Admins always keep their assigned tier — never subject to expiry
         if getattr(user, "is_admin", False):
             tier = user.subscription_tier
-            return tier if tier in {"freemium", "payg", "pro", "custom"} else "custom"
+            tier = tier if tier in {"freemium", "payg", "pro", "custom"} else "custom"
+            return tier, None
 
         tier = user.subscription_tier or "freemium"
 
@@ -67,14 +82,15 @@ class TierManager:
                 user.subscription_tier = "freemium"
                 user.tier_expires_at = None
                 self.db.commit()
-                tier = "freemium"
+                return "freemium", None
+            return tier, expires
 
-        return tier
+        return tier, None
 
     def check_feature_access(self, user_id: str, feature: str) -> bool:
         """Check if user has access to a specific feature."""
         tier = self.get_user_tier(user_id)
-        config = TierConfig.get_tier_config(tier, self.db)
+        config = tier_cache.tier_config(tier, self.db)
 
         # Check specific features
         feature_map = {
@@ -95,7 +111,7 @@ class TierManager:
     def get_tier_limits(self, user_id: str) -> Dict:
         """Get tier limits for user."""
         tier = self.get_user_tier(user_id)
-        config = TierConfig.get_tier_config(tier, self.db)
+        config = tier_cache.tier_config(tier, self.db)
 
         return {
             "daily_verification_limit": config.get("daily_verification_limit", 100),
@@ -125,6 +141,7 @@ class TierManager:
             user.tier_expires_at = expires_at
 
         self.db.commit()
+        tier_cache.invalidate(user_id)
         logger.info(f"User {user_id} upgraded to {new_tier} tier")
         return True
 
@@ -138,6 +155,7 @@ class TierManager:
         user.tier_expires_at = None
 
         self.db.commit()
+        tier_cache.invalidate(user_id)
         logger.info(f"User {user_id} downgraded to freemium tier - reason: {reason}")
         return True
 
@@ -150,7 +168,7 @@ class TierManager:
         from app.models.api_key import APIKey
 
         tier = self.get_user_tier(user_id)
-        config = TierConfig.get_tier_config(tier, self.db)
+        config = tier_cache.tier_config(tier, self.db)
         limit = config.get("api_key_limit", 0)
 
         if limit == 0:
@@ -25,6 +25,18 @@ async def mark_verification_failed(
         error_message: Optional detailed error message
         refund_eligible: Whether failure qualifies for refund
     """
+    await _apply_failure(db, verification, reason, error_message, refund_eligible)
+    db.commit()
+    await _publish_status(verification)
+
+
+async def _apply_failure(
+    db: Session,
+    verification: Verification,
+    reason: str,
+    error_message: Optional[str],
+    refund_eligible: bool,
+) -> None:
     verification.status = "failed"
     verification.failure_reason = reason
     verification.failure_category = REASON_TO_CATEGORY.get(
@@ -50,7 +62,12 @@ async def mark_verification_failed(
             logger = get_logger(__name__)
             logger.error(f"Failed to process atomic refund for {verification.id}: {e}")
 
-    db.commit()
+
+async def _publish_status(verification: Verification) -> None:
+    """Wake long-poll/SSE status requests waiting on this verification."""
+    from app.services.verification_waiters import verification_waiters
+
+    await verification_waiters.publish(verification.id, verification.status)
 
 
 async def mark_sms_code_received(
@@ -88,6 +105,7 @@ async def mark_sms_code_received(
         verification.audio_url = audio_url
 
     db.commit()
+    await _publish_status(verification)
 
 
 async def mark_verification_transcribing(
@@ -98,6 +116,7 @@ async def mark_verification_transcribing(
     if audio_url:
         verification.audio_url = audio_url
     db.commit()
+    await _publish_status(verification)
 
 
 async def mark_verification_cancelled_by_user(
@@ -105,7 +124,7 @@ async def mark_verification_cancelled_by_user(
     verification: Verification,
 ) -> None:
     """Mark verification as cancelled by user."""
-    await mark_verification_failed(
+    await _apply_failure(
         db,
         verification,
         reason=FailureReason.USER_CANCELLED,
@@ -114,3 +133,4 @@ async def mark_verification_cancelled_by_user(
     )
     verification.status = "cancelled"
     db.commit()
+    await _publish_status(verification)
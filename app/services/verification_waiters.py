@@ -0,0 +1,140 @@
+"""In-process waiters for verification status changes.
+
+Long-poll and SSE status requests park on an ``asyncio.Event`` keyed by
+verification id instead of re-querying the provider. Status transitions
+call ``publish``, which wakes local waiters and fans the change out over
+Redis pub/sub so requests parked on other workers wake too.
+"""
+
+import asyncio
+import json
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHANNEL = "verification:status"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled", "timeout"})
+
+
+def _get_redis():
+    """Lazy import to avoid circular deps; None when Redis is unavailable."""
+    from app.core.unified_cache import cache
+
+    return cache.redis_client
+
+
+class _Slot:
+    __slots__ = ("event", "listeners")
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.listeners = 0
+
+
+class VerificationWaiters:
+    """Registry of events that fire when a verification's status changes."""
+
+    def __init__(self):
+        self._slots: Dict[str, _Slot] = {}
+        self._origin = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def listen(self, verification_id: str) -> Iterator[asyncio.Event]:
+        """Register interest before reading state, so no change is missed.
+
+        The yielded event is set by the next ``notify`` for this id. Enter a
+        fresh ``listen`` block to wait for the change after that.
+        """
+        slot = self._slots.get(verification_id)
+        if slot is None:
+            slot = self._slots[verification_id] = _Slot()
+        slot.listeners += 1
+        try:
+            yield slot.event
+        finally:
+            slot.listeners -= 1
+            if slot.listeners == 0 and self._slots.get(verification_id) is slot:
+                del self._slots[verification_id]
+
+    def notify(self, verification_id: str) -> bool:
+        """Wake everything waiting on this verification in this process."""
+        slot = self._slots.pop(verification_id, None)
+        if slot is None:
+            return False
+        slot.event.set()
+        return True
+
+    async def publish(self, verification_id: str, status: str) -> None:
+        """Wake local waiters and tell the other workers."""
+        self.notify(verification_id)
+        redis = _get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.publish(
+                CHANNEL,
+                json.dumps(
+                    {"id": verification_id, "status": status, "origin": self._origin}
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Verification status publish failed: {e}")
+
+    def waiting(self) -> int:
+        return sum(slot.listeners for slot in self._slots.values())
+
+    # ------------------------------------------------------------------
+    # Cross-worker fan-in
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_redis())
+
+    async def stop(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    def _on_message(self, data) -> None:
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if event.get("origin") != self._origin and event.get("id"):
+            self.notify(event["id"])
+
+    async def _listen_redis(self) -> None:
+        while True:
+            redis = _get_redis()
+            if redis is None:
+                logger.info("Redis unavailable; verification waiters are local-only")
+                return
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._on_message(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Verification status subscription dropped: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+
+verification_waiters = VerificationWaiters()
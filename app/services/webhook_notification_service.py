@@ -4,8 +4,7 @@ import asyncio
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-import httpx
-
+from app.core.http_clients import get_http_client
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -40,10 +39,10 @@ class WebhookNotificationService:
 
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(
-                        url, json=payload, headers=default_headers
-                    )
+                client = get_http_client("webhooks")
+                response = await client.post(
+                    url, json=payload, headers=default_headers, timeout=self.timeout
+                )
 
                 if response.status_code in [200, 201, 202]:
                     logger.info(f"Webhook sent successfully: {event} to {url}")
@@ -1,21 +1,84 @@
-"""Persistent webhook queue using Redis Streams."""
+"""Persistent webhook queue using Redis Streams.
 
+Workers read ``webhooks:pending`` through a consumer group, each under its
+own consumer name, and deliver a batch concurrently over the shared
+``webhooks`` HTTP client. A failed delivery is acked and parked in the
+``webhooks:retry`` sorted set, scored by when it is next due, instead of
+being re-added straight away; due entries are moved back onto the stream.
+Entries left pending by a worker that died mid-batch are taken over with
+XAUTOCLAIM.
+"""
+
+import asyncio
+import hashlib
+import hmac
 import json
-from typing import Any, Dict
+import os
+import random
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
 
-from redis import Redis
+import httpx
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
 
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.http_clients import get_http_client
 from app.core.logging import get_logger
+from app.models.user import Webhook
 
 logger = get_logger(__name__)
 
+GROUP = "webhook-workers"
+
+
+def _consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _load_endpoint(webhook_id: str) -> Optional[Tuple[str, Optional[str]]]:
+    """URL and secret of an active webhook, or None."""
+    db = SessionLocal()
+    try:
+        webhook = (
+            db.query(Webhook)
+            .filter(Webhook.id == webhook_id, Webhook.is_active.is_(True))
+            .first()
+        )
+        return (webhook.url, webhook.secret) if webhook else None
+    finally:
+        db.close()
+
 
 class WebhookQueue:
-    def __init__(self, redis: Redis):
+    def __init__(
+        self,
+        redis: Redis,
+        http: Optional[httpx.AsyncClient] = None,
+        consumer: Optional[str] = None,
+    ):
+        settings = get_settings()
         self.redis = redis
+        self.http = http
         self.stream = "webhooks:pending"
         self.dlq_stream = "webhooks:failed"
-        self.max_retries = 5
+        self.retry_key = "webhooks:retry"
+        self.group = GROUP
+        self.consumer = consumer or _consumer_name()
+        self.max_retries = settings.webhook_max_retries
+        self.settings = settings
+        self._semaphore = asyncio.Semaphore(settings.webhook_worker_concurrency)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._claim_cursor = "0-0"
+        self._group_ready = False
 
     async def enqueue(self, webhook_id: str, event: str, data: Dict[str, Any]):
         """Add webhook to queue."""
@@ -26,13 +89,13 @@ class WebhookQueue:
             "retry_count": 0,
         }
 
-        message_id = self.redis.xadd(self.stream, payload)
+        message_id = await self.redis.xadd(self.stream, payload)
         logger.info(f"Enqueued webhook {webhook_id}: {message_id}")
         return message_id
 
     async def dequeue(self, count: int = 1):
-        """Remove and return webhooks from queue."""
-        messages = self.redis.xread({self.stream: "0"}, count=count)
+        """Return webhooks from the stream without claiming them."""
+        messages = await self.redis.xread({self.stream: "0"}, count=count)
         result = []
         if messages:
             for stream, msgs in messages:
@@ -40,51 +103,170 @@ class WebhookQueue:
                     result.append({"id": msg_id, "payload": payload})
         return result
 
-    async def process_batch(self, batch_size: int = 10):
-        """Process webhooks from queue."""
+    async def ensure_group(self):
+        if self._group_ready:
+            return
         try:
-            self.redis.xgroup_create(
-                self.stream, "webhook-workers", id="0", mkstream=True
+            await self.redis.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def process_batch(
+        self, batch_size: int = 10, block_ms: Optional[int] = 1000
+    ) -> int:
+        """Deliver up to ``batch_size`` webhooks concurrently.
+
+        Due retries are moved back onto the stream first, then stale entries
+        of other consumers are claimed, then new entries are read.
+        """
+        await self.ensure_group()
+        await self.promote_due_retries()
+
+        messages = await self.claim_stale(batch_size)
+        if len(messages) < batch_size:
+            response = await self.redis.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.stream: ">"},
+                count=batch_size - len(messages),
+                # Claimed work is waiting; don't block for new entries
+                block=None if messages else block_ms,
+            )
+            for _stream, entries in response or []:
+                messages.extend(entries)
+
+        if messages:
+            await asyncio.gather(
+                *(self._process_message(mid, payload) for mid, payload in messages)
             )
-        except Exception:
-            pass
-
-        messages = self.redis.xreadgroup(
-            "webhook-workers",
-            "worker-1",
-            {self.stream: ">"},
-            count=batch_size,
-            block=1000,
+        return len(messages)
+
+    async def claim_stale(self, count: int) -> List:
+        """Take over entries another consumer read but never acked."""
+        idle_ms = int(self.settings.webhook_claim_idle_seconds * 1000)
+        result = await self.redis.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_time=idle_ms,
+            start_id=self._claim_cursor,
+            count=count,
+        )
+        if not result:
+            return []
+        self._claim_cursor = _text(result[0])
+        return [entry for entry in result[1] if entry and entry[1]]
+
+    async def promote_due_retries(self, limit: int = 100) -> int:
+        """Move retries whose backoff has elapsed back onto the stream."""
+        due = await self.redis.zrangebyscore(
+            self.retry_key, "-inf", time.time(), start=0, num=limit
         )
+        moved = 0
+        for member in due:
+            # ZREM is the claim: only the worker that removed it re-adds it
+            if await self.redis.zrem(self.retry_key, member):
+                entry = json.loads(_text(member))
+                await self.redis.xadd(self.stream, entry["fields"])
+                moved += 1
+        return moved
 
-        for stream, message_list in messages:
-            for message_id, payload in message_list:
-                await self._process_message(message_id, payload)
+    def backoff(self, retry_count: int) -> float:
+        """Exponential backoff with jitter over the upper half of the delay."""
+        delay = min(
+            self.settings.webhook_retry_base_seconds * 2**retry_count,
+            self.settings.webhook_retry_max_seconds,
+        )
+        return delay / 2 + random.uniform(0, delay / 2)
 
-    async def _process_message(self, message_id: str, payload: Dict):
+    async def _process_message(self, message_id, payload: Dict):
         """Process single webhook message."""
-        from app.services.webhook_service import webhook_service
+        fields = {_text(k): _text(v) for k, v in payload.items()}
+        async with self._semaphore:
+            try:
+                await self._attempt(_text(message_id), fields)
+            except Exception as e:
+                # Left pending; XAUTOCLAIM picks it up after the idle timeout
+                logger.error(f"Webhook message {message_id} not processed: {e}")
+                return
+            await self.redis.xack(self.stream, self.group, message_id)
 
-        webhook_id = payload[b"webhook_id"].decode()
-        event = payload[b"event"].decode()
-        data = json.loads(payload[b"data"].decode())
-        retry_count = int(payload.get(b"retry_count", b"0"))
+    async def _attempt(self, message_id: str, fields: Dict[str, str]):
+        webhook_id = fields.get("webhook_id")
+        retry_count = int(fields.get("retry_count") or 0)
 
-        try:
-            await webhook_service.deliver(webhook_id, event, data, "secret")
-            self.redis.xack(self.stream, "webhook-workers", message_id)
-            logger.info(f"Webhook {webhook_id} delivered successfully")
+        endpoint = await asyncio.to_thread(_load_endpoint, webhook_id)
+        if endpoint is None:
+            logger.warning(f"Webhook {webhook_id} is gone or inactive; dropping")
+            return
+        url, secret = endpoint
 
-        except Exception as e:
-            logger.error(f"Webhook delivery failed: {str(e)}")
+        breaker = self._breaker(url)
+        if not breaker.allow_request():
+            # The endpoint is down, not the message: retry without counting it
+            wait = breaker.recovery_timeout - (time.time() - breaker.last_failure_time)
+            await self._schedule(message_id, fields, max(wait, 1.0))
+            return
 
+        try:
+            await self._deliver(url, secret, fields)
+        except Exception as e:
+            breaker.record_failure()
+            logger.warning(f"Webhook {webhook_id} delivery failed: {e}")
             if retry_count < self.max_retries:
-                payload[b"retry_count"] = str(retry_count + 1).encode()
-                self.redis.xadd(self.stream, payload)
+                fields = {**fields, "retry_count": str(retry_count + 1)}
+                await self._schedule(message_id, fields, self.backoff(retry_count))
             else:
-                self.redis.xadd(self.dlq_stream, payload)
+                await self.redis.xadd(self.dlq_stream, fields)
                 logger.error(
                     f"Webhook {webhook_id} moved to DLQ after {retry_count} retries"
                 )
+            return
 
-            self.redis.xack(self.stream, "webhook-workers", message_id)
+        breaker.record_success()
+        logger.info(f"Webhook {webhook_id} delivered successfully")
+
+    async def _schedule(self, message_id: str, fields: Dict[str, str], delay: float):
+        # The message id keeps otherwise identical payloads distinct
+        member = json.dumps({"id": message_id, "fields": fields}, sort_keys=True)
+        await self.redis.zadd(self.retry_key, {member: time.time() + delay})
+
+    async def _deliver(self, url: str, secret: Optional[str], fields: Dict[str, str]):
+        payload = json.dumps(
+            {"event": fields["event"], "data": json.loads(fields["data"])}
+        )
+        headers = {"Content-Type": "application/json"}
+        if secret:
+            headers["X-Webhook-Signature"] = hmac.new(
+                secret.encode(), payload.encode(), hashlib.sha256
+            ).hexdigest()
+
+        response = await self._client().post(url, content=payload, headers=headers)
+        response.raise_for_status()
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            breaker = self._breakers[url] = CircuitBreaker(
+                failure_threshold=self.settings.webhook_breaker_failure_threshold,
+                recovery_timeout=self.settings.webhook_breaker_recovery_seconds,
+            )
+        return breaker
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.http is None:
+            concurrency = self.settings.webhook_worker_concurrency
+            # Own client: its pool is sized to the worker concurrency
+            self.http = get_http_client(
+                "webhook-queue",
+                timeout=httpx.Timeout(self.settings.webhook_delivery_timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=concurrency,
+                    max_keepalive_connections=concurrency,
+                ),
+            )
+        return self.http
@@ -6,8 +6,7 @@ import json
 import uuid
 from typing import Any, Dict, Optional
 
-import httpx
-
+from app.core.http_clients import get_http_client
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -62,13 +61,14 @@ class WebhookService:
     async def trigger_webhook(self, url: str, event: str, data: Dict[str, Any]) -> dict:
         payload = json.dumps({"event": event, "data": data})
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                resp = await client.post(
-                    url,
-                    content=payload,
-                    headers={"Content-Type": "application/json"},
-                )
-                return {"success": resp.status_code < 400}
+            client = get_http_client("webhooks")
+            resp = await client.post(
+                url,
+                content=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout,
+            )
+            return {"success": resp.status_code < 400}
         except Exception as e:
             logger.error(f"Webhook trigger failed: {e}")
             return {"success": False, "error": str(e)}
@@ -104,17 +104,17 @@ class WebhookService:
         signature = self._sign_payload(payload, secret)
 
         try:
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    webhook["url"],
-                    content=payload,
-                    headers={
-                        "X - Webhook-Signature": signature,
-                        "Content - Type": "application/json",
-                    },
-                    timeout=self.timeout,
-                )
-                webhook["retries"] = 0
+            client = get_http_client("webhooks")
+            await client.post(
+                webhook["url"],
+                content=payload,
+                headers={
+                    "X - Webhook-Signature": signature,
+                    "Content - Type": "application/json",
+                },
+                timeout=self.timeout,
+            )
+            webhook["retries"] = 0
         except Exception as e:
             logger.error(f"Webhook delivery failed: {e}")
             webhook["retries"] += 1
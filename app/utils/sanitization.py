@@ -70,6 +70,80 @@ def sanitize_email_content(content: str) -> str:
     return sanitized
 
 
+# Top-level response keys that carry user-facing text
+RESPONSE_TEXT_FIELDS = frozenset(
+    ["message", "description", "name", "email", "title", "content"]
+)
+
+# sanitize_html returns a string unchanged unless it holds a character
+# html.escape rewrites or matches one of its javascript: / on*= patterns.
+# The character class is a cheap first pass; ':' and '=' are common in clean
+# values (timestamps, URLs), so those are confirmed with the full pattern.
+_UNSAFE_CHARS = re.compile(r"""[&<>"'=:]""")
+_UNSAFE_TEXT = re.compile(r"""[&<>"']|javascript:|on\w+\s*=""", re.IGNORECASE)
+
+
+def _is_clean(text: str) -> bool:
+    return _UNSAFE_CHARS.search(text) is None or _UNSAFE_TEXT.search(text) is None
+
+
+def _sanitize_text(text: str) -> str:
+    return text if _is_clean(text) else sanitize_html(text)
+
+
+def _sanitize_tree(data: Any) -> Any:
+    """``sanitize_user_input`` that only copies containers it changes."""
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    elif isinstance(data, str):
+        return _sanitize_text(data)
+    else:
+        return data
+
+    copy = None
+    for key, value in items:
+        if type(value) is str:
+            # Inlined string case: most values are short, clean strings
+            if _is_clean(value):
+                continue
+            clean = sanitize_html(value)
+        else:
+            clean = _sanitize_tree(value)
+            if clean is value:
+                continue
+        if copy is None:
+            copy = data.copy()
+        copy[key] = clean
+    return data if copy is None else copy
+
+
+def sanitize_response_content(content: Any) -> Any:
+    """Apply the ``validate_and_sanitize_response`` rules before encoding.
+
+    Produces the same result, but strings without markup-relevant
+    characters are left as they are and unchanged containers are not
+    copied, so ``content`` itself is returned when nothing needs escaping.
+    """
+    if not isinstance(content, dict):
+        return content
+
+    copy = None
+    for key, value in content.items():
+        if key in RESPONSE_TEXT_FIELDS:
+            clean = value if value is None else _sanitize_text(str(value))
+        elif isinstance(value, (dict, list)):
+            clean = _sanitize_tree(value)
+        else:
+            continue
+        if clean is not value:
+            if copy is None:
+                copy = dict(content)
+            copy[key] = clean
+    return content if copy is None else copy
+
+
 def validate_and_sanitize_response(response_data: Dict) -> Dict:
     """Validate and sanitize API response data."""
     if not isinstance(response_data, dict):
@@ -77,7 +151,7 @@ def validate_and_sanitize_response(response_data: Dict) -> Dict:
 
     sanitized = {}
     for key, value in response_data.items():
-        if key in ["message", "description", "name", "email", "title", "content"]:
+        if key in RESPONSE_TEXT_FIELDS:
             # Sanitize user - facing text fields
             sanitized[key] = sanitize_html(str(value)) if value is not None else value
         elif isinstance(value, (dict, list)):
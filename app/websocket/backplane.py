@@ -0,0 +1,124 @@
+"""Cross-worker fan-out for WebSocket messages.
+
+Each uvicorn worker only holds its own sockets. ``ConnectionManager``
+publishes user-targeted messages through a backplane so that whichever
+worker holds the socket delivers it. ``RedisBackplane`` carries messages
+over Redis pub/sub; ``LocalBackplane`` links managers inside one process,
+which is how the tests stand up several "workers".
+"""
+
+import asyncio
+import json
+from typing import Callable, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHANNEL = "websocket:fanout"
+
+Handler = Callable[[dict], None]
+
+
+def _get_redis():
+    """Lazy import to avoid circular deps; None when Redis is unavailable."""
+    from app.core.unified_cache import cache
+
+    return cache.redis_client
+
+
+class _Backplane:
+    def __init__(self):
+        self._handlers: List[Handler] = []
+
+    def attach(self, handler: Handler) -> None:
+        self._handlers.append(handler)
+
+    def detach(self, handler: Handler) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    def _dispatch(self, envelope: dict) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(envelope)
+            except Exception as e:
+                logger.warning(f"WebSocket backplane handler failed: {e}")
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class LocalBackplane(_Backplane):
+    """Delivers to every attached manager in this process."""
+
+    async def publish(self, envelope: dict) -> bool:
+        self._dispatch(envelope)
+        return True
+
+
+class RedisBackplane(_Backplane):
+    """Redis pub/sub backplane; local-only while Redis is unavailable."""
+
+    def __init__(self, channel: str = CHANNEL):
+        super().__init__()
+        self.channel = channel
+        self._listener_task: Optional[asyncio.Task] = None
+
+    async def publish(self, envelope: dict) -> bool:
+        redis = _get_redis()
+        if redis is None:
+            return False
+        try:
+            await redis.publish(self.channel, json.dumps(envelope))
+            return True
+        except Exception as e:
+            logger.warning(f"WebSocket backplane publish failed: {e}")
+            return False
+
+    def start(self) -> None:
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_redis())
+
+    async def stop(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    def _on_message(self, data) -> None:
+        try:
+            envelope = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if isinstance(envelope, dict):
+            self._dispatch(envelope)
+
+    async def _listen_redis(self) -> None:
+        while True:
+            redis = _get_redis()
+            if redis is None:
+                logger.info("Redis unavailable; WebSocket fan-out is local-only")
+                return
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._on_message(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket backplane subscription dropped: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
@@ -1,19 +1,50 @@
-"""WebSocket connection manager for real-time notifications."""
+"""WebSocket connection manager for real-time notifications.
 
+Every connection gets a bounded send queue drained by its own task, so one
+slow client cannot hold up delivery to the rest. User-targeted messages are
+also published on a backplane so the worker holding the socket delivers them.
+"""
+
+import asyncio
 import logging
-from typing import Dict, Set
+import uuid
+from typing import Dict, Optional, Set
 
 from fastapi import WebSocket
 
+from app.core.config import get_settings
+from app.core.metrics import (
+    websocket_backplane_messages_total,
+    websocket_send_queue_dropped_total,
+)
+from app.websocket.backplane import RedisBackplane
+
 logger = logging.getLogger(__name__)
 
+# WebSocket close code 1013: "try again later"
+_SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Sender:
+    """Outbound queue for one connection and the task draining it."""
+
+    __slots__ = ("queue", "task")
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time notifications."""
 
-    def __init__(self):
+    def __init__(self, backplane=None):
         # user_id -> Set of WebSocket connections
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self._senders: Dict[WebSocket, _Sender] = {}
+        self._origin = uuid.uuid4().hex
+        self.backplane = backplane if backplane is not None else RedisBackplane()
+        self.backplane.attach(self._on_backplane_message)
 
     async def connect(self, websocket: WebSocket, user_id: str):
         """Accept and store WebSocket connection."""
@@ -35,46 +66,116 @@ class ConnectionManager:
         )
 
     def disconnect(self, websocket: WebSocket, user_id: str):
-        """Remove WebSocket connection."""
-        if user_id in self.active_connections:
-            self.active_connections[user_id].discard(websocket)
+        """Remove WebSocket connection. Safe to call more than once."""
+        self._discard_sender(websocket)
+        connections = self.active_connections.get(user_id)
+        if connections is None:
+            return
+        connections.discard(websocket)
 
-        if not self.active_connections[user_id]:
+        if not connections:
             del self.active_connections[user_id]
             logger.info(f"🔌 All connections closed for user {user_id}")
         else:
             logger.info(
                 f"🔌 WebSocket disconnected: user={user_id}, "
-                f"remaining={len(self.active_connections[user_id])}"
+                f"remaining={len(connections)}"
             )
 
     async def send_personal_message(self, message: dict, user_id: str):
-        """Send message to specific user's connections."""
+        """Queue a message for this worker's connections of a user.
+
+        Returns once the message is queued; each connection's sender task
+        writes it to the socket.
+        """
         if user_id not in self.active_connections:
             logger.debug(f"No active connections for user {user_id}")
             return
+        self._deliver_local(user_id, message)
 
-        disconnected = set()
+    def _deliver_local(self, user_id: str, message: dict) -> int:
+        queued = 0
+        for connection in list(self.active_connections.get(user_id, ())):
+            if self._enqueue(connection, user_id, message):
+                queued += 1
+        return queued
 
-        for connection in self.active_connections[user_id]:
+    def _enqueue(self, websocket: WebSocket, user_id: str, message: dict) -> bool:
+        sender = self._senders.get(websocket)
+        if sender is None:
+            sender = _Sender(get_settings().websocket_send_queue_size)
+            self._senders[websocket] = sender
+        try:
+            sender.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(
+                f"Send queue full for user {user_id}; dropping slow connection"
+            )
+            websocket_send_queue_dropped_total.labels(reason="queue_full").inc()
+            self.disconnect(websocket, user_id)
+            asyncio.create_task(self._close_slow(websocket))
+            return False
+        # The sender task exits once its queue is empty, so idle sockets
+        # hold no task
+        if sender.task is None or sender.task.done():
+            sender.task = asyncio.create_task(
+                self._drain_sender(websocket, user_id, sender.queue)
+            )
+        return True
+
+    async def _drain_sender(
+        self, websocket: WebSocket, user_id: str, queue: asyncio.Queue
+    ):
+        timeout = get_settings().websocket_send_timeout_seconds
+        while not queue.empty():
+            message = queue.get_nowait()
             try:
-                await connection.send_json(message)
+                await asyncio.wait_for(websocket.send_json(message), timeout)
                 logger.debug(f"📤 Sent message to user {user_id}")
+            except asyncio.TimeoutError:
+                logger.warning(f"Send to user {user_id} timed out; dropping connection")
+                websocket_send_queue_dropped_total.labels(reason="timeout").inc()
+                self.disconnect(websocket, user_id)
+                await self._close_slow(websocket)
+                return
             except Exception as e:
                 logger.warning(f"Failed to send to connection: {e}")
-                disconnected.add(connection)
+                self.disconnect(websocket, user_id)
+                return
+            finally:
+                queue.task_done()
 
-        # Clean up disconnected
-        for conn in disconnected:
-            self.disconnect(conn, user_id)
+    def _discard_sender(self, websocket: WebSocket):
+        sender = self._senders.pop(websocket, None)
+        if sender is None:
+            return
+        # Release anything still queued so drain() never waits on a dead socket
+        while not sender.queue.empty():
+            sender.queue.get_nowait()
+            sender.queue.task_done()
+        if sender.task is not None and sender.task is not asyncio.current_task():
+            sender.task.cancel()
+
+    async def _close_slow(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=_SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    async def drain(self):
+        """Wait until every queued message has been written or dropped."""
+        await asyncio.gather(
+            *(sender.queue.join() for sender in list(self._senders.values()))
+        )
 
     async def broadcast(self, message: dict):
-        """Broadcast message to all connected users."""
+        """Broadcast message to all connected users on every worker."""
         user_count = len(self.active_connections)
         logger.info(f"📢 Broadcasting to {user_count} users")
 
         for user_id in list(self.active_connections.keys()):
-            await self.send_personal_message(message, user_id)
+            self._deliver_local(user_id, message)
+        await self._publish(None, message)
 
     def get_user_connection_count(self, user_id: str) -> int:
         """Get number of active connections for user."""
@@ -92,10 +193,14 @@ class ConnectionManager:
         return bool(self.active_connections.get(user_id))
 
     async def broadcast_to_user(self, user_id: str, message: dict) -> bool:
-        if not self.is_user_connected(user_id):
-            return False
-        await self.send_personal_message(message, user_id)
-        return True
+        """Deliver to the user's sockets on this worker and every other one.
+
+        True when a local connection took the message or the backplane
+        accepted it for the other workers.
+        """
+        delivered = self._deliver_local(user_id, message) > 0
+        published = await self._publish(user_id, message)
+        return delivered or published
 
     def subscribe_user(self, user_id: str, channel: str) -> bool:
         if not hasattr(self, "_channels"):
@@ -123,6 +228,38 @@ class ConnectionManager:
     def get_active_users(self) -> list:
         return list(self.active_connections.keys())
 
+    # ------------------------------------------------------------------
+    # Cross-worker fan-out
+    # ------------------------------------------------------------------
+
+    async def _publish(self, user_id: Optional[str], message: dict) -> bool:
+        published = await self.backplane.publish(
+            {"origin": self._origin, "user_id": user_id, "message": message}
+        )
+        if published:
+            websocket_backplane_messages_total.labels(direction="out").inc()
+        return published
+
+    def _on_backplane_message(self, envelope: dict) -> None:
+        # Our own messages were already delivered locally before publishing
+        if envelope.get("origin") == self._origin or "message" not in envelope:
+            return
+        websocket_backplane_messages_total.labels(direction="in").inc()
+        user_id = envelope.get("user_id")
+        if user_id is None:
+            for uid in list(self.active_connections.keys()):
+                self._deliver_local(uid, envelope["message"])
+        else:
+            self._deliver_local(user_id, envelope["message"])
+
+    def start(self):
+        self.backplane.start()
+
+    async def stop(self):
+        await self.backplane.stop()
+        for websocket in list(self._senders):
+            self._discard_sender(websocket)
+
 
 # Global instance
 manager = ConnectionManager()
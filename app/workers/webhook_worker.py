@@ -3,9 +3,10 @@
 import asyncio
 import logging
 
-from redis import Redis
+import redis.asyncio as aioredis
 
 from app.core.config import get_settings
+from app.core.http_clients import close_http_clients
 from app.services.webhook_queue import WebhookQueue
 
 logger = logging.getLogger(__name__)
@@ -14,15 +15,22 @@ logger = logging.getLogger(__name__)
 async def run_webhook_worker():
     """Run webhook worker continuously."""
     settings = get_settings()
-    redis = Redis.from_url(settings.redis_url)
+    redis = aioredis.from_url(settings.redis_url, decode_responses=True)
     queue = WebhookQueue(redis)
-
-    while True:
-        try:
-            await queue.process_batch(batch_size=10)
-        except Exception as e:
-            logger.error("Worker error", extra={"error": str(e)})
-            await asyncio.sleep(5)
+    logger.info(f"Webhook worker started as consumer {queue.consumer}")
+
+    try:
+        while True:
+            try:
+                await queue.process_batch(
+                    batch_size=settings.webhook_worker_concurrency
+                )
+            except Exception as e:
+                logger.error("Worker error", extra={"error": str(e)})
+                await asyncio.sleep(5)
+    finally:
+        await close_http_clients()
+        await redis.aclose()
 
 
 if __name__ == "__main__":
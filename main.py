@@ -8,7 +8,7 @@ from typing import Optional
 
 import jwt
 import uvicorn
-from fastapi import Depends, FastAPI, Request
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware as FastAPICORSMiddleware
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi.staticfiles import StaticFiles
@@ -64,13 +64,14 @@ from app.core.database import get_db
 from app.core.lifespan import lifespan
 from app.core.logging import get_logger, setup_logging
 from app.core.unified_error_handling import setup_unified_middleware
-from app.core.unified_rate_limiting import setup_unified_rate_limiting
 from app.middleware.csrf_middleware import CSRFMiddleware
 from app.middleware.logging import RequestLoggingMiddleware
+from app.middleware.mime_types import MimeTypeMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
-from app.middleware.tier_verification import tier_verification_middleware
+from app.middleware.tier_verification import TierVerificationMiddleware
+from app.middleware.timing import add_timed_middleware
 from app.middleware.whitelabel_middleware import WhitelabelMiddleware
-from app.middleware.xss_protection import XSSProtectionMiddleware
+from app.middleware.xss_protection import SanitizedJSONResponse, XSSProtectionMiddleware
 from app.models.base import Base
 
 # Import modular routers
@@ -114,12 +115,15 @@ def create_app() -> FastAPI:
         version=settings.version,
         description="Modular SMS Verification Service",
         lifespan=lifespan,
+        default_response_class=SanitizedJSONResponse,
         docs_url="/api/swagger",  # Move Swagger UI to /api/swagger
         redoc_url="/api/redoc",  # Move ReDoc to /api/redoc
     )
 
     # ============== MIDDLEWARE ==============
-    fastapi_app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # All layers are pure ASGI; add_timed_middleware records what each one
+    # costs per request (middleware_layer_seconds)
+    add_timed_middleware(fastapi_app, GZipMiddleware, "gzip", minimum_size=1000)
 
     cors_origins = [
         "http://localhost:3000",
@@ -137,38 +141,31 @@ def create_app() -> FastAPI:
             )
         )
 
-    fastapi_app.add_middleware(
+    add_timed_middleware(
+        fastapi_app,
         FastAPICORSMiddleware,
+        "cors",
         allow_origins=cors_origins,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["Content-Type", "Authorization", "X-CSRF-Token"],
     )
 
+    # Error handling and rate limiting (setup_unified_middleware adds both)
     setup_unified_middleware(fastapi_app)
-    setup_unified_rate_limiting(fastapi_app)
-
-    @fastapi_app.middleware("http")
-    async def fix_mime_types(request: Request, call_next):
-        response = await call_next(request)
-        path = request.url.path
-        if path.endswith(".css"):
-            response.headers["content-type"] = "text/css; charset=utf-8"
-        elif path.endswith(".js"):
-            response.headers["content-type"] = "application/javascript; charset=utf-8"
-        return response
-
-    fastapi_app.add_middleware(SecurityHeadersMiddleware)
-    fastapi_app.add_middleware(XSSProtectionMiddleware)
-    fastapi_app.add_middleware(RequestLoggingMiddleware)
+
+    add_timed_middleware(fastapi_app, MimeTypeMiddleware, "mime_types")
+    add_timed_middleware(fastapi_app, SecurityHeadersMiddleware, "security_headers")
+    add_timed_middleware(fastapi_app, XSSProtectionMiddleware, "xss_protection")
+    add_timed_middleware(fastapi_app, RequestLoggingMiddleware, "request_logging")
 
     # Whitelabel middleware for custom domain detection
-    fastapi_app.add_middleware(WhitelabelMiddleware, base_domain=settings.base_url)
+    add_timed_middleware(
+        fastapi_app, WhitelabelMiddleware, "whitelabel", base_domain=settings.base_url
+    )
 
     # Tier verification middleware (must be after auth middleware)
-    @fastapi_app.middleware("http")
-    async def tier_verification_wrapper(request: Request, call_next):
-        return await tier_verification_middleware(request, call_next)
+    add_timed_middleware(fastapi_app, TierVerificationMiddleware, "tier_verification")
 
     # ============== STATIC FILES ==============
     if STATIC_DIR.exists():
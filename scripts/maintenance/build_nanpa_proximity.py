@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""Rebuild app/assets/nanpa_proximity.json after editing nanpa_index.json.
+
+The service rebuilds the index in memory when the file is stale, so this only
+saves that work at startup.
+"""
+
+from app.services.area_code_geo import PROXIMITY_PATH, write_proximity_index
+
+if __name__ == "__main__":
+    index = write_proximity_index()
+    print(f"Wrote {len(index.neighbors)} area codes to {PROXIMITY_PATH}")
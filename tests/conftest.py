@@ -2,16 +2,19 @@
 
 import uuid
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import fakeredis
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from app.core.database import Base, get_db
+from app.core.database import Base, get_async_db, get_db
 from app.core.dependencies import get_current_user_id
+from app.core.unified_rate_limiting import unified_rate_limiter
 from app.models.activity import Activity
 from app.models.affiliate import (
     AffiliateApplication,
@@ -56,6 +59,11 @@ from app.models.waitlist import Waitlist
 #     WhiteLabelDomain,
 #     WhiteLabelTheme,
 # )
+from app.services import area_code_analytics_service
+from app.services.notification_analytics_service import notification_stats
+from app.services.providers.scoring_snapshot import scoring_snapshot
+from app.services.service_catalog import service_catalog
+from app.services.tier_cache import tier_cache
 from app.utils.security import create_access_token
 from main import app
 
@@ -69,10 +77,42 @@ def check_services():
     pass
 
 
+@pytest.fixture(autouse=True)
+def _fresh_tier_cache():
+    """Tests change tiers directly in the DB; start each one with no cached tiers."""
+    tier_cache.clear()
+    with patch(
+        "app.services.tier_cache._get_redis",
+        return_value=fakeredis.FakeRedis(decode_responses=True),
+    ):
+        yield
+    tier_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_state():
+    """Buffered counters, caches and rate limit windows belong to their test."""
+    notification_stats.clear()
+    service_catalog.clear()
+    area_code_analytics_service.clear_cache()
+    scoring_snapshot.clear()
+    unified_rate_limiter.reset()
+    yield
+    notification_stats.clear()
+    service_catalog.clear()
+    area_code_analytics_service.clear_cache()
+    scoring_snapshot.clear()
+    unified_rate_limiter.reset()
+
+
+# In-memory, but shared so the async engine sees the same database
+TEST_DATABASE = "file:namaskah_test?mode=memory&cache=shared&uri=true"
+
+
 @pytest.fixture(scope="session")
 def engine():
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{TEST_DATABASE}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         echo=False,
@@ -81,6 +121,34 @@ def engine():
     return engine
 
 
+@pytest.fixture(scope="session")
+def async_engine(engine):
+    # A connection per session: each test client runs its own event loop
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{TEST_DATABASE}", poolclass=NullPool
+    )
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _read_uncommitted(dbapi_connection, connection_record):
+        # Read what the sync test session has written, as one connection would
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA read_uncommitted = 1")
+        cursor.close()
+
+    return async_engine
+
+
+def _override_get_async_db(async_engine):
+    async def override_get_async_db():
+        session = AsyncSession(async_engine, autoflush=False, expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    return override_get_async_db
+
+
 @pytest.fixture(scope="function")
 def db(engine):
     # Ensure a clean slate for every test
@@ -101,7 +169,16 @@ def db_session(db):
 
 
 @pytest.fixture
-def client(engine):
+async def async_db(db, async_engine):
+    session = AsyncSession(async_engine, autoflush=False, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+@pytest.fixture
+def client(engine, async_engine):
     def override_get_db():
         TestingSessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=engine
@@ -113,6 +190,7 @@ def client(engine):
             session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db(async_engine)
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -312,7 +390,7 @@ def test_transaction(db, test_user):
     return transaction
 
 
-def _make_client_with_user(engine, user_id):
+def _make_client_with_user(engine, async_engine, user_id):
     def override_get_db():
         TestingSessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=engine
@@ -324,48 +402,49 @@ def _make_client_with_user(engine, user_id):
             session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db(async_engine)
     app.dependency_overrides[get_current_user_id] = lambda: str(user_id)
     return TestClient(app)
 
 
 @pytest.fixture
-def authenticated_client(test_user, engine):
-    client = _make_client_with_user(engine, test_user.id)
+def authenticated_client(test_user, engine, async_engine):
+    client = _make_client_with_user(engine, async_engine, test_user.id)
     yield client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def authenticated_regular_client(regular_user, engine):
-    client = _make_client_with_user(engine, regular_user.id)
+def authenticated_regular_client(regular_user, engine, async_engine):
+    client = _make_client_with_user(engine, async_engine, regular_user.id)
     yield client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def authenticated_admin_client(admin_user, engine):
-    client = _make_client_with_user(engine, admin_user.id)
+def authenticated_admin_client(admin_user, engine, async_engine):
+    client = _make_client_with_user(engine, async_engine, admin_user.id)
     yield client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def authenticated_pro_client(pro_user, engine):
-    client = _make_client_with_user(engine, pro_user.id)
+def authenticated_pro_client(pro_user, engine, async_engine):
+    client = _make_client_with_user(engine, async_engine, pro_user.id)
     yield client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def admin_client(admin_user, engine):
-    client = _make_client_with_user(engine, admin_user.id)
+def admin_client(admin_user, engine, async_engine):
+    client = _make_client_with_user(engine, async_engine, admin_user.id)
     yield client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def regular_client(regular_user, engine):
-    client = _make_client_with_user(engine, regular_user.id)
+def regular_client(regular_user, engine, async_engine):
+    client = _make_client_with_user(engine, async_engine, regular_user.id)
     yield client
     app.dependency_overrides.clear()
 
@@ -0,0 +1,139 @@
+"""Benchmark area-code proximity lookups.
+
+Times ``get_nearby``-style lookups two ways:
+
+* ``scan``: the previous implementation, a haversine against every code and
+  a sort of all matches on each call
+* ``index``: a slice of the precomputed ``ProximityIndex`` neighbour list
+
+on the shipped NANPA index, and on a synthetic index of ``--synthetic``
+codes spread over the continental US to show how each scales.
+
+    python tests/load/area_code_geo_benchmark.py --synthetic 5000 --k 15
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.services.area_code_geo import (  # noqa: E402
+    NANPA_DATA,
+    TIER_ORDER,
+    ProximityIndex,
+    _haversine,
+)
+
+STATES = ["CA", "TX", "NY", "FL", "IL", "PA", "OH", "GA", "NC", "MI"]
+
+
+def synthetic_data(size: int) -> dict:
+    rng = random.Random(7)
+    metros = [f"Metro {i}" for i in range(max(1, size // 4))]
+    return {
+        str(1000 + i): {
+            "major_city": f"City {i}",
+            "state": rng.choice(STATES),
+            "lat": rng.uniform(25.0, 49.0),
+            "lng": rng.uniform(-124.0, -67.0),
+            "metro": rng.choice(metros),
+        }
+        for i in range(size)
+    }
+
+
+def scan_nearby(data: dict, area_code: str, k: int) -> list:
+    target = data[area_code]
+    results = []
+    for code, entry in data.items():
+        if code == area_code:
+            continue
+        dist = _haversine(target["lat"], target["lng"], entry["lat"], entry["lng"])
+        if entry["metro"] == target["metro"]:
+            tier = "same_city"
+        elif dist < 50:
+            tier = "nearby"
+        elif entry["state"] == target["state"]:
+            tier = "same_state"
+        else:
+            continue
+        results.append(
+            {
+                "area_code": code,
+                "city": entry["major_city"],
+                "state": entry["state"],
+                "proximity": tier,
+                "distance": dist,
+            }
+        )
+    results.sort(key=lambda x: (TIER_ORDER[x["proximity"]], x["distance"]))
+    return results[:k]
+
+
+def index_nearby(data: dict, index: ProximityIndex, area_code: str, k: int) -> list:
+    return [
+        {
+            "area_code": code,
+            "city": data[code]["major_city"],
+            "state": data[code]["state"],
+            "proximity": tier,
+            "distance": dist,
+        }
+        for code, tier, dist in index.neighbors.get(area_code, [])[:k]
+    ]
+
+
+def measure(fn, codes, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for code in codes:
+            fn(code)
+        samples.append((time.perf_counter() - start) / len(codes))
+    return statistics.median(samples)
+
+
+def run(label: str, data: dict, k: int, lookups: int, repeat: int) -> None:
+    start = time.perf_counter()
+    index = ProximityIndex.build(data)
+    build = time.perf_counter() - start
+
+    rng = random.Random(11)
+    codes = [rng.choice(list(data)) for _ in range(lookups)]
+    for code in codes[:50]:
+        assert scan_nearby(data, code, k) == index_nearby(data, index, code, k)
+
+    scan = measure(lambda code: scan_nearby(data, code, k), codes, repeat)
+    indexed = measure(lambda code: index_nearby(data, index, code, k), codes, repeat)
+    print(
+        f"{label:>10} codes={len(data):<6} build={build * 1000:8.1f}ms "
+        f"scan={scan * 1e6:9.1f}us index={indexed * 1e6:7.2f}us "
+        f"speedup={scan / indexed:7.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--synthetic", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=15)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run("nanpa", NANPA_DATA, args.k, args.lookups, args.repeat)
+    if args.synthetic:
+        run(
+            "synthetic",
+            synthetic_data(args.synthetic),
+            args.k,
+            args.lookups,
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
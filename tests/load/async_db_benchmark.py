@@ -0,0 +1,211 @@
+"""Benchmark hot-path latency under a mix of fast and slow queries.
+
+Issues ``--rate`` requests per second for ``--seconds`` on one event loop,
+as a worker serves them. Each request is either a balance lookup (the fast
+path) or, with probability ``--slow-ratio``, a deliberately slow query.
+Latency is measured from when a request was due, so time spent waiting for
+a stalled loop counts against it. Reports p50/p99 of the balance lookups
+two ways:
+
+* ``sync``: the previous handler shape, a sync Session queried on the loop,
+  so a slow query stalls every other request in the worker
+* ``async``: ``dashboard_router.get_balance`` on an AsyncSession, the way
+  it is served through ``get_async_db``
+
+    python tests/load/async_db_benchmark.py --rate 200 --slow-ratio 0.01
+    python tests/load/async_db_benchmark.py \\
+        --database-url postgresql://localhost/namaskah_bench
+
+Without ``--database-url`` a throwaway SQLite file is used and the slow query
+is a recursive CTE of ``--slow-rows`` rows; on Postgres it is
+``pg_sleep(--slow-seconds)``. Point it at an empty scratch database: the
+users table is dropped and recreated.
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import AsyncAdaptedQueuePool  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.api.dashboard_router import get_balance  # noqa: E402
+from app.core.database import async_database_url  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+SQLITE_SLOW = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+    "WHERE x < :rows) SELECT count(*) FROM c"
+)
+
+
+def seed(engine, users: int) -> list:
+    Base.metadata.create_all(engine)
+    table = User.__table__
+    table.drop(engine)
+    table.create(engine)
+    ids = [f"bench-user-{i}" for i in range(users)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(table),
+            [
+                {
+                    "id": user_id,
+                    "email": f"{user_id}@example.com",
+                    "password_hash": "x",
+                    "credits": float(i % 100),
+                }
+                for i, user_id in enumerate(ids)
+            ],
+        )
+    return ids
+
+
+def slow_statement(url: str, args):
+    if url.startswith("postgresql"):
+        return text("SELECT pg_sleep(:seconds)"), {"seconds": args.slow_seconds}
+    return text(SQLITE_SLOW), {"rows": args.slow_rows}
+
+
+async def run_sync(engine, ids, args) -> list:
+    """Each request queries through a sync Session on the event loop."""
+    sessions = sessionmaker(bind=engine)
+    slow, params = slow_statement(str(engine.url), args)
+    return await drive(
+        ids, args, sync_fast(sessions), sync_slow(sessions, slow, params)
+    )
+
+
+def sync_fast(sessions):
+    async def fast(user_id):
+        db = sessions()
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            return float(user.credits or 0.0)
+        finally:
+            db.close()
+
+    return fast
+
+
+def sync_slow(sessions, slow, params):
+    async def run(_):
+        db = sessions()
+        try:
+            db.execute(slow, params).scalar()
+        finally:
+            db.close()
+
+    return run
+
+
+async def run_async(url: str, ids, args) -> list:
+    """Each request is served from an AsyncSession, as get_async_db does."""
+    async_url = async_database_url(url)
+    # Pooled on SQLite too, so both backends measure a warm-pool worker
+    engine = create_async_engine(
+        async_url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=args.pool_size,
+        max_overflow=0,
+    )
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    slow, params = slow_statement(url, args)
+
+    async def fast(user_id):
+        async with sessions() as db:
+            return (await get_balance(user_id=user_id, db=db))["credits"]
+
+    async def run(_):
+        async with sessions() as db:
+            await db.scalar(slow, params)
+
+    try:
+        return await drive(ids, args, fast, run)
+    finally:
+        await engine.dispose()
+
+
+async def drive(ids, args, fast, slow) -> list:
+    """Open-loop arrivals; latency is measured from each request's due time."""
+    # Warm up mappers, statement caches and the pool outside the timed run
+    await asyncio.gather(*[fast(user_id) for user_id in ids[: args.pool_size]])
+
+    rng = random.Random(7)
+    latencies = []
+    tasks = []
+    interval = 1.0 / args.rate
+    start = time.perf_counter()
+
+    async def request(due):
+        if rng.random() < args.slow_ratio:
+            await slow(None)
+            return
+        await fast(rng.choice(ids))
+        latencies.append(time.perf_counter() - due)
+
+    for i in range(int(args.seconds * args.rate)):
+        due = start + i * interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(request(due)))
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+def report(label: str, latencies: list, seconds: float) -> None:
+    if not latencies:
+        print(f"{label:>6} no fast requests completed")
+        return
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:>6} fast={len(ordered):<7} rps={len(ordered) / seconds:8.0f} "
+        f"p50={statistics.median(ordered) * 1000:8.2f}ms "
+        f"p99={p99 * 1000:8.2f}ms max={ordered[-1] * 1000:8.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=200.0)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.01)
+    parser.add_argument("--slow-rows", type=int, default=100_000)
+    parser.add_argument("--slow-seconds", type=float, default=0.2)
+    args = parser.parse_args()
+
+    url = args.database_url
+    if not url:
+        path = os.path.join(tempfile.mkdtemp(), "async_db_benchmark.db")
+        url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    ids = seed(engine, args.users)
+    # Keep full collections over the imported app's heap out of the numbers
+    gc.collect()
+    gc.freeze()
+
+    report("sync", asyncio.run(run_sync(engine, ids, args)), args.seconds)
+    report("async", asyncio.run(run_async(url, ids, args)), args.seconds)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Benchmark PurchaseIntelligenceService aggregates against a large outcome table.
+
+Seeds ``purchase_outcomes`` with synthetic rows, then times the SQL GROUP BY
+implementations of get_provider_roi, get_live_health_score and
+score_availability. With ``--legacy`` it also times the previous approach of
+loading every matching row with ``.all()`` and aggregating in Python.
+
+    python tests/load/purchase_intelligence_benchmark.py --rows 1000000
+    python tests/load/purchase_intelligence_benchmark.py --rows 10000000 \\
+        --database-url postgresql://localhost/namaskah_bench
+
+Without ``--database-url`` a throwaway SQLite file is used. Point it at an
+empty scratch database: the table is dropped and recreated.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.models.base import Base  # noqa: E402
+from app.models.purchase_outcome import PurchaseOutcome  # noqa: E402
+from app.services import purchase_intelligence  # noqa: E402
+from app.services.purchase_intelligence import PurchaseIntelligenceService  # noqa: E402
+
+PROVIDERS = ["textverified", "5sim", "telnyx", "pvapins"]
+SERVICES = ["whatsapp", "telegram", "google", "discord", "tiktok"]
+COUNTRIES = ["US", "GB", "CA", "DE", "FR"]
+AREA_CODES = ["213", "310", "415", "469", "646", "718", "917"]
+BATCH = 50_000
+
+
+class _NoCache:
+    """Stand-in for the unified cache so every call hits the database."""
+
+    async def get(self, key):
+        return None
+
+    async def set(self, key, value, ttl=None):
+        return None
+
+
+def seed(engine, rows: int, days: int) -> None:
+    # Foreign key targets must exist before purchase_outcomes on Postgres
+    Base.metadata.create_all(engine)
+    table = PurchaseOutcome.__table__
+    table.drop(engine)
+    table.create(engine)
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    span = days * 86400
+    with engine.begin() as conn:
+        for start in range(0, rows, BATCH):
+            batch = []
+            for _ in range(min(BATCH, rows - start)):
+                code = rng.choice(AREA_CODES)
+                refunded = rng.random() < 0.1
+                batch.append(
+                    {
+                        "service": rng.choice(SERVICES),
+                        "requested_code": code,
+                        "assigned_code": code if rng.random() < 0.7 else "999",
+                        "provider": rng.choice(PROVIDERS),
+                        "country": rng.choice(COUNTRIES),
+                        "sms_received": rng.random() < 0.8,
+                        "provider_cost": 1.0,
+                        "user_price": 2.0,
+                        "is_refunded": refunded,
+                        "refund_amount": 2.0 if refunded else 0.0,
+                        "created_at": now - timedelta(seconds=rng.randrange(span)),
+                    }
+                )
+            conn.execute(insert(table), batch)
+            print(f"  seeded {start + len(batch):,}/{rows:,}", end="\r", flush=True)
+    print()
+
+
+def legacy_provider_roi(db, days):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    outcomes = (
+        db.query(PurchaseOutcome).filter(PurchaseOutcome.created_at >= cutoff).all()
+    )
+    stats = {}
+    for o in outcomes:
+        s = stats.setdefault(o.provider or "unknown", [0.0, 0.0, 0.0])
+        s[0] += o.provider_cost or 0.0
+        s[1] += o.user_price or 0.0
+        if o.is_refunded:
+            s[2] += o.refund_amount or 0.0
+    return stats
+
+
+def legacy_live_health(Session, service, country, provider):
+    one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    with Session() as db:
+        outcomes = (
+            db.query(PurchaseOutcome)
+            .filter(
+                PurchaseOutcome.service == service,
+                PurchaseOutcome.country == country,
+                PurchaseOutcome.provider == provider,
+                PurchaseOutcome.created_at >= one_hour_ago,
+            )
+            .all()
+        )
+    return sum(1 for o in outcomes if o.sms_received is True) / max(len(outcomes), 1)
+
+
+def legacy_score_availability(Session, service, area_code):
+    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    with Session() as db:
+        outcomes = (
+            db.query(PurchaseOutcome)
+            .filter(
+                PurchaseOutcome.service == service,
+                (PurchaseOutcome.assigned_code == area_code)
+                | (PurchaseOutcome.requested_code == area_code),
+                PurchaseOutcome.created_at >= seven_days_ago,
+            )
+            .all()
+        )
+    return sum(1 for o in outcomes if o.assigned_code == area_code) / max(
+        len(outcomes), 1
+    )
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30, help="spread of created_at")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    url = args.database_url
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'pi_benchmark.db')}"
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine)
+
+    if not args.skip_seed:
+        print(f"Seeding {args.rows:,} outcomes into {engine.url.render_as_string()}")
+        seed(engine, args.rows, args.days)
+
+    purchase_intelligence.SessionLocal = Session
+    purchase_intelligence.cache = _NoCache()
+    loop = asyncio.new_event_loop()
+    run = loop.run_until_complete
+    db = Session()
+
+    cases = [
+        (
+            "get_provider_roi(days=14)",
+            lambda: PurchaseIntelligenceService.get_provider_roi(db, days=14),
+            lambda: legacy_provider_roi(db, 14),
+        ),
+        (
+            "get_live_health_score",
+            lambda: run(
+                PurchaseIntelligenceService.get_live_health_score(
+                    "whatsapp", "US", "textverified"
+                )
+            ),
+            lambda: legacy_live_health(Session, "whatsapp", "US", "textverified"),
+        ),
+        (
+            "score_availability",
+            lambda: run(
+                PurchaseIntelligenceService.score_availability("whatsapp", "213")
+            ),
+            lambda: legacy_score_availability(Session, "whatsapp", "213"),
+        ),
+    ]
+
+    print(f"\n{'query':<28}{'sql p50 ms':>12}{'legacy p50 ms':>16}")
+    for name, current, legacy in cases:
+        sql_ms = timed(current, args.repeat)
+        legacy_ms = f"{timed(legacy, args.repeat):>16.1f}" if args.legacy else ""
+        print(f"{name:<28}{sql_ms:>12.1f}{legacy_ms}")
+    db.close()
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
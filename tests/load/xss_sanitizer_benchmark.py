@@ -0,0 +1,108 @@
+"""Benchmark JSON response sanitizing on large list payloads.
+
+Builds a history-style payload of roughly ``--size-mb`` megabytes and times
+three ways of producing a sanitized body:
+
+* ``middleware``: the previous XSSProtectionMiddleware path, which encodes
+  the response, then decodes, sanitizes and re-encodes it
+* ``render``: ``SanitizedJSONResponse``, sanitizing once at render time
+* ``plain``: an unsanitized ``JSONResponse``, as a floor
+
+    python tests/load/xss_sanitizer_benchmark.py --size-mb 1 --unsafe 0.05
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.middleware.xss_protection import SanitizedJSONResponse  # noqa: E402
+from app.utils.sanitization import validate_and_sanitize_response  # noqa: E402
+
+SERVICES = ["whatsapp", "telegram", "google", "discord", "tiktok"]
+STATUSES = ["pending", "completed", "refunded", "expired"]
+
+
+def build_payload(size_mb: float, unsafe: float) -> dict:
+    rng = random.Random(7)
+    items = []
+    target = size_mb * 1024 * 1024
+    size = 0
+    while size < target:
+        note = "<b>flagged</b>" if rng.random() < unsafe else "no issues"
+        item = {
+            "id": f"ver_{len(items):08d}",
+            "service": rng.choice(SERVICES),
+            "status": rng.choice(STATUSES),
+            "phone_number": f"+1{rng.randrange(10**9, 10**10)}",
+            "cost": round(rng.uniform(0.5, 3.0), 2),
+            "created_at": "2026-10-01T12:00:00+00:00",
+            "note": note,
+        }
+        items.append(item)
+        size += len(json.dumps(item))
+    return {"items": items, "total": len(items), "message": "ok"}
+
+
+def middleware_path(payload):
+    body = JSONResponse(payload).body
+    return json.dumps(validate_and_sanitize_response(json.loads(body))).encode()
+
+
+def render_path(payload):
+    return SanitizedJSONResponse(payload).body
+
+
+def plain_path(payload):
+    return JSONResponse(payload).body
+
+
+def measure(fn, payload, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument(
+        "--unsafe", type=float, default=0.05, help="share of rows with markup"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = build_payload(args.size_mb, args.unsafe)
+    size = len(plain_path(payload))
+    print(f"payload: {len(payload['items']):,} rows, {size / 1024 / 1024:.2f} MB")
+
+    print(f"\n{'path':<12}{'p50 ms':>10}{'MB/s':>10}{'peak MB':>10}")
+    for name, fn in [
+        ("middleware", middleware_path),
+        ("render", render_path),
+        ("plain", plain_path),
+    ]:
+        seconds, peak = measure(fn, payload, args.repeat)
+        print(
+            f"{name:<12}{seconds * 1000:>10.1f}"
+            f"{size / seconds / 1024 / 1024:>10.1f}{peak / 1024 / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
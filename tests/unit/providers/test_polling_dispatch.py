@@ -1,12 +1,16 @@
 """Unit tests for SMS polling provider dispatch — Issue 4 from STABILITY_CHECKLIST.md."""
 
+import time
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services.adaptive_polling import AdaptivePollingService, LatencyModel
 from app.services.providers.base_provider import MessageResult
+from app.services.sms_poll_scheduler import PollJob
 from app.services.sms_polling_service import SMSPollingService
+from app.services.textverified_client import TVSms
 
 
 def _make_verification(provider="textverified", status="pending"):
@@ -26,92 +30,97 @@ def _make_verification(provider="textverified", status="pending"):
 @pytest.fixture
 def service():
     with patch("app.services.sms_polling_service.TextVerifiedService"):
-        return SMSPollingService()
+        service = SMSPollingService()
+    service.adaptive = AdaptivePollingService(LatencyModel())
+    return service
+
+
+def _make_job(provider="textverified", deadline_in=300.0):
+    return PollJob(
+        verification_id="verif-1",
+        provider=provider,
+        activation_id="act-123",
+        deadline=time.monotonic() + deadline_in,
+        user_id="user-1",
+        service_name="whatsapp",
+        created_at=datetime(2026, 3, 26, 12, 0, 0, tzinfo=timezone.utc),
+    )
 
 
 # ── dispatch by provider ──────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
-async def test_poll_verification_dispatches_textverified(service):
-    v = _make_verification(provider="textverified")
+def test_get_checker_textverified(service):
+    assert service._get_checker("textverified") == service._check_sms
 
-    with patch.object(
-        service, "_poll_textverified", new_callable=AsyncMock
-    ) as mock_tv, patch("app.services.sms_polling_service.SessionLocal") as mock_db:
-        mock_db.return_value.__enter__ = MagicMock(return_value=MagicMock())
-        mock_db.return_value.__exit__ = MagicMock(return_value=False)
-        db = MagicMock()
-        db.query.return_value.filter.return_value.first.return_value = v
-        mock_db.return_value = db
 
-        await service._poll_verification("verif-1")
-
-    mock_tv.assert_called_once()
+def test_get_checker_unknown_provider(service):
+    assert service._get_checker("unknown_provider") is None
 
 
 @pytest.mark.asyncio
-async def test_poll_verification_dispatches_telnyx(service):
-    v = _make_verification(provider="telnyx")
+async def test_poll_batch_dispatches_telnyx(service):
+    job = _make_job(provider="telnyx")
 
-    with patch.object(
-        service, "_poll_telnyx", new_callable=AsyncMock
-    ) as mock_telnyx, patch("app.services.sms_polling_service.SessionLocal") as mock_db:
-        db = MagicMock()
-        db.query.return_value.filter.return_value.first.return_value = v
-        mock_db.return_value = db
+    with patch("app.services.providers.telnyx_adapter.TelnyxAdapter") as MockAdapter:
+        adapter = AsyncMock()
+        adapter.check_messages = AsyncMock(return_value=[])
+        MockAdapter.return_value = adapter
 
-        await service._poll_verification("verif-1")
+        result = await service._poll_batch("telnyx", [job])
 
-    mock_telnyx.assert_called_once()
+    adapter.check_messages.assert_called_once_with("act-123")
+    assert result["verif-1"] > 0
 
 
 @pytest.mark.asyncio
-async def test_poll_verification_dispatches_fivesim(service):
-    v = _make_verification(provider="5sim")
+async def test_poll_batch_creates_one_adapter_per_batch(service):
+    jobs = [_make_job(provider="5sim") for _ in range(3)]
+    for i, job in enumerate(jobs):
+        job.verification_id = f"verif-{i}"
 
-    with patch.object(
-        service, "_poll_fivesim", new_callable=AsyncMock
-    ) as mock_5sim, patch("app.services.sms_polling_service.SessionLocal") as mock_db:
-        db = MagicMock()
-        db.query.return_value.filter.return_value.first.return_value = v
-        mock_db.return_value = db
+    with patch("app.services.providers.fivesim_adapter.FiveSimAdapter") as MockAdapter:
+        adapter = AsyncMock()
+        adapter.check_messages = AsyncMock(return_value=[])
+        MockAdapter.return_value = adapter
 
-        await service._poll_verification("verif-1")
+        result = await service._poll_batch("5sim", jobs)
 
-    mock_5sim.assert_called_once()
+    assert MockAdapter.call_count == 1
+    assert adapter.check_messages.call_count == 3
+    assert set(result) == {"verif-0", "verif-1", "verif-2"}
 
 
 @pytest.mark.asyncio
-async def test_poll_verification_unknown_provider(service):
-    v = _make_verification(provider="unknown_provider")
+async def test_poll_batch_unknown_provider(service):
+    job = _make_job(provider="unknown_provider")
 
     with patch.object(
-        service, "_handle_timeout", new_callable=AsyncMock
-    ) as mock_timeout, patch(
-        "app.services.sms_polling_service.SessionLocal"
-    ) as mock_db:
-        db = MagicMock()
-        db.query.return_value.filter.return_value.first.return_value = v
-        mock_db.return_value = db
+        service, "_finalize_timeout", new_callable=AsyncMock
+    ) as mock_timeout:
+        result = await service._poll_batch("unknown_provider", [job])
 
-        await service._poll_verification("verif-1")
+    mock_timeout.assert_called_once_with(job)
+    assert result == {"verif-1": None}
 
-    mock_timeout.assert_called_once()
 
-
-# ── _poll_telnyx ──────────────────────────────────────────────────────────────
+# ── telnyx ────────────────────────────────────────────────────────────────────
 
 
 @pytest.mark.asyncio
 async def test_poll_telnyx_success(service):
     v = _make_verification(provider="telnyx")
+    job = _make_job(provider="telnyx")
     db = MagicMock()
     msg = MessageResult(
         text="Code 123456", code="123456", received_at="2026-03-26T12:00:00Z"
     )
 
-    with patch("app.services.providers.telnyx_adapter.TelnyxAdapter") as MockAdapter:
+    with patch(
+        "app.services.providers.telnyx_adapter.TelnyxAdapter"
+    ) as MockAdapter, patch(
+        "app.services.sms_polling_service.SessionLocal", return_value=db
+    ):
         adapter = AsyncMock()
         adapter.check_messages = AsyncMock(return_value=[msg])
         MockAdapter.return_value = adapter
@@ -120,64 +129,108 @@ async def test_poll_telnyx_success(service):
         db.query.return_value.filter.return_value.first.return_value = v
 
         with patch("app.services.sms_polling_service.NotificationDispatcher"):
-            await service._poll_telnyx(v, db, timeout_seconds=30)
+            result = await service._poll_batch("telnyx", [job])
 
+    assert result == {"verif-1": None}
     assert v.status == "completed"
     assert v.sms_code == "123456"
     assert db.commit.called
+    db.close.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_poll_telnyx_pending_does_not_open_session(service):
+    job = _make_job(provider="telnyx")
+
+    with patch(
+        "app.services.providers.telnyx_adapter.TelnyxAdapter"
+    ) as MockAdapter, patch(
+        "app.services.sms_polling_service.SessionLocal"
+    ) as mock_session:
+        adapter = AsyncMock()
+        adapter.check_messages = AsyncMock(return_value=[])
+        MockAdapter.return_value = adapter
+
+        result = await service._poll_batch("telnyx", [job])
+
+    mock_session.assert_not_called()
+    assert result["verif-1"] > 0
 
 
 @pytest.mark.asyncio
 async def test_poll_telnyx_timeout(service):
-    v = _make_verification(provider="telnyx")
-    db = MagicMock()
+    job = _make_job(provider="telnyx", deadline_in=0)
 
     with patch(
         "app.services.providers.telnyx_adapter.TelnyxAdapter"
     ) as MockAdapter, patch.object(
-        service, "_handle_timeout", new_callable=AsyncMock
+        service, "_finalize_timeout", new_callable=AsyncMock
     ) as mock_timeout:
         adapter = AsyncMock()
         adapter.check_messages = AsyncMock(return_value=[])
         MockAdapter.return_value = adapter
 
-        # Very short timeout so loop exits immediately
-        await service._poll_telnyx(v, db, timeout_seconds=0)
+        result = await service._poll_batch("telnyx", [job])
 
     mock_timeout.assert_called_once()
+    assert result == {"verif-1": None}
 
 
 @pytest.mark.asyncio
 async def test_poll_telnyx_api_error(service):
-    v = _make_verification(provider="telnyx")
-    db = MagicMock()
+    job = _make_job(provider="telnyx", deadline_in=0)
 
     with patch(
         "app.services.providers.telnyx_adapter.TelnyxAdapter"
     ) as MockAdapter, patch.object(
-        service, "_handle_timeout", new_callable=AsyncMock
+        service, "_finalize_timeout", new_callable=AsyncMock
     ) as mock_timeout:
         adapter = AsyncMock()
         adapter.check_messages = AsyncMock(side_effect=Exception("API error"))
         MockAdapter.return_value = adapter
 
-        await service._poll_telnyx(v, db, timeout_seconds=0)
+        await service._poll_batch("telnyx", [job])
 
     mock_timeout.assert_called_once()
 
 
-# ── _poll_fivesim ─────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_poll_telnyx_api_error_backs_off(service):
+    job = _make_job(provider="telnyx")
+
+    with patch(
+        "app.services.providers.telnyx_adapter.TelnyxAdapter"
+    ) as MockAdapter, patch(
+        "app.services.sms_polling_service.settings"
+    ) as mock_settings:
+        mock_settings.sms_polling_error_backoff_seconds = 15.0
+        adapter = AsyncMock()
+        adapter.check_messages = AsyncMock(side_effect=Exception("API error"))
+        MockAdapter.return_value = adapter
+
+        result = await service._poll_batch("telnyx", [job])
+
+    assert result == {"verif-1": 15.0}
+    assert job.errors == 1
+
+
+# ── 5sim ──────────────────────────────────────────────────────────────────────
 
 
 @pytest.mark.asyncio
 async def test_poll_fivesim_success(service):
     v = _make_verification(provider="5sim")
+    job = _make_job(provider="5sim")
     db = MagicMock()
     msg = MessageResult(
         text="Code 654321", code="654321", received_at="2026-03-26T12:00:00Z"
     )
 
-    with patch("app.services.providers.fivesim_adapter.FiveSimAdapter") as MockAdapter:
+    with patch(
+        "app.services.providers.fivesim_adapter.FiveSimAdapter"
+    ) as MockAdapter, patch(
+        "app.services.sms_polling_service.SessionLocal", return_value=db
+    ):
         adapter = AsyncMock()
         adapter.check_messages = AsyncMock(return_value=[msg])
         MockAdapter.return_value = adapter
@@ -186,7 +239,7 @@ async def test_poll_fivesim_success(service):
         db.query.return_value.filter.return_value.first.return_value = v
 
         with patch("app.services.sms_polling_service.NotificationDispatcher"):
-            await service._poll_fivesim(v, db, timeout_seconds=30)
+            await service._poll_batch("5sim", [job])
 
     assert v.status == "completed"
     assert v.sms_code == "654321"
@@ -195,42 +248,197 @@ async def test_poll_fivesim_success(service):
 
 @pytest.mark.asyncio
 async def test_poll_fivesim_timeout(service):
-    v = _make_verification(provider="5sim")
-    db = MagicMock()
+    job = _make_job(provider="5sim", deadline_in=0)
 
     with patch(
         "app.services.providers.fivesim_adapter.FiveSimAdapter"
     ) as MockAdapter, patch.object(
-        service, "_handle_timeout", new_callable=AsyncMock
+        service, "_finalize_timeout", new_callable=AsyncMock
     ) as mock_timeout:
         adapter = AsyncMock()
         adapter.check_messages = AsyncMock(return_value=[])
         MockAdapter.return_value = adapter
 
-        await service._poll_fivesim(v, db, timeout_seconds=0)
+        await service._poll_batch("5sim", [job])
 
     mock_timeout.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_poll_fivesim_api_error(service):
-    v = _make_verification(provider="5sim")
-    db = MagicMock()
+    job = _make_job(provider="5sim", deadline_in=0)
 
     with patch(
         "app.services.providers.fivesim_adapter.FiveSimAdapter"
     ) as MockAdapter, patch.object(
-        service, "_handle_timeout", new_callable=AsyncMock
+        service, "_finalize_timeout", new_callable=AsyncMock
     ) as mock_timeout:
         adapter = AsyncMock()
         adapter.check_messages = AsyncMock(side_effect=Exception("API error"))
         MockAdapter.return_value = adapter
 
-        await service._poll_fivesim(v, db, timeout_seconds=0)
+        await service._poll_batch("5sim", [job])
 
     mock_timeout.assert_called_once()
 
 
+# ── textverified ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_check_sms_extracts_hyphenated_code(service):
+    job = _make_job()
+    service.textverified.check_sms = AsyncMock(
+        return_value={"status": "COMPLETED", "messages": [{"text": "Code 806-185"}]}
+    )
+
+    assert await service._check_sms(job) == ("Code 806-185", "806185")
+    service.textverified.check_sms.assert_called_once_with(
+        "act-123", created_after=job.created_at, phone_number=job.phone_number
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_sms_pending_returns_none(service):
+    job = _make_job()
+    service.textverified.check_sms = AsyncMock(
+        return_value={"status": "PENDING", "messages": []}
+    )
+
+    assert await service._check_sms(job) is None
+
+
+# ── textverified sweep ────────────────────────────────────────────────────────
+
+
+def _sweep_jobs(n=3):
+    jobs = []
+    for i in range(n):
+        job = _make_job()
+        job.verification_id = f"verif-{i}"
+        job.phone_number = f"+1202555000{i}"
+        job.attempts = 1
+        jobs.append(job)
+    return jobs
+
+
+def _tv_sms(to, code="", received_at=None):
+    return TVSms(
+        id=f"sms-{to}-{code}",
+        to=to,
+        created_at=received_at or datetime(2026, 3, 26, 12, 0, 30, tzinfo=timezone.utc),
+        sms_content=f"Your code is {code}",
+        parsed_code=code,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sweep_matches_batch_with_one_listing(service):
+    jobs = _sweep_jobs()
+    service.textverified.get_recent_sms = AsyncMock(
+        return_value=([_tv_sms("12025550001", "424242")], True)
+    )
+    service.textverified.check_sms = AsyncMock()
+
+    with patch.object(
+        service, "_finalize_success_bulk", new_callable=AsyncMock
+    ) as mock_bulk:
+        result = await service._poll_batch("textverified", jobs)
+
+    service.textverified.get_recent_sms.assert_awaited_once()
+    service.textverified.check_sms.assert_not_called()
+    mock_bulk.assert_awaited_once_with([(jobs[1], "Your code is 424242", "424242")])
+    assert result["verif-1"] is None
+    assert result["verif-0"] > 0 and result["verif-2"] > 0
+    assert service.get_polling_stats()["textverified_sweep"]["matches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sweep_ignores_sms_older_than_verification(service):
+    jobs = _sweep_jobs()
+    stale = _tv_sms(
+        "+12025550000",
+        "111111",
+        received_at=datetime(2026, 3, 26, 11, 59, 0, tzinfo=timezone.utc),
+    )
+    service.textverified.get_recent_sms = AsyncMock(return_value=([stale], True))
+
+    with patch.object(
+        service, "_finalize_success_bulk", new_callable=AsyncMock
+    ) as mock_bulk:
+        result = await service._poll_batch("textverified", jobs)
+
+    mock_bulk.assert_not_called()
+    assert all(delay is not None for delay in result.values())
+
+
+@pytest.mark.asyncio
+async def test_incomplete_sweep_falls_back_for_uncovered_jobs(service):
+    jobs = _sweep_jobs()
+    jobs[2].created_at = datetime(2026, 3, 26, 12, 5, 0, tzinfo=timezone.utc)
+    # The listing ran out of pages at 12:01, so jobs 0 and 1 are not covered
+    oldest = _tv_sms(
+        "+19995550000", received_at=datetime(2026, 3, 26, 12, 1, tzinfo=timezone.utc)
+    )
+    service.textverified.get_recent_sms = AsyncMock(return_value=([oldest], False))
+    service.textverified.check_sms = AsyncMock(
+        return_value={"status": "PENDING", "messages": []}
+    )
+
+    await service._poll_batch("textverified", jobs)
+
+    checked = {
+        c.kwargs["phone_number"] for c in service.textverified.check_sms.await_args_list
+    }
+    assert checked == {"+12025550000", "+12025550001"}
+    assert service.sweep_fallbacks == 2
+
+
+@pytest.mark.asyncio
+async def test_sweep_failure_checks_each_job(service):
+    jobs = _sweep_jobs()
+    service.textverified.get_recent_sms = AsyncMock(side_effect=Exception("429"))
+    service.textverified.check_sms = AsyncMock(
+        return_value={"status": "PENDING", "messages": []}
+    )
+
+    result = await service._poll_batch("textverified", jobs)
+
+    assert service.textverified.check_sms.await_count == 3
+    assert all(delay is not None for delay in result.values())
+
+
+@pytest.mark.asyncio
+async def test_small_batch_skips_sweep(service):
+    job = _make_job()
+    service.textverified.get_recent_sms = AsyncMock()
+    service.textverified.check_sms = AsyncMock(
+        return_value={"status": "PENDING", "messages": []}
+    )
+
+    await service._poll_batch("textverified", [job])
+
+    service.textverified.get_recent_sms.assert_not_called()
+    service.textverified.check_sms.assert_awaited_once()
+
+
+def test_textverified_delay_aligned_to_sweep_grid(service):
+    job = _make_job()
+    telnyx_job = _make_job(provider="telnyx")
+
+    with patch("app.services.sms_polling_service.time") as mock_time, patch(
+        "app.services.sms_polling_service.settings"
+    ) as mock_settings:
+        mock_time.monotonic.return_value = 102.0
+        job.deadline = telnyx_job.deadline = 1000.0
+        mock_settings.sms_polling_sweep_enabled = True
+        mock_settings.sms_polling_sweep_interval_seconds = 5.0
+
+        # 102 + 7 = 109 rounds up to the 110 grid line
+        assert service._align_to_sweep(job, 7.0) == pytest.approx(8.0)
+        assert service._align_to_sweep(telnyx_job, 7.0) == 7.0
+
+
 # ── _handle_timeout provider dispatch ────────────────────────────────────────
 
 
@@ -309,7 +517,7 @@ async def test_handle_timeout_refund_fallback(service):
 
 @pytest.mark.asyncio
 async def test_background_service_polls_all_providers(service):
-    """Background service picks up pending verifications from all providers."""
+    """Background service schedules pending verifications from all providers."""
     tv_v = _make_verification(provider="textverified")
     tv_v.id = "v1"
     telnyx_v = _make_verification(provider="telnyx")
@@ -318,18 +526,13 @@ async def test_background_service_polls_all_providers(service):
     fivesim_v.id = "v3"
 
     service.is_running = True
-    call_count = 0
 
     async def stop_after_one(*args, **kwargs):
-        nonlocal call_count
-        call_count += 1
         service.is_running = False
 
     with patch(
         "app.services.sms_polling_service.SessionLocal"
-    ) as mock_db, patch.object(
-        service, "start_polling", new_callable=AsyncMock
-    ) as mock_start, patch(
+    ) as mock_db, patch.object(service, "_ensure_scheduler"), patch(
         "asyncio.sleep", new_callable=AsyncMock, side_effect=stop_after_one
     ):
         db = MagicMock()
@@ -342,4 +545,38 @@ async def test_background_service_polls_all_providers(service):
 
         await service.start_background_service()
 
-    assert mock_start.call_count == 3
+    assert sorted(service.get_active_polls()) == ["v1", "v2", "v3"]
+    assert service.scheduler.get("v2").provider == "telnyx"
+
+
+def test_sync_pending_drops_resolved_verifications(service):
+    v1 = _make_verification()
+    v1.id = "v1"
+    v2 = _make_verification()
+    v2.id = "v2"
+
+    with patch.object(service, "_ensure_scheduler"):
+        service._sync_pending([v1, v2])
+        service._sync_pending([v2])
+
+    assert service.get_active_polls() == ["v2"]
+
+
+def test_next_interval_uses_latency_model_when_warm(service):
+    for _ in range(10):
+        service.adaptive.record_completion("whatsapp", 30)
+    job = _make_job()
+
+    # p50 interpolates to 27.5s inside the (25, 30] bucket; poll at p50 / 3
+    assert service._next_interval(job) == pytest.approx(27.5 / 3)
+
+
+@pytest.mark.asyncio
+async def test_timeout_feeds_latency_model(service):
+    v = _make_verification(provider="textverified")
+    service.textverified.report_verification = AsyncMock(return_value=True)
+
+    with patch("app.services.sms_polling_service.NotificationService"):
+        await service._handle_timeout(v, MagicMock())
+
+    assert service.adaptive.model.snapshot("whatsapp")["timed_out"] == 1
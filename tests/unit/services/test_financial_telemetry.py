@@ -8,6 +8,8 @@ from app.services.purchase_intelligence import PurchaseIntelligenceService
 
 
 def _make_outcome(**kwargs):
+    kwargs.setdefault("service", "whatsapp")
+    kwargs.setdefault("assigned_code", "202")
     return PurchaseOutcome(**kwargs)
 
 
@@ -16,7 +18,7 @@ def mock_db():
     return MagicMock()
 
 
-def test_get_provider_roi_logic(mock_db):
+def test_get_provider_roi_logic(db):
     """Verifies ROI and Margin calculations are correct."""
     now = datetime.now(timezone.utc)
     outcomes = [
@@ -45,10 +47,10 @@ def test_get_provider_roi_logic(mock_db):
         ),
     ]
 
-    # Mock query.filter.all
-    mock_db.query.return_value.filter.return_value.all.return_value = outcomes
+    db.add_all(outcomes)
+    db.commit()
 
-    roi_data = PurchaseIntelligenceService.get_provider_roi(mock_db, days=7)
+    roi_data = PurchaseIntelligenceService.get_provider_roi(db, days=7)
 
     assert "provider_a" in roi_data
     stats = roi_data["provider_a"]
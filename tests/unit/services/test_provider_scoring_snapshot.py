@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.purchase_outcome import PurchaseOutcome
+from app.services.providers.predictive_scorer import PredictiveRouterScorer
+from app.services.providers.scoring_snapshot import (
+    ScoringSnapshot,
+    ScoringSnapshotStore,
+    build_snapshot,
+    scoring_snapshot,
+)
+from app.services.purchase_intelligence import PurchaseIntelligenceService
+
+
+@pytest.fixture(autouse=True)
+def _clear_snapshot():
+    scoring_snapshot.clear()
+    yield
+    scoring_snapshot.clear()
+
+
+def _outcome(minutes_ago=5, **kwargs):
+    defaults = dict(
+        service="whatsapp",
+        assigned_code="202",
+        provider="textverified",
+        country="US",
+        provider_cost=1.0,
+        user_price=2.0,
+        is_refunded=False,
+        refund_amount=0.0,
+        created_at=datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+    )
+    defaults.update(kwargs)
+    return PurchaseOutcome(**defaults)
+
+
+@pytest.fixture
+def outcomes(db):
+    db.add_all(
+        [
+            _outcome(sms_received=True, assigned_carrier="verizon"),
+            _outcome(sms_received=False, assigned_carrier="verizon"),
+            _outcome(sms_received=True, assigned_carrier="tmobile"),
+            _outcome(is_refunded=True, refund_amount=2.0, sms_received=False),
+            # Outside the one-hour health window, inside the ROI window
+            _outcome(minutes_ago=600, sms_received=False, assigned_carrier="verizon"),
+            _outcome(provider="5sim", country="GB", provider_cost=0.5, user_price=2.0),
+            # Outside every window
+            _outcome(minutes_ago=60 * 24 * 20, provider_cost=100.0),
+        ]
+    )
+    db.commit()
+    return db
+
+
+def test_snapshot_matches_live_calculations(outcomes):
+    snapshot = build_snapshot(outcomes, version=1)
+
+    live_roi = PurchaseIntelligenceService.get_provider_roi(outcomes, days=14)
+    assert snapshot.efficiency == {
+        p: r["efficiency_score"] for p, r in live_roi.items()
+    }
+    assert snapshot.sentiment["whatsapp"] == (
+        PurchaseIntelligenceService.get_carrier_sentiment(outcomes, "whatsapp")
+    )
+    assert snapshot.health_score("whatsapp", "US", "textverified") == 0.5
+    assert snapshot.health_score("whatsapp", "GB", "5sim") == 0.0
+
+
+def test_snapshot_defaults_for_unseen_keys():
+    snapshot = ScoringSnapshot(version=1, built_at=0.0)
+
+    assert snapshot.health_score("telegram", "FR", "telnyx") == 1.0
+    assert snapshot.efficiency_score("telnyx") == 50.0
+    assert snapshot.carrier_sentiment("telegram", "att") == 0.5
+
+
+def test_refresh_bumps_version(outcomes):
+    store = ScoringSnapshotStore()
+
+    assert store.current() is None
+    assert store.refresh(outcomes).version == 1
+    assert store.refresh(outcomes).version == 2
+    assert store.stats()["fresh"] is True
+
+
+def test_snapshot_expires_after_ttl(outcomes):
+    store = ScoringSnapshotStore()
+    store.refresh(outcomes)
+
+    with patch("app.services.providers.scoring_snapshot.get_settings") as settings:
+        settings.return_value.provider_scoring_snapshot_ttl_seconds = -1
+        assert store.current() is None
+
+
+@pytest.mark.asyncio
+async def test_scorer_reads_snapshot_without_queries(outcomes):
+    scoring_snapshot.refresh(outcomes)
+    scorer = PredictiveRouterScorer(MagicMock())
+
+    with patch.object(
+        PurchaseIntelligenceService, "get_live_health_score", new_callable=AsyncMock
+    ) as live_health, patch.object(
+        PurchaseIntelligenceService, "get_provider_roi"
+    ) as live_roi:
+        score = await scorer.calculate_provider_score(
+            "whatsapp", "US", "textverified", carrier="verizon"
+        )
+
+    live_health.assert_not_called()
+    live_roi.assert_not_called()
+    snapshot = scoring_snapshot.current()
+    expected = (
+        snapshot.carrier_sentiment("whatsapp", "verizon") * 0.45
+        + min(snapshot.efficiency_score("textverified") / 200.0, 1.0) * 0.25
+        + 0.5 * 0.30
+    )
+    assert score == round(expected, 4)
+
+
+@pytest.mark.asyncio
+async def test_scorer_falls_back_to_live_queries_without_snapshot():
+    scorer = PredictiveRouterScorer(MagicMock())
+
+    with patch.object(
+        PurchaseIntelligenceService,
+        "get_live_health_score",
+        new_callable=AsyncMock,
+        return_value=1.0,
+    ) as live_health, patch.object(
+        PurchaseIntelligenceService,
+        "get_provider_roi",
+        return_value={"5sim": {"efficiency_score": 100.0}},
+    ):
+        score = await scorer.calculate_provider_score("whatsapp", "GB", "5sim")
+
+    live_health.assert_awaited_once_with("whatsapp", "GB", "5sim")
+    assert score == round(0.5 * 0.45 + 0.5 * 0.25 + 1.0 * 0.30, 4)
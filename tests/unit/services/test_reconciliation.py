@@ -8,9 +8,8 @@ from app.models.purchase_outcome import PurchaseOutcome
 
 
 @pytest.mark.asyncio
-async def test_provider_analytics_calculates_leakage():
+async def test_provider_analytics_calculates_leakage(db):
     """Verifies that the provider analytics correctly calculates margin leakage and outcome distribution."""
-    mock_db = MagicMock()
 
     # Create test outcomes
     # 1. Success
@@ -60,9 +59,13 @@ async def test_provider_analytics_calculates_leakage():
         created_at=datetime.now(timezone.utc),
     )
 
-    mock_db.query.return_value.filter.return_value.all.return_value = [o1, o2, o3, o4]
+    for outcome in (o1, o2, o3, o4):
+        outcome.service = "whatsapp"
+        outcome.assigned_code = "202"
+    db.add_all([o1, o2, o3, o4])
+    db.commit()
 
-    result = await get_provider_analytics(days=7, db=mock_db, user_id="admin")
+    result = await get_provider_analytics(days=7, db=db, user_id="admin")
 
     perf = result["provider_performance"][0]
     financials = perf["financials"]
@@ -59,34 +59,29 @@ async def test_poll_textverified_timeout_triggers_insight():
     mock_verification.created_at = datetime.now(timezone.utc)
     mock_verification.service_name = "whatsapp"
     mock_verification.user_id = "user-1"
+    mock_verification.ends_at = None
 
     service = SMSPollingService()
     service.textverified = AsyncMock()
-    # Mock result showing failure/timeout
-    service.textverified.get_verification_details.return_value = {
-        "number": "1234567890",
-        "id": "act-456",
-    }
-    service.textverified.poll_sms_standard.return_value = {"success": False}
+    # Mock result showing no SMS yet
+    service.textverified.check_sms.return_value = {"status": "PENDING", "messages": []}
+
+    job = service._build_job(mock_verification)
+    job.deadline = 0  # already expired
 
     with patch.object(
         service, "_handle_timeout", new_callable=AsyncMock
-    ) as mock_timeout:
-        # We need to bypass the reloading logic in the service
-        with patch("app.core.database.SessionLocal", return_value=mock_db), patch(
-            "app.models.Verification", return_value=mock_verification
-        ):
-
-            # Since the service re-queries the DB, we mock the query
-            mock_db.query.return_value.filter.return_value.first.return_value = (
-                mock_verification
-            )
-
-            await service._poll_textverified(
-                mock_verification, mock_db, timeout_seconds=10
-            )
-
-            # Verify it hit _handle_timeout with the correct reason
-            mock_timeout.assert_called_once()
-            args, kwargs = mock_timeout.call_args
-            assert kwargs["reason"] == "sms_timeout"
+    ) as mock_timeout, patch(
+        "app.services.sms_polling_service.SessionLocal", return_value=mock_db
+    ):
+        # The service re-queries the DB before writing, so we mock the query
+        mock_db.query.return_value.filter.return_value.first.return_value = (
+            mock_verification
+        )
+
+        await service._poll_batch("textverified", [job])
+
+        # Verify it hit _handle_timeout with the correct reason
+        mock_timeout.assert_called_once()
+        args, kwargs = mock_timeout.call_args
+        assert kwargs["reason"] == "sms_timeout"
@@ -0,0 +1,176 @@
+"""Tests for the incremental analytics rollups."""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import update
+
+from app.models.analytics_rollup import (
+    LedgerDailyRollup,
+    UserDailyRollup,
+    VerificationDailyRollup,
+)
+from app.models.balance_transaction import BalanceTransaction
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.verification import Verification
+from app.services.analytics_rollup_service import (
+    AnalyticsRollupService,
+    refresh_analytics_rollups,
+)
+from app.services.analytics_service import AnalyticsService
+
+DAY = datetime(2026, 3, 1, 12)
+
+
+def _verification(user, service, status, offset_days=0, **kwargs):
+    return Verification(
+        user_id=user.id,
+        service_name=service,
+        phone_number="+12025550100",
+        status=status,
+        cost=1.0,
+        created_at=DAY + timedelta(days=offset_days),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def seeded(db):
+    user = User(
+        email="rollup@example.com", password_hash="x", credits=5.0, created_at=DAY
+    )
+    db.add(user)
+    db.commit()
+    db.add_all(
+        [
+            _verification(user, "whatsapp", "completed"),
+            _verification(user, "whatsapp", "pending"),
+            _verification(
+                user, "telegram", "timeout", 1, refunded=True, refund_amount=1.0
+            ),
+            Transaction(user_id=user.id, amount=10.0, type="credit", created_at=DAY),
+            Transaction(
+                user_id=user.id,
+                amount=-1.0,
+                type="verification_refund",
+                created_at=DAY + timedelta(days=1),
+            ),
+            BalanceTransaction(
+                user_id=user.id,
+                amount=1.0,
+                type="refund",
+                balance_after=5.0,
+                created_at=DAY + timedelta(days=1),
+            ),
+        ]
+    )
+    db.commit()
+    return user
+
+
+def test_refresh_builds_daily_facts(db, seeded):
+    service = AnalyticsRollupService(db)
+    assert not service.is_ready()
+
+    service.refresh()
+    assert service.is_ready()
+
+    whatsapp = db.get(VerificationDailyRollup, (date(2026, 3, 1), "whatsapp"))
+    assert (whatsapp.verifications, whatsapp.completed, whatsapp.refunded) == (2, 1, 0)
+    assert whatsapp.spend == pytest.approx(2.0)
+    telegram = db.get(VerificationDailyRollup, (date(2026, 3, 2), "telegram"))
+    assert (telegram.refunded, telegram.refund_amount) == (1, 1.0)
+
+    credit = db.get(LedgerDailyRollup, (date(2026, 3, 1), "transactions", "credit"))
+    assert (credit.entries, credit.amount) == (1, 10.0)
+    refund = db.get(
+        LedgerDailyRollup, (date(2026, 3, 2), "balance_transactions", "refund")
+    )
+    assert refund.amount == 1.0
+
+    signups = db.get(UserDailyRollup, date(2026, 3, 1))
+    assert (signups.signups, signups.funded) == (1, 1)
+
+
+def test_refresh_picks_up_changed_rows(db, seeded):
+    service = AnalyticsRollupService(db)
+    service.refresh()
+
+    pending = db.query(Verification).filter_by(status="pending").one()
+    pending.status = "completed"
+    pending.updated_at = datetime.utcnow() + timedelta(hours=1)
+    db.commit()
+
+    service.refresh()
+    whatsapp = db.get(VerificationDailyRollup, (date(2026, 3, 1), "whatsapp"))
+    db.refresh(whatsapp)
+    assert whatsapp.completed == 2
+
+
+def test_refresh_picks_up_rows_without_updated_at(db, seeded):
+    service = AnalyticsRollupService(db)
+    service.refresh()
+
+    # Rows written before updated_at was set on insert only have created_at
+    late = _verification(seeded, "signal", "completed")
+    db.add(late)
+    db.commit()
+    db.execute(
+        update(Verification)
+        .where(Verification.id == late.id)
+        .values(updated_at=None, created_at=datetime.utcnow() + timedelta(hours=1))
+    )
+    db.commit()
+
+    service.refresh()
+    day = (datetime.utcnow() + timedelta(hours=1)).date()
+    assert db.get(VerificationDailyRollup, (day, "signal")).verifications == 1
+
+
+def test_refresh_skipped_while_another_worker_holds_the_lock():
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    conn = engine.connect.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = False
+    session = MagicMock()
+    session.get_bind.return_value = engine
+
+    with patch("app.core.database.SessionLocal", return_value=session), patch(
+        "app.services.analytics_rollup_service.AnalyticsRollupService"
+    ) as service:
+        assert refresh_analytics_rollups() == []
+
+    service.assert_not_called()
+    assert conn.execute.call_count == 1
+
+
+def test_rebuild_matches_incremental_refresh(db, seeded):
+    service = AnalyticsRollupService(db)
+    service.refresh()
+    before = sorted(
+        (r.day, r.source, r.type, r.entries, r.amount)
+        for r in db.query(LedgerDailyRollup)
+    )
+    service.rebuild()
+    after = sorted(
+        (r.day, r.source, r.type, r.entries, r.amount)
+        for r in db.query(LedgerDailyRollup)
+    )
+    assert before == after
+
+
+async def test_dashboard_reads_match_live_queries(db, seeded):
+    analytics = AnalyticsService(db)
+    live = (
+        await analytics.get_overview(),
+        await analytics.get_services_stats(),
+    )
+
+    AnalyticsRollupService(db).refresh()
+    rolled = (
+        await analytics.get_overview(),
+        await analytics.get_services_stats(),
+    )
+    assert rolled == live
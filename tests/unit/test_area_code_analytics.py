@@ -1,11 +1,10 @@
 from datetime import datetime, timedelta, timezone
-from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app.api.admin.admin_router import require_admin
-from app.core.database import SessionLocal, get_db
+from app.core.database import get_db
 from app.models.purchase_outcome import PurchaseOutcome
 from app.models.user import User
 from main import app
@@ -24,9 +23,7 @@ def override_require_admin():
 
 
 @pytest.fixture
-def mock_db():
-    db = MagicMock()
-
+def analytics_db(db):
     def override_get_db():
         yield db
 
@@ -35,9 +32,16 @@ def mock_db():
     app.dependency_overrides.pop(get_db, None)
 
 
-def test_area_codes_empty_data(override_require_admin, mock_db):
-    mock_db.query().filter().all.return_value = []
+def _seed(db, outcomes):
+    """Insert outcomes; the carrier fixtures leave the required assigned_code out."""
+    for outcome in outcomes:
+        if outcome.assigned_code is None:
+            outcome.assigned_code = ""
+    db.add_all(outcomes)
+    db.commit()
+
 
+def test_area_codes_empty_data(override_require_admin, analytics_db):
     response = client.get("/api/admin/analytics/area-codes?days=7")
 
     assert response.status_code == 200
@@ -47,9 +51,7 @@ def test_area_codes_empty_data(override_require_admin, mock_db):
     assert data["top_requested"] == []
 
 
-def test_carriers_empty_data(override_require_admin, mock_db):
-    mock_db.query().filter().all.return_value = []
-
+def test_carriers_empty_data(override_require_admin, analytics_db):
     response = client.get("/api/admin/analytics/carriers?days=7")
 
     assert response.status_code == 200
@@ -59,7 +61,7 @@ def test_carriers_empty_data(override_require_admin, mock_db):
     assert data["landline_rate"] == 0.0
 
 
-def test_area_codes_analytics_aggregation(override_require_admin, mock_db):
+def test_area_codes_analytics_aggregation(override_require_admin, analytics_db):
     # Mock data
     now_utc = datetime.now(timezone.utc)
     outcomes = [
@@ -86,7 +88,7 @@ def test_area_codes_analytics_aggregation(override_require_admin, mock_db):
         ),
     ]
 
-    mock_db.query().filter().all.return_value = outcomes
+    _seed(analytics_db, outcomes)
 
     response = client.get("/api/admin/analytics/area-codes?days=7")
 
@@ -102,7 +104,7 @@ def test_area_codes_analytics_aggregation(override_require_admin, mock_db):
     assert top["success_rate"] == 0.5  # 1/2
 
 
-def test_carriers_analytics_distribution(override_require_admin, mock_db):
+def test_carriers_analytics_distribution(override_require_admin, analytics_db):
     now_utc = datetime.now(timezone.utc)
     outcomes = [
         PurchaseOutcome(
@@ -135,7 +137,7 @@ def test_carriers_analytics_distribution(override_require_admin, mock_db):
         ),  # Voip, sms=None
     ]
 
-    mock_db.query().filter().all.return_value = outcomes
+    _seed(analytics_db, outcomes)
 
     response = client.get("/api/admin/analytics/carriers?days=7")
 
@@ -163,7 +165,7 @@ def test_missing_admin_throws_401():
     assert response.status_code == 401
 
 
-def test_geography_analytics_aggregation(override_require_admin, mock_db):
+def test_geography_analytics_aggregation(override_require_admin, analytics_db):
     now_utc = datetime.now(timezone.utc)
     outcomes = [
         PurchaseOutcome(
@@ -181,7 +183,7 @@ def test_geography_analytics_aggregation(override_require_admin, mock_db):
             created_at=now_utc,
         ),
     ]
-    mock_db.query().filter().all.return_value = outcomes
+    _seed(analytics_db, outcomes)
 
     response = client.get("/api/admin/analytics/geography?days=7")
 
@@ -195,3 +197,73 @@ def test_geography_analytics_aggregation(override_require_admin, mock_db):
     if ca:
         assert ca["purchases"] == 2
         assert ca["unique_area_codes"] == 2
+
+
+def test_learning_progress_counts_combinations(override_require_admin, analytics_db):
+    now_utc = datetime.now(timezone.utc)
+    _seed(
+        analytics_db,
+        [
+            PurchaseOutcome(
+                service="whatsapp",
+                assigned_code="213",
+                created_at=now_utc - timedelta(days=30),
+            ),
+            PurchaseOutcome(
+                service="whatsapp",
+                assigned_code="213",
+                selected_from_alternatives=True,
+                created_at=now_utc,
+            ),
+            PurchaseOutcome(
+                service="telegram",
+                assigned_code="",
+                requested_code="310",
+                created_at=now_utc,
+            ),
+        ],
+    )
+
+    response = client.get("/api/admin/analytics/learning")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_purchases"] == 3
+    assert data["total_combinations_tracked"] == 2
+    assert data["new_combinations_7d"] == 1
+    assert data["alternative_selections_total"] == 1
+    assert data["alternative_selection_rate"] == 0.33
+
+
+def test_reports_are_cached_until_a_new_outcome(override_require_admin, analytics_db):
+    now_utc = datetime.now(timezone.utc)
+    outcome = PurchaseOutcome(
+        service="whatsapp",
+        requested_code="213",
+        assigned_code="213",
+        matched=True,
+        created_at=now_utc,
+    )
+    _seed(analytics_db, [outcome])
+    assert client.get("/api/admin/analytics/area-codes").json()["match_rate"] == 1.0
+
+    # In-place updates are served from cache until the entry expires
+    outcome.matched = False
+    analytics_db.commit()
+    assert client.get("/api/admin/analytics/area-codes").json()["match_rate"] == 1.0
+
+    _seed(
+        analytics_db,
+        [
+            PurchaseOutcome(
+                service="whatsapp",
+                requested_code="213",
+                assigned_code="213",
+                matched=True,
+                created_at=now_utc,
+            )
+        ],
+    )
+    data = client.get("/api/admin/analytics/area-codes").json()
+    assert data["total_purchases"] == 2
+    assert data["match_rate"] == 0.5
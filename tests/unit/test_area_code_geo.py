@@ -1,13 +1,19 @@
+import json
 import math
 
 import pytest
 
+from app.services import area_code_geo
 from app.services.area_code_geo import (
     NANPA_DATA,
+    PROXIMITY_PATH,
+    TIER_ORDER,
+    ProximityIndex,
     _haversine,
     filter_supported,
     get_metro_codes,
     get_nearby,
+    get_state_codes,
 )
 
 
@@ -86,3 +92,53 @@ def test_get_nearby():
 
     # Test unknown code
     assert get_nearby("999") == []
+
+
+def _scan_nearby(area_code, max_results):
+    """The full scan the proximity index replaced."""
+    target = NANPA_DATA[area_code]
+    results = []
+    for code, data in NANPA_DATA.items():
+        if code == area_code:
+            continue
+        dist = _haversine(target["lat"], target["lng"], data["lat"], data["lng"])
+        if data["metro"] == target["metro"]:
+            tier = "same_city"
+        elif dist < 50:
+            tier = "nearby"
+        elif data["state"] == target["state"]:
+            tier = "same_state"
+        else:
+            continue
+        results.append((code, tier, dist))
+    results.sort(key=lambda x: (TIER_ORDER[x[1]], x[2]))
+    return results[:max_results]
+
+
+@pytest.mark.parametrize("max_results", [1, 8, 15, 500])
+def test_get_nearby_matches_full_scan(max_results):
+    for code in NANPA_DATA:
+        nearby = get_nearby(code, max_results=max_results)
+        assert [
+            (x["area_code"], x["proximity"], x["distance"]) for x in nearby
+        ] == _scan_nearby(code, max_results)
+
+
+def test_serialized_proximity_index_is_current():
+    # Regenerate with scripts/maintenance/build_nanpa_proximity.py
+    with open(PROXIMITY_PATH) as f:
+        payload = json.load(f)
+    assert payload["fingerprint"] == ProximityIndex.build(NANPA_DATA).fingerprint
+
+
+def test_stale_proximity_index_is_rebuilt(tmp_path, monkeypatch):
+    stale = tmp_path / "nanpa_proximity.json"
+    index = ProximityIndex.build({"212": NANPA_DATA["212"]})
+    stale.write_text(json.dumps(index.to_dict()))
+    monkeypatch.setattr(area_code_geo, "PROXIMITY_PATH", str(stale))
+
+    rebuilt = area_code_geo._load_proximity(NANPA_DATA)
+    assert set(rebuilt.neighbors) == set(NANPA_DATA)
+    assert get_state_codes("CA") == [
+        code for code, data in NANPA_DATA.items() if data["state"] == "CA"
+    ]
@@ -15,11 +15,9 @@ async def test_cancel_safe_handles_success():
     if not tv.enabled:
         pytest.skip("TextVerified not configured")
 
-    mock_client = Mock()
-    mock_client.verifications.cancel = Mock()
-    tv.client = mock_client
-
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "cancel_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.return_value = None
         result = await tv._cancel_safe("test_id")
 
@@ -34,11 +32,9 @@ async def test_cancel_safe_handles_exception():
     if not tv.enabled:
         pytest.skip("TextVerified not configured")
 
-    mock_client = Mock()
-    mock_client.verifications.cancel = Mock(side_effect=Exception("API error"))
-    tv.client = mock_client
-
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "cancel_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.side_effect = Exception("API error")
         result = await tv._cancel_safe("test_id")
 
@@ -59,7 +55,9 @@ async def test_area_code_match_first_attempt():
     mock_result.number = "+12125551234"  # 212 area code
     mock_result.total_cost = 2.50
 
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "create_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.return_value = mock_result
 
         result = await tv.create_verification(
@@ -99,7 +97,9 @@ async def test_area_code_mismatch_triggers_retry():
         call_count += 1
         return mock_result_1 if call_count == 1 else mock_result_2
 
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "create_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.side_effect = mock_create
 
         with patch.object(tv, "_cancel_safe", new_callable=AsyncMock) as mock_cancel:
@@ -130,7 +130,9 @@ async def test_accepts_after_max_retries():
     mock_result.number = "+17135551234"  # 713 (Houston)
     mock_result.total_cost = 2.50
 
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "create_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.return_value = mock_result
 
         with patch.object(tv, "_cancel_safe", new_callable=AsyncMock) as mock_cancel:
@@ -161,7 +163,9 @@ async def test_no_retry_when_no_area_code_requested():
     mock_result.number = "+17135551234"
     mock_result.total_cost = 2.50
 
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "create_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.return_value = mock_result
 
         result = await tv.create_verification(
@@ -198,7 +202,9 @@ async def test_cancel_failure_doesnt_block_retry():
         call_count += 1
         return mock_result_1 if call_count == 1 else mock_result_2
 
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "create_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.side_effect = mock_create
 
         with patch.object(tv, "_cancel_safe", new_callable=AsyncMock) as mock_cancel:
@@ -227,7 +233,9 @@ async def test_retry_with_sleep_delay():
     mock_result.number = "+17135551234"
     mock_result.total_cost = 2.50
 
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
+    with patch.object(
+        tv.http, "create_verification", new_callable=AsyncMock
+    ) as mock_thread:
         mock_thread.return_value = mock_result
 
         with patch.object(tv, "_cancel_safe", new_callable=AsyncMock) as mock_cancel:
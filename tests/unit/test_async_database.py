@@ -0,0 +1,83 @@
+"""Tests for the AsyncSession engine and the endpoints served from it."""
+
+import pytest
+
+from app.core.database import async_database_url
+from app.models.verification import Verification
+
+
+class TestAsyncDatabaseUrl:
+    def test_sqlite_uses_aiosqlite(self):
+        url = async_database_url("sqlite:///./namaskah.db")
+
+        assert url.drivername == "sqlite+aiosqlite"
+        assert url.database == "./namaskah.db"
+
+    def test_postgres_uses_asyncpg(self):
+        url = async_database_url("postgresql://user:pw@db:5432/namaskah")
+
+        assert url.drivername == "postgresql+asyncpg"
+        assert url.host == "db"
+        assert url.password == "pw"
+
+    def test_postgres_driver_is_replaced(self):
+        url = async_database_url("postgresql+psycopg2://user@db/namaskah")
+
+        assert url.drivername == "postgresql+asyncpg"
+
+    def test_sslmode_becomes_ssl(self):
+        url = async_database_url("postgresql://user@db/namaskah?sslmode=require")
+
+        assert "sslmode" not in url.query
+        assert url.query["ssl"] == "require"
+
+    def test_unsupported_backend_raises(self):
+        with pytest.raises(ValueError):
+            async_database_url("mysql://user@db/namaskah")
+
+
+class TestAsyncEndpoints:
+    def test_balance_reads_committed_credits(
+        self, authenticated_regular_client, regular_user, db
+    ):
+        regular_user.credits = 42.5
+        db.commit()
+
+        response = authenticated_regular_client.get("/api/wallet/balance")
+
+        assert response.status_code == 200
+        assert response.json()["credits"] == 42.5
+
+    def test_history_filters_and_counts(
+        self, authenticated_regular_client, regular_user, db
+    ):
+        for i, status in enumerate(["completed", "completed", "pending"]):
+            db.add(
+                Verification(
+                    user_id=regular_user.id,
+                    service_name="telegram",
+                    phone_number=f"+1555000000{i}",
+                    capability="sms",
+                    status=status,
+                    cost=1.0,
+                )
+            )
+        db.commit()
+
+        response = authenticated_regular_client.get(
+            "/api/verify/history?status=completed&limit=1"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert len(data["verifications"]) == 1
+        assert data["verifications"][0]["status"] == "completed"
+
+    async def test_async_session_sees_sync_writes(self, async_db, db, regular_user):
+        regular_user.credits = 7.0
+        db.commit()
+
+        user = await async_db.get(type(regular_user), regular_user.id)
+
+        assert user.credits == 7.0
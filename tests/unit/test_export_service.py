@@ -0,0 +1,142 @@
+"""Tests for the streaming export engine."""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.models.user import User
+from app.services.export_service import (
+    PYARROW_AVAILABLE,
+    ExportColumn,
+    ExportStore,
+    encode_csv,
+    encode_json,
+    encode_parquet,
+    iter_chunks,
+    stream_export,
+    users_dataset,
+)
+from app.services.financial_statements_service import FinancialStatementsService
+
+COLUMNS = [ExportColumn("id"), ExportColumn("credits", "float")]
+CHUNKS = [[("a", 1.5), ("b", None)], [("c", 3.0)]]
+
+
+@pytest.fixture
+def users(db):
+    for i in range(5):
+        db.add(
+            User(
+                email=f"export{i}@example.com",
+                password_hash="x",
+                credits=i,
+                created_at=datetime(2026, 1, 1, i, tzinfo=timezone.utc),
+            )
+        )
+    db.commit()
+
+
+def test_iter_chunks_yields_fixed_size_chunks(db, users):
+    chunks = list(iter_chunks(db, users_dataset().statement, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0][0][1] == "export0@example.com"
+    assert isinstance(chunks[0][0][3], float)
+
+
+def test_csv_is_emitted_per_chunk():
+    parts = list(encode_csv(COLUMNS, iter(CHUNKS)))
+    assert len(parts) == 2
+    rows = list(csv.reader(io.StringIO(b"".join(parts).decode())))
+    assert rows == [["id", "credits"], ["a", "1.5"], ["b", ""], ["c", "3.0"]]
+
+
+def test_csv_without_rows_still_has_header():
+    assert b"".join(encode_csv(COLUMNS, iter([]))) == b"id,credits\r\n"
+
+
+def test_json_array_and_lines():
+    array = json.loads(b"".join(encode_json(COLUMNS, iter(CHUNKS))))
+    assert array == [
+        {"id": "a", "credits": 1.5},
+        {"id": "b", "credits": None},
+        {"id": "c", "credits": 3.0},
+    ]
+    assert json.loads(b"".join(encode_json(COLUMNS, iter([])))) == []
+
+    lines = b"".join(encode_json(COLUMNS, iter(CHUNKS), lines=True)).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["a", "b", "c"]
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_parquet_writes_one_row_group_per_chunk():
+    import pyarrow.parquet as pq
+
+    data = b"".join(encode_parquet(COLUMNS, iter(CHUNKS)))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().column("id").to_pylist() == ["a", "b", "c"]
+
+
+def test_stream_export_users(db, users):
+    body = b"".join(stream_export(db, users_dataset(), "ndjson"))
+    emails = [json.loads(line)["email"] for line in body.splitlines()]
+    assert emails == [f"export{i}@example.com" for i in range(5)]
+
+
+def test_background_job_writes_artifact_and_progress(db, users, tmp_path):
+    store = ExportStore(str(tmp_path))
+    job = {
+        "export_id": f"users_{'0' * 32}",
+        "dataset": "users",
+        "format": "csv",
+        "status": "queued",
+        "total_rows": None,
+        "rows_written": 0,
+        "bytes_written": 0,
+        "error": None,
+        "finished_at": None,
+    }
+
+    db.close = MagicMock()
+    with patch("app.core.database.SessionLocal", return_value=db):
+        store.run(job, users_dataset())
+
+    saved = store.get(job["export_id"])
+    assert saved["status"] == "completed"
+    assert saved["total_rows"] == saved["rows_written"] == 5
+    with open(store.artifact_path(saved)) as f:
+        assert len(list(csv.reader(f))) == 6
+    assert store.get("../etc/passwd") is None
+
+
+async def test_wallet_csv_matches_previous_layout(db, test_user):
+    from app.models.balance_transaction import BalanceTransaction
+
+    db.add(
+        BalanceTransaction(
+            user_id=test_user.id,
+            amount=2.5,
+            type="refund",
+            description="Refund: whatsapp",
+            balance_after=12.5,
+            created_at=datetime(2026, 1, 2, 3, 4, 5),
+        )
+    )
+    db.commit()
+
+    content = await FinancialStatementsService(db).export_user_transactions_csv(
+        test_user.id
+    )
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows[0][0] == "Transaction ID"
+    assert rows[1][1:] == [
+        "2026-01-02 03:04:05",
+        "REFUND",
+        "2.50",
+        "12.50",
+        "Refund: whatsapp",
+    ]
@@ -26,10 +26,8 @@ class TestForwardingWebhook:
         mock_response = Mock()
         mock_response.status_code = 200
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
         result = await _send_forwarding_webhook(
             "https://example.com/webhook", "secret123", sms_data
@@ -57,8 +55,8 @@ class TestForwardingWebhook:
             captured_headers = headers
             return mock_response
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = capture_post
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = capture_post
 
             result = await _send_forwarding_webhook(
                 "https://example.com/webhook", "secret123", sms_data
@@ -83,10 +81,8 @@ class TestForwardingWebhook:
         mock_response = Mock()
         mock_response.status_code = 200
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
         result = await _send_forwarding_webhook(
             "https://example.com/webhook", None, sms_data
@@ -119,8 +115,8 @@ class TestForwardingWebhook:
             call_count += 1
             return response
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = mock_post
 
             with patch("asyncio.sleep", new_callable=AsyncMock):
                 result = await _send_forwarding_webhook(
@@ -140,8 +136,8 @@ class TestForwardingWebhook:
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(
                 side_effect=httpx.TimeoutException("Timeout")
             )
 
@@ -162,8 +158,8 @@ class TestForwardingWebhook:
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(
                 side_effect=httpx.RequestError("Connection error")
             )
 
@@ -188,10 +184,8 @@ class TestForwardingWebhook:
             mock_response = Mock()
         mock_response.status_code = status_code
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
             result = await _send_forwarding_webhook(
                 "https://example.com/webhook", "secret123", sms_data
@@ -219,8 +213,8 @@ class TestForwardingWebhook:
             captured_content = content
             return mock_response
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = capture_post
+        with patch("app.api.core.forwarding.get_http_client") as mock_client:
+            mock_client.return_value.post = capture_post
 
             await _send_forwarding_webhook(
                 "https://example.com/webhook", "secret123", sms_data
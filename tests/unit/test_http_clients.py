@@ -0,0 +1,81 @@
+"""Tests for the shared outbound HTTP client registry."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httpx
+import pytest
+
+from app.core.http_clients import HTTPClientRegistry
+from app.core.metrics import (
+    http_client_connections_opened_total,
+    http_client_requests_total,
+)
+
+
+class _Ok(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = HTTPServer(("127.0.0.1", 0), _Ok)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_name():
+    registry = HTTPClientRegistry()
+
+    first = registry.get("paystack")
+    assert registry.get("paystack") is first
+    assert registry.get("telegram") is not first
+    assert registry.stats()["clients"] == ["paystack", "telegram"]
+
+    await registry.aclose()
+    assert first.is_closed
+    assert registry.get("paystack") is not first
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_shared_name_rejects_different_options():
+    registry = HTTPClientRegistry()
+
+    first = registry.get("webhooks", limits=httpx.Limits(max_connections=4))
+    assert registry.get("webhooks", limits=httpx.Limits(max_connections=4)) is first
+    with pytest.raises(ValueError):
+        registry.get("webhooks")
+
+    await registry.aclose()
+    assert registry.get("webhooks") is not first
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_pooled_connection(local_server):
+    registry = HTTPClientRegistry()
+    requests = http_client_requests_total.labels(client="reuse-test")
+    opened = http_client_connections_opened_total.labels(client="reuse-test")
+    requests_before, opened_before = requests._value.get(), opened._value.get()
+
+    client = registry.get("reuse-test", base_url=local_server)
+    for _ in range(3):
+        response = await client.get("/")
+        assert response.text == "ok"
+    await registry.aclose()
+
+    assert requests._value.get() - requests_before == 3
+    assert opened._value.get() - opened_before == 1
@@ -0,0 +1,172 @@
+"""Tests for event-loop lag sampling and stall attribution."""
+
+import asyncio
+import os
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+
+from app.core.loop_monitor import (
+    _APP_DIR as APP_DIR,
+    UNKNOWN,
+    LoopMonitor,
+    loop_monitor,
+    route_endpoints,
+    sample_stack,
+)
+
+
+def _blocking_helper(seconds):
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def monitor():
+    return LoopMonitor(interval=0.02, threshold=0.05, log_interval=0.0)
+
+
+def test_route_endpoints_maps_endpoint_code_to_route():
+    app = FastAPI()
+
+    @app.get("/api/things/{thing_id}")
+    async def get_thing(thing_id: str):
+        return {}
+
+    routes = route_endpoints(app)
+
+    assert routes[get_thing.__code__] == "GET /api/things/{thing_id}"
+
+
+_Code = namedtuple("_Code", "co_filename co_name")
+
+
+def _frames(*entries):
+    """A fake stack of (filename, function) pairs, outermost first."""
+    frame = None
+    for line, (filename, name) in enumerate(entries, start=1):
+        code = _Code(filename, name)
+        frame = SimpleNamespace(f_code=code, f_lineno=line, f_back=frame)
+    return frame
+
+
+def test_sample_stack_attributes_route_and_innermost_app_module():
+    frame = _frames(
+        ("/usr/lib/python3.11/asyncio/events.py", "_run"),
+        (os.path.join(APP_DIR, "api", "notifications.py"), "send_test"),
+        (os.path.join(APP_DIR, "services", "email_service.py"), "send"),
+        ("/usr/lib/python3.11/smtplib.py", "sendmail"),
+    )
+    routes = {frame.f_back.f_back.f_code: "POST /api/notifications/test"}
+
+    sample = sample_stack(frame, routes, depth=3)
+
+    assert sample["route"] == "POST /api/notifications/test"
+    assert sample["module"] == "app.services.email_service"
+    assert sample["call"] == "smtplib.py:4 in sendmail"
+    assert sample["stack"] == [
+        "app/api/notifications.py:2 in send_test",
+        "app/services/email_service.py:3 in send",
+        "smtplib.py:4 in sendmail",
+    ]
+
+
+def test_sample_stack_outside_app_is_unknown():
+    frame = _frames(("/usr/lib/python3.11/json/encoder.py", "encode"))
+
+    sample = sample_stack(frame, {}, depth=5)
+
+    assert sample["route"] == UNKNOWN
+    assert sample["module"] == UNKNOWN
+
+
+def test_short_lag_is_not_a_stall(monitor):
+    monitor.record(0.001)
+
+    report = monitor.report()
+    assert report["lag"]["samples"] == 1
+    assert report["stalls"] == []
+
+
+def test_stall_without_sample_is_unattributed(monitor):
+    monitor.record(0.2, due=1.0)
+
+    (stall,) = monitor.report()["stalls"]
+    assert stall["route"] == UNKNOWN
+    assert stall["module"] == UNKNOWN
+    assert stall["count"] == 1
+    assert stall["max_ms"] == 200.0
+
+
+def test_stalls_aggregate_by_route_and_module(monitor):
+    sample = {
+        "route": "GET /api/slow",
+        "module": "app.services.email_service",
+        "call": "smtplib.py:1 in sendmail",
+        "stack": ["app/services/email_service.py:10 in send"],
+    }
+    monitor.record_stall(0.1, sample)
+    monitor.record_stall(0.3, sample)
+    monitor.record_stall(0.05, {**sample, "route": "GET /api/other"})
+
+    stalls = monitor.report()["stalls"]
+    assert [row["route"] for row in stalls] == ["GET /api/slow", "GET /api/other"]
+    assert stalls[0]["count"] == 2
+    assert stalls[0]["total_ms"] == 400.0
+    assert stalls[0]["max_ms"] == 300.0
+    assert stalls[0]["call"] == "smtplib.py:1 in sendmail"
+
+
+async def test_blocking_call_is_captured_with_its_route(monitor):
+    app = FastAPI()
+
+    @app.get("/api/blocking")
+    async def blocking_endpoint():
+        _blocking_helper(0.3)
+        return {}
+
+    monitor.start(app)
+    try:
+        await asyncio.sleep(0.05)
+        await blocking_endpoint()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert not monitor.running
+    stalls = monitor.report()["stalls"]
+    assert stalls[0]["route"] == "GET /api/blocking"
+    # time.sleep has no Python frame; the innermost one is its caller
+    assert stalls[0]["call"].endswith("in _blocking_helper")
+    assert stalls[0]["max_ms"] >= 150
+
+
+def test_admin_endpoint_reports_event_loop(authenticated_admin_client):
+    loop_monitor.reset()
+    loop_monitor.record_stall(
+        0.12,
+        {
+            "route": "POST /api/verify/create",
+            "module": "app.services.notification_service",
+            "call": "smtplib.py:1 in sendmail",
+            "stack": [],
+        },
+    )
+    try:
+        response = authenticated_admin_client.get("/api/admin/performance/event-loop")
+    finally:
+        loop_monitor.reset()
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert data["stalls"][0]["route"] == "POST /api/verify/create"
+    assert data["stalls"][0]["module"] == "app.services.notification_service"
+
+
+def test_admin_endpoint_requires_admin(authenticated_regular_client):
+    response = authenticated_regular_client.get("/api/admin/performance/event-loop")
+
+    assert response.status_code in (401, 403)
@@ -153,6 +153,68 @@ class TestAdaptivePolling:
         assert 5 <= result <= 30
 
 
+class TestLatencyModel:
+    @pytest.fixture
+    def model(self):
+        from app.services.adaptive_polling import LatencyModel
+
+        return LatencyModel()
+
+    def test_percentiles_from_histogram(self, model):
+        now = 1_000_000.0
+        for latency in [10] * 5 + [100] * 5:
+            model.record_completion("whatsapp", latency, now=now)
+        snap = model.snapshot("whatsapp", now=now)
+        assert snap["completed"] == 10
+        assert snap["p50"] <= 10
+        assert 90 < snap["p90"] <= 120
+
+    def test_window_expires_old_slices(self, model):
+        from app.services.adaptive_polling import SLICE_SECONDS, WINDOW_SLICES
+
+        now = 1_000_000.0
+        model.record_completion("whatsapp", 20, now=now)
+        model.record_timeout("whatsapp", now=now)
+        later = now + SLICE_SECONDS * WINDOW_SLICES
+        assert model.snapshot("whatsapp", now=later)["completed"] == 0
+        assert model.snapshot("whatsapp", now=later)["timed_out"] == 0
+
+    def test_interval_for_cold_model_is_none(self, model):
+        from app.services.adaptive_polling import AdaptivePollingService
+
+        assert AdaptivePollingService(model).interval_for("whatsapp") is None
+
+    def test_interval_for_backs_off_in_tail(self, model):
+        from app.services.adaptive_polling import AdaptivePollingService
+
+        for _ in range(10):
+            model.record_completion("whatsapp", 45)
+        service = AdaptivePollingService(model)
+        early = service.interval_for("whatsapp", elapsed_seconds=0)
+        late = service.interval_for("whatsapp", elapsed_seconds=300)
+        assert 5 <= early < late <= 30
+
+    def test_interval_for_falls_back_to_global(self, model):
+        from app.services.adaptive_polling import AdaptivePollingService
+
+        for _ in range(10):
+            model.record_completion("telegram", 30)
+        assert AdaptivePollingService(model).interval_for("whatsapp") is not None
+
+    def test_persist_and_load_round_trip(self, model, redis_client):
+        from app.services.adaptive_polling import LatencyModel
+
+        for _ in range(6):
+            model.record_completion("whatsapp", 30)
+        with patch(
+            "app.services.adaptive_polling._get_redis", return_value=redis_client
+        ):
+            assert model.persist() is True
+            restored = LatencyModel()
+            assert restored.load() is True
+        assert restored.snapshot("whatsapp")["completed"] == 6
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Issue 12: Availability Service
 # ═══════════════════════════════════════════════════════════════════════════════
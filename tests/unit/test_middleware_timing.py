@@ -0,0 +1,131 @@
+"""Tests for the timed pure-ASGI middleware chain."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_error_handling import UnifiedErrorHandlingMiddleware
+from app.middleware.mime_types import MimeTypeMiddleware
+from app.middleware.timing import (
+    TimedLayer,
+    add_timed_middleware,
+    middleware_timings,
+)
+
+
+class _SlowLayer:
+    """Spends ``delay`` seconds of its own before calling the next app."""
+
+    def __init__(self, app, delay: float):
+        self.app = app
+        self.delay = delay
+
+    async def __call__(self, scope, receive, send):
+        await asyncio.sleep(self.delay)
+        await self.app(scope, receive, send)
+
+
+def _slow_app(delay: float):
+    async def app(scope, receive, send):
+        await asyncio.sleep(delay)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
+async def _request(app, path="/"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [],
+    }
+    await app(scope, receive, send)
+    return messages
+
+
+@pytest.fixture(autouse=True)
+def _reset_timings():
+    middleware_timings.reset()
+    yield
+    middleware_timings.reset()
+
+
+@pytest.mark.asyncio
+async def test_timed_layer_excludes_downstream_time():
+    inner = TimedLayer(_slow_app(0.05), _SlowLayer, "inner", delay=0.0)
+    outer = TimedLayer(inner, _SlowLayer, "outer", delay=0.02)
+
+    await _request(outer)
+
+    report = {row["layer"]: row for row in middleware_timings.report()}
+    assert report["outer"]["requests"] == 1
+    assert 15_000 <= report["outer"]["mean_us"] < 45_000
+    # The 50ms endpoint belongs to neither layer
+    assert report["inner"]["mean_us"] < 15_000
+    assert [row["layer"] for row in middleware_timings.report()] == ["outer", "inner"]
+
+
+def test_timing_can_be_disabled(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "middleware_timing_enabled", False)
+    app = FastAPI()
+    add_timed_middleware(app, MimeTypeMiddleware, "mime_types")
+
+    assert app.user_middleware[0].cls is MimeTypeMiddleware
+
+
+def test_chain_records_every_layer():
+    app = FastAPI()
+
+    @app.get("/static/app.js")
+    async def script():
+        return {"ok": True}
+
+    add_timed_middleware(app, MimeTypeMiddleware, "mime_types")
+    add_timed_middleware(app, UnifiedErrorHandlingMiddleware, "error_handling")
+
+    response = TestClient(app).get("/static/app.js")
+
+    assert response.headers["content-type"] == "application/javascript; charset=utf-8"
+    layers = {row["layer"] for row in middleware_timings.report()}
+    assert layers == {"mime_types", "error_handling"}
+
+
+@pytest.mark.asyncio
+async def test_error_handling_serves_fallback_on_exception():
+    async def broken(scope, receive, send):
+        raise RuntimeError("boom")
+
+    middleware = UnifiedErrorHandlingMiddleware(broken)
+    messages = await _request(middleware, "/verify/services")
+
+    assert messages[0]["status"] == 200
+    assert b"telegram" in messages[1]["body"]
+
+
+@pytest.mark.asyncio
+async def test_error_handling_replaces_error_status_on_fallback_path():
+    async def unavailable(scope, receive, send):
+        await send({"type": "http.response.start", "status": 503, "headers": []})
+        await send({"type": "http.response.body", "body": b"down"})
+
+    middleware = UnifiedErrorHandlingMiddleware(unavailable)
+    messages = await _request(middleware, "/verify/services")
+
+    assert messages[0]["status"] == 200
+    assert len(messages) == 2
+    assert b"down" not in messages[1]["body"]
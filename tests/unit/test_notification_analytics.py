@@ -5,12 +5,20 @@ import uuid
 from datetime import datetime, timezone
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
 from app.models.notification import Notification
-from app.models.notification_analytics import NotificationAnalytics
+from app.models.notification_analytics import (
+    NotificationAnalytics,
+    NotificationStatsHourly,
+)
 from app.models.user import User
-from app.services.notification_analytics_service import NotificationAnalyticsService
+from app.services.notification_analytics_service import (
+    NotificationAnalyticsService,
+    notification_stats,
+)
 
 
 @pytest.fixture
@@ -309,6 +317,114 @@ class TestNotificationAnalyticsService:
         assert "period" in metrics[0]
         assert "total" in metrics[0]
 
+    def test_status_changes_move_counts(
+        self, db: Session, analytics_service, test_user, test_notification
+    ):
+        """Test counters follow each notification's current status."""
+        analytics_service.track_notification_sent(
+            notification_id=test_notification.id,
+            user_id=test_user.id,
+            notification_type="verification",
+            delivery_method="email",
+        )
+        analytics_service.track_notification_delivered(
+            notification_id=test_notification.id,
+            user_id=test_user.id,
+            delivery_method="email",
+        )
+        analytics_service.track_notification_clicked(
+            notification_id=test_notification.id,
+            user_id=test_user.id,
+        )
+
+        # One pending counter row for all three events
+        assert len(notification_stats) == 1
+
+        metrics = analytics_service.get_delivery_metrics(user_id=test_user.id)
+        assert len(notification_stats) == 0
+        assert metrics["total_notifications"] == 1
+        assert (metrics["sent"], metrics["delivered"], metrics["clicked"]) == (1, 1, 1)
+
+        stats = db.query(NotificationStatsHourly).one()
+        assert (stats.sent, stats.delivered, stats.clicked) == (0, 0, 1)
+
+    def test_flush_merges_into_existing_counters(
+        self, db: Session, analytics_service, test_user
+    ):
+        """Test later flushes add to the stored counters."""
+        for _ in range(2):
+            notification = Notification(
+                user_id=test_user.id,
+                type="payment",
+                title="Payment",
+                message="Payment received",
+            )
+            db.add(notification)
+            db.commit()
+            analytics_service.track_notification_sent(
+                notification_id=notification.id,
+                user_id=test_user.id,
+                notification_type="payment",
+                delivery_method="sms",
+            )
+            assert notification_stats.flush(db) == 1
+
+        assert db.query(NotificationStatsHourly).one().sent == 2
+
+        timeline = analytics_service.get_timeline_metrics(
+            user_id=test_user.id, interval="hour"
+        )
+        assert [period["total"] for period in timeline] == [2]
+        assert timeline[0]["period"].endswith(":00:00")
+
+    def test_status_updates_lock_the_row(
+        self, db: Session, analytics_service, test_user, test_notification
+    ):
+        """Test the row is read FOR UPDATE before its status moves."""
+        analytics_service.track_notification_sent(
+            notification_id=test_notification.id,
+            user_id=test_user.id,
+            notification_type="verification",
+            delivery_method="email",
+        )
+        statements = []
+
+        def on_execute(state):
+            statements.append(state.statement)
+
+        event.listen(db, "do_orm_execute", on_execute)
+        try:
+            assert analytics_service.track_notification_read(
+                notification_id=test_notification.id, user_id=test_user.id
+            )
+        finally:
+            event.remove(db, "do_orm_execute", on_execute)
+
+        compiled = [
+            str(statement.compile(dialect=postgresql.dialect()))
+            for statement in statements
+        ]
+        lookup = next(sql for sql in compiled if "FROM notification_analytics" in sql)
+        assert lookup.endswith("FOR UPDATE")
+
+    def test_metrics_flush_leaves_caller_session_uncommitted(
+        self, db: Session, analytics_service, test_user, test_notification
+    ):
+        """Test the stats flush does not commit the caller's pending work."""
+        analytics_service.track_notification_sent(
+            notification_id=test_notification.id,
+            user_id=test_user.id,
+            notification_type="verification",
+            delivery_method="email",
+        )
+        test_user.credits = 5.0
+
+        metrics = analytics_service.get_delivery_metrics(user_id=test_user.id)
+        db.rollback()
+
+        assert metrics["sent"] == 1
+        assert db.get(User, test_user.id).credits == 100.0
+
 
 class TestAnalyticsEndpoints:
     """Test analytics endpoints."""
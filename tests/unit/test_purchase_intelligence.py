@@ -1,8 +1,9 @@
 """
 Unit tests for PurchaseIntelligenceService.score_availability.
 
-The service now opens its own SessionLocal internally (no db argument).
-We patch SessionLocal so the test-inserted rows are visible to the service.
+The service now opens its own SessionLocal internally (no db argument) and
+aggregates in SQL. We insert rows into the test database and patch
+SessionLocal so the service queries them.
 """
 
 from datetime import datetime, timedelta, timezone
@@ -34,21 +35,17 @@ def patch_cache():
         yield
 
 
-def _mock_session_local(rows):
-    """Return a patcher that makes SessionLocal() yield a mock session with preset rows."""
-    mock_session = MagicMock()
-    mock_query = mock_session.query.return_value
-    mock_filter = mock_query.filter.return_value
-    mock_filter.all.return_value = rows
-    return patch(
-        "app.services.purchase_intelligence.SessionLocal", return_value=mock_session
-    )
+def _session_with(db, rows):
+    """Return a patcher that makes SessionLocal() yield the test db holding rows."""
+    db.add_all(rows)
+    db.commit()
+    return patch("app.services.purchase_intelligence.SessionLocal", return_value=db)
 
 
 @pytest.mark.asyncio
-async def test_score_availability_no_data():
+async def test_score_availability_no_data(db):
     """No history → unknown, zero confidence."""
-    with _mock_session_local([]):
+    with _session_with(db, []):
         score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
     assert score.available is None
     assert score.confidence == 0.0
@@ -56,7 +53,7 @@ async def test_score_availability_no_data():
 
 
 @pytest.mark.asyncio
-async def test_score_availability_high_success():
+async def test_score_availability_high_success(db):
     """5 matched outcomes → available=True, confidence=0.6, rate=1.0."""
     now = datetime.now(timezone.utc)
     rows = [
@@ -69,7 +66,7 @@ async def test_score_availability_high_success():
         )
         for i in range(5)
     ]
-    with _mock_session_local(rows):
+    with _session_with(db, rows):
         score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
     assert score.available is True
     assert score.confidence == 0.6  # 5 samples → 0.6
@@ -77,7 +74,7 @@ async def test_score_availability_high_success():
 
 
 @pytest.mark.asyncio
-async def test_score_availability_high_failures():
+async def test_score_availability_high_failures(db):
     """5 mismatched outcomes → available=False, confidence=0.6, rate=0.0."""
     now = datetime.now(timezone.utc)
     rows = [
@@ -90,7 +87,7 @@ async def test_score_availability_high_failures():
         )
         for i in range(5)
     ]
-    with _mock_session_local(rows):
+    with _session_with(db, rows):
         score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
     assert score.available is False
     assert score.confidence == 0.6
@@ -98,7 +95,7 @@ async def test_score_availability_high_failures():
 
 
 @pytest.mark.asyncio
-async def test_score_availability_mixed():
+async def test_score_availability_mixed(db):
     """2 success + 2 failures (not recent) → rate 0.5 → available=None (ambiguous)."""
     now = datetime.now(timezone.utc)
     rows = [
@@ -131,14 +128,14 @@ async def test_score_availability_mixed():
             created_at=now - timedelta(hours=4),
         ),
     ]
-    with _mock_session_local(rows):
+    with _session_with(db, rows):
         score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
     assert score.available is None  # 0.4 <= rate 0.5 < 0.6 → ambiguous
     assert score.success_rate == 0.5
 
 
 @pytest.mark.asyncio
-async def test_score_availability_recency_weight():
+async def test_score_availability_recency_weight(db):
     """Older successes + a very recent failure → downgraded on recency penalty."""
     now = datetime.now(timezone.utc)
     rows = [
@@ -166,14 +163,14 @@ async def test_score_availability_recency_weight():
             created_at=now - timedelta(minutes=30),
         ),
     ]
-    with _mock_session_local(rows):
+    with _session_with(db, rows):
         score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
     # Total weighted: success=2, failure=3 → rate = 2/5 = 0.4
     assert score.success_rate == pytest.approx(0.4)
 
 
 @pytest.mark.asyncio
-async def test_unfiltered_purchase_scores_correctly():
+async def test_unfiltered_purchase_scores_correctly(db):
     """Unfiltered buy (requested_code=None) that lands on 213 counts as a 213 success."""
     now = datetime.now(timezone.utc)
     rows = [
@@ -185,7 +182,7 @@ async def test_unfiltered_purchase_scores_correctly():
             created_at=now - timedelta(hours=1),
         ),
     ]
-    with _mock_session_local(rows):
+    with _session_with(db, rows):
         score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
     assert score.sample_size == 1
     assert score.success_rate == 1.0
@@ -202,3 +199,65 @@ async def test_score_availability_db_error_gracefully_returns_unknown():
         score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
     assert score.available is None
     assert score.confidence == 0.0
+
+
+@pytest.mark.asyncio
+async def test_score_availability_reports_last_success_and_failure(db):
+    """MAX(created_at) per outcome kind comes back as tz-aware datetimes."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        _make_outcome(
+            service="whatsapp",
+            assigned_code="213",
+            requested_code="213",
+            created_at=now - timedelta(hours=days),
+        )
+        for days in (5, 3)
+    ] + [
+        _make_outcome(
+            service="whatsapp",
+            requested_code="213",
+            assigned_code="469",
+            created_at=now - timedelta(hours=4),
+        )
+    ]
+    with _session_with(db, rows):
+        score = await PurchaseIntelligenceService.score_availability("whatsapp", "213")
+    assert score.last_success == pytest.approx(
+        now - timedelta(hours=3), abs=timedelta(seconds=1)
+    )
+    assert score.last_failure == pytest.approx(
+        now - timedelta(hours=4), abs=timedelta(seconds=1)
+    )
+    assert score.last_success.tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_live_health_score_aggregates_last_hour(db):
+    """Share of last-hour outcomes that received an SMS; older rows are ignored."""
+    now = datetime.now(timezone.utc)
+    niche = dict(service="whatsapp", assigned_code="213", provider="5sim", country="GB")
+    rows = [
+        _make_outcome(
+            sms_received=True, created_at=now - timedelta(minutes=5), **niche
+        ),
+        _make_outcome(
+            sms_received=None, created_at=now - timedelta(minutes=5), **niche
+        ),
+        _make_outcome(
+            sms_received=False, created_at=now - timedelta(minutes=5), **niche
+        ),
+        _make_outcome(
+            sms_received=True, created_at=now - timedelta(minutes=5), **niche
+        ),
+        _make_outcome(sms_received=False, created_at=now - timedelta(hours=3), **niche),
+    ]
+    with _session_with(db, rows):
+        health = await PurchaseIntelligenceService.get_live_health_score(
+            "whatsapp", "GB", "5sim"
+        )
+        empty = await PurchaseIntelligenceService.get_live_health_score(
+            "telegram", "GB", "5sim"
+        )
+    assert health == 0.5
+    assert empty == 1.0
@@ -1,16 +1,28 @@
 import time
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import fakeredis
 import pytest
 from fastapi import FastAPI
 
 from app.core.unified_rate_limiting import (
+    IP_BUCKET,
+    PrefixTrie,
+    RateLimitConfig,
     TokenBucket,
     UnifiedRateLimiter,
     UnifiedRateLimitMiddleware,
 )
 
 
+def _request(path="/api/v1/test", ip="127.0.0.1"):
+    request = MagicMock()
+    request.client.host = ip
+    request.url.path = path
+    request.headers = {}
+    return request
+
+
 @pytest.mark.asyncio
 async def test_token_bucket():
     bucket = TokenBucket(capacity=10, refill_rate=1.0)
@@ -66,3 +78,123 @@ def test_middleware_init():
     middleware = UnifiedRateLimitMiddleware(app)
     assert middleware.app == app
     assert isinstance(middleware.rate_limiter, UnifiedRateLimiter)
+
+
+def test_prefix_trie_matches_longest_prefix():
+    trie = PrefixTrie([("/auth", "auth"), ("/auth/login", "login")])
+    assert trie.longest_prefix("/auth/login/2fa") == "login"
+    assert trie.longest_prefix("/auth/register") == "auth"
+    assert trie.longest_prefix("/wallet", "default") == "default"
+    assert trie.has_prefix_of("/auth/x") is True
+    assert trie.has_prefix_of("/au") is False
+
+
+def test_endpoint_rules_resolve_through_trie():
+    limiter = UnifiedRateLimiter()
+    assert (
+        limiter.get_endpoint_config("/auth/login")
+        is limiter.endpoint_limits["/auth/login"]
+    )
+    assert (
+        limiter.get_endpoint_config("/verify/create/bulk")
+        is limiter.endpoint_limits["/verify/create"]
+    )
+    assert limiter.should_skip_rate_limiting("/static/app.js") is True
+
+
+def test_root_is_public_only_as_exact_path():
+    limiter = UnifiedRateLimiter()
+    assert limiter.should_skip_rate_limiting("/") is True
+    assert limiter.should_skip_rate_limiting("/api/verify/create") is False
+    assert limiter.should_skip_rate_limiting("/auth/login") is False
+
+
+async def test_disabled_limiter_allows_everything():
+    limiter = UnifiedRateLimiter()
+    limiter.enabled = False
+
+    results = [
+        await limiter.check_rate_limit(_request("/api/verify/create", "10.0.0.4"))
+        for _ in range(IP_BUCKET[0] + 1)
+    ]
+
+    assert all(allowed for allowed, _, _ in results)
+    assert not limiter.ip_requests
+
+
+async def test_default_rules_limit_api_paths():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    limiter = UnifiedRateLimiter()
+    limiter.enabled = True
+    capacity = IP_BUCKET[0]
+
+    # A fixed clock, so the bucket cannot refill between requests
+    clock = MagicMock()
+    clock.time.return_value = time.time()
+    with patch.object(limiter, "_shared_redis", return_value=redis), patch(
+        "app.core.unified_rate_limiting.time", clock
+    ):
+        results = [
+            await limiter.check_rate_limit(_request("/api/verify/create", "10.0.0.3"))
+            for _ in range(capacity + 1)
+        ]
+        home = await limiter.check_rate_limit(_request("/", "10.0.0.3"))
+
+    assert [allowed for allowed, _, _ in results] == [True] * capacity + [False]
+    assert results[-1][2]["limit_type"] == "burst"
+    assert home == (True, 0, {})
+
+
+async def test_shared_limit_spans_workers():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    workers = [UnifiedRateLimiter(), UnifiedRateLimiter()]
+    config = RateLimitConfig(requests=4, window=60)
+    now = time.time()
+
+    results = [
+        await workers[i % 2]._check_shared(redis, None, "10.0.0.1", config, 0.0, now)
+        for i in range(5)
+    ]
+
+    assert [allowed for allowed, _, _ in results] == [True] * 4 + [False]
+    allowed, retry_after, info = results[-1]
+    assert info["limit_type"] == "window"
+    assert 0 < retry_after <= 60
+    assert results[0][2]["remaining"] == 3
+
+
+async def test_shared_burst_bucket_refills():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    limiter = UnifiedRateLimiter()
+    config = RateLimitConfig(requests=1000, window=60)
+    now = time.time()
+
+    for _ in range(20):
+        allowed, _, _ = await limiter._check_shared(
+            redis, None, "10.0.0.2", config, 0.0, now
+        )
+        assert allowed
+    allowed, retry_after, info = await limiter._check_shared(
+        redis, None, "10.0.0.2", config, 0.0, now
+    )
+    assert not allowed and info["limit_type"] == "burst"
+    assert retry_after == 1
+
+    allowed, _, _ = await limiter._check_shared(
+        redis, None, "10.0.0.2", config, 0.0, now + 1
+    )
+    assert allowed
+
+
+async def test_falls_back_to_local_limiter_when_redis_fails():
+    limiter = UnifiedRateLimiter()
+    limiter.enabled = True
+
+    broken = MagicMock()
+    broken.register_script.side_effect = ConnectionError("down")
+    with patch.object(limiter, "_shared_redis", return_value=broken):
+        allowed, _, info = await limiter.check_rate_limit(_request(), "user_123")
+
+    assert allowed is True
+    assert len(limiter.ip_requests["127.0.0.1"]) == 1
+    assert limiter._redis_retry_at > time.time()
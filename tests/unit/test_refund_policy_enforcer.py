@@ -9,6 +9,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.models.transaction import Transaction
 from app.models.user import User
 from app.models.verification import Verification
 from app.services.refund_policy_enforcer import RefundPolicyEnforcer
@@ -194,6 +195,70 @@ async def test_refund_enforcer_immediate_enforcement(db_session):
     assert user.credits == initial_balance + Decimal("2.50")
 
 
+@pytest.mark.asyncio
+async def test_refund_enforcer_batches_refunds_per_user(db_session):
+    """Test that batched enforcement credits each user once per refund."""
+    users = [
+        User(
+            email=f"batch{i}@example.com",
+            password_hash="test",
+            subscription_tier="payg",
+            credits=Decimal("1.00"),
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+
+    for i in range(5):
+        db_session.add(
+            Verification(
+                user_id=users[i % 2].id,
+                service_name="whatsapp",
+                phone_number=f"+1202555130{i}",
+                status="pending" if i % 2 else "failed",
+                cost=Decimal("0.50"),
+                created_at=datetime.now(timezone.utc) - timedelta(minutes=15),
+                activation_id=f"batch_activation_{i}",
+                refunded=False,
+            )
+        )
+    db_session.commit()
+
+    enforcer = RefundPolicyEnforcer()
+    enforcer.batch_size = 2
+    with patch("app.core.database.SessionLocal") as mock_session_local:
+        mock_session_local.return_value = db_session
+        mock_session_local.return_value.close = MagicMock()
+        await enforcer._enforce_refund_policy()
+
+    for user in users:
+        db_session.refresh(user)
+    assert users[0].credits == Decimal("2.50")
+    assert users[1].credits == Decimal("2.00")
+
+    remaining = (
+        db_session.query(Verification).filter(Verification.refunded == False).count()
+    )
+    assert remaining == 0
+    assert db_session.query(Verification).filter_by(status="pending").count() == 0
+    refunds = db_session.query(Transaction).filter_by(type="verification_refund")
+    assert refunds.count() == 5
+
+    report = enforcer.last_report
+    assert report["batches"] == 3
+    assert report["refunded"] == 5
+    assert report["failed"] == 0
+    assert report["amount"] == pytest.approx(2.5)
+
+    # A second run finds nothing left to refund
+    with patch("app.core.database.SessionLocal") as mock_session_local:
+        mock_session_local.return_value = db_session
+        mock_session_local.return_value.close = MagicMock()
+        await enforcer._enforce_refund_policy()
+    assert enforcer.last_report["selected"] == 0
+
+
 def test_refund_enforcer_configuration():
     """Test enforcer configuration."""
     enforcer = RefundPolicyEnforcer()
@@ -117,3 +117,14 @@ def test_rental_without_area_code_no_fee(db: Session, setup_tiers):
         db, "user5", duration_hours=24, provider_cost=5.0, area_code=None
     )
     assert result["area_code_fee"] == 0.0
+
+
+def test_rental_request_rejects_unsold_duration(authenticated_regular_client):
+    """Hours that are not a provider rental length are refused, not rounded up."""
+    response = authenticated_regular_client.post(
+        "/api/rentals/request",
+        json={"service": "whatsapp", "duration_hours": 25.0},
+    )
+
+    assert response.status_code == 400
+    assert "Unsupported rental duration" in str(response.json())
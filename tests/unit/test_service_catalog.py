@@ -0,0 +1,122 @@
+"""Tests for the purchase pricing service catalog."""
+
+import asyncio
+from unittest.mock import patch
+
+import fakeredis.aioredis
+import pytest
+
+from app.services.service_catalog import LOCK_KEY, ServiceCatalog
+
+SERVICES = [
+    {"id": "telegram", "name": "Telegram", "price": 0.5, "cost": 0.5},
+    {"id": "whatsapp", "name": "Whatsapp", "price": 0.75, "cost": 0.75},
+    {"id": "telegram", "name": "Telegram", "price": 9.0, "cost": 9.0},
+]
+
+
+class Source:
+    def __init__(self, services=SERVICES, delay=0.01):
+        self.services = services
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return list(self.services)
+
+
+def _catalog(source, fresh_ttl=60.0, check_interval=0.0):
+    return ServiceCatalog(
+        loader=source,
+        fresh_ttl=fresh_ttl,
+        max_stale=3600.0,
+        check_interval=check_interval,
+    )
+
+
+@pytest.fixture
+def redis():
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    with patch("app.services.service_catalog._get_redis", return_value=client):
+        yield client
+
+
+async def test_concurrent_misses_share_one_fetch(redis):
+    source = Source()
+    catalog = _catalog(source)
+
+    entries = await asyncio.gather(*[catalog.get("telegram") for _ in range(20)])
+
+    assert source.calls == 1
+    # First entry wins when the provider lists a service twice
+    assert {entry["price"] for entry in entries} == {0.5}
+    assert await catalog.get("unknown") is None
+    assert catalog.stats()["misses"] == 20
+
+
+async def test_stale_snapshot_is_served_while_refreshing(redis):
+    source = Source()
+    catalog = _catalog(source, fresh_ttl=0.05)
+    await catalog.get("telegram")
+    await asyncio.sleep(0.1)
+
+    source.services = [{"id": "telegram", "name": "Telegram", "price": 0.6}]
+    assert (await catalog.get("telegram"))["price"] == 0.5
+    assert catalog.stale_hits == 1
+
+    await catalog._refresh
+    assert source.calls == 2
+    assert (await catalog.get("telegram"))["price"] == 0.6
+
+
+async def test_workers_follow_the_published_version(redis):
+    first, second = Source(), Source()
+    worker_a = _catalog(first)
+    worker_b = _catalog(second)
+
+    await worker_a.get("telegram")
+    assert (await worker_b.get("whatsapp"))["price"] == 0.75
+    assert second.calls == 0
+
+    await worker_a.publish([{"id": "whatsapp", "name": "Whatsapp", "price": 1.0}])
+    assert (await worker_b.get("whatsapp"))["price"] == 1.0
+    assert worker_b.stats()["version"] == int(await redis.get("tv:catalog:version"))
+
+
+async def test_works_without_redis():
+    source = Source()
+    catalog = _catalog(source)
+    with patch("app.services.service_catalog._get_redis", return_value=None):
+        assert (await catalog.get("whatsapp"))["price"] == 0.75
+        snapshot = await catalog.publish(SERVICES[:1])
+    assert snapshot.version == 2
+    assert source.calls == 1
+
+
+async def test_failed_refresh_keeps_stale_snapshot(redis):
+    source = Source()
+    catalog = _catalog(source, fresh_ttl=0.0)
+    await catalog.get("telegram")
+
+    async def broken():
+        raise RuntimeError("TextVerified API is not responding")
+
+    assert (await catalog.get("telegram", loader=broken))["price"] == 0.5
+    assert (await catalog._refresh).services["telegram"]["price"] == 0.5
+
+
+async def test_refresh_releases_only_its_own_lock(redis):
+    await _catalog(Source()).get("telegram")
+    assert await redis.get(LOCK_KEY) is None
+
+    async def slow():
+        # Our lock expires mid-fetch and another worker takes it
+        await redis.set(LOCK_KEY, "other-worker")
+        return list(SERVICES)
+
+    await redis.flushall()
+    await _catalog(Source()).get("telegram", loader=slow)
+
+    assert await redis.get(LOCK_KEY) == "other-worker"
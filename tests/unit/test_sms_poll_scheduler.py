@@ -0,0 +1,152 @@
+"""Unit tests for the central SMS poll scheduler."""
+
+import asyncio
+
+import pytest
+
+from app.services.sms_poll_scheduler import PollJob, PollScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _job(verification_id, provider="textverified"):
+    return PollJob(
+        verification_id=verification_id,
+        provider=provider,
+        activation_id=f"act-{verification_id}",
+        deadline=10_000.0,
+    )
+
+
+async def _drain(scheduler):
+    while scheduler._batches:
+        await asyncio.gather(*list(scheduler._batches))
+
+
+@pytest.mark.asyncio
+async def test_due_jobs_are_batched_per_provider():
+    calls = []
+
+    async def handler(provider, jobs):
+        calls.append((provider, sorted(j.verification_id for j in jobs)))
+        return {j.verification_id: None for j in jobs}
+
+    clock = FakeClock()
+    scheduler = PollScheduler(handler, clock=clock)
+    scheduler.schedule(_job("a"))
+    scheduler.schedule(_job("b"))
+    scheduler.schedule(_job("c", provider="telnyx"))
+    scheduler.schedule(_job("d"), delay=30)
+
+    scheduler._tick(clock())
+    await _drain(scheduler)
+
+    assert sorted(calls) == [("telnyx", ["c"]), ("textverified", ["a", "b"])]
+    assert scheduler.job_ids() == ["d"]
+
+
+@pytest.mark.asyncio
+async def test_handler_delay_reschedules_job():
+    async def handler(provider, jobs):
+        return {j.verification_id: 5.0 for j in jobs}
+
+    clock = FakeClock()
+    scheduler = PollScheduler(handler, clock=clock)
+    job = _job("a")
+    scheduler.schedule(job)
+
+    scheduler._tick(clock())
+    await _drain(scheduler)
+
+    assert job.attempts == 1
+    assert job.due_at == clock() + 5.0
+    assert scheduler._pop_due(clock()) == []
+    clock.now += 5.0
+    assert scheduler._pop_due(clock()) == [job]
+
+
+@pytest.mark.asyncio
+async def test_handler_error_uses_backoff():
+    async def handler(provider, jobs):
+        raise RuntimeError("provider down")
+
+    clock = FakeClock()
+    scheduler = PollScheduler(handler, error_backoff_seconds=15.0, clock=clock)
+    job = _job("a")
+    scheduler.schedule(job)
+
+    scheduler._tick(clock())
+    await _drain(scheduler)
+
+    assert "a" in scheduler
+    assert job.due_at == clock() + 15.0
+
+
+def test_cancel_discards_heap_entry_lazily():
+    async def handler(provider, jobs):
+        return {}
+
+    clock = FakeClock()
+    scheduler = PollScheduler(handler, clock=clock)
+    scheduler.schedule(_job("a"))
+    assert scheduler.schedule(_job("a")) is False
+
+    assert scheduler.cancel("a") is True
+    assert scheduler._pop_due(clock()) == []
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_report_depth_lag_and_in_flight():
+    release = asyncio.Event()
+
+    async def handler(provider, jobs):
+        await release.wait()
+        return {j.verification_id: 10.0 for j in jobs}
+
+    clock = FakeClock()
+    scheduler = PollScheduler(handler, clock=clock)
+    scheduler.schedule(_job("a"))
+    scheduler.schedule(_job("b", provider="5sim"), delay=60)
+
+    clock.now += 2.0
+    scheduler._tick(clock())
+    await asyncio.sleep(0)
+
+    stats = scheduler.stats()
+    assert stats["queue_depth"] == 1
+    assert stats["in_flight"] == {"textverified": 1}
+    assert stats["last_tick_lag_seconds"] == 2.0
+
+    release.set()
+    await _drain(scheduler)
+    assert scheduler.stats()["in_flight"] == {}
+    assert scheduler.stats()["queue_depth"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_loop_polls_until_done():
+    polls = []
+
+    async def handler(provider, jobs):
+        polls.extend(j.verification_id for j in jobs)
+        return {j.verification_id: (None if j.attempts >= 1 else 0.01) for j in jobs}
+
+    scheduler = PollScheduler(handler)
+    scheduler.schedule(_job("a"))
+    task = asyncio.create_task(scheduler.run())
+    for _ in range(100):
+        if "a" not in scheduler:
+            break
+        await asyncio.sleep(0.01)
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert polls == ["a", "a"]
+    assert len(scheduler) == 0
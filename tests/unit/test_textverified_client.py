@@ -0,0 +1,213 @@
+"""Unit tests for the async TextVerified transport."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.services.textverified_client import (
+    TextVerifiedAPIError,
+    TextVerifiedAsyncClient,
+    rental_duration_for_hours,
+)
+
+BASE = "https://tv.test"
+
+
+def _auth_response(token="tok-1"):
+    return httpx.Response(
+        200, json={"token": token, "expiresAt": "2099-01-01T00:00:00Z"}
+    )
+
+
+def _client(handler):
+    http = httpx.AsyncClient(base_url=BASE, transport=httpx.MockTransport(handler))
+    return TextVerifiedAsyncClient("key", "user", base_url=BASE, http=http)
+
+
+@pytest.mark.asyncio
+async def test_token_fetched_once_and_sent_as_bearer():
+    seen = []
+
+    def handler(request):
+        if request.url.path == "/api/pub/v2/auth":
+            assert request.headers["X-API-KEY"] == "key"
+            assert request.headers["X-API-USERNAME"] == "user"
+            seen.append("auth")
+            return _auth_response()
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(
+            200,
+            json={
+                "id": "v1",
+                "number": "+12025550100",
+                "createdAt": "2026-01-01T00:00:00Z",
+                "endsAt": "2026-01-01T00:10:00Z",
+                "totalCost": 1.5,
+                "state": "verificationPending",
+                "cancel": {"canCancel": True},
+                "report": {"canReport": False},
+            },
+        )
+
+    client = _client(handler)
+    first = await client.get_verification("v1")
+    await client.get_verification("v1")
+
+    assert seen == ["auth", "Bearer tok-1", "Bearer tok-1"]
+    assert first.number == "+12025550100"
+    assert first.total_cost == 1.5
+    assert first.can_cancel is True
+    assert first.ends_at.tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_401_forces_one_reauth():
+    tokens = iter(["stale", "fresh"])
+
+    def handler(request):
+        if request.url.path == "/api/pub/v2/auth":
+            return _auth_response(next(tokens))
+        if request.headers["Authorization"] == "Bearer stale":
+            return httpx.Response(401)
+        return httpx.Response(200, json={})
+
+    client = _client(handler)
+    await client.report_verification("v1")
+
+    assert client._token == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_429_is_retried_honouring_retry_after():
+    calls = {"n": 0}
+
+    def handler(request):
+        if request.url.path == "/api/pub/v2/auth":
+            return _auth_response()
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx.Response(429, headers={"Retry-After": "2"})
+        return httpx.Response(200, json={})
+
+    client = _client(handler)
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        await client.cancel_verification("v1")
+
+    assert calls["n"] == 2
+    mock_sleep.assert_awaited_once_with(2.0)
+
+
+@pytest.mark.asyncio
+async def test_5xx_is_retried_for_reads_only():
+    calls = {"GET": 0, "POST": 0}
+
+    def handler(request):
+        if request.url.path == "/api/pub/v2/auth":
+            return _auth_response()
+        calls[request.method] += 1
+        if calls[request.method] == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={})
+
+    client = _client(handler)
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        await client.get_verification("v1")
+        # A POST that failed with a 5xx may still have bought a number
+        with pytest.raises(TextVerifiedAPIError) as exc:
+            await client.request("POST", "/api/pub/v2/verifications", json={})
+
+    assert calls == {"GET": 2, "POST": 1}
+    assert exc.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_error_response_raises_with_api_error_code():
+    def handler(request):
+        if request.url.path == "/api/pub/v2/auth":
+            return _auth_response()
+        return httpx.Response(
+            400, json={"errorCode": "BadRequest", "errorDescription": "nope"}
+        )
+
+    client = _client(handler)
+    with pytest.raises(TextVerifiedAPIError) as exc:
+        await client.cancel_verification("v1")
+
+    assert exc.value.status_code == 400
+    assert exc.value.error_code == "BadRequest"
+
+
+@pytest.mark.asyncio
+async def test_list_sms_filters_by_number_and_follows_pages():
+    def handler(request):
+        if request.url.path == "/api/pub/v2/auth":
+            return _auth_response()
+        if request.url.params.get("page") == "2":
+            return httpx.Response(
+                200,
+                json={
+                    "data": [{"id": "s2", "createdAt": "2026-01-01T00:01:00Z"}],
+                    "hasNext": False,
+                },
+            )
+        assert request.url.params["to"] == "+12025550100"
+        return httpx.Response(
+            200,
+            json={
+                "data": [
+                    {
+                        "id": "s1",
+                        "to": "+12025550100",
+                        "createdAt": "2026-01-01T00:00:30Z",
+                        "smsContent": "Code 123456",
+                        "parsedCode": "123456",
+                    }
+                ],
+                "hasNext": True,
+                "links": {
+                    "next": {"method": "GET", "href": f"{BASE}/api/pub/v2/sms?page=2"}
+                },
+            },
+        )
+
+    client = _client(handler)
+    messages = await client.list_sms(to_number="+12025550100")
+
+    assert [m.id for m in messages] == ["s1", "s2"]
+    assert messages[0].parsed_code == "123456"
+
+
+@pytest.mark.asyncio
+async def test_create_verification_follows_returned_action():
+    def handler(request):
+        if request.url.path == "/api/pub/v2/auth":
+            return _auth_response()
+        if request.method == "POST":
+            return httpx.Response(
+                201,
+                json={"method": "GET", "href": f"{BASE}/api/pub/v2/verifications/v9"},
+            )
+        return httpx.Response(
+            200, json={"id": "v9", "number": "+13105550100", "totalCost": 2.0}
+        )
+
+    client = _client(handler)
+    result = await client.create_verification(
+        {"serviceName": "whatsapp", "capability": "sms"}
+    )
+
+    assert result.id == "v9"
+    assert result.number == "+13105550100"
+
+
+def test_rental_duration_for_hours():
+    assert rental_duration_for_hours(24) == "oneDay"
+    assert rental_duration_for_hours(72.0) == "threeDay"
+    assert rental_duration_for_hours(720) == "thirtyDay"
+
+
+@pytest.mark.parametrize("hours", [1, 25, 10_000])
+def test_rental_duration_rejects_unsold_lengths(hours):
+    with pytest.raises(ValueError):
+        rental_duration_for_hours(hours)
@@ -39,15 +39,16 @@ def _make_service():
             svc = TextVerifiedService()
             svc.enabled = True
             svc.client = MagicMock()
+            svc.http = AsyncMock()
             return svc
 
 
-# ── Deviation 1: poll_sms_standard uses TV object, not string ID ──────────────
+# ── Deviation 1: poll_sms_standard polls the TV object's number ──────────────
 
 
 @pytest.mark.asyncio
 async def test_poll_sms_standard_uses_tv_object():
-    """sms.incoming() must receive the VerificationExpanded object, not a string."""
+    """SMS must be listed by the verification's number, not a string ID."""
     svc = _make_service()
 
     tv_obj = MagicMock()
@@ -59,20 +60,13 @@ async def test_poll_sms_standard_uses_tv_object():
     received_sms.sms_content = "Your code is 123456"
     received_sms.created_at = datetime.now(timezone.utc)
 
-    def _mock_incoming(data, since, timeout, polling_interval):
-        # Verify data is the object, not a string
-        assert not isinstance(
-            data, str
-        ), "sms.incoming() received a string ID instead of TV object"
-        assert data is tv_obj
-        yield received_sms
-
-    svc.client.sms.incoming = _mock_incoming
+    svc.http.list_sms.return_value = [received_sms]
 
     result = await svc.poll_sms_standard(tv_obj, timeout_seconds=30.0)
 
     assert result["success"] is True
     assert result["code"] == "123456"
+    svc.http.list_sms.assert_awaited_once_with(to_number="+12025551234")
 
 
 # ── Deviation 2: parsed_code used first, regex is fallback ───────────────────
@@ -91,10 +85,7 @@ async def test_poll_sms_standard_parsed_code_first():
     sms.sms_content = "Your code is 806-185"  # Hyphenated in raw text
     sms.created_at = datetime.now(timezone.utc)
 
-    def _mock_incoming(data, since, timeout, polling_interval):
-        yield sms
-
-    svc.client.sms.incoming = _mock_incoming
+    svc.http.list_sms.return_value = [sms]
 
     result = await svc.poll_sms_standard(tv_obj, timeout_seconds=30.0)
 
@@ -118,10 +109,7 @@ async def test_poll_sms_standard_regex_fallback_hyphenated():
     sms.sms_content = "Your verification code is 806-185"
     sms.created_at = datetime.now(timezone.utc)
 
-    def _mock_incoming(data, since, timeout, polling_interval):
-        yield sms
-
-    svc.client.sms.incoming = _mock_incoming
+    svc.http.list_sms.return_value = [sms]
 
     result = await svc.poll_sms_standard(tv_obj, timeout_seconds=30.0)
 
@@ -143,9 +131,9 @@ async def test_create_verification_returns_ends_at_and_tv_object():
     mock_result.total_cost = 2.22
     mock_result.ends_at = datetime.now(timezone.utc) + timedelta(minutes=10)
 
-    with patch(
-        "asyncio.to_thread", new_callable=AsyncMock, return_value=mock_result
-    ), patch.object(
+    svc.http.create_verification.return_value = mock_result
+
+    with patch.object(
         svc,
         "_build_area_code_preference",
         new_callable=AsyncMock,
@@ -193,11 +181,9 @@ async def test_create_verification_returns_ends_at_and_tv_object():
 async def test_report_verification_called_on_timeout():
     """report_verification must be called when verification times out."""
     svc = _make_service()
-    svc.client.verifications.report = MagicMock()
-
     result = await svc.report_verification("tv-act-123")
 
-    svc.client.verifications.report.assert_called_once_with("tv-act-123")
+    svc.http.report_verification.assert_awaited_once_with("tv-act-123")
     assert result is True
 
 
@@ -212,17 +198,22 @@ async def test_poll_sms_standard_uses_ends_at_for_timeout():
     tv_obj = MagicMock()
     tv_obj.created_at = datetime.now(timezone.utc)
 
-    captured_timeout = {}
-
-    def _mock_incoming(data, since, timeout, polling_interval):
-        captured_timeout["value"] = timeout
-        return iter([])  # No SMS — timeout
+    svc.http.list_sms.return_value = []  # No SMS — timeout
+    clock = {"now": 1000.0}
+    slept = []
 
-    svc.client.sms.incoming = _mock_incoming
+    async def _fake_sleep(seconds):
+        slept.append(seconds)
+        clock["now"] += seconds
 
-    await svc.poll_sms_standard(tv_obj, timeout_seconds=42.0)
+    with patch("app.services.textverified_service.time") as mock_time, patch(
+        "asyncio.sleep", side_effect=_fake_sleep
+    ):
+        mock_time.monotonic.side_effect = lambda: clock["now"]
+        result = await svc.poll_sms_standard(tv_obj, timeout_seconds=42.0)
 
-    assert captured_timeout["value"] == 42.0
+    assert result == {"success": False, "timed_out": True}
+    assert sum(slept) == pytest.approx(42.0)
 
 
 # ── Deviation: get_sms filters stale SMS via created_after ───────────────────
@@ -247,10 +238,11 @@ async def test_get_sms_filters_stale_messages():
     fresh_sms.sms_content = "Your code is 999999"
     fresh_sms.parsed_code = "999999"
 
-    with patch(
-        "asyncio.to_thread", new_callable=AsyncMock, return_value=[stale_sms, fresh_sms]
-    ):
-        result = await svc.get_sms("tv-act-123", created_after=created_at)
+    svc.http.list_sms.return_value = [stale_sms, fresh_sms]
+
+    result = await svc.get_sms(
+        "tv-act-123", created_after=created_at, phone_number="+12025551234"
+    )
 
     assert result["success"] is True
     assert result["code"] == "999999"  # Only fresh SMS returned
@@ -266,8 +258,11 @@ async def test_get_sms_returns_pending_when_all_stale():
     stale_sms.created_at = created_at - timedelta(minutes=5)
     stale_sms.sms_content = "Old code 111111"
 
-    with patch("asyncio.to_thread", new_callable=AsyncMock, return_value=[stale_sms]):
-        result = await svc.get_sms("tv-act-123", created_after=created_at)
+    svc.http.list_sms.return_value = [stale_sms]
+
+    result = await svc.get_sms(
+        "tv-act-123", created_after=created_at, phone_number="+12025551234"
+    )
 
     assert result["success"] is False
     assert result["sms"] is None
@@ -291,9 +286,9 @@ async def test_area_code_fallback_same_state():
     # Both 415 and 408 are in CA
     by_state = {"CA": ["415", "408", "510"]}
 
-    with patch(
-        "asyncio.to_thread", new_callable=AsyncMock, return_value=mock_result
-    ), patch.object(
+    svc.http.create_verification.return_value = mock_result
+
+    with patch.object(
         svc,
         "_build_area_code_preference",
         new_callable=AsyncMock,
@@ -352,16 +347,9 @@ async def test_voip_rejection_triggers_retry():
     mobile_result.total_cost = 2.22
     mobile_result.ends_at = datetime.now(timezone.utc) + timedelta(minutes=10)
 
-    call_count = 0
-
-    async def _mock_to_thread(fn, *args, **kwargs):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            return voip_result
-        return mobile_result
+    svc.http.create_verification.side_effect = [voip_result, mobile_result]
 
-    with patch("asyncio.to_thread", side_effect=_mock_to_thread), patch.object(
+    with patch.object(
         svc, "_build_area_code_preference", new_callable=AsyncMock, return_value=["202"]
     ), patch.object(
         svc, "_get_area_codes_by_state", new_callable=AsyncMock, return_value={}
@@ -29,7 +29,17 @@ def mock_textverified_client():
 
 
 @pytest.fixture
-def textverified_service(mock_textverified_client):
+def mock_textverified_http():
+    """Mock async TextVerified transport."""
+    http = AsyncMock()
+    http.get_verification.return_value = Mock(
+        id="ver123", number="+12025551234", carrier=None
+    )
+    return http
+
+
+@pytest.fixture
+def textverified_service(mock_textverified_client, mock_textverified_http):
     """Create TextVerifiedService instance with mocked client."""
     with patch.dict(
         "os.environ",
@@ -40,6 +50,7 @@ def textverified_service(mock_textverified_client):
     ):
         service = TextVerifiedService()
         service.client = mock_textverified_client
+        service.http = mock_textverified_http
         service.enabled = True
         return service
 
@@ -61,6 +72,7 @@ def mock_verification():
 def mock_sms():
     """Create a mock SMS object."""
     sms = Mock()
+    sms.id = "sms123"
     sms.sms_content = "Your verification code is 123456"
     sms.parsed_code = "123456"
     sms.created_at = datetime.now(timezone.utc)
@@ -177,9 +189,7 @@ class TestNumberPurchasing:
         self, textverified_service, mock_verification
     ):
         """Test successful number purchase."""
-        textverified_service.client.verifications.create.return_value = (
-            mock_verification
-        )
+        textverified_service.http.create_verification.return_value = mock_verification
 
         with patch(
             "app.services.textverified_service.PhoneValidator"
@@ -198,14 +208,35 @@ class TestNumberPurchasing:
         assert result["phone_number"] == "+12025551234"
         assert "cost" in result
 
+    @pytest.mark.asyncio
+    async def test_create_verification_without_ends_at(
+        self, textverified_service, mock_verification
+    ):
+        """A verification the API returns without endsAt is still usable."""
+        mock_verification.ends_at = None
+        textverified_service.http.create_verification.return_value = mock_verification
+
+        with patch(
+            "app.services.textverified_service.PhoneValidator"
+        ) as mock_validator:
+            mock_validator.return_value.validate_mobile.return_value = {
+                "is_mobile": True,
+                "is_voip": False,
+            }
+
+            result = await textverified_service.create_verification(
+                service="whatsapp", country="US"
+            )
+
+        assert result["id"] == "ver123"
+        assert result["ends_at"] is None
+
     @pytest.mark.asyncio
     async def test_purchase_number_with_area_code(
         self, textverified_service, mock_verification
     ):
         """Test number purchase with specific area code."""
-        textverified_service.client.verifications.create.return_value = (
-            mock_verification
-        )
+        textverified_service.http.create_verification.return_value = mock_verification
 
         with patch(
             "app.services.textverified_service.PhoneValidator"
@@ -231,9 +262,7 @@ class TestNumberPurchasing:
         self, textverified_service, mock_verification
     ):
         """Test number purchase rejects VOIP numbers."""
-        textverified_service.client.verifications.create.return_value = (
-            mock_verification
-        )
+        textverified_service.http.create_verification.return_value = mock_verification
 
         with patch(
             "app.services.textverified_service.PhoneValidator"
@@ -251,12 +280,12 @@ class TestNumberPurchasing:
 
         assert result["success"] is True
         # Should have retried
-        assert textverified_service.client.verifications.create.call_count >= 2
+        assert textverified_service.http.create_verification.await_count >= 2
 
     @pytest.mark.asyncio
     async def test_purchase_number_api_error(self, textverified_service):
         """Test number purchase when API fails."""
-        textverified_service.client.verifications.create.side_effect = Exception(
+        textverified_service.http.create_verification.side_effect = Exception(
             "API error"
         )
 
@@ -274,7 +303,7 @@ class TestSMSRetrieval:
     @pytest.mark.asyncio
     async def test_get_sms_success(self, textverified_service, mock_sms):
         """Test successful SMS retrieval."""
-        textverified_service.client.sms.list.return_value = [mock_sms]
+        textverified_service.http.list_sms.return_value = [mock_sms]
 
         result = await textverified_service.get_sms("ver123")
 
@@ -285,7 +314,7 @@ class TestSMSRetrieval:
     @pytest.mark.asyncio
     async def test_get_sms_no_messages(self, textverified_service):
         """Test SMS retrieval when no messages available."""
-        textverified_service.client.sms.list.return_value = []
+        textverified_service.http.list_sms.return_value = []
 
         result = await textverified_service.get_sms("ver123")
 
@@ -305,7 +334,7 @@ class TestSMSRetrieval:
         new_sms.parsed_code = "222222"
         new_sms.created_at = datetime.now(timezone.utc)
 
-        textverified_service.client.sms.list.return_value = [old_sms, new_sms]
+        textverified_service.http.list_sms.return_value = [old_sms, new_sms]
 
         created_after = datetime.now(timezone.utc) - timedelta(minutes=5)
         result = await textverified_service.get_sms(
@@ -315,6 +344,22 @@ class TestSMSRetrieval:
         assert result["success"] is True
         assert result["code"] == "222222"  # Should get new SMS only
 
+    @pytest.mark.asyncio
+    async def test_get_sms_tolerates_missing_timestamps(
+        self, textverified_service, mock_sms
+    ):
+        """Messages without created_at sort as oldest instead of raising."""
+        undated = Mock()
+        undated.sms_content = "Code: 333333"
+        undated.parsed_code = "333333"
+        undated.created_at = None
+        textverified_service.http.list_sms.return_value = [undated, mock_sms]
+
+        result = await textverified_service.get_sms("ver123")
+
+        assert result["success"] is True
+        assert result["code"] == "123456"
+
     @pytest.mark.asyncio
     async def test_get_sms_service_disabled(self):
         """Test SMS retrieval when service is disabled."""
@@ -326,6 +371,68 @@ class TestSMSRetrieval:
         assert result["success"] is False
         assert "error" in result
 
+    @pytest.mark.asyncio
+    async def test_get_recent_sms_stops_at_older_message(self, textverified_service):
+        """Sweep listing stops at the first page reaching past ``since``."""
+        since = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        fresh = Mock(created_at=since + timedelta(seconds=30))
+        stale = Mock(created_at=since - timedelta(seconds=30))
+        pages_read = []
+
+        async def _pages(max_pages):
+            for page in ([fresh], [fresh, stale], [fresh]):
+                pages_read.append(page)
+                yield page, True
+
+        textverified_service.http.iter_sms_pages = _pages
+
+        messages, complete = await textverified_service.get_recent_sms(since)
+
+        assert messages == [fresh, fresh]
+        assert complete is True
+        assert len(pages_read) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_recent_sms_untimed_message_does_not_stop(
+        self, textverified_service
+    ):
+        """A message without a timestamp is skipped but does not end the sweep."""
+        since = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        fresh = Mock(created_at=since + timedelta(seconds=30))
+        untimed = Mock(created_at=None)
+
+        async def _pages(max_pages):
+            yield [fresh, untimed], True
+            yield [fresh], False
+
+        textverified_service.http.iter_sms_pages = _pages
+
+        messages, complete = await textverified_service.get_recent_sms(since)
+
+        assert messages == [fresh, fresh]
+        assert complete is True
+
+    @pytest.mark.asyncio
+    async def test_get_recent_sms_incomplete_when_pages_run_out(
+        self, textverified_service
+    ):
+        """Hitting max_pages before reaching ``since`` is reported as incomplete."""
+        since = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        fresh = Mock(created_at=since + timedelta(seconds=30))
+
+        async def _pages(max_pages):
+            for _ in range(max_pages):
+                yield [fresh], True
+
+        textverified_service.http.iter_sms_pages = _pages
+
+        messages, complete = await textverified_service.get_recent_sms(
+            since, max_pages=2
+        )
+
+        assert len(messages) == 2
+        assert complete is False
+
 
 class TestSMSPolling:
     """Test SMS polling operations."""
@@ -335,11 +442,7 @@ class TestSMSPolling:
         self, textverified_service, mock_verification, mock_sms
     ):
         """Test successful SMS polling."""
-
-        def mock_incoming(*args, **kwargs):
-            yield mock_sms
-
-        textverified_service.client.sms.incoming = mock_incoming
+        textverified_service.http.list_sms.return_value = [mock_sms]
 
         result = await textverified_service.poll_sms_standard(
             mock_verification, timeout_seconds=10.0
@@ -347,24 +450,61 @@ class TestSMSPolling:
 
         assert result["success"] is True
         assert result["code"] == "123456"
+        textverified_service.http.list_sms.assert_awaited_with(to_number="+12025551234")
 
     @pytest.mark.asyncio
     async def test_poll_sms_standard_timeout(
         self, textverified_service, mock_verification
     ):
         """Test SMS polling timeout."""
+        textverified_service.http.list_sms.return_value = []  # No messages
 
-        def mock_incoming(*args, **kwargs):
-            return iter([])  # No messages
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await textverified_service.poll_sms_standard(
+                mock_verification, timeout_seconds=0.0
+            )
 
-        textverified_service.client.sms.incoming = mock_incoming
+        assert result["success"] is False
+        assert result.get("timed_out") is True
+        mock_sleep.assert_not_called()
 
-        result = await textverified_service.poll_sms_standard(
-            mock_verification, timeout_seconds=1.0
+
+class TestVerificationStatus:
+    """Test verification status lookups."""
+
+    @pytest.mark.asyncio
+    async def test_status_includes_received_sms(self, textverified_service, mock_sms):
+        """The code comes from the number's inbox, not the verification."""
+        textverified_service.http.get_verification.return_value = Mock(
+            id="ver123",
+            number="+12025551234",
+            carrier=None,
+            state="verificationCompleted",
+            created_at=mock_sms.created_at - timedelta(minutes=1),
         )
+        textverified_service.http.list_sms.return_value = [mock_sms]
 
-        assert result["success"] is False
-        assert result.get("timed_out") is True
+        result = await textverified_service.get_verification_status("ver123")
+
+        assert result["status"] == "completed"
+        assert result["sms_code"] == "123456"
+        assert result["sms_text"] == "Your verification code is 123456"
+
+    @pytest.mark.asyncio
+    async def test_status_skips_inbox_for_cancelled(self, textverified_service):
+        textverified_service.http.get_verification.return_value = Mock(
+            id="ver123",
+            number="+12025551234",
+            carrier=None,
+            state="verificationCanceled",
+            created_at=None,
+        )
+
+        result = await textverified_service.get_verification_status("ver123")
+
+        assert result["status"] == "cancelled"
+        assert result["sms_code"] is None
+        textverified_service.http.list_sms.assert_not_awaited()
 
 
 class TestVerificationCancellation:
@@ -373,17 +513,17 @@ class TestVerificationCancellation:
     @pytest.mark.asyncio
     async def test_cancel_verification_success(self, textverified_service):
         """Test successful verification cancellation."""
-        textverified_service.client.verifications.cancel.return_value = None
+        textverified_service.http.cancel_verification.return_value = None
 
         result = await textverified_service.cancel_verification("ver123")
 
         assert result["success"] is True
-        assert textverified_service.client.verifications.cancel.called
+        assert textverified_service.http.cancel_verification.called
 
     @pytest.mark.asyncio
     async def test_cancel_verification_api_error(self, textverified_service):
         """Test verification cancellation when API fails."""
-        textverified_service.client.verifications.cancel.side_effect = Exception(
+        textverified_service.http.cancel_verification.side_effect = Exception(
             "API error"
         )
 
@@ -395,7 +535,7 @@ class TestVerificationCancellation:
     @pytest.mark.asyncio
     async def test_cancel_safe_no_exception(self, textverified_service):
         """Test _cancel_safe never raises exceptions."""
-        textverified_service.client.verifications.cancel.side_effect = Exception(
+        textverified_service.http.cancel_verification.side_effect = Exception(
             "API error"
         )
 
@@ -411,17 +551,17 @@ class TestVerificationReporting:
     @pytest.mark.asyncio
     async def test_report_verification_success(self, textverified_service):
         """Test successful verification reporting."""
-        textverified_service.client.verifications.report.return_value = None
+        textverified_service.http.report_verification.return_value = None
 
         result = await textverified_service.report_verification("ver123")
 
         assert result is True
-        assert textverified_service.client.verifications.report.called
+        assert textverified_service.http.report_verification.called
 
     @pytest.mark.asyncio
     async def test_report_verification_failure(self, textverified_service):
         """Test verification reporting when API fails."""
-        textverified_service.client.verifications.report.side_effect = Exception(
+        textverified_service.http.report_verification.side_effect = Exception(
             "API error"
         )
 
@@ -467,14 +607,17 @@ class TestReservations:
     @pytest.mark.asyncio
     async def test_create_reservation_success(self, textverified_service):
         """Test successful reservation creation."""
-        mock_reservation = Mock()
-        mock_reservation.id = "res123"
-        mock_reservation.number = "+12025551234"
-        mock_reservation.total_cost = 10.0
-        mock_reservation.ends_at = datetime.now(timezone.utc) + timedelta(hours=24)
-        mock_reservation.state = Mock(value="active")
-
-        textverified_service.client.reservations.create.return_value = mock_reservation
+        textverified_service.http.create_rental.return_value = {
+            "id": "sale123",
+            "total": 10.0,
+            "reservations": [{"id": "res123", "reservationType": "nonrenewable"}],
+        }
+        textverified_service.http.get_reservation.return_value = {
+            "id": "res123",
+            "number": "+12025551234",
+            "endsAt": "2030-01-02T00:00:00Z",
+            "state": "nonrenewableActive",
+        }
 
         result = await textverified_service.create_reservation(
             service="whatsapp", duration_hours=24.0
@@ -483,16 +626,54 @@ class TestReservations:
         assert result["id"] == "res123"
         assert result["phone_number"] == "+12025551234"
         assert result["cost"] == 10.0
+        payload = textverified_service.http.create_rental.await_args[0][0]
+        assert payload["duration"] == "oneDay"
+        assert payload["serviceName"] == "whatsapp"
+        assert "alwaysOn" not in payload
+        assert "isRenewable" not in payload
+        assert "numberType" not in payload
+
+    @pytest.mark.asyncio
+    async def test_create_reservation_rejects_unsupported_duration(
+        self, textverified_service
+    ):
+        """Hours are not rounded up to a longer (pricier) rental."""
+        with pytest.raises(ValueError):
+            await textverified_service.create_reservation(
+                service="whatsapp", duration_hours=25.0
+            )
+
+        textverified_service.http.create_rental.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_extend_reservation_rejects_unsupported_duration(
+        self, textverified_service
+    ):
+        with pytest.raises(ValueError):
+            await textverified_service.extend_reservation("res123", 5.0)
+
+        textverified_service.http.extend_rental.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_extend_reservation_sends_exact_duration(self, textverified_service):
+        assert await textverified_service.extend_reservation("res123", 72.0)
+
+        textverified_service.http.extend_rental.assert_awaited_once_with(
+            "res123", "threeDay"
+        )
 
     @pytest.mark.asyncio
     async def test_get_reservation_messages(self, textverified_service, mock_sms):
         """Test retrieving messages for a reservation."""
-        textverified_service.client.reservations.messages.return_value = [mock_sms]
+        textverified_service.http.list_sms.return_value = [mock_sms]
 
         result = await textverified_service.get_reservation_messages("res123")
 
         assert len(result) == 1
         assert result[0]["code"] == "123456"
+        textverified_service.http.list_sms.assert_awaited_once_with(
+            reservation_id="res123"
+        )
 
 
 class TestHealthStatus:
@@ -527,7 +708,7 @@ class TestEdgeCases:
     @pytest.mark.asyncio
     async def test_check_sms_with_error(self, textverified_service):
         """Test check_sms handles errors gracefully."""
-        textverified_service.client.sms.list.side_effect = Exception("API error")
+        textverified_service.http.list_sms.side_effect = Exception("API error")
 
         result = await textverified_service.check_sms("ver123")
 
@@ -538,9 +719,7 @@ class TestEdgeCases:
     @pytest.mark.asyncio
     async def test_get_verification_details_error(self, textverified_service):
         """Test get_verification_details handles errors gracefully."""
-        textverified_service.client.verifications.details.side_effect = Exception(
-            "API error"
-        )
+        textverified_service.http.get_verification.side_effect = Exception("API error")
 
         result = await textverified_service.get_verification_details("ver123")
 
@@ -0,0 +1,110 @@
+"""Tests for the tier resolution cache and its use in TierManager."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from sqlalchemy import event
+
+from app.services.tier_cache import REDIS_PREFIX, TierCache, tier_cache
+from app.services.tier_manager import TierManager
+
+
+@pytest.fixture
+def redis():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.tier_cache._get_redis", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def user_queries(db):
+    """SELECTs issued on the test session."""
+    seen = []
+
+    def on_execute(state):
+        if state.is_select:
+            seen.append(state.statement)
+
+    event.listen(db, "do_orm_execute", on_execute)
+    yield seen
+    event.remove(db, "do_orm_execute", on_execute)
+
+
+def test_second_lookup_skips_database(db, test_user, redis, user_queries):
+    manager = TierManager(db)
+
+    assert manager.get_user_tier(test_user.id) == "pro"
+    queries = len(user_queries)
+    assert queries > 0
+
+    for _ in range(3):
+        assert TierManager(db).get_user_tier(test_user.id) == "pro"
+    assert len(user_queries) == queries
+
+
+def test_upgrade_and_downgrade_invalidate(db, test_user, redis):
+    manager = TierManager(db)
+    assert manager.get_user_tier(test_user.id) == "pro"
+
+    manager.downgrade_user_tier(test_user.id, reason="test")
+    assert redis.get(f"{REDIS_PREFIX}{test_user.id}") is None
+    assert manager.get_user_tier(test_user.id) == "freemium"
+
+    manager.upgrade_user_tier(test_user.id, "payg")
+    assert manager.get_user_tier(test_user.id) == "payg"
+
+
+def test_other_worker_reads_shared_entry(db, test_user, redis):
+    TierManager(db).get_user_tier(test_user.id)
+
+    other_worker = TierCache(local_ttl=10, redis_ttl=300, config_ttl=60)
+    assert other_worker.get(test_user.id) == "pro"
+
+
+def test_entry_does_not_outlive_tier_expiry(db, test_user, redis):
+    test_user.tier_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+
+    assert TierManager(db).get_user_tier(test_user.id) == "freemium"
+
+    cache = TierCache(local_ttl=10, redis_ttl=300, config_ttl=60)
+    cache.set("user-1", "pro", datetime.now(timezone.utc) - timedelta(seconds=1))
+    assert cache.get("user-1") is None
+    assert redis.get(f"{REDIS_PREFIX}user-1") is None
+
+
+def test_stats_report_hit_rate(redis):
+    cache = TierCache(local_ttl=10, redis_ttl=300, config_ttl=60)
+    assert cache.get("user-1") is None
+    cache.set("user-1", "pro")
+    assert cache.get("user-1") == "pro"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_works_without_redis(db, test_user):
+    with patch(
+        "app.services.tier_cache._get_redis", side_effect=ConnectionError("down")
+    ):
+        assert TierManager(db).get_user_tier(test_user.id) == "pro"
+        assert tier_cache.get(test_user.id) == "pro"
+        tier_cache.invalidate(test_user.id)
+        assert tier_cache.get(test_user.id) is None
+
+
+def test_bulk_tier_update_invalidates(db, test_user, redis, authenticated_admin_client):
+    assert TierManager(db).get_user_tier(test_user.id) == "pro"
+
+    response = authenticated_admin_client.post(
+        "/api/admin/tiers/users/bulk/tier",
+        json={"user_ids": [test_user.id], "tier": "payg"},
+    )
+
+    assert response.status_code == 200
+    assert redis.get(f"{REDIS_PREFIX}{test_user.id}") is None
+    assert TierManager(db).get_user_tier(test_user.id) == "payg"
@@ -0,0 +1,130 @@
+"""Tests for the verified-token cache and its use in AuthService.verify_token."""
+
+import json
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from sqlalchemy import event
+
+from app.core.dependencies import _load_user
+from app.core.token_cache import CHANNEL, VerifiedTokenCache, verified_tokens
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    verified_tokens.clear()
+    yield
+    verified_tokens.clear()
+
+
+@pytest.fixture
+def redis():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.auth_service._get_redis", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def statements(db):
+    """SELECTs issued on the test session."""
+    seen = []
+
+    def on_execute(state):
+        if state.is_select:
+            seen.append(state.statement)
+
+    event.listen(db, "do_orm_execute", on_execute)
+    yield seen
+    event.remove(db, "do_orm_execute", on_execute)
+
+
+def test_cache_hit_skips_redis_and_database(db, test_user, redis, statements):
+    auth = AuthService(db)
+    token = auth.create_user_token(test_user)
+
+    assert auth.verify_token(token) == test_user.id
+    assert len(statements) == 1
+
+    with patch.object(redis, "exists", wraps=redis.exists) as exists:
+        for _ in range(3):
+            assert auth.verify_token(token) == test_user.id
+    assert exists.call_count == 0
+    assert len(statements) == 1
+
+
+def test_tampered_token_is_rejected_even_when_jti_is_cached(db, test_user, redis):
+    auth = AuthService(db)
+    token = auth.create_user_token(test_user)
+    auth.verify_token(token)
+
+    header, payload, signature = token.split(".")
+    assert auth.verify_token(f"{header}.{payload}.{signature[::-1]}") is None
+
+
+def test_logout_evicts_and_publishes(db, test_user, redis):
+    auth = AuthService(db)
+    token = auth.create_user_token(test_user)
+    auth.verify_token(token)
+
+    pubsub = redis.pubsub()
+    pubsub.subscribe(CHANNEL)
+    pubsub.get_message()
+
+    assert auth.revoke_token(token) is True
+    assert auth.verify_token(token) is None
+
+    message = json.loads(pubsub.get_message()["data"])
+    assert message["jti"] and message["user_id"] is None
+
+
+def test_revocation_check_failure_is_not_cached(db, test_user):
+    auth = AuthService(db)
+    token = auth.create_user_token(test_user)
+
+    with patch(
+        "app.services.auth_service._get_redis", side_effect=ConnectionError("down")
+    ):
+        assert auth.verify_token(token) == test_user.id
+    assert len(verified_tokens._claims) == 0
+
+
+def test_revocations_from_other_workers_evict():
+    worker = VerifiedTokenCache(maxsize=10, ttl=30)
+    other = VerifiedTokenCache(maxsize=10, ttl=30)
+    worker.add("jti-1", "user-1")
+    worker.add("jti-2", "user-1")
+    worker.add("jti-3", "user-2")
+
+    # Own messages are ignored; they were applied before publishing
+    worker._on_message(json.dumps({"jti": "jti-3", "origin": worker._origin}))
+    assert worker.get("jti-3") == "user-2"
+
+    other_origin = other._origin
+    worker._on_message(json.dumps({"jti": "jti-3", "origin": other_origin}))
+    assert worker.get("jti-3") is None
+
+    worker._on_message(json.dumps({"user_id": "user-1", "origin": other_origin}))
+    assert worker.get("jti-1") is None and worker.get("jti-2") is None
+
+
+def test_entries_never_outlive_the_token():
+    cache = VerifiedTokenCache(maxsize=10, ttl=30)
+
+    cache.add("expired", "user-1", exp=0)
+
+    assert cache.get("expired") is None
+
+
+def test_user_row_is_loaded_once_per_request(db, test_user, redis, statements):
+    auth = AuthService(db)
+    token = auth.create_user_token(test_user)
+    db.expunge_all()
+
+    # Cache miss: verify_token's existence check loads the row...
+    user_id = auth.verify_token(token)
+    # ...and the user dependencies reuse it from the session
+    assert _load_user(db, user_id).id == test_user.id
+    assert _load_user(db, user_id).id == test_user.id
+    assert len(statements) == 1
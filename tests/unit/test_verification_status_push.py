@@ -0,0 +1,182 @@
+"""Tests for event-driven verification status delivery (long-poll and SSE)."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.api.verification.status_polling import (
+    _status_events,
+    wait_for_verification_status,
+)
+from app.models.verification import Verification
+from app.services.verification_status_service import (
+    mark_sms_code_received,
+    mark_verification_cancelled_by_user,
+)
+from app.services.verification_waiters import VerificationWaiters, verification_waiters
+
+
+@pytest.fixture
+def pending(db, test_user, async_engine):
+    verification = Verification(
+        user_id=test_user.id,
+        service_name="telegram",
+        phone_number="+12025551234",
+        status="pending",
+        cost=0.50,
+        capability="sms",
+        country="US",
+        activation_id="tv-123",
+    )
+    db.add(verification)
+    db.commit()
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+    with patch(
+        "app.api.verification.status_polling.get_async_session_local",
+        return_value=sessions,
+    ):
+        yield verification
+
+
+def _elsewhere(db, verification):
+    """The same row through another session, as another request would see it."""
+    other = Session(bind=db.get_bind())
+    return other, other.get(Verification, verification.id)
+
+
+async def _until_waiting(count=1):
+    for _ in range(100):
+        if verification_waiters.waiting() >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("waiter never parked")
+
+
+# ── VerificationWaiters ───────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_notify_wakes_every_listener_once():
+    waiters = VerificationWaiters()
+    with waiters.listen("v1") as first, waiters.listen("v1") as second:
+        assert waiters.waiting() == 2
+        assert waiters.notify("v1") is True
+        assert first.is_set() and second.is_set()
+        # A later listener waits for the next change, not the one just seen
+        with waiters.listen("v1") as later:
+            assert not later.is_set()
+    assert waiters.waiting() == 0
+    assert waiters.notify("v1") is False
+
+
+@pytest.mark.asyncio
+async def test_publish_without_redis_is_local_only():
+    waiters = VerificationWaiters()
+    with patch(
+        "app.services.verification_waiters._get_redis", return_value=None
+    ), waiters.listen("v1") as changed:
+        await waiters.publish("v1", "completed")
+        assert changed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_and_ignores_own_echo():
+    waiters = VerificationWaiters()
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+    with patch("app.services.verification_waiters._get_redis", return_value=redis):
+        await waiters.publish("v1", "completed")
+
+    message = redis.publish.await_args.args[1]
+    with waiters.listen("v1") as changed:
+        waiters._on_message(message)
+        assert not changed.is_set()
+        other = json.dumps({"id": "v1", "status": "completed", "origin": "peer"})
+        waiters._on_message(other)
+        assert changed.is_set()
+
+
+# ── long-poll ─────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_when_status_differs(
+    db, async_db, test_user, pending
+):
+    result = await wait_for_verification_status(
+        pending.id,
+        since="queued",
+        timeout=5,
+        current_user=test_user,
+        auth_db=db,
+        db=async_db,
+    )
+    assert result["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_wait_resolves_on_completion(db, async_db, test_user, pending):
+    task = asyncio.create_task(
+        wait_for_verification_status(
+            pending.id,
+            since=None,
+            timeout=5,
+            current_user=test_user,
+            auth_db=db,
+            db=async_db,
+        )
+    )
+    await _until_waiting()
+
+    other, verification = _elsewhere(db, pending)
+    await mark_sms_code_received(other, verification, "123456", "Your code is 123456")
+    other.close()
+    result = await asyncio.wait_for(task, 1)
+
+    assert result["status"] == "completed"
+    assert result["sms_code"] == "123456"
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_current_status(db, async_db, test_user, pending):
+    result = await wait_for_verification_status(
+        pending.id,
+        since="pending",
+        timeout=0.05,
+        current_user=test_user,
+        auth_db=db,
+        db=async_db,
+    )
+    assert result["status"] == "pending"
+    assert verification_waiters.waiting() == 0
+
+
+# ── SSE ───────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_sse_streams_until_terminal(db, pending):
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+    events = _status_events(request, pending.id)
+
+    first = await events.__anext__()
+    assert first.startswith("event: status")
+    assert json.loads(first.split("data: ", 1)[1])["status"] == "pending"
+
+    nxt = asyncio.create_task(events.__anext__())
+    await _until_waiting()
+    with patch("app.services.auto_refund_service.AutoRefundService") as refunds:
+        refunds.return_value.process_verification_refund = AsyncMock()
+        other, verification = _elsewhere(db, pending)
+        await mark_verification_cancelled_by_user(other, verification)
+        other.close()
+
+    update = await asyncio.wait_for(nxt, 1)
+    assert json.loads(update.split("data: ", 1)[1])["status"] == "cancelled"
+    with pytest.raises(StopAsyncIteration):
+        await events.__anext__()
@@ -9,6 +9,7 @@ Tests verify:
 6. Timer and polling
 """
 
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -27,7 +28,9 @@ class TestVoiceVerificationAreaCodeSupport:
         if not service.enabled:
             pytest.skip("TextVerified not configured")
 
-        with patch.object(service.client.verifications, "create") as mock_create:
+        with patch.object(
+            service.http, "create_verification", new_callable=AsyncMock
+        ) as mock_create:
             mock_result = MagicMock()
             mock_result.id = "test_123"
             mock_result.number = "+12135551234"
@@ -54,7 +57,9 @@ class TestVoiceVerificationAreaCodeSupport:
         if not service.enabled:
             pytest.skip("TextVerified not configured")
 
-        with patch.object(service.client.verifications, "create") as mock_create:
+        with patch.object(
+            service.http, "create_verification", new_callable=AsyncMock
+        ) as mock_create:
             mock_result = MagicMock()
             mock_result.id = "test_456"
             mock_result.number = "+14795551234"
@@ -85,7 +90,9 @@ class TestVoiceVerificationAreaCodeSupport:
         with patch.object(service, "_build_area_code_preference") as mock_build:
             mock_build.return_value = ["213", "310", "323"]
 
-            with patch.object(service.client.verifications, "create") as mock_create:
+            with patch.object(
+                service.http, "create_verification", new_callable=AsyncMock
+            ) as mock_create:
                 mock_result = MagicMock()
                 mock_result.id = "test_789"
                 mock_result.number = "+12135551234"
@@ -101,8 +108,8 @@ class TestVoiceVerificationAreaCodeSupport:
                 mock_build.assert_called_once_with("213")
 
                 # Verify it was passed to API
-                call_kwargs = mock_create.call_args[1]
-                assert call_kwargs["area_code_select_option"] == ["213", "310", "323"]
+                payload = mock_create.call_args[0][0]
+                assert payload["areaCodeSelectOption"] == ["213", "310", "323"]
 
 
 class TestVoiceVerificationPricing:
@@ -146,14 +153,16 @@ class TestVoiceVerificationPolling:
 
         mock_verification = MagicMock()
         mock_verification.id = "test_123"
-        mock_verification.created_at = "2026-05-10T12:00:00Z"
+        mock_verification.created_at = datetime(2026, 5, 10, 12, 0, tzinfo=timezone.utc)
 
-        with patch.object(service.client.sms, "incoming") as mock_incoming:
+        with patch.object(
+            service.http, "list_sms", new_callable=AsyncMock
+        ) as mock_list_sms:
             mock_sms = MagicMock()
             mock_sms.parsed_code = "123456"
             mock_sms.sms_content = "Your code is 123456"
-            mock_sms.created_at = "2026-05-10T12:01:00Z"
-            mock_incoming.return_value = [mock_sms]
+            mock_sms.created_at = datetime(2026, 5, 10, 12, 1, tzinfo=timezone.utc)
+            mock_list_sms.return_value = [mock_sms]
 
             result = await service.poll_sms_standard(
                 mock_verification, timeout_seconds=300
@@ -242,7 +251,9 @@ class TestVoiceVerificationEndToEnd:
             pytest.skip("TextVerified not configured")
 
         # Step 1: Create verification with area code
-        with patch.object(service.client.verifications, "create") as mock_create:
+        with patch.object(
+            service.http, "create_verification", new_callable=AsyncMock
+        ) as mock_create:
             mock_result = MagicMock()
             mock_result.id = "voice_123"
             mock_result.number = "+12135551234"
@@ -269,7 +280,9 @@ class TestVoiceVerificationEndToEnd:
             pytest.skip("TextVerified not configured")
 
         # Step 1: Create verification without area code
-        with patch.object(service.client.verifications, "create") as mock_create:
+        with patch.object(
+            service.http, "create_verification", new_callable=AsyncMock
+        ) as mock_create:
             mock_result = MagicMock()
             mock_result.id = "voice_456"
             mock_result.number = "+14795551234"
@@ -319,7 +332,9 @@ class TestVoiceVerificationRegression:
         if not service.enabled:
             pytest.skip("TextVerified not configured")
 
-        with patch.object(service.client.verifications, "create") as mock_create:
+        with patch.object(
+            service.http, "create_verification", new_callable=AsyncMock
+        ) as mock_create:
             mock_result = MagicMock()
             mock_result.id = "sms_123"
             mock_result.number = "+12135551234"
@@ -0,0 +1,214 @@
+"""Tests for the Redis Streams webhook queue worker."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from unittest.mock import patch
+
+import fakeredis.aioredis
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.user import Webhook
+from app.services.webhook_queue import WebhookQueue
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def endpoint(db, test_user):
+    webhook = Webhook(
+        user_id=test_user.id, url="https://hooks.example.com/in", secret="s3cret"
+    )
+    db.add(webhook)
+    db.commit()
+    with patch(
+        "app.services.webhook_queue.SessionLocal",
+        side_effect=lambda: Session(bind=db.get_bind()),
+    ):
+        yield webhook
+
+
+class Receiver:
+    """httpx transport that records requests and replies with queued statuses."""
+
+    def __init__(self, *statuses, delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return httpx.Response(self.statuses.pop(0) if self.statuses else 200)
+
+
+def _queue(redis, receiver, **kwargs):
+    http = httpx.AsyncClient(transport=httpx.MockTransport(receiver))
+    return WebhookQueue(redis, http=http, **kwargs)
+
+
+async def _retries(redis, queue):
+    return [
+        (json.loads(member)["fields"], due)
+        for member, due in await redis.zrange(queue.retry_key, 0, -1, withscores=True)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_consumers_get_unique_names(redis):
+    assert WebhookQueue(redis).consumer != WebhookQueue(redis).consumer
+
+
+@pytest.mark.asyncio
+async def test_delivers_signed_payload_and_acks(redis, endpoint):
+    receiver = Receiver()
+    queue = _queue(redis, receiver)
+    await queue.enqueue(endpoint.id, "sms.received", {"code": "123456"})
+
+    assert await queue.process_batch(block_ms=None) == 1
+
+    request = receiver.requests[0]
+    assert str(request.url) == endpoint.url
+    expected = hmac.new(b"s3cret", request.content, hashlib.sha256).hexdigest()
+    assert request.headers["X-Webhook-Signature"] == expected
+    assert json.loads(request.content)["data"] == {"code": "123456"}
+    pending = await redis.xpending(queue.stream, queue.group)
+    assert pending["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_delivers_concurrently_within_limit(redis, endpoint):
+    receiver = Receiver(delay=0.05)
+    queue = _queue(redis, receiver)
+    queue._semaphore = asyncio.Semaphore(3)
+    for n in range(6):
+        await queue.enqueue(endpoint.id, "sms.received", {"n": n})
+
+    await queue.process_batch(batch_size=6, block_ms=None)
+
+    assert len(receiver.requests) == 6
+    assert receiver.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_failure_is_scheduled_with_backoff_not_requeued(redis, endpoint):
+    queue = _queue(redis, Receiver(500))
+    await queue.enqueue(endpoint.id, "sms.received", {})
+
+    before = time.time()
+    await queue.process_batch(block_ms=None)
+
+    assert await redis.xlen(queue.stream) == 1  # only the original, acked
+    [(fields, due)] = await _retries(redis, queue)
+    assert fields["retry_count"] == "1"
+    base = queue.settings.webhook_retry_base_seconds
+    assert before + base / 2 <= due <= time.time() + base
+    # Not due yet: nothing is delivered again
+    assert await queue.process_batch(block_ms=None) == 0
+
+
+@pytest.mark.asyncio
+async def test_due_retry_is_redelivered(redis, endpoint):
+    receiver = Receiver(500, 200)
+    queue = _queue(redis, receiver)
+    await queue.enqueue(endpoint.id, "sms.received", {})
+    await queue.process_batch(block_ms=None)
+
+    with patch("app.services.webhook_queue.time.time", return_value=time.time() + 60):
+        assert await queue.process_batch(block_ms=None) == 1
+
+    assert len(receiver.requests) == 2
+    assert await _retries(redis, queue) == []
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_go_to_dlq(redis, endpoint):
+    queue = _queue(redis, Receiver(500))
+    await redis.xgroup_create(queue.stream, queue.group, id="0", mkstream=True)
+    await redis.xadd(
+        queue.stream,
+        {
+            "webhook_id": endpoint.id,
+            "event": "sms.received",
+            "data": "{}",
+            "retry_count": queue.max_retries,
+        },
+    )
+
+    await queue.process_batch(block_ms=None)
+
+    assert await redis.xlen(queue.dlq_stream) == 1
+    assert await _retries(redis, queue) == []
+
+
+def test_backoff_grows_and_caps(redis):
+    queue = WebhookQueue(redis)
+    base = queue.settings.webhook_retry_base_seconds
+    cap = queue.settings.webhook_retry_max_seconds
+
+    for attempt in range(4):
+        delay = queue.backoff(attempt)
+        assert base * 2**attempt / 2 <= delay <= base * 2**attempt
+    assert cap / 2 <= queue.backoff(50) <= cap
+
+
+@pytest.mark.asyncio
+async def test_stale_pending_entries_are_reclaimed(redis, endpoint):
+    crashed = _queue(redis, Receiver(), consumer="crashed")
+    await crashed.ensure_group()
+    await crashed.enqueue(endpoint.id, "sms.received", {})
+    # Read but never acked, as if the worker died mid-delivery
+    await redis.xreadgroup(crashed.group, "crashed", {crashed.stream: ">"}, count=1)
+
+    receiver = Receiver()
+    survivor = _queue(redis, receiver, consumer="survivor")
+    survivor.settings = survivor.settings.model_copy(
+        update={"webhook_claim_idle_seconds": 0}
+    )
+    assert await survivor.process_batch(block_ms=None) == 1
+
+    assert len(receiver.requests) == 1
+    assert (await redis.xpending(survivor.stream, survivor.group))["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_defers_without_calling_endpoint(redis, endpoint):
+    receiver = Receiver(*[500] * 10)
+    queue = _queue(redis, receiver)
+    queue.max_retries = 100
+    threshold = queue.settings.webhook_breaker_failure_threshold
+    for n in range(threshold + 2):
+        await queue.enqueue(endpoint.id, "sms.received", {"n": n})
+    queue._semaphore = asyncio.Semaphore(1)
+
+    await queue.process_batch(batch_size=threshold + 2, block_ms=None)
+
+    assert len(receiver.requests) == threshold
+    retries = await _retries(redis, queue)
+    assert len(retries) == threshold + 2
+    # Deferred by the breaker: retry count unchanged
+    assert sorted(f["retry_count"] for f, _ in retries).count("0") == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_webhook_is_dropped(redis, endpoint):
+    receiver = Receiver()
+    queue = _queue(redis, receiver)
+    await queue.enqueue("wh-unknown", "sms.received", {})
+
+    await queue.process_batch(block_ms=None)
+
+    assert receiver.requests == []
+    assert (await redis.xpending(queue.stream, queue.group))["pending"] == 0
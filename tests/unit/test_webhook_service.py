@@ -165,12 +165,10 @@ class TestSignatureVerification:
 class TestTriggerWebhook:
     @pytest.mark.asyncio
     async def test_triggers_webhook_successfully(self, webhook_service):
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.webhook_service.get_http_client") as mock_client:
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
             result = await webhook_service.trigger_webhook(
                 "https://example.com/webhook", "payment.success", {"amount": 100}
@@ -179,12 +177,10 @@ class TestTriggerWebhook:
 
     @pytest.mark.asyncio
     async def test_handles_webhook_failure(self, webhook_service):
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.webhook_service.get_http_client") as mock_client:
             mock_response = Mock()
             mock_response.status_code = 500
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
             result = await webhook_service.trigger_webhook(
                 "https://example.com/webhook", "payment.success", {"amount": 100}
@@ -193,8 +189,8 @@ class TestTriggerWebhook:
 
     @pytest.mark.asyncio
     async def test_handles_network_error(self, webhook_service):
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+        with patch("app.services.webhook_service.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(
                 side_effect=Exception("Network error")
             )
 
@@ -216,12 +212,10 @@ class TestDeliverWebhook:
         webhook_id = result["webhook_id"]
         secret = result["secret"]
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.webhook_service.get_http_client") as mock_client:
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
             await webhook_service.deliver(
                 webhook_id, "payment.success", {"amount": 100}, secret
@@ -237,12 +231,12 @@ class TestDeliverWebhook:
         )
         webhook_id = result["webhook_id"]
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock()
+        with patch("app.services.webhook_service.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock()
             await webhook_service.deliver(
                 webhook_id, "sms.received", {"code": "123"}, "secret"
             )
-            mock_client.return_value.__aenter__.return_value.post.assert_not_called()
+            mock_client.return_value.post.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_increments_retries_on_failure(self, webhook_service, mock_user_id):
@@ -252,8 +246,8 @@ class TestDeliverWebhook:
         webhook_id = result["webhook_id"]
         secret = result["secret"]
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+        with patch("app.services.webhook_service.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(
                 side_effect=Exception("Network error")
             )
 
@@ -273,8 +267,8 @@ class TestDeliverWebhook:
         secret = result["secret"]
         webhook_service.webhooks[webhook_id]["retries"] = 3
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+        with patch("app.services.webhook_service.get_http_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(
                 side_effect=Exception("Network error")
             )
 
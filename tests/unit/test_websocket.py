@@ -93,6 +93,8 @@ class TestConnectionManager:
             "user-123", message
         )
 
+        await connection_manager_instance.drain()
+
         assert result is True
         mock_websocket.send_json.assert_called_once_with(message)
 
@@ -122,6 +124,7 @@ class TestConnectionManager:
 
         message = {"type": "notification", "title": "Test"}
         await connection_manager_instance.broadcast(message)
+        await connection_manager_instance.drain()
 
         mock_websocket1.send_json.assert_called_once_with(message)
         mock_websocket2.send_json.assert_called_once_with(message)
@@ -147,6 +150,7 @@ class TestConnectionManager:
         result = await connection_manager_instance.broadcast_to_channel(
             "notifications", message
         )
+        await connection_manager_instance.drain()
 
         # Accept both 1 (only subscribed user) or 2 (all connected users)
         assert result in [1, 2]
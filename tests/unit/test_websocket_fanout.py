@@ -0,0 +1,143 @@
+"""Tests for cross-worker WebSocket fan-out and per-connection send queues."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.websocket.backplane import LocalBackplane, RedisBackplane
+from app.websocket.manager import ConnectionManager
+
+
+def _socket(send=None):
+    websocket = AsyncMock()
+    websocket.send_json = send or AsyncMock()
+    return websocket
+
+
+@pytest.fixture
+def workers():
+    backplane = LocalBackplane()
+    return ConnectionManager(backplane), ConnectionManager(backplane)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_to_user_reaches_socket_on_other_worker(workers):
+    worker_a, worker_b = workers
+    websocket = _socket()
+    worker_b.register(websocket, "user-1")
+
+    assert await worker_a.broadcast_to_user("user-1", {"type": "ping"}) is True
+    await worker_b.drain()
+
+    websocket.send_json.assert_awaited_once_with({"type": "ping"})
+
+
+@pytest.mark.asyncio
+async def test_user_on_both_workers_gets_one_copy_per_socket(workers):
+    worker_a, worker_b = workers
+    local, remote = _socket(), _socket()
+    worker_a.register(local, "user-1")
+    worker_b.register(remote, "user-1")
+
+    await worker_a.broadcast_to_user("user-1", {"n": 1})
+    await worker_a.broadcast({"n": 2})
+    await asyncio.gather(worker_a.drain(), worker_b.drain())
+
+    assert [c.args[0] for c in local.send_json.await_args_list] == [{"n": 1}, {"n": 2}]
+    assert [c.args[0] for c in remote.send_json.await_args_list] == [
+        {"n": 1},
+        {"n": 2},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others():
+    manager = ConnectionManager(LocalBackplane())
+    stalled = asyncio.Event()
+
+    async def stall(_):
+        await stalled.wait()
+
+    slow = _socket(AsyncMock(side_effect=stall))
+    fast = _socket()
+    manager.register(slow, "slow")
+    manager.register(fast, "fast")
+
+    await manager.send_personal_message({"n": 1}, "slow")
+    await manager.send_personal_message({"n": 1}, "fast")
+    await asyncio.wait_for(manager._senders[fast].queue.join(), 1)
+
+    fast.send_json.assert_awaited_once_with({"n": 1})
+    assert manager.is_user_connected("slow")
+    stalled.set()
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_send_queue_drops_connection():
+    manager = ConnectionManager(LocalBackplane())
+
+    async def never(_):
+        await asyncio.Event().wait()
+
+    slow = _socket(AsyncMock(side_effect=never))
+    manager.register(slow, "slow")
+
+    with patch("app.websocket.manager.get_settings") as settings:
+        settings.return_value.websocket_send_queue_size = 2
+        settings.return_value.websocket_send_timeout_seconds = 30
+        for n in range(4):
+            await manager.send_personal_message({"n": n}, "slow")
+        await asyncio.sleep(0)
+
+    assert not manager.is_user_connected("slow")
+    assert slow not in manager._senders
+    slow.close.assert_awaited_once_with(code=1013)
+    await asyncio.wait_for(manager.drain(), 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_send_disconnects():
+    manager = ConnectionManager(LocalBackplane())
+    broken = _socket(AsyncMock(side_effect=RuntimeError("closed")))
+    manager.register(broken, "user-1")
+
+    await manager.send_personal_message({"n": 1}, "user-1")
+    await asyncio.wait_for(manager.drain(), 1)
+
+    assert not manager.is_user_connected("user-1")
+    # The endpoint disconnects again when its receive loop ends
+    manager.disconnect(broken, "user-1")
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_without_redis_is_local_only():
+    manager = ConnectionManager(RedisBackplane())
+    with patch("app.websocket.backplane._get_redis", return_value=None):
+        assert await manager.broadcast_to_user("nobody", {"n": 1}) is False
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_round_trip_ignores_own_echo():
+    backplane = RedisBackplane()
+    manager = ConnectionManager(backplane)
+    websocket = _socket()
+    manager.register(websocket, "user-1")
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+
+    with patch("app.websocket.backplane._get_redis", return_value=redis):
+        assert await manager.broadcast_to_user("user-1", {"n": 1}) is True
+    own = redis.publish.await_args.args[1]
+    backplane._on_message(own)
+    backplane._on_message(
+        json.dumps({"origin": "peer", "user_id": "user-1", "message": {"n": 2}})
+    )
+    await manager.drain()
+
+    assert [c.args[0] for c in websocket.send_json.await_args_list] == [
+        {"n": 1},
+        {"n": 2},
+    ]
@@ -5,12 +5,66 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
 from app.middleware.whitelabel_middleware import (
+    DomainBrandingCache,
     WhitelabelMiddleware,
+    _branding_css,
+    _CSSInjector,
+    domain_branding_cache,
     get_whitelabel_context,
 )
 from app.models.whitelabel_models import WhitelabelBranding
 
 
+BRANDING = {
+    "primary_color": "#FF0000",
+    "secondary_color": "#00FF00",
+    "accent_color": "#0000FF",
+    "font_family": "Arial",
+    "logo_url": "https://example.com/logo.png",
+}
+
+
+def _scope(host):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(b"host", host.encode())],
+    }
+
+
+async def _call(middleware, host):
+    """Run the middleware and return the ASGI scope and sent messages."""
+    scope = _scope(host)
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return scope, messages
+
+
+def _body(messages):
+    return b"".join(m.get("body", b"") for m in messages[1:])
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    domain_branding_cache.invalidate()
+    yield
+    domain_branding_cache.invalidate()
+
+
+def _resolved(branding=BRANDING):
+    whitelabel = {"enabled": True, "partner_id": 1, "branding": branding}
+    return AsyncMock(return_value=(whitelabel, _branding_css(branding).encode()))
+
+
 @pytest.fixture
 def mock_app():
     async def app(scope, receive, send):
@@ -66,33 +120,20 @@ class TestDomainDetection:
     async def test_base_domain_no_whitelabel(self, mock_app):
         middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
 
-        request = Mock()
-        request.headers = {"host": "vrenum.app"}
-        request.state = Mock()
-
         with patch("app.middleware.whitelabel_middleware.SessionLocal") as mock_session:
-            call_next = AsyncMock(
-                return_value=Mock(
-                    headers={"content-type": "text/html"}, body_iterator=[]
-                )
-            )
-
-            await middleware.dispatch(request, call_next)
+            scope, _ = await _call(middleware, "vrenum.app")
 
             # Should not query database for base domain
             assert not mock_session.called
+        assert scope["state"]["whitelabel"]["enabled"] is False
 
     @pytest.mark.asyncio
     async def test_custom_domain_queries_db(self, mock_app):
         middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
 
-        request = Mock()
-        request.headers = {"host": "custom.example.com"}
-        request.state = Mock()
-
         mock_branding = Mock(spec=WhitelabelBranding)
         mock_branding.user_id = 1
-        mock_branding.to_dict.return_value = {"company_name": "Custom"}
+        mock_branding.to_dict.return_value = {"company_name": "Custom", **BRANDING}
 
         with patch("app.middleware.whitelabel_middleware.SessionLocal") as mock_session:
             mock_db = Mock()
@@ -103,16 +144,11 @@ class TestDomainDetection:
             ) as mock_get:
                 mock_get.return_value = mock_branding
 
-                call_next = AsyncMock(
-                    return_value=Mock(
-                        headers={"content-type": "text/html"}, body_iterator=[]
-                    )
-                )
-
-                await middleware.dispatch(request, call_next)
+                scope, _ = await _call(middleware, "custom.example.com")
 
                 # Should query database
                 mock_get.assert_called_once_with(mock_db, "custom.example.com")
+        assert scope["state"]["whitelabel"]["partner_id"] == 1
 
 
 class TestBrandingInjection:
@@ -122,53 +158,29 @@ class TestBrandingInjection:
     async def test_css_injected_for_html(self, mock_app):
         middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
 
-        request = Mock()
-        request.headers = {"host": "custom.example.com"}
-        request.state = Mock()
-        request.state.whitelabel = {
-            "enabled": True,
-            "branding": {
-                "primary_color": "#FF0000",
-                "secondary_color": "#00FF00",
-                "accent_color": "#0000FF",
-                "font_family": "Arial",
-                "logo_url": "https://example.com/logo.png",
-            },
-        }
-
-        html_body = b"<html><head></head><body>Test</body></html>"
-
-        async def body_iterator():
-            yield html_body
-
-        response = Mock()
-        response.headers = {"content-type": "text/html"}
-        response.body_iterator = body_iterator()
-        response.status_code = 200
+        with patch.object(middleware, "_resolve", _resolved()):
+            _, messages = await _call(middleware, "custom.example.com")
 
-        result = await middleware._inject_branding_css(request, response)
-
-        # Should return modified response
-        assert result is not None
+        body = _body(messages)
+        assert b'<style id="whitelabel-branding">' in body
+        assert body.index(b"whitelabel-branding") < body.index(b"</head>")
+        # The page is streamed, so the original content-length is dropped
+        assert b"content-length" not in dict(messages[0]["headers"])
 
     @pytest.mark.asyncio
-    async def test_no_injection_for_json(self, mock_app):
-        middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
-
-        request = Mock()
-        request.headers = {"host": "custom.example.com"}
-        request.state = Mock()
-        request.state.whitelabel = {"enabled": True, "branding": {}}
+    async def test_no_injection_for_json(self):
+        async def json_app(scope, receive, send):
+            from starlette.responses import JSONResponse
 
-        response = Mock()
-        response.headers = {"content-type": "application/json"}
+            await JSONResponse({"ok": True})(scope, receive, send)
 
-        call_next = AsyncMock(return_value=response)
+        middleware = WhitelabelMiddleware(json_app, base_domain="vrenum.app")
 
-        result = await middleware.dispatch(request, call_next)
+        with patch.object(middleware, "_resolve", _resolved()):
+            _, messages = await _call(middleware, "custom.example.com")
 
         # Should not modify JSON responses
-        assert result == response
+        assert _body(messages) == b'{"ok":true}'
 
 
 class TestErrorHandling:
@@ -178,10 +190,6 @@ class TestErrorHandling:
     async def test_db_error_graceful(self, mock_app):
         middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
 
-        request = Mock()
-        request.headers = {"host": "custom.example.com"}
-        request.state = Mock()
-
         with patch("app.middleware.whitelabel_middleware.SessionLocal") as mock_session:
             mock_db = Mock()
             mock_session.return_value = mock_db
@@ -191,28 +199,143 @@ class TestErrorHandling:
             ) as mock_get:
                 mock_get.side_effect = Exception("DB error")
 
-                call_next = AsyncMock(
-                    return_value=Mock(
-                        headers={"content-type": "text/html"}, body_iterator=[]
-                    )
-                )
-
                 # Should not crash
-                result = await middleware.dispatch(request, call_next)
-                assert result is not None
+                scope, messages = await _call(middleware, "custom.example.com")
+
+        assert scope["state"]["whitelabel"]["enabled"] is False
+        assert _body(messages) == b"<html><head></head><body>Test</body></html>"
 
     @pytest.mark.asyncio
-    async def test_injection_error_graceful(self, mock_app):
+    async def test_css_render_error_graceful(self, mock_app):
         middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
 
-        request = Mock()
-        request.state = Mock()
-        request.state.whitelabel = {"enabled": True, "branding": None}
+        mock_branding = Mock(spec=WhitelabelBranding)
+        mock_branding.user_id = 1
+        # Missing colour keys; the page is served without branding CSS
+        mock_branding.to_dict.return_value = {"company_name": "Custom"}
+
+        with patch("app.middleware.whitelabel_middleware.SessionLocal"), patch(
+            "app.middleware.whitelabel_middleware.whitelabel_service.get_branding_by_domain",
+            return_value=mock_branding,
+        ):
+            scope, messages = await _call(middleware, "custom.example.com")
+
+        assert scope["state"]["whitelabel"]["enabled"] is True
+        assert _body(messages) == b"<html><head></head><body>Test</body></html>"
+
+
+class TestStreamingInjection:
+    """Test CSS injection across chunk boundaries"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 64])
+    def test_marker_split_across_chunks(self, size):
+        html = b"<html><head><title>x</title></head><body>Test</body></html>"
+        injector = _CSSInjector(b"<style/>")
+
+        out = b"".join(
+            injector.feed(html[i : i + size]) for i in range(0, len(html), size)
+        )
+        out += injector.flush()
+
+        assert out == html.replace(b"</head>", b"<style/>\n</head>")
+
+    def test_falls_back_to_body_without_head(self):
+        injector = _CSSInjector(b"<style/>")
+
+        out = injector.feed(b"<html><body>Test</body></html>") + injector.flush()
 
-        response = Mock()
-        response.headers = {"content-type": "text/html"}
-        response.body_iterator = None  # Will cause error
+        assert out == b"<html><body>\n<style/>Test</body></html>"
+
+    def test_injects_once(self):
+        injector = _CSSInjector(b"<style/>")
+
+        out = injector.feed(b"<head></head>") + injector.feed(b"</head>")
+
+        assert out.count(b"<style/>") == 1
+
+    @pytest.mark.asyncio
+    async def test_streams_chunks_without_buffering(self):
+        async def chunked_app(scope, receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/html"),
+                        (b"content-length", b"37"),
+                    ],
+                }
+            )
+            for part in (b"<html><head></head>", b"<body>Test</body></html>"):
+                await send(
+                    {"type": "http.response.body", "body": part, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = WhitelabelMiddleware(chunked_app, base_domain="vrenum.app")
+        with patch.object(middleware, "_resolve", _resolved()):
+            _, messages = await _call(middleware, "custom.example.com")
+
+        bodies = [m for m in messages if m["type"] == "http.response.body"]
+        assert len(bodies) == 3
+        assert b"whitelabel-branding" in bodies[0]["body"]
+
+
+class TestDomainCache:
+    """Test cached host resolution"""
+
+    @pytest.mark.asyncio
+    async def test_lookups_are_cached(self, mock_app):
+        middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
+        mock_branding = Mock(spec=WhitelabelBranding)
+        mock_branding.user_id = 7
+        mock_branding.to_dict.return_value = dict(BRANDING)
+
+        with patch("app.middleware.whitelabel_middleware.SessionLocal"), patch(
+            "app.middleware.whitelabel_middleware.whitelabel_service.get_branding_by_domain",
+            side_effect=[mock_branding, None, None],
+        ) as mock_get:
+            for _ in range(3):
+                _, messages = await _call(middleware, "custom.example.com")
+                assert b"whitelabel-branding" in _body(messages)
+            assert mock_get.call_count == 1
+
+            # Branding update for the partner forces a fresh lookup
+            domain_branding_cache.invalidate_partner(7)
+            scope, _ = await _call(middleware, "custom.example.com")
+            assert mock_get.call_count == 2
+            assert scope["state"]["whitelabel"]["enabled"] is False
+
+            # Unknown hosts are cached negatively
+            await _call(middleware, "custom.example.com")
+            assert mock_get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_db_errors_are_not_cached(self, mock_app):
+        middleware = WhitelabelMiddleware(mock_app, base_domain="vrenum.app")
 
-        # Should not crash
-        result = await middleware._inject_branding_css(request, response)
-        assert result == response
+        with patch("app.middleware.whitelabel_middleware.SessionLocal"), patch(
+            "app.middleware.whitelabel_middleware.whitelabel_service.get_branding_by_domain",
+            side_effect=Exception("DB error"),
+        ) as mock_get:
+            await _call(middleware, "custom.example.com")
+            await _call(middleware, "custom.example.com")
+
+        assert mock_get.call_count == 2
+
+    def test_expiry_and_lru_eviction(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.core.local_cache.time.monotonic", lambda: now[0])
+        cache = DomainBrandingCache(maxsize=2, ttl=60, negative_ttl=10)
+        enabled = {"enabled": True, "partner_id": 1}
+
+        cache.set("a.com", enabled, b"css")
+        cache.set("b.com", {"enabled": False, "partner_id": None}, None)
+        cache.get("a.com")
+        cache.set("c.com", enabled, b"css")
+
+        assert cache.get("b.com") is None  # least recently used
+        now[0] += 30
+        assert cache.get("a.com") == (enabled, b"css")
+        now[0] += 31
+        assert cache.get("a.com") is None
@@ -0,0 +1,127 @@
+"""Tests for render-time response sanitizing and XSSProtectionMiddleware."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.xss_protection import (
+    SanitizedJSONResponse,
+    TrustedJSONResponse,
+    XSSProtectionMiddleware,
+)
+from app.utils.sanitization import (
+    sanitize_response_content,
+    validate_and_sanitize_response,
+)
+
+PAYLOADS = [
+    {"message": "<script>alert(1)</script>", "count": 3},
+    {"name": 42, "email": None, "title": "plain"},
+    {"status": "<b>top-level scalars are left alone</b>"},
+    {"items": [{"note": "a=b", "tags": ["<i>", "ok"]}, {"id": 1}]},
+    {"nested": {"deep": {"value": "javascript:alert(1)", "x": 1.5}}},
+    {"content": {"raw": "<p>"}},
+    {"rows": ["2026-10-01T12:00:00+00:00", "https://x.io/?a=1", "ONCLICK =x"]},
+    {"rows": [{"href": "JavaScript:void(0)", "attr": "onload=go()"}]},
+    [{"message": "<b>lists at the top level are not sanitized</b>"}],
+    "bare string",
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_matches_validate_and_sanitize_response(payload):
+    assert sanitize_response_content(payload) == validate_and_sanitize_response(payload)
+
+
+def test_clean_content_is_not_copied():
+    payload = {"items": [{"id": i, "service": "telegram"} for i in range(100)]}
+
+    assert sanitize_response_content(payload) is payload
+
+
+def test_only_changed_branches_are_copied():
+    clean = {"id": 1, "service": "telegram"}
+    payload = {"items": [clean, {"note": "<b>"}]}
+
+    result = sanitize_response_content(payload)
+
+    assert result["items"][0] is clean
+    assert result["items"][1] == {"note": "&lt;b&gt;"}
+    assert payload["items"][1] == {"note": "<b>"}
+
+
+def _client():
+    app = FastAPI(default_response_class=SanitizedJSONResponse)
+    app.add_middleware(XSSProtectionMiddleware)
+
+    @app.get("/default")
+    async def default():
+        return {"message": "<b>hi</b>", "items": [{"note": "<i>"}]}
+
+    @app.get("/plain")
+    async def plain():
+        return JSONResponse({"message": "<b>hi</b>"})
+
+    @app.get("/trusted", response_class=TrustedJSONResponse)
+    async def trusted():
+        return {"message": "<b>hi</b>"}
+
+    @app.get("/health/detail")
+    async def allowlisted():
+        return JSONResponse({"message": "<b>hi</b>"})
+
+    return TestClient(app)
+
+
+def test_default_response_is_sanitized_at_render_time():
+    response = _client().get("/default")
+
+    assert response.json() == {
+        "message": "&lt;b&gt;hi&lt;/b&gt;",
+        "items": [{"note": "&lt;i&gt;"}],
+    }
+    assert int(response.headers["content-length"]) == len(response.content)
+
+
+def test_plain_json_response_is_sanitized_by_middleware():
+    response = _client().get("/plain")
+
+    assert response.json() == {"message": "&lt;b&gt;hi&lt;/b&gt;"}
+    assert int(response.headers["content-length"]) == len(response.content)
+
+
+def test_trusted_response_class_opts_out():
+    assert _client().get("/trusted").json() == {"message": "<b>hi</b>"}
+
+
+def test_trusted_path_prefix_opts_out():
+    assert _client().get("/health/detail").json() == {"message": "<b>hi</b>"}
+
+
+@pytest.mark.asyncio
+async def test_sanitized_response_is_not_buffered():
+    async def app(scope, receive, send):
+        await SanitizedJSONResponse({"message": "<b>"})(scope, receive, send)
+
+    sent = []
+
+    async def send(message):
+        sent.append(message["type"])
+
+    async def receive():
+        return {"type": "http.request"}
+
+    scope = {"type": "http", "path": "/x", "method": "GET", "headers": []}
+    await XSSProtectionMiddleware(app)(scope, receive, send)
+
+    assert sent == ["http.response.start", "http.response.body"]
+    assert scope["xss_sanitized"] is True
+
+
+def test_render_escapes_text_fields():
+    body = SanitizedJSONResponse({"message": "<b>", "n": 1}).body
+
+    assert json.loads(body) == {"message": "&lt;b&gt;", "n": 1}